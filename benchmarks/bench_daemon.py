@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark for running ra-aid commands in a warm daemon (ra_aid.daemon).
+
+Measures the wall time before an ra-aid command can start its work:
+- without a daemon: a new interpreter importing the agent stack
+  (ra_aid.__main__), as every ra-aid invocation does
+- with a daemon: a new interpreter running the thin client, which forwards
+  the command to a daemon that forks a child with everything imported
+
+The commands run by the daemon do nothing, so only the startup is measured.
+
+Usage:
+    python benchmarks/bench_daemon.py [--repeat N]
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+# Allow running from a source checkout without installing
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from ra_aid.daemon.protocol import request  # noqa: E402
+
+SERVER_SCRIPT = """
+import sys
+sys.path.insert(0, {repo_root!r})
+import ra_aid.__main__
+from ra_aid.daemon.server import DaemonServer
+DaemonServer(sys.argv[1], runner=lambda argv: None).serve()
+"""
+
+CLIENT_SCRIPT = """
+import sys
+sys.path.insert(0, {repo_root!r})
+from ra_aid.daemon import forward
+sys.exit(forward(["-m", "task"]) or 0)
+"""
+
+
+def timed(argv, cwd: str, env: dict, repeat: int) -> float:
+    """Return the mean wall time of running ``argv`` in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        subprocess.run(argv, cwd=cwd, env=env, check=True)
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    project = tempfile.mkdtemp(prefix="ra-aid-bench-")
+    runtime_dir = tempfile.mkdtemp(prefix="rad-")
+    env = dict(os.environ, XDG_RUNTIME_DIR=runtime_dir)
+    os.environ["XDG_RUNTIME_DIR"] = runtime_dir
+    server = None
+    try:
+        import_stack = f"import sys; sys.path.insert(0, {REPO_ROOT!r}); import ra_aid.__main__"
+        cold = timed(
+            [sys.executable, "-c", import_stack],
+            project,
+            env,
+            args.repeat,
+        )
+
+        server = subprocess.Popen(
+            [sys.executable, "-c", SERVER_SCRIPT.format(repo_root=REPO_ROOT), project],
+            env=env,
+        )
+        while request(project, {"command": "status"}) is None:
+            if server.poll() is not None:
+                sys.exit("The daemon exited")
+            time.sleep(0.1)
+        client = [sys.executable, "-c", CLIENT_SCRIPT.format(repo_root=REPO_ROOT)]
+        # Write the client's bytecode before timing it
+        subprocess.run(client, cwd=project, env=env, check=True)
+        warm = timed(client, project, env, args.repeat)
+        runs = request(project, {"command": "status"})["runs"]
+        if runs != args.repeat + 1:
+            sys.exit(f"Expected {args.repeat + 1} forwarded runs, the daemon served {runs}")
+    finally:
+        if server is not None:
+            request(project, {"command": "stop"})
+            server.wait()
+        shutil.rmtree(project, ignore_errors=True)
+        shutil.rmtree(runtime_dir, ignore_errors=True)
+
+    print(f"{'startup':<28} {'ms/run':>10}")
+    print(f"{'no daemon (cold import)':<28} {cold:>10.1f}")
+    print(f"{'daemon (forwarded)':<28} {warm:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the SQLite performance profiles in ra_aid.database.connection.
+
+For each profile a fresh database is created in a temporary directory, then:
+- trajectory records are written one per transaction through TrajectoryRepository.create,
+  mirroring what every tool call does on the agent's hot path
+- the session's trajectories are read back repeatedly through
+  TrajectoryRepository.get_trajectories_by_session
+
+Usage:
+    python benchmarks/bench_db_profiles.py [--records N] [--reads N] [--profile NAME ...]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Allow running from a source checkout without installing
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ra_aid.database.connection import DB_PROFILES, close_db, db_var, init_db  # noqa: E402
+from ra_aid.database.models import (  # noqa: E402
+    HumanInput,
+    Session,
+    Trajectory,
+    TrajectoryBlob,
+    database_proxy,
+)
+from ra_aid.database.repositories.trajectory_repository import (  # noqa: E402
+    TrajectoryRepository,
+)
+
+
+def run_profile(profile: str, records: int, reads: int) -> dict:
+    """Run the write and read workloads against a fresh database using ``profile``."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_var.set(None)
+        db = init_db(base_dir=tmp_dir, profile=profile)
+        database_proxy.initialize(db)
+        db.create_tables([Session, HumanInput, Trajectory, TrajectoryBlob], safe=True)
+        session = Session.create(command_line="bench")
+
+        repo = TrajectoryRepository(db)
+        payload = {"pattern": "needle", "output": "x" * 512}
+
+        start = time.perf_counter()
+        for i in range(records):
+            repo.create(
+                tool_name="ripgrep_search",
+                tool_parameters={"pattern": "needle", "index": i},
+                tool_result=payload,
+                step_data={"display_title": "Search"},
+                session_id=session.id,
+            )
+        write_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(reads):
+            rows = repo.get_trajectories_by_session(session.id)
+            assert len(rows) == records
+        read_seconds = time.perf_counter() - start
+
+        close_db()
+        db_var.set(None)
+
+    return {
+        "profile": profile,
+        "writes_per_sec": records / write_seconds,
+        "rows_read_per_sec": records * reads / read_seconds,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--reads", type=int, default=5)
+    parser.add_argument(
+        "--profile",
+        action="append",
+        choices=sorted(DB_PROFILES),
+        help="Profile to benchmark (repeatable, default: all)",
+    )
+    args = parser.parse_args()
+
+    print(f"{'profile':<10} {'writes/s':>12} {'rows read/s':>14}")
+    for profile in args.profile or sorted(DB_PROFILES):
+        result = run_profile(profile, args.records, args.reads)
+        print(
+            f"{result['profile']:<10} "
+            f"{result['writes_per_sec']:>12,.0f} "
+            f"{result['rows_read_per_sec']:>14,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
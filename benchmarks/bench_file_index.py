@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the project file index in ra_aid.file_index.
+
+A git repository with many committed files is generated in a temporary
+directory, then the time to get a file listing is measured:
+- uncached, with ra_aid.file_listing.get_file_listing (what every prompt build
+  and fuzzy find used to do)
+- the first (cold) request through ProjectFileIndex
+- repeated (warm) requests through ProjectFileIndex, which only stat the
+  watched directories
+- a warm request right after a new file is created, which rebuilds the listing
+
+Usage:
+    python benchmarks/bench_file_index.py [--files N] [--per-dir N] [--repeat N]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# Allow running from a source checkout without installing
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ra_aid.file_index import RACY_WINDOW_NS, get_project_file_index  # noqa: E402
+from ra_aid.file_listing import get_file_listing  # noqa: E402
+
+GIT_ENV = dict(
+    os.environ,
+    GIT_AUTHOR_NAME="bench",
+    GIT_AUTHOR_EMAIL="bench@example.com",
+    GIT_COMMITTER_NAME="bench",
+    GIT_COMMITTER_EMAIL="bench@example.com",
+)
+
+
+def create_repo(root: str, files: int, per_dir: int) -> None:
+    """Create a git repository with ``files`` committed files, ``per_dir`` per directory."""
+    for i in range(files):
+        directory = os.path.join(root, f"pkg{i // (per_dir * 10)}", f"mod{i // per_dir}")
+        if i % per_dir == 0:
+            os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"file{i}.py"), "w") as f:
+            f.write("x = 1\n")
+
+    subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+    subprocess.run(["git", "add", "-A"], cwd=root, check=True)
+    subprocess.run(
+        ["git", "commit", "-q", "-m", "bench"], cwd=root, check=True, env=GIT_ENV
+    )
+
+
+def timed(func, repeat: int) -> float:
+    """Return the mean wall time of ``func`` in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--per-dir", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        print(f"Creating a git repository with {args.files:,} files...")
+        create_repo(root, args.files, args.per_dir)
+        time.sleep(2 * RACY_WINDOW_NS / 1e9)
+
+        index = get_project_file_index()
+        index.invalidate()
+
+        results = [
+            ("uncached get_file_listing", timed(lambda: get_file_listing(root, limit=2000), args.repeat)),
+            ("index, cold", timed(lambda: index.get_file_listing(root, limit=2000), 1)),
+            ("index, warm", timed(lambda: index.get_file_listing(root, limit=2000), args.repeat)),
+        ]
+
+        with open(os.path.join(root, "pkg0", "mod0", "new_file.py"), "w") as f:
+            f.write("y = 2\n")
+        results.append(
+            ("index, after a change", timed(lambda: index.get_file_listing(root, limit=2000), 1))
+        )
+
+    print(f"{'listing':<28} {'ms/call':>10}")
+    for name, ms in results:
+        print(f"{name:<28} {ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
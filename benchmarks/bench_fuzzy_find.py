@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the prebuilt fuzzy-search candidates in ra_aid.tools.fuzzy_find.
+
+A synthetic monorepo-like file list is searched with:
+- a fuzzywuzzy-style scan: rapidfuzz process.extract over the raw paths on
+  every call, the way fuzzy_find_project_files worked before the index
+- FuzzyCandidates.search on prebuilt candidates (trigram shortlist for large
+  lists, falling back to a full scan of preprocessed paths)
+
+It also reports the one-time cost of building the candidates and the cost of
+updating them incrementally when a file is added and another removed.
+
+Usage:
+    python benchmarks/bench_fuzzy_find.py [--files N] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Allow running from a source checkout without installing
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rapidfuzz import fuzz, process, utils  # noqa: E402
+
+from ra_aid.tools.fuzzy_find import DEFAULT_EXCLUDE_PATTERNS, FuzzyCandidates  # noqa: E402
+
+TERMS = ["payment webhook", "user_service", "README", "test_handler_1234", "cfg"]
+
+
+def make_files(count: int) -> list:
+    """Generate a sorted, monorepo-like list of ``count`` relative file paths."""
+    areas = ["services", "libs", "apps", "tools", "infra"]
+    kinds = ["handler", "model", "service", "utils", "test_handler", "schema"]
+    files = [
+        f"{areas[i % 5]}/team{i % 97}/component{i % 1009}/{kinds[i % 6]}_{i}.py"
+        for i in range(count)
+    ]
+    files += ["services/payments/stripe_webhook.py", "libs/users/user_service.py", "README.md"]
+    return sorted(files)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    files = make_files(args.files)
+    print(f"{len(files):,} files")
+
+    start = time.perf_counter()
+    candidates = FuzzyCandidates(files, None, DEFAULT_EXCLUDE_PATTERNS)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"build candidates (first search only): {build_ms:,.0f} ms")
+
+    changed = sorted(files[1:] + ["services/payments/new_module.py"])
+    start = time.perf_counter()
+    candidates.update(changed)
+    update_ms = (time.perf_counter() - start) * 1000
+    print(f"update after the file list changes: {update_ms:,.1f} ms")
+
+    print(f"{'term':<20} {'scan ms':>10} {'indexed ms':>11}  best match")
+    for term in TERMS:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            process.extract(
+                term, files, scorer=fuzz.WRatio, processor=utils.default_process, limit=10
+            )
+        scan_ms = (time.perf_counter() - start) * 1000 / args.repeat
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            results = candidates.search(term, 10, 60)
+        indexed_ms = (time.perf_counter() - start) * 1000 / args.repeat
+
+        best = results[0][0] if results else "-"
+        print(f"{term:<20} {scan_ms:>10.1f} {indexed_ms:>11.1f}  {best}")
+
+
+if __name__ == "__main__":
+    main()
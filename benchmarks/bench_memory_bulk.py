@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the bulk create/delete APIs of the memory repositories.
+
+Key facts are stored and then deleted in batches, against a fresh on-disk
+database per run, comparing:
+- the previous per-row path: KeyFactRepository.create for every fact (one
+  transaction each), and get + delete for every ID a GC agent deletes
+- KeyFactRepository.create_many and delete_many, which use a single
+  transaction per batch and one SELECT ... WHERE id IN (...) for the delete
+
+Duplicate detection is disabled in both so that only the database round
+trips are compared.
+
+Usage:
+    python benchmarks/bench_memory_bulk.py [--facts N] [--batch N] [--profile NAME]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Allow running from a source checkout without installing
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ra_aid.database.connection import DB_PROFILES, close_db, db_var, init_db  # noqa: E402
+from ra_aid.database.models import HumanInput, KeyFact, Session, database_proxy  # noqa: E402
+from ra_aid.database.repositories.key_fact_repository import (  # noqa: E402
+    KeyFactRepository,
+)
+
+
+def per_row(repo: KeyFactRepository, batches: list) -> tuple:
+    """Store and delete each batch one row at a time; return (create, delete) seconds."""
+    start = time.perf_counter()
+    created = [
+        [repo.create(content, deduplicate=False).id for content in batch] for batch in batches
+    ]
+    create_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for ids in created:
+        for fact_id in ids:
+            if repo.get(fact_id):
+                repo.delete(fact_id)
+    return create_seconds, time.perf_counter() - start
+
+
+def bulk(repo: KeyFactRepository, batches: list) -> tuple:
+    """Store and delete each batch with one call; return (create, delete) seconds."""
+    start = time.perf_counter()
+    created = [
+        [fact.id for fact in repo.create_many(batch, deduplicate=False)] for batch in batches
+    ]
+    create_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for ids in created:
+        repo.delete_many(ids)
+    return create_seconds, time.perf_counter() - start
+
+
+def run(workload, profile: str, batches: list) -> tuple:
+    """Run ``workload`` against a fresh database using ``profile``."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_var.set(None)
+        db = init_db(base_dir=tmp_dir, profile=profile)
+        database_proxy.initialize(db)
+        db.create_tables([Session, HumanInput, KeyFact], safe=True)
+        try:
+            return workload(KeyFactRepository(db), batches)
+        finally:
+            close_db()
+            db_var.set(None)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--facts", type=int, default=2000, help="facts stored in total")
+    parser.add_argument("--batch", type=int, default=20, help="facts per emit/delete call")
+    parser.add_argument("--profile", choices=sorted(DB_PROFILES), default="default")
+    args = parser.parse_args()
+
+    contents = [f"Fact {i}: the module at src/module_{i}.py handles case {i}" for i in range(args.facts)]
+    batches = [contents[i : i + args.batch] for i in range(0, len(contents), args.batch)]
+    print(f"{args.facts:,} facts in batches of {args.batch}, profile {args.profile!r}")
+
+    print(f"{'path':<10} {'create µs/row':>14} {'delete µs/row':>14}")
+    for name, workload in (("per-row", per_row), ("bulk", bulk)):
+        create_seconds, delete_seconds = run(workload, args.profile, batches)
+        print(
+            f"{name:<10} {create_seconds / args.facts * 1e6:>14.1f} "
+            f"{delete_seconds / args.facts * 1e6:>14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
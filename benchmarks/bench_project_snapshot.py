@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the persistent project snapshot in ra_aid.project_snapshot.
+
+A git repository with many committed files is generated in a temporary
+directory, then the time for get_project_info (what every agent creation
+calls) is measured for:
+- the first call of a run without a snapshot in .ra-aid (a cold start, which
+  lists the project and writes the snapshot)
+- the first call of a run with a current snapshot (a repeat run)
+- repeated calls within a run (nested agents)
+
+Each run is simulated by emptying the process-wide ProjectFileIndex.
+
+Usage:
+    python benchmarks/bench_project_snapshot.py [--files N] [--per-dir N] [--repeat N]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# Allow running from a source checkout without installing
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ra_aid.file_index import RACY_WINDOW_NS, get_project_file_index  # noqa: E402
+from ra_aid.project_info import get_project_info  # noqa: E402
+from ra_aid.project_snapshot import project_snapshot_path  # noqa: E402
+
+GIT_ENV = dict(
+    os.environ,
+    GIT_AUTHOR_NAME="bench",
+    GIT_AUTHOR_EMAIL="bench@example.com",
+    GIT_COMMITTER_NAME="bench",
+    GIT_COMMITTER_EMAIL="bench@example.com",
+)
+
+
+def create_repo(root: str, files: int, per_dir: int) -> None:
+    """Create a git repository with ``files`` committed files, ``per_dir`` per directory."""
+    for i in range(files):
+        directory = os.path.join(root, f"pkg{i // (per_dir * 10)}", f"mod{i // per_dir}")
+        if i % per_dir == 0:
+            os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"file{i}.py"), "w") as f:
+            f.write("x = 1\n")
+
+    subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+    subprocess.run(["git", "add", "-A"], cwd=root, check=True)
+    subprocess.run(
+        ["git", "commit", "-q", "-m", "bench"], cwd=root, check=True, env=GIT_ENV
+    )
+    os.mkdir(os.path.join(root, ".ra-aid"))
+
+
+def timed(func, repeat: int) -> float:
+    """Return the mean wall time of ``func`` in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--per-dir", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        print(f"Creating a git repository with {args.files:,} files...")
+        create_repo(root, args.files, args.per_dir)
+        # Let git status refresh the index once, as the user's own git use would
+        subprocess.run(["git", "status"], cwd=root, check=True, capture_output=True)
+        time.sleep(2 * RACY_WINDOW_NS / 1e9)
+
+        index = get_project_file_index()
+        snapshot = project_snapshot_path(os.path.realpath(root))
+
+        def new_run(keep_snapshot: bool) -> None:
+            index.invalidate()
+            if not keep_snapshot and os.path.exists(snapshot):
+                os.remove(snapshot)
+            get_project_info(root, file_limit=2000)
+
+        results = [
+            ("cold start (no snapshot)", timed(lambda: new_run(False), args.repeat)),
+            ("repeat run (snapshot)", timed(lambda: new_run(True), args.repeat)),
+            ("nested agent (in process)", timed(lambda: get_project_info(root, file_limit=2000), args.repeat)),
+        ]
+
+    print(f"{'get_project_info':<28} {'ms/call':>10}")
+    for name, ms in results:
+        print(f"{name:<28} {ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the database startup path: opening the database and ensuring migrations.
+
+Each run opens the project database with DatabaseManager and calls
+ensure_migrations_applied, as every ra-aid start does, for:
+- a fresh project, where the database file does not exist yet
+- an existing project, where every migration has already been applied
+
+The "legacy" mode reproduces the behaviour before schema version stamps:
+existing databases are unstamped, so peewee_migrate builds a Router and diffs
+the migrations directory on every start, and fresh databases replay every
+migration instead of recording the squashed baseline. The "stamped" mode is
+the current behaviour.
+
+Usage:
+    python benchmarks/bench_startup_migrations.py [--runs N]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Allow running from a source checkout without installing
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ra_aid.database.connection import DatabaseManager, db_var  # noqa: E402
+from ra_aid.database.migrations import ensure_migrations_applied  # noqa: E402
+from ra_aid.database.models import database_proxy  # noqa: E402
+from ra_aid.database.schema import latest_schema_version  # noqa: E402
+
+MODES = ("legacy", "stamped")
+
+
+def start(legacy: bool) -> float:
+    """Open the database of the current directory and ensure migrations, timed."""
+    # Each start is a new process, with no connection bound to the models
+    db_var.set(None)
+    database_proxy.initialize(None)
+    begin = time.perf_counter()
+    with DatabaseManager() as db:
+        if legacy:
+            # Replay migrations on fresh databases, check them on existing ones
+            if hasattr(db, "_schema_created"):
+                del db._schema_created
+            db.execute_sql("PRAGMA user_version = 0")
+        assert ensure_migrations_applied()
+        if legacy:
+            db.execute_sql("PRAGMA user_version = 0")
+    return time.perf_counter() - begin
+
+
+def run_mode(mode: str, runs: int) -> dict:
+    """Time fresh and existing project starts in the given mode."""
+    legacy = mode == "legacy"
+    cwd = os.getcwd()
+    fresh, existing = [], []
+    try:
+        for _ in range(runs):
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                os.chdir(tmp_dir)
+                fresh.append(start(legacy))
+                existing.append(start(legacy))
+                os.chdir(cwd)
+    finally:
+        os.chdir(cwd)
+        db_var.set(None)
+    return {
+        "mode": mode,
+        "fresh_ms": statistics.median(fresh) * 1000,
+        "existing_ms": statistics.median(existing) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    # Import peewee_migrate up front so neither mode pays for it
+    run_mode("legacy", 1)
+
+    print(f"schema version: {latest_schema_version()}, median of {args.runs} runs")
+    print(f"{'mode':<8} {'fresh project':>14} {'existing project':>17}")
+    for mode in MODES:
+        result = run_mode(mode, args.runs)
+        print(
+            f"{result['mode']:<8} "
+            f"{result['fresh_ms']:>12.1f}ms "
+            f"{result['existing_ms']:>15.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark of inline vs blob storage of large trajectory payloads.
+
+For each mode a fresh database is created in a temporary directory, then:
+- trajectory records are written through TrajectoryRepository.create with a mix
+  of small results and large results (file reads and command output), some of
+  which repeat, as they do when an agent reads the same file more than once
+- the session's trajectories are read back through
+  TrajectoryRepository.get_trajectories_by_session
+
+The "inline" mode stores every payload in the trajectory row, as before blob
+storage existed; "blob" uses the default blob threshold. The database file
+size is reported after a VACUUM.
+
+Usage:
+    python benchmarks/bench_trajectory_blobs.py [--records N] [--reads N] [--distinct N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Allow running from a source checkout without installing
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ra_aid.config import DEFAULT_TRAJECTORY_BLOB_THRESHOLD  # noqa: E402
+from ra_aid.database.blobs import default_codec  # noqa: E402
+from ra_aid.database.connection import close_db, db_var, init_db  # noqa: E402
+from ra_aid.database.models import (  # noqa: E402
+    HumanInput,
+    Session,
+    Trajectory,
+    TrajectoryBlob,
+    database_proxy,
+)
+from ra_aid.database.repositories.trajectory_repository import (  # noqa: E402
+    TrajectoryRepository,
+)
+
+MODES = {"inline": 0, "blob": DEFAULT_TRAJECTORY_BLOB_THRESHOLD}
+
+
+def make_results(records: int, distinct: int) -> list:
+    """Build the tool results to write: every fourth one small, the rest large."""
+    rng = random.Random(0)
+    large = [
+        {
+            "path": f"src/module_{i}.py",
+            "content": "\n".join(
+                f"def function_{i}_{line}(value):\n    return value * {rng.randint(1, 99)}"
+                for line in range(200)
+            ),
+        }
+        for i in range(distinct)
+    ]
+    return [
+        {"output": f"ok {i}"} if i % 4 == 0 else large[rng.randrange(distinct)]
+        for i in range(records)
+    ]
+
+
+def run_mode(mode: str, results: list, reads: int) -> dict:
+    """Write and read ``results`` against a fresh database in the given mode."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_var.set(None)
+        db = init_db(base_dir=tmp_dir)
+        database_proxy.initialize(db)
+        db.create_tables([Session, HumanInput, Trajectory, TrajectoryBlob], safe=True)
+        session = Session.create(command_line="bench")
+
+        repo = TrajectoryRepository(db, blob_threshold=MODES[mode])
+
+        start = time.perf_counter()
+        for i, result in enumerate(results):
+            repo.create(
+                tool_name="read_file_tool",
+                tool_parameters={"filepath": f"src/module_{i}.py"},
+                tool_result=result,
+                step_data={"display_title": "Read file"},
+                session_id=session.id,
+            )
+        write_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(reads):
+            rows = repo.get_trajectories_by_session(session.id)
+            assert len(rows) == len(results)
+        read_seconds = time.perf_counter() - start
+
+        db.execute_sql("VACUUM")
+        blob_count = TrajectoryBlob.select().count()
+        db_path = db.database
+        close_db()
+        db_var.set(None)
+        size = os.path.getsize(db_path)
+
+    return {
+        "mode": mode,
+        "db_bytes": size,
+        "blobs": blob_count,
+        "writes_per_sec": len(results) / write_seconds,
+        "rows_read_per_sec": len(results) * reads / read_seconds,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--reads", type=int, default=3)
+    parser.add_argument(
+        "--distinct", type=int, default=100, help="Number of distinct large results"
+    )
+    args = parser.parse_args()
+
+    results = make_results(args.records, args.distinct)
+    print(f"codec: {default_codec()}, threshold: {DEFAULT_TRAJECTORY_BLOB_THRESHOLD} bytes")
+    print(f"{'mode':<8} {'db size':>12} {'blobs':>7} {'writes/s':>10} {'rows read/s':>13}")
+    for mode in MODES:
+        result = run_mode(mode, results, args.reads)
+        print(
+            f"{result['mode']:<8} "
+            f"{result['db_bytes'] / 1024:>10,.0f}KB "
+            f"{result['blobs']:>7} "
+            f"{result['writes_per_sec']:>10,.0f} "
+            f"{result['rows_read_per_sec']:>13,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
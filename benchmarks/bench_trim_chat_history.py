@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark for CiaynAgent._trim_chat_history on long chat histories.
+
+A history of 5,000 messages (configurable) is trimmed to a token limit that
+keeps about half of it, comparing:
+- the previous algorithm, which re-summed the token estimate of every
+  remaining message after popping each message from the front of the list
+- the current implementation (cold), with a running total
+- the current implementation on the next agent step (warm), when only the
+  newly appended message has to be estimated
+
+Usage:
+    python benchmarks/bench_trim_chat_history.py [--messages N] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+from unittest.mock import Mock
+
+# Allow running from a source checkout without installing
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.messages import AIMessage, HumanMessage  # noqa: E402
+
+from ra_aid.agent_backends.ciayn_agent import CiaynAgent  # noqa: E402
+
+
+def make_history(count: int) -> list:
+    """Create ``count`` alternating messages of varying size."""
+    return [
+        (HumanMessage if i % 2 == 0 else AIMessage)(
+            content=f"message {i} " + "lorem ipsum dolor sit amet " * (i % 40 + 1)
+        )
+        for i in range(count)
+    ]
+
+
+def previous_trim(agent: CiaynAgent, initial_messages: list, chat_history: list) -> list:
+    """The trimming algorithm before the running total and token cache."""
+    if len(chat_history) > agent.max_history_messages:
+        chat_history = chat_history[-agent.max_history_messages :]
+    initial_tokens = sum(agent._estimate_tokens(msg) for msg in initial_messages)
+    while chat_history:
+        total_tokens = initial_tokens + sum(
+            agent._estimate_tokens(msg) for msg in chat_history
+        )
+        if total_tokens <= agent.max_tokens:
+            break
+        chat_history.pop(0)
+    return initial_messages + chat_history
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    history = make_history(args.messages)
+    initial_messages = [HumanMessage(content="You are a helpful agent.")]
+    total = sum(CiaynAgent._estimate_tokens(msg) for msg in history)
+    max_tokens = int(total // 2)
+    print(f"{args.messages:,} messages, {total:,.0f} estimated tokens, limit {max_tokens:,}")
+
+    def new_agent() -> CiaynAgent:
+        return CiaynAgent(
+            Mock(), [], max_history_messages=args.messages * 2, max_tokens=max_tokens
+        )
+
+    def timed(trim) -> tuple:
+        agents = [new_agent() for _ in range(args.repeat)]
+        start = time.perf_counter()
+        for agent in agents:
+            kept = trim(agent)
+        return (time.perf_counter() - start) / args.repeat, len(kept)
+
+    results = [
+        (
+            "previous (re-sum per pop)",
+            *timed(lambda agent: previous_trim(agent, initial_messages, list(history))),
+        ),
+        (
+            "running total, cold",
+            *timed(lambda agent: agent._trim_chat_history(initial_messages, list(history))),
+        ),
+    ]
+
+    agent = new_agent()
+    chat_history = list(history)
+    agent._trim_chat_history(initial_messages, chat_history)
+    start = time.perf_counter()
+    for i in range(args.repeat):
+        chat_history.append(HumanMessage(content=f"next step {i}"))
+        kept = agent._trim_chat_history(initial_messages, chat_history)
+    results.append(
+        ("running total, next step", (time.perf_counter() - start) / args.repeat, len(kept))
+    )
+
+    print(f"{'trim':<28} {'ms/call':>10} {'kept':>7}")
+    for name, seconds, kept_count in results:
+        print(f"{name:<28} {seconds * 1000:>10.2f} {kept_count:>7}")
+
+
+if __name__ == "__main__":
+    main()
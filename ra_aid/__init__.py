@@ -1,15 +1,19 @@
 from .__version__ import __version__
-from .agent_utils import run_agent_with_retry
-from .console.formatting import (
-    print_error,
-    print_interrupt,
-    print_stage_header,
-    print_task_header,
-)
-from .console.output import print_agent_output
-from .text.processing import truncate_output
-from .scripts.last_session_usage import get_latest_session_usage
-from .scripts.all_sessions_usage import get_all_sessions_usage
+
+# Public names are imported from their modules on first access, so that
+# importing any ra_aid submodule (e.g. by the ra-aid entry point) does not
+# import the whole agent stack
+_LAZY_EXPORTS = {
+    "run_agent_with_retry": ".agent_utils",
+    "print_error": ".console.formatting",
+    "print_interrupt": ".console.formatting",
+    "print_stage_header": ".console.formatting",
+    "print_task_header": ".console.formatting",
+    "print_agent_output": ".console.output",
+    "truncate_output": ".text.processing",
+    "get_latest_session_usage": ".scripts.last_session_usage",
+    "get_all_sessions_usage": ".scripts.all_sessions_usage",
+}
 
 __all__ = [
     "print_stage_header",
@@ -23,3 +27,17 @@ __all__ = [
     "get_latest_session_usage",
     "get_all_sessions_usage",
 ]
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        import importlib
+
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
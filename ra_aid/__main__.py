@@ -1,7 +1,8 @@
-import argparse
+import contextlib
 import logging
 import os
 import sys
+import time
 import uuid
 from datetime import datetime
 
@@ -20,13 +21,8 @@ from ra_aid.agent_utils import (
     run_agent_with_retry,
 )
 from ra_aid.agents.research_agent import run_research_agent
-from ra_aid.config import (
-    DEFAULT_MAX_TEST_CMD_RETRIES,
-    DEFAULT_MODEL,
-    DEFAULT_RECURSION_LIMIT,
-    DEFAULT_TEST_CMD_TIMEOUT,
-    VALID_PROVIDERS,
-)
+from ra_aid.batch import BatchRunner, default_batch_output_path, load_batch_tasks
+from ra_aid.arguments import parse_arguments
 from ra_aid.database.repositories.key_fact_repository import (
     KeyFactRepositoryManager,
     get_key_fact_repository,
@@ -56,7 +52,8 @@ from ra_aid.database.repositories.config_repository import (
     ConfigRepositoryManager,
     get_config_repository,
 )
-from ra_aid.env_inv import EnvDiscovery
+from ra_aid.env_inv import discover_environment
+from ra_aid.memory_gc import get_memory_gc_scheduler
 from ra_aid.env_inv_context import EnvInvManager, get_env_inv
 from ra_aid.model_formatters import format_key_facts_dict
 from ra_aid.model_formatters.key_snippets_formatter import format_key_snippets_dict
@@ -65,6 +62,7 @@ from ra_aid.database import (
     DatabaseManager,
     ensure_migrations_applied,
 )
+from ra_aid.database.retention import start_background_vacuum
 from ra_aid.dependencies import check_dependencies
 from ra_aid.env import validate_environment
 from ra_aid.exceptions import AgentInterrupt
@@ -77,6 +75,7 @@ from ra_aid.prompts.chat_prompts import CHAT_PROMPT
 from ra_aid.prompts.web_research_prompts import WEB_RESEARCH_PROMPT_SECTION_CHAT
 from ra_aid.prompts.custom_tools_prompts import DEFAULT_CUSTOM_TOOLS_PROMPT
 from ra_aid.tool_configs import get_chat_tools, set_modification_tools, get_custom_tools
+from ra_aid.startup import StartupPipeline
 from ra_aid.tools.human import ask_human
 
 logger = get_logger(__name__)
@@ -125,7 +124,6 @@ def launch_server(host: str, port: int, args):
     )
     from ra_aid.database.repositories.config_repository import ConfigRepositoryManager
     from ra_aid.env_inv_context import EnvInvManager
-    from ra_aid.env_inv import EnvDiscovery
 
     # Set the console handler level to INFO for server mode
     # Get the root logger and modify the console handler
@@ -190,22 +188,24 @@ def launch_server(host: str, port: int, args):
         )
 
     # Initialize environment discovery
-    env_discovery = EnvDiscovery()
-    env_discovery.discover()
-    env_data = env_discovery.format_markdown()
+    env_data = discover_environment(args.project_state_dir)
 
     print(f"Starting RA.Aid web interface on http://{host}:{port}")
 
     # Initialize database connection and repositories
     with (
-        DatabaseManager(base_dir=args.project_state_dir) as db,
+        DatabaseManager(
+            base_dir=args.project_state_dir, profile=args.db_profile
+        ) as db,
         SessionRepositoryManager(db) as session_repo,
         KeyFactRepositoryManager(db) as key_fact_repo,
         KeySnippetRepositoryManager(db) as key_snippet_repo,
         HumanInputRepositoryManager(db) as human_input_repo,
         ResearchNoteRepositoryManager(db) as research_note_repo,
         RelatedFilesRepositoryManager() as related_files_repo,
-        TrajectoryRepositoryManager(db) as trajectory_repo,
+        TrajectoryRepositoryManager(
+            db, write_behind=args.trajectory_write_behind
+        ) as trajectory_repo,
         WorkLogRepositoryManager() as work_log_repo,
         ConfigRepositoryManager() as config_repo,
         EnvInvManager(env_data) as env_inv,
@@ -237,6 +237,8 @@ def launch_server(host: str, port: int, args):
                 "web_research_enabled": web_research_enabled,
                 "show_thoughts": args.show_thoughts,
                 "show_cost": args.show_cost,
+                "db_profile": args.db_profile,
+                "memory_token_budget": args.memory_token_budget,
                 "force_reasoning_assistance": args.reasoning_assistance,
                 "disable_reasoning_assistance": args.no_reasoning_assistance,
             }
@@ -246,323 +248,6 @@ def launch_server(host: str, port: int, args):
         run_server(host=host, port=port)
 
 
-def parse_arguments(args=None):
-    ANTHROPIC_DEFAULT_MODEL = DEFAULT_MODEL
-    OPENAI_DEFAULT_MODEL = "gpt-4o"
-
-    # Case-insensitive log level argument type
-    def log_level_type(value):
-        value = value.lower()
-        if value not in ["debug", "info", "warning", "error", "critical"]:
-            raise argparse.ArgumentTypeError(
-                f"Invalid log level: {value}. Choose from debug, info, warning, error, critical."
-            )
-        return value
-
-    parser = argparse.ArgumentParser(
-        description="RA.Aid - AI Agent for executing programming and research tasks",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-    ra-aid -m "Add error handling to the database module"
-    ra-aid -m "Explain the authentication flow" --research-only
-    ra-aid --msg-file task_description.txt
-        """,
-    )
-    parser.add_argument(
-        "-m",
-        "--message",
-        type=str,
-        help="The task or query to be executed by the agent (cannot be used with --msg-file)",
-    )
-    parser.add_argument(
-        "--msg-file",
-        type=str,
-        help="Path to a text file containing the task/message (cannot be used with --message)",
-    )
-    parser.add_argument(
-        "--version",
-        action="version",
-        version=f"%(prog)s {__version__}",
-        help="Show program version number and exit",
-    )
-    parser.add_argument(
-        "--research-only",
-        action="store_true",
-        help="Only perform research without implementation",
-    )
-    parser.add_argument(
-        "--provider",
-        type=str,
-        default=(
-            "openai"
-            if (os.getenv("OPENAI_API_KEY") and not os.getenv("ANTHROPIC_API_KEY"))
-            else "anthropic"
-        ),
-        choices=VALID_PROVIDERS,
-        help="The LLM provider to use",
-    )
-    parser.add_argument("--model", type=str, help="The model name to use")
-    parser.add_argument(
-        "--num-ctx",
-        type=int,
-        default=262144,
-        help="Context window size for Ollama models",
-    )
-    parser.add_argument(
-        "--research-provider",
-        type=str,
-        choices=VALID_PROVIDERS,
-        help="Provider to use specifically for research tasks",
-    )
-    parser.add_argument(
-        "--research-model",
-        type=str,
-        help="Model to use specifically for research tasks",
-    )
-    parser.add_argument(
-        "--planner-provider",
-        type=str,
-        choices=VALID_PROVIDERS,
-        help="Provider to use specifically for planning tasks",
-    )
-    parser.add_argument(
-        "--planner-model", type=str, help="Model to use specifically for planning tasks"
-    )
-    parser.add_argument(
-        "--cowboy-mode",
-        action="store_true",
-        help="Skip interactive approval for shell commands",
-    )
-    parser.add_argument(
-        "--expert-provider",
-        type=str,
-        default=None,
-        choices=VALID_PROVIDERS,
-        help="The LLM provider to use for expert knowledge queries",
-    )
-    parser.add_argument(
-        "--expert-model",
-        type=str,
-        help="The model name to use for expert knowledge queries (required for non-OpenAI providers)",
-    )
-    parser.add_argument(
-        "--expert-num-ctx",
-        type=int,
-        default=262144,
-        help="Context window size for expert Ollama models",
-    )
-    parser.add_argument(
-        "--hil",
-        "-H",
-        action="store_true",
-        help="Enable human-in-the-loop mode, where the agent can prompt the user for additional information.",
-    )
-    parser.add_argument(
-        "--chat",
-        action="store_true",
-        help="Enable chat mode with direct human interaction (implies --hil)",
-    )
-    parser.add_argument(
-        "--log-mode",
-        choices=["console", "file"],
-        default="file",
-        help="Logging mode: 'console' shows all logs in console, 'file' logs to file with only warnings+ in console",
-    )
-    parser.add_argument(
-        "--pretty-logger", action="store_true", help="Enable pretty logging output"
-    )
-    parser.add_argument(
-        "--log-level",
-        type=log_level_type,
-        default="debug",
-        help="Set specific logging level (case-insensitive, affects file and console logging based on --log-mode)",
-    )
-    parser.add_argument(
-        "--temperature",
-        type=float,
-        help="LLM temperature (0.0-2.0). Controls randomness in responses",
-        default=None,
-    )
-    parser.add_argument(
-        "--disable-limit-tokens",
-        action="store_false",
-        help="Whether to disable token limiting for Anthropic Claude react agents. Token limiter removes older messages to prevent maximum token limit API errors.",
-    )
-    parser.add_argument(
-        "--experimental-fallback-handler",
-        action="store_true",
-        help="Enable experimental fallback handler.",
-    )
-    parser.add_argument(
-        "--recursion-limit",
-        type=int,
-        default=DEFAULT_RECURSION_LIMIT,
-        help="Maximum recursion depth for agent operations (default: 100)",
-    )
-    parser.add_argument(
-        "--aider-config", type=str, help="Specify the aider config file path"
-    )
-    parser.add_argument(
-        "--use-aider",
-        action="store_true",
-        help="Use aider for code modifications instead of default file tools (file_str_replace, put_complete_file_contents)",
-    )
-    parser.add_argument(
-        "--test-cmd",
-        type=str,
-        help="Test command to run before completing tasks (e.g. 'pytest tests/')",
-    )
-    parser.add_argument(
-        "--auto-test",
-        action="store_true",
-        help="Automatically run tests before completing tasks",
-    )
-    parser.add_argument(
-        "--max-test-cmd-retries",
-        type=int,
-        default=DEFAULT_MAX_TEST_CMD_RETRIES,
-        help="Maximum number of retries for the test command (default: 3)",
-    )
-    parser.add_argument(
-        "--test-cmd-timeout",
-        type=int,
-        default=DEFAULT_TEST_CMD_TIMEOUT,
-        help=f"Timeout in seconds for test command execution (default: {DEFAULT_TEST_CMD_TIMEOUT})",
-    )
-    parser.add_argument(
-        "--server",
-        action="store_true",
-        help="Launch the web interface",
-    )
-    parser.add_argument(
-        "--server-host",
-        type=str,
-        default="0.0.0.0",
-        help="Host to listen on for web interface (default: 0.0.0.0)",
-    )
-    parser.add_argument(
-        "--server-port",
-        type=int,
-        default=1818,
-        help="Port to listen on for web interface (default: 1818)",
-    )
-    parser.add_argument(
-        "--wipe-project-memory",
-        action="store_true",
-        help="Delete the project database file (.ra-aid/pk.db) before starting, effectively wiping all stored memory",
-    )
-    parser.add_argument(
-        "--project-state-dir",
-        help="Directory to store project state (database and logs). By default, a .ra-aid directory is created in the current working directory.",
-    )
-    parser.add_argument(
-        "--show-thoughts",
-        action="store_true",
-        help="Display model thinking content extracted from think tags when supported by the model",
-    )
-    parser.add_argument(
-        "--show-cost",
-        action="store_true",
-        help="Display cost information as the agent works",
-    )
-    parser.add_argument(
-        "--track-cost",
-        action="store_true",
-        default=False,
-        help="Track token usage and costs (default: False)",
-    )
-    parser.add_argument(
-        "--no-track-cost",
-        action="store_false",
-        dest="track_cost",
-        help="Disable tracking of token usage and costs",
-    )
-    parser.add_argument(
-        "--reasoning-assistance",
-        action="store_true",
-        help="Force enable reasoning assistance regardless of model defaults",
-    )
-    parser.add_argument(
-        "--no-reasoning-assistance",
-        action="store_true",
-        help="Force disable reasoning assistance regardless of model defaults",
-    )
-    parser.add_argument(
-        "--custom-tools",
-        type=str,
-        help="File path of Python module containing custom tools (e.g. ./path/to_custom_tools.py)",
-    )
-    if args is None:
-        args = sys.argv[1:]
-    parsed_args = parser.parse_args(args)
-
-    # Validate message vs msg-file usage
-    if parsed_args.message and parsed_args.msg_file:
-        parser.error("Cannot use both --message and --msg-file")
-    if parsed_args.msg_file:
-        try:
-            with open(parsed_args.msg_file, "r") as f:
-                parsed_args.message = f.read()
-        except IOError as e:
-            parser.error(f"Failed to read message file: {str(e)}")
-
-    # Set hil=True when chat mode is enabled
-    if parsed_args.chat:
-        parsed_args.hil = True
-
-    # Validate provider
-    if parsed_args.provider not in VALID_PROVIDERS:
-        parser.error(f"Invalid provider: {parsed_args.provider}")
-    # Handle model defaults and requirements
-
-    if parsed_args.provider == "openai":
-        parsed_args.model = parsed_args.model or OPENAI_DEFAULT_MODEL
-    elif parsed_args.provider == "anthropic":
-        # Use default model for Anthropic only if not specified
-        parsed_args.model = parsed_args.model or ANTHROPIC_DEFAULT_MODEL
-    elif not parsed_args.model and not parsed_args.research_only:
-        # Require model for other providers unless in research mode
-        parser.error(
-            f"--model is required when using provider '{parsed_args.provider}'"
-        )
-
-    # Handle expert provider/model defaults
-    if not parsed_args.expert_provider:
-        # Check for OpenAI API key first
-        if os.environ.get("OPENAI_API_KEY"):
-            parsed_args.expert_provider = "openai"
-            parsed_args.expert_model = None  # Will be auto-selected
-        # If no OpenAI key but DeepSeek key exists, use DeepSeek
-        elif os.environ.get("DEEPSEEK_API_KEY"):
-            parsed_args.expert_provider = "deepseek"
-            parsed_args.expert_model = "deepseek-reasoner"
-        else:
-            # Fall back to main provider if neither is available
-            parsed_args.expert_provider = parsed_args.provider
-            parsed_args.expert_model = parsed_args.model
-
-    # Validate temperature range if provided
-    if parsed_args.temperature is not None and not (
-        0.0 <= parsed_args.temperature <= 2.0
-    ):
-        parser.error("Temperature must be between 0.0 and 2.0")
-
-    # Validate recursion limit is positive
-    if parsed_args.recursion_limit <= 0:
-        parser.error("Recursion limit must be positive")
-
-    # if auto-test command is provided, validate test-cmd is also provided
-    if parsed_args.auto_test and not parsed_args.test_cmd:
-        parser.error("Test command is required when using --auto-test")
-
-    # If show_cost is true, we must also enable track_cost
-    if parsed_args.show_cost:
-        parsed_args.track_cost = True
-
-    return parsed_args
-
-
 # Create console instance
 console = Console()
 
@@ -615,10 +300,13 @@ def wipe_project_memory(custom_dir=None):
         return f"Error: Failed to wipe project memory: {str(e)}"
 
 
-def build_status():
+def build_status(version_message=None):
     """Build status panel with model and feature information.
 
     Includes memory statistics at the bottom with counts of key facts, snippets, and research notes.
+
+    Args:
+        version_message: Result of check_for_newer_version, if already checked
     """
     status = Text()
 
@@ -709,7 +397,8 @@ def build_status():
         status.append(" (use --wipe-project-memory to reset)")
 
     # Check for newer version
-    version_message = check_for_newer_version()
+    if version_message is None:
+        version_message = check_for_newer_version()
     if version_message:
         status.append("\n\n")
         status.append(version_message, style="yellow")
@@ -717,9 +406,60 @@ def build_status():
     return status
 
 
-def main():
-    """Main entry point for the ra-aid command line tool."""
-    args = parse_arguments()
+def run_batch_mode(args, model, expert_enabled: bool, web_research_enabled: bool):
+    """Run the tasks of the --batch file and write their results.
+
+    Args:
+        args: Parsed command line arguments
+        model: The model shared by the tasks' agents
+        expert_enabled: Whether expert mode is enabled
+        web_research_enabled: Whether web research is enabled
+    """
+    try:
+        tasks = load_batch_tasks(args.batch)
+    except (OSError, ValueError) as e:
+        print_error(f"Failed to read batch file: {str(e)}")
+        sys.exit(1)
+    output_path = args.batch_output or default_batch_output_path(args.batch)
+
+    print_stage_header("Batch Mode")
+    cpm(
+        f"Running {len(tasks)} tasks from {args.batch}, "
+        f"{args.batch_concurrency} at a time. Results: {output_path}"
+    )
+    runner = BatchRunner(
+        model,
+        args.batch_concurrency,
+        expert_enabled=expert_enabled,
+        web_research_enabled=web_research_enabled,
+        research_only=args.research_only,
+        write_behind=args.trajectory_write_behind,
+    )
+    started = time.perf_counter()
+    with open(output_path, "w", encoding="utf-8") as output:
+        results = runner.run(tasks, output)
+
+    failed = [result.id for result in results if result.status != "completed"]
+    tokens = sum(result.usage.get("total_tokens", 0) for result in results)
+    cost = sum(result.usage.get("total_cost", 0.0) for result in results)
+    summary = (
+        f"{len(results) - len(failed)} of {len(results)} tasks completed in "
+        f"{time.perf_counter() - started:.1f}s, {tokens:,} tokens, ${cost:.4f}"
+    )
+    if failed:
+        print_error(f"{summary}. Failed: {', '.join(failed)}")
+        sys.exit(1)
+    cpm(summary, title="Batch Complete", border_style="green")
+
+
+def main(args=None):
+    """Main entry point for the ra-aid command line tool.
+
+    Args:
+        args: Arguments already parsed by parse_arguments (default: parse sys.argv)
+    """
+    if args is None:
+        args = parse_arguments()
     setup_logging(
         args.log_mode,
         args.pretty_logger,
@@ -739,27 +479,42 @@ def main():
         launch_server(args.server_host, args.server_port, args)
         return
 
+    # Steps independent of the database run while it is opened and migrated
+    startup = StartupPipeline()
+    env_data = startup.add(
+        "env_discovery", discover_environment, args.project_state_dir
+    )
+    startup.add("version_check", check_for_newer_version)
+
     try:
-        with DatabaseManager(base_dir=args.project_state_dir) as db:
-            # Apply any pending database migrations
-            try:
-                migration_result = ensure_migrations_applied()
-                if not migration_result:
-                    logger.warning(
-                        "Database migrations failed but execution will continue"
+        with contextlib.ExitStack() as stack:
+            with startup.step("database"):
+                db = stack.enter_context(
+                    DatabaseManager(
+                        base_dir=args.project_state_dir, profile=args.db_profile
                     )
-            except Exception as e:
-                logger.error(f"Database migration error: {str(e)}")
+                )
+                # On the way out, before the database closes: drop queued memory
+                # collections and let a running one finish its writes
+                stack.callback(get_memory_gc_scheduler().shutdown, wait=True)
+                # Apply any pending database migrations
+                try:
+                    migration_result = ensure_migrations_applied()
+                    if not migration_result:
+                        logger.warning(
+                            "Database migrations failed but execution will continue"
+                        )
+                except Exception as e:
+                    logger.error(f"Database migration error: {str(e)}")
+
+                # Return space freed by pruned sessions without delaying startup
+                start_background_vacuum(db)
 
             # Initialize empty config dictionary to be populated later
             config = {}
 
             # Initialize repositories with database connection
-            # Create environment inventory data
-            env_discovery = EnvDiscovery()
-            env_discovery.discover()
-            env_data = env_discovery.format_markdown()
-
+            # The environment inventory is awaited by the first prompt using it
             with (
                 SessionRepositoryManager(db) as session_repo,
                 KeyFactRepositoryManager(db) as key_fact_repo,
@@ -767,7 +522,9 @@ def main():
                 HumanInputRepositoryManager(db) as human_input_repo,
                 ResearchNoteRepositoryManager(db) as research_note_repo,
                 RelatedFilesRepositoryManager() as related_files_repo,
-                TrajectoryRepositoryManager(db) as trajectory_repo,
+                TrajectoryRepositoryManager(
+                    db, write_behind=args.trajectory_write_behind
+                ) as trajectory_repo,
                 WorkLogRepositoryManager() as work_log_repo,
                 ConfigRepositoryManager() as config_repo,
                 EnvInvManager(env_data) as env_inv,
@@ -784,10 +541,13 @@ def main():
                 logger.debug("Initialized ConfigRepository")
                 logger.debug("Initialized Environment Inventory")
 
+                # Reports a missing dependency through the config repository
+                startup.add("dependencies", check_dependencies)
+
                 logger.debug("Initializing new session")
                 session_repo.create_session()
 
-                check_dependencies()
+                startup.result("dependencies")
 
                 (
                     expert_enabled,
@@ -844,6 +604,8 @@ def main():
                 config_repo.set("show_thoughts", args.show_thoughts)
                 config_repo.set("show_cost", args.show_cost)
                 config_repo.set("track_cost", args.track_cost)
+                config_repo.set("db_profile", args.db_profile)
+                config_repo.set("memory_token_budget", args.memory_token_budget)
                 config_repo.set("force_reasoning_assistance", args.reasoning_assistance)
                 config_repo.set(
                     "disable_reasoning_assistance", args.no_reasoning_assistance
@@ -853,12 +615,32 @@ def main():
                     "custom_tools_enabled", True if args.custom_tools else False
                 )
 
+                # Build the model of the first agent while the session is set up
+                if args.chat:
+                    startup.add(
+                        "llm",
+                        initialize_llm,
+                        args.provider,
+                        args.model,
+                        temperature=args.temperature,
+                    )
+                else:
+                    startup.add(
+                        "llm",
+                        initialize_llm,
+                        args.research_provider or args.provider,
+                        args.research_model or args.model,
+                        temperature=args.temperature,
+                    )
+
                 # Validate custom tools function signatures
                 get_custom_tools()
                 custom_tools_enabled = config_repo.get("custom_tools_enabled", False)
 
                 # Build status panel with memory statistics
-                status = build_status()
+                status = build_status(
+                    version_message=startup.result("version_check")
+                )
 
                 console.print(
                     Panel(
@@ -871,10 +653,9 @@ def main():
 
                 # Handle chat mode
                 if args.chat:
-                    # Initialize chat model with default provider/model
-                    chat_model = initialize_llm(
-                        args.provider, args.model, temperature=args.temperature
-                    )
+                    # Chat model with default provider/model
+                    chat_model = startup.result("llm")
+                    startup.log_timings()
 
                     if args.research_only:
                         try:
@@ -1024,9 +805,11 @@ def main():
 
                 # Validate message is provided
                 if (
-                    not args.message and not args.wipe_project_memory
+                    not args.message
+                    and not args.wipe_project_memory
+                    and not args.batch
                 ):  # Add check for wipe_project_memory flag
-                    error_message = "--message or --msg-file is required"
+                    error_message = "--message, --msg-file or --batch is required"
                     try:
                         trajectory_repo = get_trajectory_repository()
                         human_input_id = (
@@ -1052,20 +835,21 @@ def main():
                 if args.message:  # Only set base_task if message exists
                     base_task = args.message
 
-                # Record CLI input in database
-                try:
-                    # Using get_human_input_repository() to access the repository from context
-                    human_input_repository = get_human_input_repository()
-                    # Get current session ID
-                    session_id = session_repo.get_current_session_id()
-                    human_input_repository.create(
-                        content=base_task, source="cli", session_id=session_id
-                    )
-                    # Run garbage collection to ensure we don't exceed 100 inputs
-                    human_input_repository.garbage_collect()
-                    logger.debug(f"Recorded CLI input: {base_task}")
-                except Exception as e:
-                    logger.error(f"Failed to record CLI input: {str(e)}")
+                # Record CLI input in database (batch tasks record their own)
+                if not args.batch:
+                    try:
+                        # Using get_human_input_repository() to access the repository from context
+                        human_input_repository = get_human_input_repository()
+                        # Get current session ID
+                        session_id = session_repo.get_current_session_id()
+                        human_input_repository.create(
+                            content=base_task, source="cli", session_id=session_id
+                        )
+                        # Run garbage collection to ensure we don't exceed 100 inputs
+                        human_input_repository.garbage_collect()
+                        logger.debug(f"Recorded CLI input: {base_task}")
+                    except Exception as e:
+                        logger.error(f"Failed to record CLI input: {str(e)}")
                 config = {
                     "configurable": {"thread_id": str(uuid.uuid4())},
                     "recursion_limit": args.recursion_limit,
@@ -1119,6 +903,16 @@ def main():
                 # Set modification tools based on use_aider flag
                 set_modification_tools(args.use_aider)
 
+                if args.batch:
+                    run_batch_mode(
+                        args,
+                        startup.result("llm"),
+                        expert_enabled=expert_enabled,
+                        web_research_enabled=web_research_enabled,
+                    )
+                    startup.log_timings()
+                    return
+
                 # Run research stage
                 print_stage_header("Research Stage")
 
@@ -1134,12 +928,9 @@ def main():
                     human_input_id=human_input_id,
                 )
 
-                # Initialize research model with potential overrides
-                research_provider = args.research_provider or args.provider
-                research_model_name = args.research_model or args.model
-                research_model = initialize_llm(
-                    research_provider, research_model_name, temperature=args.temperature
-                )
+                # Research model with potential overrides
+                research_model = startup.result("llm")
+                startup.log_timings()
 
                 run_research_agent(
                     base_task,
@@ -1157,6 +948,8 @@ def main():
         print(" 👋 Bye!")
         print()
         sys.exit(0)
+    finally:
+        startup.close()
 
 
 if __name__ == "__main__":
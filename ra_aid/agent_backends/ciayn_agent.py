@@ -25,6 +25,7 @@ import ra_aid.console.formatting
 from ra_aid.agent_context import should_exit
 from ra_aid.text.processing import extract_think_tag, process_thinking_content
 from ra_aid.text import fix_triple_quote_contents
+from ra_aid.text.tokens import estimate_tokens
 from rich.panel import Panel
 from rich.markdown import Markdown
 
@@ -196,6 +197,11 @@ class CiaynAgent:
         self.last_tool_call = None
         self.last_tool_params = None
 
+        # Token estimates of the messages seen by the last _trim_chat_history
+        # call, keyed by id() of the message: (message, content, tokens). The
+        # message is kept referenced so its id can't be reused while cached.
+        self._token_cache: Dict[int, Tuple[Any, Any, float]] = {}
+
     def _build_prompt(self, last_result: Optional[str] = None) -> str:
         """Build the prompt for the agent including available tools and context."""
         # Add last result section if provided
@@ -732,39 +738,51 @@ class CiaynAgent:
         if self.max_tokens is None:
             return initial_messages + chat_history
 
-        # Calculate initial messages token count
-        initial_tokens = sum(self._estimate_tokens(msg) for msg in initial_messages)
-
-        # Remove messages from start of chat_history until under token limit
-        while chat_history:
-            total_tokens = initial_tokens + sum(
-                self._estimate_tokens(msg) for msg in chat_history
-            )
-            if total_tokens <= self.max_tokens:
-                break
-            chat_history.pop(0)
+        # Look up (or estimate) every message's tokens once, keeping only the
+        # messages passed in this call in the cache
+        previous_cache = self._token_cache
+        self._token_cache = {}
+        initial_tokens = sum(
+            self._cached_tokens(msg, previous_cache) for msg in initial_messages
+        )
+        history_tokens = [self._cached_tokens(msg, previous_cache) for msg in chat_history]
+
+        # Drop messages from the start of chat_history until under the token
+        # limit, keeping a running total instead of re-summing after each drop
+        total_tokens = initial_tokens + sum(history_tokens)
+        drop = 0
+        while drop < len(chat_history) and total_tokens > self.max_tokens:
+            total_tokens -= history_tokens[drop]
+            drop += 1
+        if drop:
+            del chat_history[:drop]
 
         return initial_messages + chat_history
 
-    @staticmethod
-    def _estimate_tokens(content: Optional[Union[str, BaseMessage]]) -> int:
-        """Estimate token count for a message or string."""
-        if content is None:
-            return 0
+    def _cached_tokens(
+        self, msg: Any, previous_cache: Dict[int, Tuple[Any, Any, float]]
+    ) -> float:
+        """Return the estimated tokens of a message, reusing the previous estimate if unchanged.
 
-        if isinstance(content, BaseMessage):
-            text = content.content
-        else:
-            text = content
-
-        # create-react-agent tool calls can be lists
-        if isinstance(text, List):
-            text = str(text)
+        Args:
+            msg: Message (or string) to estimate
+            previous_cache: Cache from the previous _trim_chat_history call
 
-        if not text:
-            return 0
+        Returns:
+            float: Estimated token count, as returned by _estimate_tokens
+        """
+        content = msg.content if isinstance(msg, BaseMessage) else msg
+        key = id(msg)
+        entry = self._token_cache.get(key) or previous_cache.get(key)
+        if entry is None or entry[0] is not msg or entry[1] is not content:
+            entry = (msg, content, self._estimate_tokens(msg))
+        self._token_cache[key] = entry
+        return entry[2]
 
-        return len(text.encode("utf-8")) // 2.0
+    @staticmethod
+    def _estimate_tokens(content: Optional[Union[str, BaseMessage]]) -> int:
+        """Estimate token count for a message or string."""
+        return estimate_tokens(content)
 
     def stream(
         self, messages_dict: Dict[str, List[Any]], _config: Dict[str, Any] = None
@@ -49,6 +49,7 @@ from ra_aid.exceptions import (
     ToolExecutionError,
 )
 from ra_aid.fallback_handler import FallbackHandler
+from ra_aid.interrupts import in_background_section
 from ra_aid.logging_config import get_logger
 from ra_aid.models_params import (
     DEFAULT_TOKEN_LIMIT,
@@ -224,11 +225,14 @@ def _request_interrupt(signum, frame):
 
 class InterruptibleSection:
     def __enter__(self):
-        _CONTEXT_STACK.append(self)
+        self._registered = not in_background_section()
+        if self._registered:
+            _CONTEXT_STACK.append(self)
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        _CONTEXT_STACK.remove(self)
+        if self._registered:
+            _CONTEXT_STACK.remove(self)
 
 
 def check_interrupt():
@@ -19,19 +19,14 @@ from rich.panel import Panel
 from ra_aid.agent_context import agent_context, is_completed, reset_completion_flags, should_exit
 # Import agent_utils functions at runtime to avoid circular imports
 from ra_aid import agent_utils
-from ra_aid.database.repositories.key_fact_repository import get_key_fact_repository
-from ra_aid.database.repositories.key_snippet_repository import get_key_snippet_repository
 from ra_aid.database.repositories.human_input_repository import get_human_input_repository
-from ra_aid.database.repositories.research_note_repository import get_research_note_repository
 from ra_aid.database.repositories.config_repository import get_config_repository
 from ra_aid.database.repositories.work_log_repository import get_work_log_repository
 from ra_aid.env_inv_context import get_env_inv
 from ra_aid.exceptions import AgentInterrupt
 from ra_aid.llm import initialize_expert_llm
 from ra_aid.logging_config import get_logger
-from ra_aid.model_formatters import format_key_facts_dict
-from ra_aid.model_formatters.key_snippets_formatter import format_key_snippets_dict
-from ra_aid.model_formatters.research_notes_formatter import format_research_notes_dict
+from ra_aid.memory_context import build_memory_sections
 from ra_aid.models_params import models_params, DEFAULT_TOKEN_LIMIT
 from ra_aid.project_info import format_project_info, get_project_info
 from ra_aid.prompts.expert_prompts import EXPERT_PROMPT_SECTION_IMPLEMENTATION
@@ -105,21 +100,11 @@ def run_task_implementation_agent(
     current_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     working_directory = os.getcwd()
 
-    # Make sure key_facts is defined before using it
-    try:
-        key_facts = format_key_facts_dict(get_key_fact_repository().get_facts_dict())
-    except RuntimeError as e:
-        logger.error(f"Failed to access key fact repository: {str(e)}")
-        key_facts = ""
-
-    # Get formatted research notes using repository
-    try:
-        repository = get_research_note_repository()
-        notes_dict = repository.get_notes_dict()
-        formatted_research_notes = format_research_notes_dict(notes_dict)
-    except RuntimeError as e:
-        logger.error(f"Failed to access research note repository: {str(e)}")
-        formatted_research_notes = ""
+    # The key facts, snippets and notes most relevant to the task, within the memory budget
+    memory_sections = build_memory_sections(f"{task}\n{base_task}")
+    key_facts = memory_sections.key_facts
+    key_snippets = memory_sections.key_snippets
+    formatted_research_notes = memory_sections.research_notes
 
     # Get latest project info
     try:
@@ -196,9 +181,7 @@ def run_task_implementation_agent(
                 working_directory=working_directory,
                 task=task,
                 key_facts=key_facts,
-                key_snippets=format_key_snippets_dict(
-                    get_key_snippet_repository().get_snippets_dict()
-                ),
+                key_snippets=key_snippets,
                 research_notes=formatted_research_notes,
                 related_files="\n".join(related_files),
                 env_inv=env_inv,
@@ -272,9 +255,7 @@ def run_task_implementation_agent(
         plan=plan,
         related_files=related_files,
         key_facts=key_facts,
-        key_snippets=format_key_snippets_dict(
-            get_key_snippet_repository().get_snippets_dict()
-        ),
+        key_snippets=key_snippets,
         research_notes=formatted_research_notes,
         work_log=get_work_log_repository().format_work_log(),
         expert_section=EXPERT_PROMPT_SECTION_IMPLEMENTATION if expert_enabled else "",
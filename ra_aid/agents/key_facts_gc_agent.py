@@ -7,7 +7,7 @@ key facts and deletes the least valuable ones to keep the database clean and rel
 """
 
 import logging
-from typing import List
+from typing import List, Optional
 
 from langchain_core.tools import tool
 from rich.console import Console
@@ -24,6 +24,7 @@ from ra_aid.database.repositories.human_input_repository import get_human_input_
 from ra_aid.database.repositories.config_repository import get_config_repository
 from ra_aid.database.repositories.trajectory_repository import get_trajectory_repository
 from ra_aid.llm import initialize_llm
+from ra_aid.memory_gc import delete_duplicate_memory
 from ra_aid.prompts.key_facts_gc_prompts import KEY_FACTS_GC_PROMPT
 from ra_aid.tools.memory import log_work_event
 
@@ -53,30 +54,24 @@ def delete_key_facts(fact_ids: List[int]) -> str:
     except Exception as e:
         console.print(f"Warning: Could not retrieve current human input: {str(e)}")
     
-    for fact_id in fact_ids:
-        try:
-            # Get the fact first to display information
-            fact = get_key_fact_repository().get(fact_id)
-            if fact:
-                # Check if this fact is associated with the current human input
-                if current_human_input_id is not None and fact.human_input_id == current_human_input_id:
-                    protected_facts.append((fact_id, fact.content))
-                    continue
-                
-                # Delete the fact if it's not protected
-                was_deleted = get_key_fact_repository().delete(fact_id)
-                if was_deleted:
-                    deleted_facts.append((fact_id, fact.content))
-                    log_work_event(f"Deleted fact {fact_id}.")
-                else:
-                    failed_facts.append(fact_id)
-        except RuntimeError as e:
-            logger.error(f"Failed to access key fact repository: {str(e)}")
-            failed_facts.append(fact_id)
-        except Exception as e:
-            # For any other exceptions, log and continue
-            logger.error(f"Error processing fact {fact_id}: {str(e)}")
-            failed_facts.append(fact_id)
+    try:
+        # Fetch and delete all facts in a single transaction
+        deleted, protected = get_key_fact_repository().delete_many(
+            fact_ids, protected_human_input_id=current_human_input_id
+        )
+        deleted_facts = [(fact.id, fact.content) for fact in deleted]
+        protected_facts = [(fact.id, fact.content) for fact in protected]
+        found_ids = {fact_id for fact_id, _ in deleted_facts + protected_facts}
+        not_found_facts = [fact_id for fact_id in fact_ids if fact_id not in found_ids]
+        if deleted_facts:
+            log_work_event(f"Deleted facts {', '.join(str(fact_id) for fact_id, _ in deleted_facts)}.")
+    except RuntimeError as e:
+        logger.error(f"Failed to access key fact repository: {str(e)}")
+        failed_facts = list(fact_ids)
+    except Exception as e:
+        # For any other exceptions, log and report the facts as not deleted
+        logger.error(f"Error deleting facts {fact_ids}: {str(e)}")
+        failed_facts = list(fact_ids)
             
     # Prepare result message
     result_parts = []
@@ -140,12 +135,17 @@ def delete_key_facts(fact_ids: List[int]) -> str:
     return "\n".join(result_parts)
 
 
-def run_key_facts_gc_agent() -> None:
+def run_key_facts_gc_agent(threshold: Optional[int] = None) -> None:
     """Run the key facts gc agent to maintain a reasonable number of key facts.
     
-    The agent analyzes all key facts and determines which are the least valuable,
+    Duplicate facts are deleted first, without a model call. The agent then
+    analyzes the remaining key facts and determines which are the least valuable,
     deleting them to maintain a manageable collection size of high-value facts.
     Facts associated with the current human input are excluded from deletion.
+
+    Args:
+        threshold: If given, the agent is only run if more facts than this remain
+            after deleting duplicates
     """
     # Get the count of key facts
     try:
@@ -201,6 +201,22 @@ def run_key_facts_gc_agent() -> None:
             current_human_input_id = get_human_input_repository().get_most_recent_id()
         except Exception as e:
             console.print(f"Warning: Could not retrieve current human input: {str(e)}")
+
+        # Collapse duplicates before asking the model about the rest
+        if delete_duplicate_memory(
+            get_key_fact_repository(),
+            "key facts",
+            "key_facts_gc_agent",
+            lambda fact: f"#{fact.id}: {fact.content}",
+            current_human_input_id,
+        ):
+            facts = get_key_fact_repository().get_all()
+            if threshold is not None and len(facts) <= threshold:
+                console_panel(
+                    f"Cleaned key facts: {fact_count} → {len(facts)}",
+                    title="🗑 GC Complete"
+                )
+                return
         
         # Get all facts that are not associated with the current human input
         eligible_facts = []
@@ -240,8 +256,7 @@ def run_key_facts_gc_agent() -> None:
             
             # Get updated count
             try:
-                updated_facts = get_key_fact_repository().get_all()
-                updated_count = len(updated_facts)
+                updated_count = get_key_fact_repository().count()
             except RuntimeError as e:
                 logger.error(f"Failed to access key fact repository for update count: {str(e)}")
                 updated_count = "unknown"
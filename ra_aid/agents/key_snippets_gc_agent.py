@@ -6,7 +6,7 @@ snippets when the total number exceeds a specified threshold. The agent evaluate
 key snippets and deletes the least valuable ones to keep the database clean and relevant.
 """
 
-from typing import List
+from typing import List, Optional
 
 from langchain_core.tools import tool
 from rich.console import Console
@@ -21,11 +21,14 @@ from ra_aid.database.repositories.human_input_repository import get_human_input_
 from ra_aid.database.repositories.config_repository import get_config_repository
 from ra_aid.database.repositories.trajectory_repository import get_trajectory_repository
 from ra_aid.llm import initialize_llm
+from ra_aid.logging_config import get_logger
+from ra_aid.memory_gc import delete_duplicate_memory
 from ra_aid.prompts.key_snippets_gc_prompts import KEY_SNIPPETS_GC_PROMPT
 from ra_aid.tools.memory import log_work_event
 from ra_aid.agent_context import mark_should_exit
 
 
+logger = get_logger(__name__)
 console = Console()
 
 
@@ -52,55 +55,47 @@ def delete_key_snippets(snippet_ids: List[int]) -> str:
     except Exception as e:
         console.print(f"Warning: Could not retrieve current human input: {str(e)}")
     
-    for snippet_id in snippet_ids:
-        # Get the snippet first to capture filepath for the message
-        snippet = get_key_snippet_repository().get(snippet_id)
-        if snippet:
-            filepath = snippet.filepath
-            
-            # Check if this snippet is associated with the current human input
-            if current_human_input_id is not None and snippet.human_input_id == current_human_input_id:
-                protected_snippets.append((snippet_id, filepath))
-                continue
-                
-            # Delete from database if not protected
-            success = get_key_snippet_repository().delete(snippet_id)
-            if success:
-                success_msg = f"Successfully deleted snippet #{snippet_id} from {filepath}"
-                # Record GC operation in trajectory
-                try:
-                    trajectory_repo = get_trajectory_repository()
-                    human_input_id = get_human_input_repository().get_most_recent_id()
-                    trajectory_repo.create(
-                        step_data={
-                            "deleted_snippet_id": snippet_id,
-                            "filepath": filepath,
-                            "display_title": "Snippet Deleted",
-                        },
-                        record_type="gc_operation",
-                        human_input_id=human_input_id,
-                        tool_name="key_snippets_gc_agent"
-                    )
-                except Exception:
-                    pass  # Continue if trajectory recording fails
-                
-                console.print(
-                    Panel(
-                        Markdown(success_msg), title="Snippet Deleted", border_style="green"
-                    )
-                )
-                results.append((snippet_id, filepath))
-                log_work_event(f"Deleted snippet {snippet_id}.")
-            else:
-                failed_snippets.append(snippet_id)
-        else:
-            not_found_snippets.append(snippet_id)
+    try:
+        # Fetch and delete all snippets in a single transaction
+        deleted, protected = get_key_snippet_repository().delete_many(
+            snippet_ids, protected_human_input_id=current_human_input_id
+        )
+        results = [(snippet.id, snippet.filepath) for snippet in deleted]
+        protected_snippets = [(snippet.id, snippet.filepath) for snippet in protected]
+        found_ids = {snippet_id for snippet_id, _ in results + protected_snippets}
+        not_found_snippets = [snippet_id for snippet_id in snippet_ids if snippet_id not in found_ids]
+    except RuntimeError as e:
+        logger.error(f"Failed to access key snippet repository: {str(e)}")
+        failed_snippets = list(snippet_ids)
+    except Exception as e:
+        logger.error(f"Error deleting snippets {snippet_ids}: {str(e)}")
+        failed_snippets = list(snippet_ids)
 
     # Prepare result message
     result_parts = []
     if results:
         deleted_msg = "Successfully deleted snippets:\n" + "\n".join([f"- #{snippet_id}: {filepath}" for snippet_id, filepath in results])
         result_parts.append(deleted_msg)
+        log_work_event(f"Deleted snippets {', '.join(str(snippet_id) for snippet_id, _ in results)}.")
+        # Record GC operation in trajectory
+        try:
+            trajectory_repo = get_trajectory_repository()
+            human_input_id = get_human_input_repository().get_most_recent_id()
+            trajectory_repo.create(
+                step_data={
+                    "deleted_snippets": results,
+                    "display_title": "Snippets Deleted",
+                },
+                record_type="gc_operation",
+                human_input_id=human_input_id,
+                tool_name="key_snippets_gc_agent"
+            )
+        except Exception:
+            pass  # Continue if trajectory recording fails
+
+        console.print(
+            Panel(Markdown(deleted_msg), title="Snippets Deleted", border_style="green")
+        )
     
     if protected_snippets:
         protected_msg = "Protected snippets (associated with current request):\n" + "\n".join([f"- #{snippet_id}: {filepath}" for snippet_id, filepath in protected_snippets])
@@ -139,12 +134,17 @@ def delete_key_snippets(snippet_ids: List[int]) -> str:
     return "Snippets deleted."
 
 
-def run_key_snippets_gc_agent() -> None:
+def run_key_snippets_gc_agent(threshold: Optional[int] = None) -> None:
     """Run the key snippets gc agent to maintain a reasonable number of key snippets.
     
-    The agent analyzes all key snippets and determines which are the least valuable,
+    Duplicate snippets are deleted first, without a model call. The agent then
+    analyzes the remaining key snippets and determines which are the least valuable,
     deleting them to maintain a manageable collection size of high-value snippets.
     Snippets associated with the current human input are excluded from deletion.
+
+    Args:
+        threshold: If given, the agent is only run if more snippets than this remain
+            after deleting duplicates
     """
     # Get the count of key snippets
     snippets = get_key_snippet_repository().get_all()
@@ -176,6 +176,22 @@ def run_key_snippets_gc_agent() -> None:
             current_human_input_id = get_human_input_repository().get_most_recent_id()
         except Exception as e:
             console.print(f"Warning: Could not retrieve current human input: {str(e)}")
+
+        # Collapse duplicates before asking the model about the rest
+        if delete_duplicate_memory(
+            get_key_snippet_repository(),
+            "key snippets",
+            "key_snippets_gc_agent",
+            lambda snippet: f"#{snippet.id}: {snippet.filepath}:{snippet.line_number}",
+            current_human_input_id,
+        ):
+            snippets = get_key_snippet_repository().get_all()
+            if threshold is not None and len(snippets) <= threshold:
+                console_panel(
+                    f"Cleaned key snippets: {snippet_count} → {len(snippets)}",
+                    title="🗑 GC Complete"
+                )
+                return
         
         # Get all snippets that are not associated with the current human input
         eligible_snippets = []
@@ -226,8 +242,7 @@ def run_key_snippets_gc_agent() -> None:
             agent_utils.run_agent_with_retry(agent, prompt, agent_config)
             
             # Get updated count
-            updated_snippets = get_key_snippet_repository().get_all()
-            updated_count = len(updated_snippets)
+            updated_count = get_key_snippet_repository().count()
             
             # Show info panel with updated count and protected snippets count
             protected_count = len(protected_snippets)
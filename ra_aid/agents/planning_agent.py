@@ -19,9 +19,6 @@ from ra_aid.agent_context import agent_context, is_completed, reset_completion_f
 # Import agent_utils functions at runtime to avoid circular imports
 from ra_aid import agent_utils
 from ra_aid.console.formatting import print_stage_header
-from ra_aid.database.repositories.key_fact_repository import get_key_fact_repository
-from ra_aid.database.repositories.key_snippet_repository import get_key_snippet_repository
-from ra_aid.database.repositories.research_note_repository import get_research_note_repository
 from ra_aid.database.repositories.config_repository import get_config_repository
 from ra_aid.database.repositories.work_log_repository import get_work_log_repository
 from ra_aid.database.repositories.trajectory_repository import get_trajectory_repository
@@ -30,9 +27,7 @@ from ra_aid.env_inv_context import get_env_inv
 from ra_aid.exceptions import AgentInterrupt
 from ra_aid.llm import initialize_expert_llm
 from ra_aid.logging_config import get_logger
-from ra_aid.model_formatters import format_key_facts_dict
-from ra_aid.model_formatters.key_snippets_formatter import format_key_snippets_dict
-from ra_aid.model_formatters.research_notes_formatter import format_research_notes_dict
+from ra_aid.memory_context import build_memory_sections
 from ra_aid.text.processing import process_thinking_content
 from ra_aid.models_params import models_params
 from ra_aid.project_info import format_project_info, get_project_info
@@ -126,30 +121,11 @@ def run_planning_agent(
     current_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     working_directory = os.getcwd()
 
-    # Make sure key_facts is defined before using it
-    try:
-        key_facts = format_key_facts_dict(get_key_fact_repository().get_facts_dict())
-    except RuntimeError as e:
-        logger.error(f"Failed to access key fact repository: {str(e)}")
-        key_facts = ""
-
-    # Make sure key_snippets is defined before using it
-    try:
-        key_snippets = format_key_snippets_dict(
-            get_key_snippet_repository().get_snippets_dict()
-        )
-    except RuntimeError as e:
-        logger.error(f"Failed to access key snippet repository: {str(e)}")
-        key_snippets = ""
-
-    # Get formatted research notes using repository
-    try:
-        repository = get_research_note_repository()
-        notes_dict = repository.get_notes_dict()
-        formatted_research_notes = format_research_notes_dict(notes_dict)
-    except RuntimeError as e:
-        logger.error(f"Failed to access research note repository: {str(e)}")
-        formatted_research_notes = ""
+    # The key facts, snippets and notes most relevant to the task, within the memory budget
+    memory_sections = build_memory_sections(base_task)
+    key_facts = memory_sections.key_facts
+    key_snippets = memory_sections.key_snippets
+    formatted_research_notes = memory_sections.research_notes
 
     # Get related files
     related_files = "\n".join(get_related_files())
@@ -17,25 +17,16 @@ from rich.console import Console
 # Import agent_utils functions at runtime to avoid circular imports
 from ra_aid import agent_utils
 from ra_aid.console.formatting import cpm
-from ra_aid.database.repositories.key_fact_repository import get_key_fact_repository
-from ra_aid.database.repositories.key_snippet_repository import (
-    get_key_snippet_repository,
-)
 from ra_aid.database.repositories.human_input_repository import (
     get_human_input_repository,
 )
-from ra_aid.database.repositories.research_note_repository import (
-    get_research_note_repository,
-)
 from ra_aid.database.repositories.config_repository import get_config_repository
 from ra_aid.database.repositories.work_log_repository import get_work_log_repository
 from ra_aid.env_inv_context import get_env_inv
 from ra_aid.exceptions import AgentInterrupt
 from ra_aid.llm import initialize_expert_llm
 from ra_aid.logging_config import get_logger
-from ra_aid.model_formatters import format_key_facts_dict
-from ra_aid.model_formatters.key_snippets_formatter import format_key_snippets_dict
-from ra_aid.model_formatters.research_notes_formatter import format_research_notes_dict
+from ra_aid.memory_context import build_memory_sections
 from ra_aid.text.processing import process_thinking_content
 from ra_aid.models_params import models_params
 from ra_aid.project_info import (
@@ -128,14 +119,12 @@ def run_research_agent(
         logger.error(f"Failed to access human input repository: {str(e)}")
         # Continue without appending last human input
 
-    try:
-        key_facts = format_key_facts_dict(get_key_fact_repository().get_facts_dict())
-    except RuntimeError as e:
-        logger.error(f"Failed to access key fact repository: {str(e)}")
-        key_facts = ""
-    key_snippets = format_key_snippets_dict(
-        get_key_snippet_repository().get_snippets_dict()
-    )
+    # The key facts and snippets most relevant to the task, within the memory
+    # budget; research notes only appear in the reasoning assist prompt, so they
+    # must not take budget from what the research prompt shows
+    memory_sections = build_memory_sections(base_task, kinds=("key_facts", "key_snippets"))
+    key_facts = memory_sections.key_facts
+    key_snippets = memory_sections.key_snippets
     related_files = get_related_files()
 
     try:
@@ -178,18 +167,14 @@ def run_research_agent(
     logger.debug("Reasoning assist enabled: %s", reasoning_assist_enabled)
     expert_guidance = ""
 
-    # Get research note information for reasoning assistance
-    try:
-        research_notes = format_research_notes_dict(
-            get_research_note_repository().get_notes_dict()
-        )
-    except Exception as e:
-        logger.warning(f"Failed to get research notes: {e}")
-        research_notes = ""
-
     # If reasoning assist is enabled, make a one-off call to the expert model
     if reasoning_assist_enabled:
         try:
+            # Research notes are only used for reasoning assistance, within their own budget
+            research_notes = build_memory_sections(
+                base_task, kinds=("research_notes",)
+            ).research_notes
+
             logger.info(
                 "Reasoning assist enabled for model %s, getting expert guidance",
                 model_name,
@@ -476,18 +461,9 @@ def run_web_research_agent(
     expert_section = EXPERT_PROMPT_SECTION_RESEARCH if expert_enabled else ""
     human_section = HUMAN_PROMPT_SECTION_RESEARCH if hil else ""
 
-    try:
-        key_facts = format_key_facts_dict(get_key_fact_repository().get_facts_dict())
-    except RuntimeError as e:
-        logger.error(f"Failed to access key fact repository: {str(e)}")
-        key_facts = ""
-    try:
-        key_snippets = format_key_snippets_dict(
-            get_key_snippet_repository().get_snippets_dict()
-        )
-    except RuntimeError as e:
-        logger.error(f"Failed to access key snippet repository: {str(e)}")
-        key_snippets = ""
+    memory_sections = build_memory_sections(query, kinds=("key_facts", "key_snippets"))
+    key_facts = memory_sections.key_facts
+    key_snippets = memory_sections.key_snippets
     related_files = get_related_files()
 
     current_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -24,6 +24,7 @@ from ra_aid.database.repositories.human_input_repository import get_human_input_
 from ra_aid.database.repositories.config_repository import get_config_repository
 from ra_aid.database.repositories.trajectory_repository import get_trajectory_repository
 from ra_aid.llm import initialize_llm
+from ra_aid.memory_gc import delete_duplicate_memory
 from ra_aid.tools.memory import log_work_event
 
 logger = logging.getLogger(__name__)
@@ -54,32 +55,24 @@ def delete_research_notes(note_ids: List[int]) -> str:
     except Exception as e:
         console.print(f"Warning: Could not retrieve current human input: {str(e)}")
     
-    for note_id in note_ids:
-        try:
-            # Get the note first to display information
-            note = get_research_note_repository().get(note_id)
-            if note:
-                # Check if this note is associated with the current human input
-                if current_human_input_id is not None and note.human_input_id == current_human_input_id:
-                    protected_notes.append((note_id, note.content))
-                    continue
-                
-                # Delete the note if it's not protected
-                was_deleted = get_research_note_repository().delete(note_id)
-                if was_deleted:
-                    deleted_notes.append((note_id, note.content))
-                    log_work_event(f"Deleted research note {note_id}.")
-                else:
-                    failed_notes.append(note_id)
-            else:
-                not_found_notes.append(note_id)
-        except RuntimeError as e:
-            logger.error(f"Failed to access research note repository: {str(e)}")
-            failed_notes.append(note_id)
-        except Exception as e:
-            # For any other exceptions, log and continue
-            logger.error(f"Error processing research note {note_id}: {str(e)}")
-            failed_notes.append(note_id)
+    try:
+        # Fetch and delete all notes in a single transaction
+        deleted, protected = get_research_note_repository().delete_many(
+            note_ids, protected_human_input_id=current_human_input_id
+        )
+        deleted_notes = [(note.id, note.content) for note in deleted]
+        protected_notes = [(note.id, note.content) for note in protected]
+        found_ids = {note_id for note_id, _ in deleted_notes + protected_notes}
+        not_found_notes = [note_id for note_id in note_ids if note_id not in found_ids]
+        if deleted_notes:
+            log_work_event(f"Deleted research notes {', '.join(str(note_id) for note_id, _ in deleted_notes)}.")
+    except RuntimeError as e:
+        logger.error(f"Failed to access research note repository: {str(e)}")
+        failed_notes = list(note_ids)
+    except Exception as e:
+        # For any other exceptions, log and report the notes as not deleted
+        logger.error(f"Error deleting research notes {note_ids}: {str(e)}")
+        failed_notes = list(note_ids)
             
     # Prepare result message
     result_parts = []
@@ -146,7 +139,8 @@ def delete_research_notes(note_ids: List[int]) -> str:
 def run_research_notes_gc_agent(threshold: int = 30) -> None:
     """Run the research notes gc agent to maintain a reasonable number of research notes.
     
-    The agent analyzes all research notes and determines which are the least valuable,
+    Duplicate notes are deleted first, without a model call. The agent then
+    analyzes the remaining research notes and determines which are the least valuable,
     deleting them to maintain a manageable collection size of high-value notes.
     Notes associated with the current human input are excluded from deletion.
     
@@ -207,6 +201,22 @@ def run_research_notes_gc_agent(threshold: int = 30) -> None:
             current_human_input_id = get_human_input_repository().get_most_recent_id()
         except Exception as e:
             console.print(f"Warning: Could not retrieve current human input: {str(e)}")
+
+        # Collapse duplicates before asking the model about the rest
+        if delete_duplicate_memory(
+            get_research_note_repository(),
+            "research notes",
+            "research_notes_gc_agent",
+            lambda note: f"#{note.id}: {note.content[:80]}",
+            current_human_input_id,
+        ):
+            notes = get_research_note_repository().get_all()
+            if len(notes) <= threshold:
+                console_panel(
+                    f"Cleaned research notes: {note_count} → {len(notes)}",
+                    title="🗑 GC Complete"
+                )
+                return
         
         # Get all notes that are not associated with the current human input
         eligible_notes = []
@@ -291,8 +301,7 @@ Remember: Your goal is to maintain a concise, high-value collection of research
             
             # Get updated count
             try:
-                updated_notes = get_research_note_repository().get_all()
-                updated_count = len(updated_notes)
+                updated_count = get_research_note_repository().count()
             except RuntimeError as e:
                 logger.error(f"Failed to access research note repository for update count: {str(e)}")
                 updated_count = "unknown"
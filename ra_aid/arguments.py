@@ -0,0 +1,398 @@
+"""
+Command line arguments of the ra-aid command.
+
+Parsing only needs the standard library and ra_aid.config, so ra-aid can
+answer --help and --version, and reject invalid arguments, before importing
+the agent stack (see ra_aid.cli).
+"""
+
+import argparse
+import os
+import sys
+
+from ra_aid.__version__ import __version__
+from ra_aid.config import (
+    DB_PROFILES,
+    DEFAULT_BATCH_CONCURRENCY,
+    DEFAULT_DB_PROFILE,
+    DEFAULT_MAX_TEST_CMD_RETRIES,
+    DEFAULT_MEMORY_TOKEN_BUDGET,
+    DEFAULT_MODEL,
+    DEFAULT_RECURSION_LIMIT,
+    DEFAULT_TEST_CMD_TIMEOUT,
+    VALID_PROVIDERS,
+)
+
+
+def parse_arguments(args=None):
+    ANTHROPIC_DEFAULT_MODEL = DEFAULT_MODEL
+    OPENAI_DEFAULT_MODEL = "gpt-4o"
+
+    # Case-insensitive log level argument type
+    def log_level_type(value):
+        value = value.lower()
+        if value not in ["debug", "info", "warning", "error", "critical"]:
+            raise argparse.ArgumentTypeError(
+                f"Invalid log level: {value}. Choose from debug, info, warning, error, critical."
+            )
+        return value
+
+    parser = argparse.ArgumentParser(
+        description="RA.Aid - AI Agent for executing programming and research tasks",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+    ra-aid -m "Add error handling to the database module"
+    ra-aid -m "Explain the authentication flow" --research-only
+    ra-aid --msg-file task_description.txt
+    ra-aid --batch questions.jsonl --research-only --batch-concurrency 8
+    ra-aid daemon start    # keep a warm process for this project
+        """,
+    )
+    parser.add_argument(
+        "-m",
+        "--message",
+        type=str,
+        help="The task or query to be executed by the agent (cannot be used with --msg-file)",
+    )
+    parser.add_argument(
+        "--msg-file",
+        type=str,
+        help="Path to a text file containing the task/message (cannot be used with --message)",
+    )
+    parser.add_argument(
+        "--batch",
+        type=str,
+        metavar="TASKS_JSONL",
+        help='Run the tasks of a JSONL file, one {"id": ..., "message": ...} object per line, concurrently '
+        "and each in its own session, writing one JSON result per task (implies --track-cost)",
+    )
+    parser.add_argument(
+        "--batch-output",
+        type=str,
+        help="Path of the JSONL results of --batch (default: the tasks file with a .results.jsonl suffix)",
+    )
+    parser.add_argument(
+        "--batch-concurrency",
+        type=int,
+        default=DEFAULT_BATCH_CONCURRENCY,
+        help=f"Number of --batch tasks run at the same time (default: {DEFAULT_BATCH_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--version",
+        action="version",
+        version=f"%(prog)s {__version__}",
+        help="Show program version number and exit",
+    )
+    parser.add_argument(
+        "--research-only",
+        action="store_true",
+        help="Only perform research without implementation",
+    )
+    parser.add_argument(
+        "--provider",
+        type=str,
+        default=(
+            "openai"
+            if (os.getenv("OPENAI_API_KEY") and not os.getenv("ANTHROPIC_API_KEY"))
+            else "anthropic"
+        ),
+        choices=VALID_PROVIDERS,
+        help="The LLM provider to use",
+    )
+    parser.add_argument("--model", type=str, help="The model name to use")
+    parser.add_argument(
+        "--num-ctx",
+        type=int,
+        default=262144,
+        help="Context window size for Ollama models",
+    )
+    parser.add_argument(
+        "--research-provider",
+        type=str,
+        choices=VALID_PROVIDERS,
+        help="Provider to use specifically for research tasks",
+    )
+    parser.add_argument(
+        "--research-model",
+        type=str,
+        help="Model to use specifically for research tasks",
+    )
+    parser.add_argument(
+        "--planner-provider",
+        type=str,
+        choices=VALID_PROVIDERS,
+        help="Provider to use specifically for planning tasks",
+    )
+    parser.add_argument(
+        "--planner-model", type=str, help="Model to use specifically for planning tasks"
+    )
+    parser.add_argument(
+        "--cowboy-mode",
+        action="store_true",
+        help="Skip interactive approval for shell commands",
+    )
+    parser.add_argument(
+        "--expert-provider",
+        type=str,
+        default=None,
+        choices=VALID_PROVIDERS,
+        help="The LLM provider to use for expert knowledge queries",
+    )
+    parser.add_argument(
+        "--expert-model",
+        type=str,
+        help="The model name to use for expert knowledge queries (required for non-OpenAI providers)",
+    )
+    parser.add_argument(
+        "--expert-num-ctx",
+        type=int,
+        default=262144,
+        help="Context window size for expert Ollama models",
+    )
+    parser.add_argument(
+        "--hil",
+        "-H",
+        action="store_true",
+        help="Enable human-in-the-loop mode, where the agent can prompt the user for additional information.",
+    )
+    parser.add_argument(
+        "--chat",
+        action="store_true",
+        help="Enable chat mode with direct human interaction (implies --hil)",
+    )
+    parser.add_argument(
+        "--log-mode",
+        choices=["console", "file"],
+        default="file",
+        help="Logging mode: 'console' shows all logs in console, 'file' logs to file with only warnings+ in console",
+    )
+    parser.add_argument(
+        "--pretty-logger", action="store_true", help="Enable pretty logging output"
+    )
+    parser.add_argument(
+        "--log-level",
+        type=log_level_type,
+        default="debug",
+        help="Set specific logging level (case-insensitive, affects file and console logging based on --log-mode)",
+    )
+    parser.add_argument(
+        "--temperature",
+        type=float,
+        help="LLM temperature (0.0-2.0). Controls randomness in responses",
+        default=None,
+    )
+    parser.add_argument(
+        "--disable-limit-tokens",
+        action="store_false",
+        help="Whether to disable token limiting for Anthropic Claude react agents. Token limiter removes older messages to prevent maximum token limit API errors.",
+    )
+    parser.add_argument(
+        "--experimental-fallback-handler",
+        action="store_true",
+        help="Enable experimental fallback handler.",
+    )
+    parser.add_argument(
+        "--recursion-limit",
+        type=int,
+        default=DEFAULT_RECURSION_LIMIT,
+        help="Maximum recursion depth for agent operations (default: 100)",
+    )
+    parser.add_argument(
+        "--aider-config", type=str, help="Specify the aider config file path"
+    )
+    parser.add_argument(
+        "--use-aider",
+        action="store_true",
+        help="Use aider for code modifications instead of default file tools (file_str_replace, put_complete_file_contents)",
+    )
+    parser.add_argument(
+        "--test-cmd",
+        type=str,
+        help="Test command to run before completing tasks (e.g. 'pytest tests/')",
+    )
+    parser.add_argument(
+        "--auto-test",
+        action="store_true",
+        help="Automatically run tests before completing tasks",
+    )
+    parser.add_argument(
+        "--max-test-cmd-retries",
+        type=int,
+        default=DEFAULT_MAX_TEST_CMD_RETRIES,
+        help="Maximum number of retries for the test command (default: 3)",
+    )
+    parser.add_argument(
+        "--test-cmd-timeout",
+        type=int,
+        default=DEFAULT_TEST_CMD_TIMEOUT,
+        help=f"Timeout in seconds for test command execution (default: {DEFAULT_TEST_CMD_TIMEOUT})",
+    )
+    parser.add_argument(
+        "--server",
+        action="store_true",
+        help="Launch the web interface",
+    )
+    parser.add_argument(
+        "--server-host",
+        type=str,
+        default="0.0.0.0",
+        help="Host to listen on for web interface (default: 0.0.0.0)",
+    )
+    parser.add_argument(
+        "--server-port",
+        type=int,
+        default=1818,
+        help="Port to listen on for web interface (default: 1818)",
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Run in this process even if an ra-aid daemon is running for the project (see 'ra-aid daemon')",
+    )
+    parser.add_argument(
+        "--wipe-project-memory",
+        action="store_true",
+        help="Delete the project database file (.ra-aid/pk.db) before starting, effectively wiping all stored memory",
+    )
+    parser.add_argument(
+        "--project-state-dir",
+        help="Directory to store project state (database and logs). By default, a .ra-aid directory is created in the current working directory.",
+    )
+    parser.add_argument(
+        "--show-thoughts",
+        action="store_true",
+        help="Display model thinking content extracted from think tags when supported by the model",
+    )
+    parser.add_argument(
+        "--show-cost",
+        action="store_true",
+        help="Display cost information as the agent works",
+    )
+    parser.add_argument(
+        "--track-cost",
+        action="store_true",
+        default=False,
+        help="Track token usage and costs (default: False)",
+    )
+    parser.add_argument(
+        "--no-track-cost",
+        action="store_false",
+        dest="track_cost",
+        help="Disable tracking of token usage and costs",
+    )
+    parser.add_argument(
+        "--db-profile",
+        choices=sorted(DB_PROFILES),
+        default=DEFAULT_DB_PROFILE,
+        help=f"SQLite performance profile for the project database (default: {DEFAULT_DB_PROFILE}). "
+        "'fast' trades commit durability for throughput, 'durable' fsyncs a rollback journal on every commit",
+    )
+    parser.add_argument(
+        "--trajectory-write-behind",
+        action="store_true",
+        help="Write trajectory records from a background thread in batches instead of on every tool call",
+    )
+    parser.add_argument(
+        "--memory-token-budget",
+        type=int,
+        default=DEFAULT_MEMORY_TOKEN_BUDGET,
+        help="Estimated tokens of key facts, snippets and research notes to include in agent prompts, "
+        f"choosing those most relevant to the task (default: {DEFAULT_MEMORY_TOKEN_BUDGET}, 0 for no limit)",
+    )
+    parser.add_argument(
+        "--reasoning-assistance",
+        action="store_true",
+        help="Force enable reasoning assistance regardless of model defaults",
+    )
+    parser.add_argument(
+        "--no-reasoning-assistance",
+        action="store_true",
+        help="Force disable reasoning assistance regardless of model defaults",
+    )
+    parser.add_argument(
+        "--custom-tools",
+        type=str,
+        help="File path of Python module containing custom tools (e.g. ./path/to_custom_tools.py)",
+    )
+    if args is None:
+        args = sys.argv[1:]
+    parsed_args = parser.parse_args(args)
+
+    # Validate message vs msg-file usage
+    if parsed_args.message and parsed_args.msg_file:
+        parser.error("Cannot use both --message and --msg-file")
+    if parsed_args.msg_file:
+        try:
+            with open(parsed_args.msg_file, "r") as f:
+                parsed_args.message = f.read()
+        except IOError as e:
+            parser.error(f"Failed to read message file: {str(e)}")
+
+    # Validate batch mode usage
+    if parsed_args.batch:
+        if parsed_args.message:
+            parser.error("Cannot use --batch with --message or --msg-file")
+        if parsed_args.chat or parsed_args.hil:
+            parser.error("Cannot use --batch with --chat or --hil")
+        if parsed_args.server:
+            parser.error("Cannot use --batch with --server")
+        # Results report the token usage of each task
+        parsed_args.track_cost = True
+    if parsed_args.batch_concurrency <= 0:
+        parser.error("Batch concurrency must be positive")
+
+    # Set hil=True when chat mode is enabled
+    if parsed_args.chat:
+        parsed_args.hil = True
+
+    # Validate provider
+    if parsed_args.provider not in VALID_PROVIDERS:
+        parser.error(f"Invalid provider: {parsed_args.provider}")
+    # Handle model defaults and requirements
+
+    if parsed_args.provider == "openai":
+        parsed_args.model = parsed_args.model or OPENAI_DEFAULT_MODEL
+    elif parsed_args.provider == "anthropic":
+        # Use default model for Anthropic only if not specified
+        parsed_args.model = parsed_args.model or ANTHROPIC_DEFAULT_MODEL
+    elif not parsed_args.model and not parsed_args.research_only:
+        # Require model for other providers unless in research mode
+        parser.error(
+            f"--model is required when using provider '{parsed_args.provider}'"
+        )
+
+    # Handle expert provider/model defaults
+    if not parsed_args.expert_provider:
+        # Check for OpenAI API key first
+        if os.environ.get("OPENAI_API_KEY"):
+            parsed_args.expert_provider = "openai"
+            parsed_args.expert_model = None  # Will be auto-selected
+        # If no OpenAI key but DeepSeek key exists, use DeepSeek
+        elif os.environ.get("DEEPSEEK_API_KEY"):
+            parsed_args.expert_provider = "deepseek"
+            parsed_args.expert_model = "deepseek-reasoner"
+        else:
+            # Fall back to main provider if neither is available
+            parsed_args.expert_provider = parsed_args.provider
+            parsed_args.expert_model = parsed_args.model
+
+    # Validate temperature range if provided
+    if parsed_args.temperature is not None and not (
+        0.0 <= parsed_args.temperature <= 2.0
+    ):
+        parser.error("Temperature must be between 0.0 and 2.0")
+
+    # Validate recursion limit is positive
+    if parsed_args.recursion_limit <= 0:
+        parser.error("Recursion limit must be positive")
+
+    # if auto-test command is provided, validate test-cmd is also provided
+    if parsed_args.auto_test and not parsed_args.test_cmd:
+        parser.error("Test command is required when using --auto-test")
+
+    # If show_cost is true, we must also enable track_cost
+    if parsed_args.show_cost:
+        parsed_args.track_cost = True
+
+    return parsed_args
@@ -0,0 +1,345 @@
+"""
+Batch mode: run the tasks of a JSONL file concurrently (ra-aid --batch).
+
+Each line of the task file is a JSON object with the task in "message" and,
+optionally, an "id" (default: the line number) and "research_only" (default:
+the --research-only setting):
+
+    {"id": "q1", "message": "Which modules use the session repository?"}
+
+Every task runs a research agent in its own session, on a pool of worker
+threads. The tasks share the process's database (each worker thread uses its
+own connection) and the model built at startup, whose provider client pools
+its HTTP connections. Per-run state (session, human input, trajectory,
+related files, work log and configuration) gets fresh repositories for every
+task; project memory (key facts, snippets, research notes) is shared, as it
+is between consecutive runs.
+
+One JSON line is written per task as it finishes:
+
+    {"id": "q1", "session_id": 12, "status": "completed", "result": "...",
+     "error": null, "latency": 8.41, "usage": {"total_tokens": 5120, ...}}
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, TextIO
+
+from ra_aid.interrupts import background_section
+from ra_aid.agents.research_agent import run_research_agent
+from ra_aid.database.connection import db_var
+from ra_aid.database.repositories.config_repository import (
+    ConfigRepositoryManager,
+    get_config_repository,
+)
+from ra_aid.database.repositories.human_input_repository import (
+    HumanInputRepositoryManager,
+)
+from ra_aid.database.repositories.related_files_repository import (
+    RelatedFilesRepositoryManager,
+)
+from ra_aid.database.repositories.research_note_repository import (
+    get_research_note_repository,
+)
+from ra_aid.database.repositories.session_repository import SessionRepositoryManager
+from ra_aid.database.repositories.trajectory_repository import (
+    TrajectoryRepositoryManager,
+)
+from ra_aid.database.repositories.work_log_repository import WorkLogRepositoryManager
+from ra_aid.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Start of what run_agent_with_retry returns when the agent crashed
+AGENT_CRASHED_PREFIX = "Agent has crashed"
+
+
+@dataclass(frozen=True)
+class BatchTask:
+    """
+    A task of a batch file.
+
+    Attributes:
+        id: Identifier of the task in the results
+        message: The task or query for the agent
+        research_only: Whether to only research, or None for the command line setting
+    """
+
+    id: str
+    message: str
+    research_only: Optional[bool] = None
+
+
+@dataclass
+class BatchResult:
+    """
+    The outcome of a batch task, written as one line of the results file.
+
+    Attributes:
+        id: Identifier of the task
+        session_id: ID of the session the task ran in
+        status: "completed" or "failed"
+        result: The agent's completion message, or else the research notes it
+            stored for the task
+        error: The error that stopped the task, if it failed
+        latency: Seconds from the start of the task to its end
+        usage: Token and cost totals of the task's session
+    """
+
+    id: str
+    session_id: Optional[int] = None
+    status: str = "failed"
+    result: Optional[str] = None
+    error: Optional[str] = None
+    latency: float = 0.0
+    usage: Dict[str, Any] = field(default_factory=dict)
+
+
+def load_batch_tasks(path: str) -> List[BatchTask]:
+    """
+    Read the tasks of a batch file.
+
+    Args:
+        path: Path of a JSONL file, one task object per line (blank lines are skipped)
+
+    Returns:
+        List[BatchTask]: The tasks, in file order
+
+    Raises:
+        ValueError: If a line is not a valid task or two tasks have the same id
+        OSError: If the file can't be read
+    """
+    tasks = []
+    ids = set()
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{path}:{line_number}: invalid JSON: {e}")
+            if not isinstance(data, dict) or not isinstance(data.get("message"), str):
+                raise ValueError(
+                    f'{path}:{line_number}: expected an object with a "message" string'
+                )
+            research_only = data.get("research_only")
+            if research_only is not None and not isinstance(research_only, bool):
+                raise ValueError(f'{path}:{line_number}: "research_only" must be a boolean')
+            task_id = str(data.get("id", line_number))
+            if task_id in ids:
+                raise ValueError(f"{path}:{line_number}: duplicate task id {task_id!r}")
+            ids.add(task_id)
+            tasks.append(BatchTask(task_id, data["message"], research_only))
+    return tasks
+
+
+def default_batch_output_path(tasks_path: str) -> str:
+    """
+    Path of the results file of a batch file when --batch-output isn't given.
+
+    Args:
+        tasks_path: Path of the batch file, e.g. tasks.jsonl
+
+    Returns:
+        str: The results path, e.g. tasks.results.jsonl
+    """
+    root, ext = os.path.splitext(tasks_path)
+    if ext != ".jsonl":
+        root = tasks_path
+    return f"{root}.results.jsonl"
+
+
+def _close_thread_connection(db) -> None:
+    """Close the current thread's connection to the database, if any."""
+    try:
+        if db is not None and not db.is_closed():
+            db.close()
+    except Exception as e:
+        logger.debug(f"Error closing batch worker connection: {str(e)}")
+
+
+class BatchRunner:
+    """
+    Runs batch tasks on a pool of worker threads.
+
+    Create it in the context set up for an agent run (database, repositories,
+    configuration and environment inventory); tasks see a copy of that context.
+
+    Example:
+        runner = BatchRunner(model, concurrency=4)
+        with open("results.jsonl", "w") as output:
+            results = runner.run(load_batch_tasks("tasks.jsonl"), output)
+    """
+
+    def __init__(
+        self,
+        model,
+        concurrency: int,
+        *,
+        expert_enabled: bool = False,
+        web_research_enabled: bool = False,
+        research_only: bool = False,
+        write_behind: bool = False,
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            model: The model shared by the tasks' agents
+            concurrency: Number of tasks run at the same time
+            expert_enabled: Whether expert mode is enabled
+            web_research_enabled: Whether web research is enabled
+            research_only: Whether tasks only research unless they say otherwise
+            write_behind: Whether tasks write trajectory records from a background thread
+        """
+        self.model = model
+        self.concurrency = max(1, concurrency)
+        self.expert_enabled = expert_enabled
+        self.web_research_enabled = web_research_enabled
+        self.research_only = research_only
+        self.write_behind = write_behind
+        self.db = db_var.get()
+        self._config = get_config_repository()
+        self._output_lock = threading.Lock()
+
+    def run(self, tasks: List[BatchTask], output: TextIO) -> List[BatchResult]:
+        """
+        Run tasks, writing each result to output as it finishes.
+
+        In-memory databases can't be seen from other threads, so tasks run one
+        after another in the calling thread with one.
+
+        Args:
+            tasks: The tasks to run
+            output: Text stream receiving one JSON line per task
+
+        Returns:
+            List[BatchResult]: The results, in task order
+        """
+        results: Dict[str, BatchResult] = {}
+        if getattr(self.db, "_is_in_memory", False) is True:
+            for task in tasks:
+                results[task.id] = self._write(self._run_task(task, False), output)
+            return [results[task.id] for task in tasks]
+
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.concurrency, max(1, len(tasks))),
+            thread_name_prefix="batch",
+        )
+        try:
+            futures = [
+                executor.submit(contextvars.copy_context().run, self._run_task, task, True)
+                for task in tasks
+            ]
+            for future in as_completed(futures):
+                result = self._write(future.result(), output)
+                results[result.id] = result
+        except BaseException:
+            # Ctrl+C: drop the tasks not started yet; running ones are waited for
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+        return [results[task.id] for task in tasks]
+
+    def _write(self, result: BatchResult, output: TextIO) -> BatchResult:
+        """Write a result line, whole, as soon as its task is done."""
+        with self._output_lock:
+            output.write(json.dumps(asdict(result)) + "\n")
+            output.flush()
+        logger.info(
+            f"Batch task {result.id} {result.status} in {result.latency:.1f}s"
+        )
+        return result
+
+    def _completion_message(
+        self, trajectory_repo, session_id: int, human_input_id: int
+    ) -> Optional[str]:
+        """
+        Return what the agent answered in a task's session.
+
+        That is the message of the agent's last completion tool call or, if it
+        called none, the research notes it stored for the task.
+        """
+        completion = trajectory_repo.get_last_session_completion(session_id)
+        if completion is not None and completion.step_data:
+            message = completion.step_data.get("completion_message")
+            if message:
+                return message
+        try:
+            notes = get_research_note_repository().get_by_human_input(human_input_id)
+        except RuntimeError as e:
+            logger.warning(f"No research notes available: {str(e)}")
+            return None
+        return "\n\n".join(note.content for note in notes) or None
+
+    def _run_task(self, task: BatchTask, in_worker: bool) -> BatchResult:
+        """Run one task in its own session."""
+        started = time.perf_counter()
+        result = BatchResult(id=task.id)
+        research_only = (
+            self.research_only if task.research_only is None else task.research_only
+        )
+        try:
+            with (
+                background_section(),
+                SessionRepositoryManager(self.db) as session_repo,
+                HumanInputRepositoryManager(self.db) as human_input_repo,
+                TrajectoryRepositoryManager(
+                    self.db, write_behind=self.write_behind
+                ) as trajectory_repo,
+                RelatedFilesRepositoryManager(),
+                WorkLogRepositoryManager(),
+                ConfigRepositoryManager(source_repo=self._config) as config_repo,
+            ):
+                session = session_repo.create_session(
+                    metadata={
+                        "agent_type": "research-only" if research_only else "research",
+                        "batch_task": task.id,
+                    }
+                )
+                result.session_id = session.id
+                config_repo.set("research_only", research_only)
+                human_input = human_input_repo.create(
+                    content=task.message, source="batch", session_id=session.id
+                )
+                human_input_repo.current_input_id = human_input.id
+                try:
+                    outcome = run_research_agent(
+                        task.message,
+                        self.model,
+                        expert_enabled=self.expert_enabled,
+                        research_only=research_only,
+                        hil=False,
+                        web_research_enabled=self.web_research_enabled,
+                        thread_id=str(session.id),
+                    )
+                    # run_agent_with_retry reports crashes in its return value
+                    if outcome and outcome.startswith(AGENT_CRASHED_PREFIX):
+                        logger.error(f"Batch task {task.id} failed: {outcome}")
+                        result.error = outcome
+                    else:
+                        result.result = (
+                            self._completion_message(
+                                trajectory_repo, session.id, human_input.id
+                            )
+                            or outcome
+                        )
+                        result.status = "completed"
+                except (Exception, SystemExit) as e:
+                    logger.error(f"Batch task {task.id} failed: {str(e)}")
+                    result.error = str(e) or type(e).__name__
+                result.usage = trajectory_repo.get_session_usage_totals(session.id)
+        except Exception as e:
+            logger.error(f"Batch task {task.id} could not run: {str(e)}")
+            result.error = result.error or str(e)
+        finally:
+            result.latency = round(time.perf_counter() - started, 3)
+            if in_worker:
+                _close_thread_connection(self.db)
+        return result
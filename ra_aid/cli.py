@@ -0,0 +1,39 @@
+"""
+Entry point of the ra-aid command.
+
+Importing ra_aid.__main__ imports the LLM clients, LangGraph, every agent,
+repository and tool, which takes seconds. This module parses the command line
+first, with nothing but the standard library, so --help, --version and
+invalid arguments are answered at once, and imports the rest only for the
+mode that was chosen. When an ra-aid daemon serves the project (see
+ra_aid.daemon), the command runs there and nothing else is imported.
+"""
+
+import sys
+
+from ra_aid.arguments import parse_arguments
+
+
+def main():
+    """Run the ra-aid command line tool."""
+    if sys.argv[1:2] == ["daemon"]:
+        from ra_aid.daemon.commands import main as daemon
+
+        sys.exit(daemon(sys.argv[2:]))
+
+    args = parse_arguments()
+
+    from ra_aid.daemon import can_forward, forward
+
+    if can_forward(args):
+        status = forward(sys.argv[1:])
+        if status is not None:
+            sys.exit(status)
+
+    from ra_aid.__main__ import main as run
+
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
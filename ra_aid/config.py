@@ -21,3 +21,85 @@ VALID_PROVIDERS = [
     "fireworks",
     "groq",
 ]
+
+# Threads running independent startup steps (see ra_aid.startup)
+DEFAULT_STARTUP_WORKERS = 4
+
+# Environment inventory (see ra_aid.env_inv): file kept in the project state
+# directory, threads running the probes' subprocesses, and the age in seconds
+# after which it is rebuilt even if no probed binary changed
+ENV_INVENTORY_CACHE_FILE = "env_inventory.json"
+DEFAULT_ENV_DISCOVERY_WORKERS = 8
+DEFAULT_ENV_INVENTORY_MAX_AGE = 24 * 60 * 60
+
+# Snapshot of the project info (new-project status and file listing) kept in
+# the project state directory (see ra_aid.project_snapshot)
+PROJECT_SNAPSHOT_FILE = "project_snapshot.json"
+
+# Trajectory write-behind settings (used when --trajectory-write-behind is enabled)
+DEFAULT_TRAJECTORY_QUEUE_SIZE = 1000
+DEFAULT_TRAJECTORY_BATCH_SIZE = 100
+
+# Trajectory JSON payloads of at least this many bytes are stored compressed
+# and deduplicated in the trajectory_blob table instead of inline
+DEFAULT_TRAJECTORY_BLOB_THRESHOLD = 4096
+
+# Incremental vacuum: pages freed per step, and free pages needed before a
+# background vacuum is started when ra-aid starts
+DEFAULT_VACUUM_STEP_PAGES = 256
+DEFAULT_VACUUM_MIN_FREE_PAGES = 2048
+
+# ripgrep_search match caps, enforced while rg output is being read
+DEFAULT_RIPGREP_MAX_MATCHES_PER_FILE = 50
+DEFAULT_RIPGREP_MAX_MATCHES = 500
+
+# Estimated tokens of key facts, key snippets and research notes put in agent
+# prompts; the items most relevant to the task are chosen (0 = no limit)
+DEFAULT_MEMORY_TOKEN_BUDGET = 20000
+
+# SQLite pragma sets applied on every connection, selectable with --db-profile.
+# Pragmas are applied per connection, so background threads get them too.
+# auto_vacuum only takes effect when a database is created; existing databases
+# are converted by the vacuum command (see ra_aid.database.retention).
+# Used by ra_aid.database.connection; defined here so that parsing the
+# command line does not need the database modules.
+DB_PROFILES = {
+    # Balanced: the WAL journal and 32MB cache ra-aid has always used, plus
+    # incremental auto_vacuum like every profile
+    "default": {
+        "auto_vacuum": "incremental",  # Let freed pages be returned to the OS
+        "journal_mode": "wal",  # Write-Ahead Logging for better concurrency
+        "foreign_keys": 1,  # Enforce foreign key constraints
+        "cache_size": -1024 * 32,  # 32MB cache
+    },
+    # Favour throughput: no fsync on every commit (WAL stays consistent, the
+    # last transactions may be lost on power failure), larger cache and mmap
+    "fast": {
+        "auto_vacuum": "incremental",
+        "journal_mode": "wal",
+        "synchronous": "normal",
+        "foreign_keys": 1,
+        "cache_size": -1024 * 64,  # 64MB cache
+        "mmap_size": 256 * 1024 * 1024,  # 256MB memory-mapped I/O
+        "temp_store": "memory",
+        "busy_timeout": 5000,  # Wait up to 5s for locks held by other connections
+    },
+    # Favour durability: rollback journal with a full fsync on every commit
+    "durable": {
+        "auto_vacuum": "incremental",
+        "journal_mode": "delete",
+        "synchronous": "full",
+        "foreign_keys": 1,
+        "cache_size": -1024 * 32,
+        "busy_timeout": 5000,
+    },
+}
+DEFAULT_DB_PROFILE = "default"
+
+# ra-aid daemon: seconds to wait for a starting daemon to be ready, and its log
+# file in the project state directory
+DEFAULT_DAEMON_START_TIMEOUT = 120
+DAEMON_LOG_FILE = "daemon.log"
+
+# Batch mode (--batch): number of tasks run at the same time
+DEFAULT_BATCH_CONCURRENCY = 4
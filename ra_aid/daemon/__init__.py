@@ -0,0 +1,21 @@
+"""
+A warm ra-aid process per project (``ra-aid daemon``).
+
+The daemon imports the agent stack and warms the project's caches once, then
+runs each ra-aid command forwarded by the ra-aid entry point in a forked
+child attached to the caller's terminal. See ra_aid.daemon.server.
+
+Only the standard library is imported here, as the entry point imports this
+package before deciding where to run.
+"""
+
+from ra_aid.daemon.client import can_forward, forward
+from ra_aid.daemon.protocol import DaemonError, daemon_socket_path, daemon_supported
+
+__all__ = [
+    "DaemonError",
+    "can_forward",
+    "daemon_socket_path",
+    "daemon_supported",
+    "forward",
+]
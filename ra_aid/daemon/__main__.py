@@ -0,0 +1,8 @@
+"""Run ``python -m ra_aid.daemon``, the same as ``ra-aid daemon``."""
+
+import sys
+
+from ra_aid.daemon.commands import main
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
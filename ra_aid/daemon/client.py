@@ -0,0 +1,143 @@
+"""
+Thin client forwarding ra-aid invocations to the project's daemon.
+
+Used by ra_aid.cli before anything heavy is imported: when a daemon of the
+same ra-aid version serves the current directory, the command runs there and
+the client only relays signals and the exit status.
+"""
+
+import contextlib
+import os
+import signal
+import socket
+import sys
+from typing import Iterator, List, Optional, Sequence
+
+from ra_aid.__version__ import __version__
+from ra_aid.daemon.protocol import (
+    DaemonError,
+    MessageReader,
+    daemon_socket_path,
+    daemon_supported,
+    send_message,
+)
+
+# Signals relayed to the command while it runs in the daemon. Ctrl+C and
+# terminal resizes reach the client, which is in the terminal's foreground
+# process group; the daemon's child is not.
+FORWARDED_SIGNALS = ("SIGINT", "SIGTERM", "SIGHUP", "SIGWINCH")
+
+
+def can_forward(args) -> bool:
+    """
+    Whether a parsed command line can run in a daemon.
+
+    Args:
+        args: Arguments returned by parse_arguments
+
+    Returns:
+        bool: False for server mode and when --no-daemon was given
+    """
+    return not args.server and not args.no_daemon
+
+
+@contextlib.contextmanager
+def _relay_signals(pid: int) -> Iterator[None]:
+    """Send the signals received by the client to a process while active."""
+
+    def relay(signum, frame):
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+    previous = {}
+    for name in FORWARDED_SIGNALS:
+        signum = getattr(signal, name, None)
+        if signum is not None:
+            previous[signum] = signal.signal(signum, relay)
+    try:
+        yield
+    finally:
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+
+
+def _stdio_fds() -> List[int]:
+    """The client's stdin, stdout and stderr descriptors, /dev/null for closed ones."""
+    fds = []
+    streams = ((sys.stdin, os.O_RDONLY), (sys.stdout, os.O_WRONLY), (sys.stderr, os.O_WRONLY))
+    for stream, mode in streams:
+        try:
+            fds.append(stream.fileno())
+        except (AttributeError, OSError, ValueError):
+            fds.append(os.open(os.devnull, mode))
+    return fds
+
+
+def forward(
+    argv: Sequence[str],
+    project_dir: Optional[str] = None,
+    fds: Optional[Sequence[int]] = None,
+) -> Optional[int]:
+    """
+    Run an ra-aid command in the daemon serving a project.
+
+    Args:
+        argv: Command line arguments, without the program name
+        project_dir: The project directory (default: the current directory)
+        fds: stdin, stdout and stderr descriptors for the command (default:
+            the client's own)
+
+    Returns:
+        Optional[int]: The exit status of the command, or None if it could
+            not be forwarded (no daemon, or a daemon of another version) and
+            should run in this process
+    """
+    if not daemon_supported():
+        return None
+    cwd = os.getcwd()
+    path = daemon_socket_path(project_dir or cwd)
+    if not os.path.exists(path):
+        return None
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except OSError:
+            # Stale socket of a daemon that is gone
+            return None
+        for stream in (sys.stdout, sys.stderr):
+            if stream is not None:
+                stream.flush()
+        reader = MessageReader(sock)
+        try:
+            send_message(
+                sock,
+                {
+                    "command": "run",
+                    "version": __version__,
+                    "argv": list(argv),
+                    "cwd": cwd,
+                    "env": dict(os.environ),
+                },
+                fds if fds is not None else _stdio_fds(),
+            )
+            reply, _ = reader.read()
+        except (OSError, DaemonError):
+            return None
+        if reply is None or "pid" not in reply:
+            # Refused, e.g. by a daemon of another version
+            return None
+
+        # The command is running: never fall back to running it again here
+        try:
+            with _relay_signals(reply["pid"]):
+                reply, _ = reader.read()
+        except (OSError, DaemonError):
+            reply = None
+
+    if reply is None:
+        # The command died without reporting its status
+        return 1
+    return reply.get("exit", 1)
@@ -0,0 +1,176 @@
+"""
+The ``ra-aid daemon`` command.
+
+    ra-aid daemon [start]   start a daemon for the current project
+    ra-aid daemon status    show the daemon serving the current project
+    ra-aid daemon stop      stop it
+
+Only ``serve`` (what ``start`` runs in the background) imports the agent
+stack, so the other actions answer at once.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import List, Optional
+
+from ra_aid.config import DAEMON_LOG_FILE, DEFAULT_DAEMON_START_TIMEOUT
+from ra_aid.daemon.protocol import (
+    DaemonError,
+    daemon_socket_path,
+    daemon_supported,
+    request,
+)
+
+# Seconds between readiness checks of a starting daemon
+START_POLL_INTERVAL = 0.1
+
+
+def _parse_arguments(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="ra-aid daemon",
+        description="Keep a warm ra-aid process for the current project. While it runs, "
+        "ra-aid commands started in the project run in it instead of starting from scratch.",
+    )
+    parser.add_argument(
+        "action",
+        nargs="?",
+        choices=["start", "stop", "status", "serve"],
+        default="start",
+        help="start (default) a daemon in the background, stop it, show its status, "
+        "or serve in the foreground",
+    )
+    parser.add_argument(
+        "--project-state-dir",
+        help="Directory to store project state. By default, the .ra-aid directory of the current working directory.",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_DAEMON_START_TIMEOUT,
+        help=f"Seconds to wait for a started daemon to be ready (default: {DEFAULT_DAEMON_START_TIMEOUT})",
+    )
+    return parser.parse_args(argv)
+
+
+def _state_dir(args: argparse.Namespace, project_dir: str) -> str:
+    if args.project_state_dir:
+        return os.path.abspath(args.project_state_dir)
+    return os.path.join(project_dir, ".ra-aid")
+
+
+def start(project_dir: str, state_dir: str, timeout: float) -> dict:
+    """
+    Start a daemon for a project in the background and wait until it is ready.
+
+    Args:
+        project_dir: The project directory
+        state_dir: Project state directory, which receives the daemon's log
+        timeout: Seconds to wait for the daemon to be ready
+
+    Returns:
+        dict: The status of the daemon
+
+    Raises:
+        DaemonError: If the daemon exited or was not ready in time
+    """
+    os.makedirs(state_dir, exist_ok=True)
+    log_path = os.path.join(state_dir, DAEMON_LOG_FILE)
+    with open(log_path, "ab") as log, open(os.devnull, "rb") as devnull:
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "ra_aid.daemon",
+                "serve",
+                "--project-state-dir",
+                state_dir,
+            ],
+            cwd=project_dir,
+            stdin=devnull,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = request(project_dir, {"command": "status"})
+        if status is not None:
+            return status
+        if process.poll() is not None:
+            raise DaemonError(f"The daemon exited with status {process.returncode}, see {log_path}")
+        time.sleep(START_POLL_INTERVAL)
+    process.terminate()
+    raise DaemonError(f"The daemon was not ready after {timeout:g}s, see {log_path}")
+
+
+def serve(project_dir: str, state_dir: str) -> None:
+    """
+    Warm up and serve a project in the foreground until stopped.
+
+    Args:
+        project_dir: The project directory
+        state_dir: Project state directory
+    """
+    from ra_aid.daemon.server import DaemonServer
+    from ra_aid.logging_config import setup_logging
+
+    # The daemon's stdout is its log file when started with "ra-aid daemon start"
+    setup_logging("console", log_level="info")
+    server = DaemonServer(project_dir, state_dir)
+    server.warm_up()
+    server.serve()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the ``ra-aid daemon`` command.
+
+    Args:
+        argv: Arguments following ``daemon`` (default: sys.argv[2:])
+
+    Returns:
+        int: The exit status
+    """
+    args = _parse_arguments(sys.argv[2:] if argv is None else argv)
+    if not daemon_supported():
+        print("ra-aid daemon is not supported on this platform", file=sys.stderr)
+        return 1
+
+    project_dir = os.path.realpath(os.getcwd())
+    status = request(project_dir, {"command": "status"})
+    try:
+        if args.action == "status":
+            if status is None:
+                print(f"No daemon is running for {project_dir}")
+                return 1
+            print(
+                f"Daemon {status['pid']} (ra-aid {status['version']}) serving {status['project']}: "
+                f"up {status['uptime']:.0f}s, {status['runs']} runs, {status['running']} running"
+            )
+        elif args.action == "stop":
+            if status is None:
+                print(f"No daemon is running for {project_dir}")
+                return 1
+            request(project_dir, {"command": "stop"})
+            print(f"Stopped daemon {status['pid']}")
+        elif status is not None:
+            print(f"Daemon {status['pid']} is already running for {project_dir}", file=sys.stderr)
+            return 1
+        elif args.action == "serve":
+            serve(project_dir, _state_dir(args, project_dir))
+        else:
+            status = start(project_dir, _state_dir(args, project_dir), args.timeout)
+            print(
+                f"Started daemon {status['pid']} for {project_dir} "
+                f"(listening on {daemon_socket_path(project_dir)})"
+            )
+    except DaemonError as e:
+        print(f"ra-aid daemon: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 130
+    return 0
@@ -0,0 +1,168 @@
+"""
+Messages exchanged between ra-aid clients and the daemon.
+
+Messages are JSON objects, one per line, over a Unix stream socket. A client
+running a command sends its stdin, stdout and stderr file descriptors as
+SCM_RIGHTS ancillary data along with its request. Only the standard library
+is used here, so that the ra-aid entry point can talk to a daemon without
+importing anything heavy.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import stat
+import tempfile
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Requests larger than this are read in several chunks
+RECV_SIZE = 65536
+
+
+class DaemonError(Exception):
+    """Raised when the daemon can't be started or reached."""
+
+    pass
+
+
+def daemon_supported() -> bool:
+    """Whether this platform supports daemons (fork, Unix sockets and fd passing)."""
+    return (
+        hasattr(os, "fork")
+        and hasattr(socket, "AF_UNIX")
+        and hasattr(socket, "send_fds")
+    )
+
+
+def daemon_socket_path(project_dir: str) -> str:
+    """
+    Path of the socket of the daemon serving a project.
+
+    Sockets live in a directory private to the user ($XDG_RUNTIME_DIR or the
+    temporary directory), named after a hash of the project path, which keeps
+    them under the length limit of Unix socket paths.
+
+    Args:
+        project_dir: The project directory
+
+    Returns:
+        str: The socket path
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    digest = hashlib.sha256(
+        os.path.realpath(project_dir).encode("utf-8")
+    ).hexdigest()[:16]
+    return os.path.join(runtime_dir, f"ra-aid-{os.getuid()}", f"{digest}.sock")
+
+
+def ensure_socket_dir(socket_path: str) -> None:
+    """
+    Create the directory of a socket, accessible to the current user only.
+
+    Args:
+        socket_path: Path of the socket
+
+    Raises:
+        DaemonError: If the directory exists but is not private to the user
+    """
+    directory = os.path.dirname(socket_path)
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    info = os.lstat(directory)
+    if (
+        not stat.S_ISDIR(info.st_mode)
+        or info.st_uid != os.getuid()
+        or info.st_mode & 0o077
+    ):
+        raise DaemonError(f"Refusing to use insecure socket directory {directory}")
+
+
+def send_message(
+    sock: socket.socket, message: Dict[str, Any], fds: Sequence[int] = ()
+) -> None:
+    """
+    Send a message, with file descriptors if given.
+
+    Args:
+        sock: Connected socket
+        message: JSON-serializable message
+        fds: File descriptors to pass along with the message
+    """
+    data = (json.dumps(message) + "\n").encode("utf-8")
+    sent = socket.send_fds(sock, [data], list(fds)) if fds else 0
+    sock.sendall(data[sent:])
+
+
+class MessageReader:
+    """Reads the messages received on a socket, one at a time."""
+
+    def __init__(self, sock: socket.socket):
+        """
+        Initialize the reader.
+
+        Args:
+            sock: Connected socket
+        """
+        self.sock = sock
+        self._buffer = b""
+
+    def read(self, max_fds: int = 0) -> Tuple[Optional[Dict[str, Any]], List[int]]:
+        """
+        Read the next message.
+
+        Args:
+            max_fds: Number of file descriptors that may come with the message
+
+        Returns:
+            Tuple[Optional[Dict[str, Any]], List[int]]: The message (None if
+                the connection was closed first) and the file descriptors
+                received with it
+
+        Raises:
+            DaemonError: If the message is not valid JSON
+        """
+        fds: List[int] = []
+        while b"\n" not in self._buffer:
+            if max_fds and not fds:
+                data, fds, _, _ = socket.recv_fds(self.sock, RECV_SIZE, max_fds)
+            else:
+                data = self.sock.recv(RECV_SIZE)
+            if not data:
+                for fd in fds:
+                    os.close(fd)
+                return None, []
+            self._buffer += data
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        try:
+            message = json.loads(line)
+        except ValueError as e:
+            for fd in fds:
+                os.close(fd)
+            raise DaemonError(f"Invalid daemon message: {e}")
+        return message, list(fds)
+
+
+def request(
+    project_dir: str, message: Dict[str, Any], timeout: float = 5.0
+) -> Optional[Dict[str, Any]]:
+    """
+    Send a request to the daemon of a project and return its reply.
+
+    Args:
+        project_dir: The project directory
+        message: The request
+        timeout: Seconds to wait for the reply
+
+    Returns:
+        Optional[Dict[str, Any]]: The reply, or None if no daemon is running
+    """
+    path = daemon_socket_path(project_dir)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(path)
+            send_message(sock, message)
+            reply, _ = MessageReader(sock).read()
+        except (OSError, DaemonError):
+            return None
+    return reply
@@ -0,0 +1,302 @@
+"""
+The ra-aid daemon: a warm process forking one child per forwarded command.
+
+The daemon imports the agent stack once and warms the project's file index
+and environment inventory. Each command is run in a child forked from it, so
+a run starts with everything imported but shares no state with other runs.
+Nothing holding a connection is kept across the fork: SQLite connections and
+HTTP connection pools can't be shared by forked processes, and opening the
+(schema-stamped) project database costs a few milliseconds.
+
+The daemon must not have other threads running when it forks, so its
+warm-up finishes before it starts accepting connections and it serves them
+from a single thread.
+"""
+
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from ra_aid.__version__ import __version__
+from ra_aid.daemon.protocol import (
+    DaemonError,
+    MessageReader,
+    daemon_socket_path,
+    ensure_socket_dir,
+    send_message,
+)
+from ra_aid.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Seconds between checks for finished children and stop requests
+POLL_INTERVAL = 0.5
+
+
+def run_command(argv: Sequence[str]) -> None:
+    """
+    Run an ra-aid command line, as the ra-aid entry point does.
+
+    Args:
+        argv: Command line arguments, without the program name
+    """
+    from ra_aid.__main__ import main
+    from ra_aid.arguments import parse_arguments
+
+    main(parse_arguments(list(argv)))
+
+
+def _exit_status(runner: Callable[[Sequence[str]], None], argv: Sequence[str]) -> int:
+    """Run a command and return its exit status, like the interpreter would."""
+    try:
+        runner(argv)
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        if isinstance(e.code, int):
+            return e.code
+        print(e.code, file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 128 + signal.SIGINT
+    except BaseException:
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+def _reset_consoles() -> None:
+    """Make the rich consoles created in the daemon detect the client's terminal."""
+    try:
+        import rich
+        from rich.console import Console
+    except ImportError:
+        return
+    rich._console = None
+    for name, module in list(sys.modules.items()):
+        if module is None or not (name == "ra_aid" or name.startswith("ra_aid.")):
+            continue
+        for value in list(vars(module).values()):
+            if isinstance(value, Console):
+                # Module-level consoles are shared by reference; re-detect in place
+                value.__init__()
+
+
+def _adopt_client(request: Dict[str, Any], fds: List[int]) -> None:
+    """Take over the working directory, environment and stdio of the client."""
+    # The daemon's log handlers would write to the client's stdio
+    logging.getLogger().handlers.clear()
+    os.chdir(request["cwd"])
+    os.environ.clear()
+    os.environ.update(request["env"])
+
+    for target, fd in zip((0, 1, 2), fds):
+        if fd != target:
+            os.dup2(fd, target)
+            os.close(fd)
+    sys.stdin = sys.__stdin__ = open(
+        0, "r", encoding="utf-8", errors="surrogateescape", closefd=False
+    )
+    sys.stdout = sys.__stdout__ = open(
+        1,
+        "w",
+        buffering=1 if os.isatty(1) else -1,
+        encoding="utf-8",
+        errors="surrogateescape",
+        closefd=False,
+    )
+    sys.stderr = sys.__stderr__ = open(
+        2, "w", buffering=1, encoding="utf-8", errors="backslashreplace", closefd=False
+    )
+    _reset_consoles()
+
+
+class DaemonServer:
+    """
+    Serves forwarded ra-aid commands for one project.
+
+    Example:
+        server = DaemonServer(os.getcwd())
+        server.warm_up()
+        server.serve()
+    """
+
+    def __init__(
+        self,
+        project_dir: str,
+        state_dir: Optional[str] = None,
+        runner: Callable[[Sequence[str]], None] = run_command,
+    ):
+        """
+        Initialize the server.
+
+        Args:
+            project_dir: The project directory served
+            state_dir: Project state directory (default: .ra-aid in the project directory)
+            runner: Function running a command line in a child
+        """
+        self.project_dir = os.path.realpath(project_dir)
+        self.state_dir = state_dir
+        self.socket_path = daemon_socket_path(self.project_dir)
+        self.runner = runner
+        self.started = time.time()
+        self.runs = 0
+        self._children: set = set()
+        self._listener: Optional[socket.socket] = None
+        self._stopping = False
+        self._pid = os.getpid()
+
+    def warm_up(self) -> None:
+        """Import the agent stack and build the project's cached state."""
+        started = time.perf_counter()
+        import ra_aid.__main__  # noqa: F401
+        from ra_aid.env_inv import discover_environment
+        from ra_aid.project_snapshot import get_project_snapshot
+
+        discover_environment(self.state_dir)
+        try:
+            get_project_snapshot(self.project_dir, self.state_dir)
+        except Exception as e:
+            logger.warning(f"Could not index project {self.project_dir}: {e}")
+        logger.info(f"Daemon warmed up in {time.perf_counter() - started:.1f}s")
+
+    def status(self) -> Dict[str, Any]:
+        """Describe the daemon, as returned for status requests."""
+        return {
+            "pid": os.getpid(),
+            "version": __version__,
+            "project": self.project_dir,
+            "uptime": time.time() - self.started,
+            "runs": self.runs,
+            "running": len(self._children),
+        }
+
+    def _bind(self) -> socket.socket:
+        """Listen on the project's socket, replacing a stale one."""
+        ensure_socket_dir(self.socket_path)
+        if os.path.exists(self.socket_path):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                try:
+                    probe.connect(self.socket_path)
+                except OSError:
+                    os.unlink(self.socket_path)
+                else:
+                    raise DaemonError(
+                        f"A daemon is already running for {self.project_dir}"
+                    )
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self.socket_path)
+        listener.listen()
+        listener.settimeout(POLL_INTERVAL)
+        return listener
+
+    def serve(self) -> None:
+        """Accept and serve requests until stopped (stop request, SIGTERM or Ctrl+C)."""
+
+        def terminate(signum, frame):
+            self._stopping = True
+
+        previous = signal.signal(signal.SIGTERM, terminate)
+        self._listener = self._bind()
+        logger.info(f"Daemon for {self.project_dir} listening on {self.socket_path}")
+        try:
+            while not self._stopping:
+                self._reap()
+                try:
+                    conn, _ = self._listener.accept()
+                except socket.timeout:
+                    continue
+                with conn:
+                    conn.settimeout(None)
+                    self._handle(conn)
+        finally:
+            if os.getpid() == self._pid:
+                self._listener.close()
+                try:
+                    os.unlink(self.socket_path)
+                except FileNotFoundError:
+                    pass
+                signal.signal(signal.SIGTERM, previous)
+                logger.info(f"Daemon for {self.project_dir} stopped")
+
+    def _reap(self) -> None:
+        """Collect the exit status of finished children."""
+        for pid in list(self._children):
+            try:
+                done, _ = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                done = pid
+            if done:
+                self._children.discard(pid)
+
+    def _handle(self, conn: socket.socket) -> None:
+        """Serve one connection."""
+        try:
+            request, fds = MessageReader(conn).read(max_fds=3)
+        except (OSError, DaemonError) as e:
+            logger.warning(f"Invalid daemon request: {e}")
+            return
+        try:
+            command = request.get("command") if request else None
+            if command == "status":
+                send_message(conn, self.status())
+            elif command == "stop":
+                self._stopping = True
+                send_message(conn, {"stopping": True})
+            elif command == "run":
+                if request.get("version") != __version__:
+                    send_message(
+                        conn, {"error": f"Daemon runs ra-aid {__version__}"}
+                    )
+                elif len(fds) != 3:
+                    send_message(conn, {"error": "Expected stdin, stdout and stderr"})
+                else:
+                    self._fork(conn, request, fds)
+            else:
+                send_message(conn, {"error": f"Unknown command: {command}"})
+        except OSError as e:
+            logger.warning(f"Lost daemon client: {e}")
+        finally:
+            for fd in fds:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+
+    def _fork(self, conn: socket.socket, request: Dict[str, Any], fds: List[int]) -> None:
+        """Run a command in a child process that takes over the client's stdio."""
+        for stream in (sys.stdout, sys.stderr):
+            stream.flush()
+        pid = os.fork()
+        if pid:
+            self._children.add(pid)
+            self.runs += 1
+            logger.debug(f"Running {request['argv']} in child {pid}")
+            return
+
+        # Child: never return into the server loop
+        status = 1
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            self._listener.close()
+            send_message(conn, {"pid": os.getpid()})
+            _adopt_client(request, list(fds))
+            fds.clear()
+            status = _exit_status(self.runner, request["argv"])
+        except BaseException:
+            traceback.print_exc()
+        finally:
+            try:
+                logging.shutdown()
+                sys.stdout.flush()
+                sys.stderr.flush()
+                send_message(conn, {"exit": status})
+            except BaseException:
+                pass
+            os._exit(status)
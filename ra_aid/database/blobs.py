@@ -0,0 +1,310 @@
+"""
+Out-of-line storage of large trajectory payloads.
+
+Trajectory records keep their tool parameters, tool result and UI step data as
+JSON text. Tool results in particular (file contents, command output, search
+matches) can be large and are often repeated, so payloads at or above a size
+threshold are compressed and stored once in the trajectory_blob table, keyed
+by the SHA-256 of their text. The trajectory row then holds the hash in the
+matching ``*_blob`` column and NULL in the inline one.
+
+Payloads are compressed with zstd when the zstandard package is installed and
+with zlib otherwise; each blob records its codec, so databases written with
+either can be read by both as long as the codec's module is available.
+"""
+
+import datetime
+import hashlib
+import zlib
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import peewee
+
+from ra_aid.database.models import Trajectory, TrajectoryBlob
+from ra_aid.database.utils import MAX_IDS_PER_QUERY
+from ra_aid.logging_config import get_logger
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = get_logger(__name__)
+
+# Trajectory JSON fields that may be stored out of line
+BLOB_FIELDS = ("tool_parameters", "tool_result", "step_data")
+
+
+def blob_column(field: str) -> str:
+    """Return the name of the column referencing the blob of a JSON field."""
+    return f"{field}_blob"
+
+
+def default_codec() -> str:
+    """
+    Return the codec new blobs are compressed with.
+
+    Returns:
+        str: "zstd" if the zstandard package is available, "zlib" otherwise
+    """
+    return "zstd" if zstandard is not None else "zlib"
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    """
+    Compress bytes with a codec.
+
+    Args:
+        data: Bytes to compress
+        codec: "zstd" or "zlib"
+
+    Returns:
+        bytes: The compressed data
+
+    Raises:
+        ValueError: If the codec is unknown or its module isn't installed
+    """
+    if codec == "zstd" and zstandard is not None:
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    if codec == "zlib":
+        return zlib.compress(data, 6)
+    raise ValueError(f"Unsupported trajectory blob codec: {codec}")
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    """
+    Decompress bytes written by compress().
+
+    Args:
+        data: Compressed bytes
+        codec: Codec the data was compressed with
+
+    Returns:
+        bytes: The original data
+
+    Raises:
+        ValueError: If the codec is unknown or its module isn't installed
+    """
+    if codec == "zstd" and zstandard is not None:
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == "zlib":
+        return zlib.decompress(data)
+    raise ValueError(f"Unsupported trajectory blob codec: {codec}")
+
+
+def encode_payload(data: bytes) -> Tuple[str, str, bytes, int]:
+    """
+    Hash and compress a UTF-8 encoded JSON payload for storage as a blob.
+
+    Args:
+        data: Encoded JSON text
+
+    Returns:
+        Tuple: The hash, codec, compressed data and uncompressed size in bytes
+    """
+    codec = default_codec()
+    return hashlib.sha256(data).hexdigest(), codec, compress(data, codec), len(data)
+
+
+def store_blob(data: bytes) -> str:
+    """
+    Store a payload as a blob unless an identical one is already stored.
+
+    Args:
+        data: UTF-8 encoded JSON text
+
+    Returns:
+        str: The hash referencing the blob
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    # Repeated payloads are common; skip compressing them again
+    if TrajectoryBlob.select(TrajectoryBlob.hash).where(TrajectoryBlob.hash == digest).exists():
+        return digest
+
+    digest, codec, compressed, size = encode_payload(data)
+    TrajectoryBlob.insert(
+        hash=digest, codec=codec, data=compressed, size=size
+    ).on_conflict_ignore().execute()
+    return digest
+
+
+def externalize(row: Dict[str, Any], threshold: Optional[int]) -> Dict[str, str]:
+    """
+    Move the large JSON payloads of a trajectory row into blobs, in place.
+
+    Payloads of at least ``threshold`` bytes are stored with store_blob and
+    replaced by a reference; the blob reference of every other JSON field in
+    the row is cleared, so the row can also be used to update a record. Call
+    this in the transaction that writes the row.
+
+    Args:
+        row: Field values for creating or updating a Trajectory, with JSON
+            fields already encoded
+        threshold: Minimum payload size in bytes to store out of line; None or
+            a value <= 0 keeps every payload inline
+
+    Returns:
+        Dict[str, str]: The JSON text of each blob the row now references, by hash
+    """
+    payloads: Dict[str, str] = {}
+    for field in BLOB_FIELDS:
+        if field not in row:
+            continue
+        text = row[field]
+        # A character takes at most 4 bytes in UTF-8, so most small payloads
+        # are ruled out without encoding them
+        data = None
+        if text is not None and threshold and threshold > 0 and len(text) * 4 >= threshold:
+            data = text.encode("utf-8")
+        if data is None or len(data) < threshold:
+            row[blob_column(field)] = None
+            continue
+        digest = store_blob(data)
+        payloads[digest] = text
+        row[field] = None
+        row[blob_column(field)] = digest
+    return payloads
+
+
+def blob_refs(trajectory: Any) -> Dict[str, str]:
+    """
+    Return the blob references of a trajectory record.
+
+    Args:
+        trajectory: A Trajectory instance, or a row of one as a dictionary
+
+    Returns:
+        Dict[str, str]: Hash of each JSON field stored out of line, by field name
+    """
+    refs = {}
+    for field in BLOB_FIELDS:
+        if isinstance(trajectory, dict):
+            digest = trajectory.get(blob_column(field))
+        else:
+            digest = getattr(trajectory, blob_column(field), None)
+        if digest:
+            refs[field] = digest
+    return refs
+
+
+def load_payloads(hashes: Iterable[str]) -> Dict[str, str]:
+    """
+    Read and decompress blobs.
+
+    Args:
+        hashes: Hashes of the blobs to read; duplicates are read once
+
+    Returns:
+        Dict[str, str]: The JSON text of each blob found, by hash
+    """
+    wanted = list(dict.fromkeys(hashes))
+    payloads: Dict[str, str] = {}
+    for chunk in peewee.chunked(wanted, MAX_IDS_PER_QUERY):
+        query = TrajectoryBlob.select(
+            TrajectoryBlob.hash, TrajectoryBlob.codec, TrajectoryBlob.data
+        ).where(TrajectoryBlob.hash.in_(chunk))
+        for blob in query:
+            payloads[blob.hash] = decompress(bytes(blob.data), blob.codec).decode("utf-8")
+
+    missing = len(wanted) - len(payloads)
+    if missing:
+        logger.warning(f"{missing} referenced trajectory blob(s) not found")
+    return payloads
+
+
+def delete_orphaned_blobs() -> int:
+    """
+    Delete the blobs that no trajectory record references any more.
+
+    Returns:
+        int: Number of blobs deleted
+    """
+    condition = None
+    for field in BLOB_FIELDS:
+        column = getattr(Trajectory, blob_column(field))
+        referenced = Trajectory.select(column).where(column.is_null(False))
+        clause = TrajectoryBlob.hash.not_in(referenced)
+        condition = clause if condition is None else condition & clause
+    deleted = TrajectoryBlob.delete().where(condition).execute()
+    if deleted:
+        logger.debug(f"Deleted {deleted} orphaned trajectory blobs")
+    return deleted
+
+
+def externalize_existing(database, threshold: int, batch_size: int = 500) -> int:
+    """
+    Move the large payloads of existing trajectory records into blobs.
+
+    Used by the migration that introduced blob storage. Works on the raw
+    tables, so it doesn't depend on the models being bound to ``database``.
+
+    Args:
+        database: Database holding the trajectory and trajectory_blob tables
+        threshold: Minimum payload size in bytes to store out of line
+        batch_size: Number of records read per query
+
+    Returns:
+        int: Number of payloads moved
+    """
+    moved = 0
+    for field in BLOB_FIELDS:
+        column = blob_column(field)
+        after_id = 0
+        while True:
+            rows = database.execute_sql(
+                f'SELECT id, "{field}" FROM trajectory '
+                f'WHERE id > ? AND length(CAST("{field}" AS BLOB)) >= ? '
+                "ORDER BY id LIMIT ?",
+                (after_id, threshold, batch_size),
+            ).fetchall()
+            if not rows:
+                break
+            now = datetime.datetime.now()
+            with database.atomic():
+                for trajectory_id, text in rows:
+                    digest, codec, data, size = encode_payload(text.encode("utf-8"))
+                    database.execute_sql(
+                        "INSERT OR IGNORE INTO trajectory_blob "
+                        "(hash, codec, data, size, created_at, updated_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (digest, codec, data, size, now, now),
+                    )
+                    database.execute_sql(
+                        f'UPDATE trajectory SET "{field}" = NULL, "{column}" = ? WHERE id = ?',
+                        (digest, trajectory_id),
+                    )
+            moved += len(rows)
+            after_id = rows[-1][0]
+    if moved:
+        logger.debug(f"Moved {moved} trajectory payloads into blobs")
+    return moved
+
+
+def inline_existing(database) -> int:
+    """
+    Copy every blob-stored payload back into its trajectory record.
+
+    The inverse of externalize_existing, used when rolling the migration back.
+
+    Args:
+        database: Database holding the trajectory and trajectory_blob tables
+
+    Returns:
+        int: Number of payloads restored
+    """
+    restored = 0
+    for field in BLOB_FIELDS:
+        column = blob_column(field)
+        rows = database.execute_sql(
+            f'SELECT t.id, b.codec, b.data FROM trajectory t '
+            f'JOIN trajectory_blob b ON b.hash = t."{column}"'
+        ).fetchall()
+        with database.atomic():
+            for trajectory_id, codec, data in rows:
+                text = decompress(bytes(data), codec).decode("utf-8")
+                database.execute_sql(
+                    f'UPDATE trajectory SET "{field}" = ?, "{column}" = NULL WHERE id = ?',
+                    (text, trajectory_id),
+                )
+        restored += len(rows)
+    return restored
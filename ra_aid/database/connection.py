@@ -6,12 +6,14 @@ It also provides a context manager for database connections.
 """
 
 import contextvars
+import logging
 import os
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 
 import peewee
 
+from ra_aid.config import DB_PROFILES, DEFAULT_DB_PROFILE
 from ra_aid.logging_config import get_logger
 
 # Import initialize_database after it's defined in models.py
@@ -22,6 +24,28 @@ db_var = contextvars.ContextVar("db", default=None)
 logger = get_logger(__name__)
 
 
+def get_db_pragmas(profile: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Get the SQLite pragmas for a performance profile.
+
+    Args:
+        profile: Name of the profile in DB_PROFILES. If None, uses DEFAULT_DB_PROFILE.
+
+    Returns:
+        Dict[str, Any]: Pragma names mapped to their values
+
+    Raises:
+        ValueError: If the profile name is unknown
+    """
+    name = profile or DEFAULT_DB_PROFILE
+    if name not in DB_PROFILES:
+        raise ValueError(
+            f"Unknown database profile: {name}. "
+            f"Choose from {', '.join(sorted(DB_PROFILES))}."
+        )
+    return dict(DB_PROFILES[name])
+
+
 class DatabaseManager:
     """
     Context manager for database connections.
@@ -41,9 +65,18 @@ class DatabaseManager:
         # Or with custom base directory:
         with DatabaseManager(base_dir="/custom/path") as db:
             # Use database in custom directory
+
+        # Or with a performance profile:
+        with DatabaseManager(profile="fast") as db:
+            # Use database with the "fast" pragma set
     """
 
-    def __init__(self, in_memory: bool = False, base_dir: Optional[str] = None):
+    def __init__(
+        self,
+        in_memory: bool = False,
+        base_dir: Optional[str] = None,
+        profile: Optional[str] = None,
+    ):
         """
         Initialize the DatabaseManager.
 
@@ -51,9 +84,12 @@ class DatabaseManager:
             in_memory: Whether to use an in-memory database (default: False)
             base_dir: Optional base directory to use instead of current working directory.
                      If None, uses os.getcwd() (default: None)
+            profile: Optional name of a performance profile in DB_PROFILES.
+                     If None, uses DEFAULT_DB_PROFILE (default: None)
         """
         self.in_memory = in_memory
         self.base_dir = base_dir
+        self.profile = profile
 
     def __enter__(self) -> peewee.SqliteDatabase:
         """
@@ -62,7 +98,9 @@ class DatabaseManager:
         Returns:
             peewee.SqliteDatabase: The initialized database connection
         """
-        db = init_db(in_memory=self.in_memory, base_dir=self.base_dir)
+        db = init_db(
+            in_memory=self.in_memory, base_dir=self.base_dir, profile=self.profile
+        )
         
         # Initialize the database proxy in models.py
         try:
@@ -96,7 +134,11 @@ class DatabaseManager:
         return False
 
 
-def init_db(in_memory: bool = False, base_dir: Optional[str] = None) -> peewee.SqliteDatabase:
+def init_db(
+    in_memory: bool = False,
+    base_dir: Optional[str] = None,
+    profile: Optional[str] = None,
+) -> peewee.SqliteDatabase:
     """
     Initialize the database connection.
 
@@ -108,10 +150,18 @@ def init_db(in_memory: bool = False, base_dir: Optional[str] = None) -> peewee.S
         in_memory: Whether to use an in-memory database (default: False)
         base_dir: Optional base directory to use instead of current working directory.
                   If None, uses os.getcwd() (default: None)
+        profile: Optional name of a performance profile in DB_PROFILES, controlling
+                 the pragmas applied on connect. If None, uses DEFAULT_DB_PROFILE.
+                 Ignored when an existing connection is reused.
 
     Returns:
         peewee.SqliteDatabase: The initialized database connection
+
+    Raises:
+        ValueError: If the profile name is unknown
     """
+    pragmas = get_db_pragmas(profile)
+
     # Check if a database connection already exists
     existing_db = db_var.get()
     if existing_db is not None:
@@ -217,14 +267,15 @@ def init_db(in_memory: bool = False, base_dir: Optional[str] = None) -> peewee.S
         )
 
         # Check parent directory permissions and contents for debugging
-        try:
-            parent_dir = os.path.dirname(ra_aid_dir_str)
-            parent_perms = oct(os.stat(parent_dir).st_mode)[-3:]
-            parent_contents = os.listdir(parent_dir)
-            logger.debug(f"Parent directory {parent_dir} permissions: {parent_perms}")
-            logger.debug(f"Parent directory contents: {parent_contents}")
-        except Exception as e:
-            logger.debug(f"Could not check parent directory: {str(e)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            try:
+                parent_dir = os.path.dirname(ra_aid_dir_str)
+                parent_perms = oct(os.stat(parent_dir).st_mode)[-3:]
+                parent_contents = os.listdir(parent_dir)
+                logger.debug(f"Parent directory {parent_dir} permissions: {parent_perms}")
+                logger.debug(f"Parent directory contents: {parent_contents}")
+            except Exception as e:
+                logger.debug(f"Could not check parent directory: {str(e)}")
 
         if not os_exists or not is_dir:
             error_msg = f"Directory does not exist or is not a directory after creation attempts: {ra_aid_dir_str}"
@@ -241,8 +292,9 @@ def init_db(in_memory: bool = False, base_dir: Optional[str] = None) -> peewee.S
             )
 
             # List directory contents for debugging
-            dir_contents = os.listdir(ra_aid_dir_str)
-            logger.debug(f"Directory contents: {dir_contents}")
+            if logger.isEnabledFor(logging.DEBUG):
+                dir_contents = os.listdir(ra_aid_dir_str)
+                logger.debug(f"Directory contents: {dir_contents}")
         except Exception as e:
             logger.debug(f"Could not check directory details: {str(e)}")
 
@@ -274,15 +326,11 @@ def init_db(in_memory: bool = False, base_dir: Optional[str] = None) -> peewee.S
                     # Continue anyway, as SQLite might be able to create the file itself
 
         # Initialize the database connection
-        logger.debug(f"Initializing SQLite database at: {db_path}")
-        db = peewee.SqliteDatabase(
-            db_path,
-            pragmas={
-                "journal_mode": "wal",  # Write-Ahead Logging for better concurrency
-                "foreign_keys": 1,  # Enforce foreign key constraints
-                "cache_size": -1024 * 32,  # 32MB cache
-            },
+        logger.debug(
+            f"Initializing SQLite database at: {db_path} "
+            f"(profile: {profile or DEFAULT_DB_PROFILE})"
         )
+        db = peewee.SqliteDatabase(db_path, pragmas=pragmas)
 
         # Always explicitly connect to ensure the connection is established
         if db.is_closed():
@@ -294,6 +342,7 @@ def init_db(in_memory: bool = False, base_dir: Optional[str] = None) -> peewee.S
 
         # Store whether this is an in-memory database (for backward compatibility)
         db._is_in_memory = in_memory
+        db._profile = profile or DEFAULT_DB_PROFILE
 
         # Verify the database is usable by executing a simple query
         if not in_memory:
@@ -366,8 +415,9 @@ def get_db(base_dir: Optional[str] = None) -> peewee.SqliteDatabase:
             # Then initialize a new connection with the same in-memory setting
             in_memory = hasattr(db, "_is_in_memory") and db._is_in_memory
             logger.debug(f"Creating new database connection (in_memory={in_memory})")
+            profile = getattr(db, "_profile", None)
             # Create a completely new database object, don't reuse the old one
-            return init_db(in_memory=in_memory, base_dir=base_dir)
+            return init_db(in_memory=in_memory, base_dir=base_dir, profile=profile)
 
     return db
 
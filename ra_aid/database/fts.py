@@ -0,0 +1,175 @@
+"""
+SQLite FTS5 full-text indexes over agent memory.
+
+Key facts, key snippets, research notes and human inputs each get an
+external-content FTS5 table (the text is stored once, in the source table)
+kept in sync by triggers, so memory can be searched with BM25 ranking instead
+of being formatted into every prompt in full.
+
+SQLite builds without FTS5 are supported: the indexes are then simply not
+created and search_fts falls back to a LIKE scan ranked by the number of
+matching query terms.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+import peewee
+
+from ra_aid.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# FTS table name -> (source table, indexed columns)
+MEMORY_FTS_TABLES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "key_fact_fts": ("key_fact", ("content",)),
+    "key_snippet_fts": ("key_snippet", ("filepath", "snippet", "description")),
+    "research_note_fts": ("research_note", ("content",)),
+    "human_input_fts": ("human_input", ("content",)),
+}
+
+_QUERY_TERM_RE = re.compile(r"\w+")
+
+
+def fts_statements(fts_table: str) -> List[str]:
+    """
+    Return the SQL creating an FTS table of MEMORY_FTS_TABLES and its sync triggers.
+
+    All statements use IF NOT EXISTS, so they are safe to run repeatedly.
+
+    Args:
+        fts_table: Name of the FTS table
+
+    Returns:
+        List[str]: CREATE VIRTUAL TABLE and CREATE TRIGGER statements
+    """
+    source, columns = MEMORY_FTS_TABLES[fts_table]
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    insert = f"INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values});"
+    delete = (
+        f"INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) "
+        f"VALUES ('delete', old.id, {old_values});"
+    )
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5("
+        f"{column_list}, content='{source}', content_rowid='id', "
+        "tokenize='porter unicode61')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_insert AFTER INSERT ON {source} "
+        f"BEGIN {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_delete AFTER DELETE ON {source} "
+        f"BEGIN {delete} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_update AFTER UPDATE OF {column_list} "
+        f"ON {source} BEGIN {delete} {insert} END",
+    ]
+
+
+def drop_statements(fts_table: str) -> List[str]:
+    """
+    Return the SQL dropping an FTS table of MEMORY_FTS_TABLES and its sync triggers.
+
+    Args:
+        fts_table: Name of the FTS table
+
+    Returns:
+        List[str]: DROP TRIGGER and DROP TABLE statements
+    """
+    return [
+        f"DROP TRIGGER IF EXISTS {fts_table}_{event}" for event in ("insert", "delete", "update")
+    ] + [f"DROP TABLE IF EXISTS {fts_table}"]
+
+
+def _table_exists(db: peewee.Database, name: str) -> bool:
+    cursor = db.execute_sql("SELECT 1 FROM sqlite_master WHERE name = ?", (name,))
+    return cursor.fetchone() is not None
+
+
+def create_memory_fts(db: peewee.Database) -> bool:
+    """
+    Create the memory FTS tables and triggers that don't exist yet.
+
+    Newly created indexes are populated from their source tables. Source
+    tables that don't exist are skipped.
+
+    Args:
+        db: Database to create the indexes in
+
+    Returns:
+        bool: False if FTS5 is not available in this SQLite build
+    """
+    for fts_table, (source, _) in MEMORY_FTS_TABLES.items():
+        if not _table_exists(db, source):
+            continue
+        created = not _table_exists(db, fts_table)
+        try:
+            with db.atomic():
+                for statement in fts_statements(fts_table):
+                    db.execute_sql(statement)
+                if created:
+                    db.execute_sql(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+        except peewee.OperationalError as e:
+            if "fts5" in str(e).lower():
+                logger.warning(f"SQLite FTS5 is not available, memory search will be slower: {e}")
+                return False
+            raise
+    return True
+
+
+def fts_match_query(text: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 query matching any of its words.
+
+    Words are quoted, so FTS5 operators and punctuation in the text are not
+    interpreted. BM25 ranks rows matching more (and rarer) words higher.
+
+    Args:
+        text: Free-text query
+
+    Returns:
+        Optional[str]: The FTS5 query, or None if the text has no words
+    """
+    terms = list(dict.fromkeys(term.lower() for term in _QUERY_TERM_RE.findall(text)))
+    if not terms:
+        return None
+    return " OR ".join(f'"{term}"' for term in terms)
+
+
+def search_fts(
+    db: peewee.Database, fts_table: str, query: str, limit: int = 10
+) -> List[Tuple[int, float]]:
+    """
+    Search one kind of memory.
+
+    Args:
+        db: Database to search
+        fts_table: Name of the FTS table in MEMORY_FTS_TABLES
+        query: Free-text query
+        limit: Maximum number of results
+
+    Returns:
+        List[Tuple[int, float]]: (row ID, score) pairs, best first; higher scores are better
+    """
+    match = fts_match_query(query)
+    if match is None or limit <= 0:
+        return []
+
+    if _table_exists(db, fts_table):
+        cursor = db.execute_sql(
+            f"SELECT rowid, bm25({fts_table}) AS rank FROM {fts_table} "
+            f"WHERE {fts_table} MATCH ? ORDER BY rank LIMIT ?",
+            (match, limit),
+        )
+        return [(row_id, -rank) for row_id, rank in cursor.fetchall()]
+
+    # No FTS5: count the matching terms in a scan of the source table
+    source, columns = MEMORY_FTS_TABLES[fts_table]
+    terms = [term.strip('"') for term in match.split(" OR ")]
+    text = " || ' ' || ".join(f"COALESCE({column}, '')" for column in columns)
+    score = " + ".join(f"(({text}) LIKE ?)" for _ in terms)
+    cursor = db.execute_sql(
+        f"SELECT id, {score} AS score FROM {source} WHERE score > 0 "
+        "ORDER BY score DESC, id DESC LIMIT ?",
+        [f"%{term}%" for term in terms] + [limit],
+    )
+    return [(row_id, float(score)) for row_id, score in cursor.fetchall()]
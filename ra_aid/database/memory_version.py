@@ -0,0 +1,123 @@
+"""
+Database-side version counters of agent memory.
+
+Rendered memory sections are cached per data version (see
+ra_aid.database.section_cache). A counter kept by a repository instance only
+sees the writes made through that instance, so the memory_version table holds
+one counter per memory table instead, bumped by SQLite triggers on every
+inserted, updated or deleted row. Every writer is seen: other repository
+instances, direct model queries (e.g. ra_aid.database.retention) and other
+processes sharing the database.
+"""
+
+import itertools
+import threading
+import weakref
+from typing import List, Optional, Tuple
+
+import peewee
+
+from ra_aid.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Memory tables that have a version counter
+MEMORY_VERSION_TABLES: Tuple[str, ...] = ("key_fact", "key_snippet", "research_note")
+
+_EVENTS = ("insert", "update", "delete")
+
+# Process-wide identity of each database object: counters of different
+# databases (e.g. test databases) can be equal
+_tokens: "weakref.WeakKeyDictionary[peewee.Database, int]" = weakref.WeakKeyDictionary()
+_token_counter = itertools.count(1)
+_tokens_lock = threading.Lock()
+
+
+def memory_version_statements(table: str) -> List[str]:
+    """
+    Return the SQL creating the version counter of a memory table and its triggers.
+
+    All statements are safe to run repeatedly.
+
+    Args:
+        table: Name of a table of MEMORY_VERSION_TABLES
+
+    Returns:
+        List[str]: CREATE TABLE, INSERT and CREATE TRIGGER statements
+    """
+    bump = f"UPDATE memory_version SET version = version + 1 WHERE name = '{table}';"
+    return [
+        'CREATE TABLE IF NOT EXISTS "memory_version" ('
+        '"name" TEXT NOT NULL PRIMARY KEY, "version" INTEGER NOT NULL DEFAULT 0)',
+        f"INSERT OR IGNORE INTO memory_version (name, version) VALUES ('{table}', 0)",
+    ] + [
+        f'CREATE TRIGGER IF NOT EXISTS "{table}_memory_version_{event}" '
+        f"AFTER {event.upper()} ON {table} BEGIN {bump} END"
+        for event in _EVENTS
+    ]
+
+
+def drop_memory_version_statements() -> List[str]:
+    """
+    Return the SQL dropping the memory version counters and their triggers.
+
+    Returns:
+        List[str]: DROP TRIGGER and DROP TABLE statements
+    """
+    return [
+        f'DROP TRIGGER IF EXISTS "{table}_memory_version_{event}"'
+        for table in MEMORY_VERSION_TABLES
+        for event in _EVENTS
+    ] + ['DROP TABLE IF EXISTS "memory_version"']
+
+
+def create_memory_versions(db: peewee.Database) -> None:
+    """
+    Create the version counters and triggers of the memory tables that exist.
+
+    Args:
+        db: Database to create them in
+    """
+    tables = set(db.get_tables())
+    with db.atomic():
+        for table in MEMORY_VERSION_TABLES:
+            if table in tables:
+                for statement in memory_version_statements(table):
+                    db.execute_sql(statement)
+
+
+def _database_token(db: peewee.Database) -> int:
+    """Return a number identifying a database object for the life of the process."""
+    with _tokens_lock:
+        token = _tokens.get(db)
+        if token is None:
+            token = _tokens[db] = next(_token_counter)
+        return token
+
+
+def read_memory_version(db: peewee.Database, table: str) -> Optional[Tuple[int, int]]:
+    """
+    Return the current version of a memory table.
+
+    Args:
+        db: Database the table is in, or a proxy of it
+        table: Name of a table of MEMORY_VERSION_TABLES
+
+    Returns:
+        Optional[Tuple[int, int]]: The version, which changes on every write to the
+            table, or None if the database has no counter for it (e.g. a test
+            database created from the models alone)
+    """
+    if isinstance(db, peewee.DatabaseProxy):
+        db = db.obj
+        if db is None:
+            return None
+    try:
+        row = db.execute_sql(
+            "SELECT version FROM memory_version WHERE name = ?", (table,)
+        ).fetchone()
+    except peewee.OperationalError:
+        return None
+    if row is None:
+        return None
+    return (_database_token(db), row[0])
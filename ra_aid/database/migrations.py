@@ -14,6 +14,11 @@ from typing import Any, Dict, List, Optional, Tuple
 from peewee_migrate import Router
 
 from ra_aid.database.connection import DatabaseManager, get_db
+from ra_aid.database.schema import (
+    get_schema_version,
+    latest_schema_version,
+    set_schema_version,
+)
 from ra_aid.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -170,12 +175,15 @@ class MigrationManager:
         """
         try:
             # Get pending migrations
-            _, pending = self.check_migrations()
+            applied, pending = self.check_migrations()
 
             if not pending:
                 logger.info("No pending migrations to apply")
                 return True
 
+            if not applied and getattr(self.db, "_schema_created", False):
+                return self._apply_baseline(pending)
+
             logger.info(f"Applying {len(pending)} pending migrations...")
 
             # Apply migrations
@@ -194,6 +202,30 @@ class MigrationManager:
             logger.error(f"Failed to apply migrations: {str(e)}")
             return False
 
+    def _apply_baseline(self, pending: List[str]) -> bool:
+        """
+        Record all migrations as applied to a freshly created database.
+
+        initialize_database creates the tables of a new database from the
+        current models in one transaction, which is the squashed result of
+        every migration. Replaying the migrations one by one would only
+        rebuild what is already there, so they are recorded without running.
+
+        Args:
+            pending: Names of the migrations to record
+
+        Returns:
+            bool: True if the migrations were recorded successfully
+        """
+        try:
+            with self.db.atomic():
+                self.router.model.insert_many([{"name": name} for name in pending]).execute()
+            logger.info(f"Created database schema from baseline of {len(pending)} migrations")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to record baseline migrations: {str(e)}")
+            return False
+
     def create_migration(self, name: str, auto: bool = True) -> Optional[str]:
         """
         Create a new migration.
@@ -283,8 +315,18 @@ def ensure_migrations_applied() -> bool:
         
         with DatabaseManager() as db:
             try:
+                # A current schema stamp means there is nothing to discover
+                latest = latest_schema_version(migrations_dir)
+                if latest and get_schema_version(db) >= latest:
+                    logger.debug(f"Database schema is at version {latest}")
+                    return True
+
                 migration_manager = init_migrations(migrations_dir=migrations_dir)
-                return migration_manager.apply_migrations()
+                if not migration_manager.apply_migrations():
+                    return False
+                if latest:
+                    set_schema_version(db, latest)
+                return True
             except Exception as e:
                 logger.error(f"Failed to apply migrations: {str(e)}")
                 return False
@@ -42,19 +42,48 @@ def initialize_database():
     # to avoid circular imports
     # Note: This import needs to be here, not at the top level
     try:
+        from ra_aid.database.schema import schema_is_current
+
+        # A database stamped by ensure_migrations_applied has every table
+        if schema_is_current(db):
+            logger.debug("Database schema is current")
+            return db
+
         from ra_aid.database.models import (
             KeyFact,
             KeySnippet,
             HumanInput,
             ResearchNote,
             Trajectory,
+            TrajectoryBlob,
             Session,
+            SessionUsage,
         )
+        from ra_aid.database.fts import create_memory_fts
+        from ra_aid.database.memory_version import create_memory_versions
 
-        db.create_tables(
-            [KeyFact, KeySnippet, HumanInput, ResearchNote, Trajectory, Session],
-            safe=True,
-        )
+        models = [
+            KeyFact,
+            KeySnippet,
+            HumanInput,
+            ResearchNote,
+            Trajectory,
+            TrajectoryBlob,
+            Session,
+            SessionUsage,
+        ]
+        # Tables are created through the proxy, which may still point at an
+        # earlier connection; only a new database created here is a baseline
+        fresh = database_proxy.obj is db and not db.get_tables()
+        with db.atomic():
+            db.create_tables(models, safe=True)
+            create_session_usage_triggers()
+            create_memory_fts(db)
+            create_memory_versions(db)
+        if fresh:
+            # The schema is the squashed result of every migration, which
+            # MigrationManager.apply_migrations then records without running
+            db._schema_created = True
         logger.debug("Ensured database tables exist")
     except Exception as e:
         logger.error(f"Error creating tables: {str(e)}")
@@ -130,6 +159,7 @@ class Session(BaseModel):
 
     class Meta:
         table_name = "session"
+        indexes = ((("created_at",), False),)
 
 
 class HumanInput(BaseModel):
@@ -148,6 +178,10 @@ class HumanInput(BaseModel):
 
     class Meta:
         table_name = "human_input"
+        indexes = (
+            (("session", "created_at"), False),
+            (("created_at",), False),
+        )
 
 
 class KeyFact(BaseModel):
@@ -165,6 +199,7 @@ class KeyFact(BaseModel):
 
     class Meta:
         table_name = "key_fact"
+        indexes = ((("session", "created_at"), False),)
 
 
 class KeySnippet(BaseModel):
@@ -186,6 +221,7 @@ class KeySnippet(BaseModel):
 
     class Meta:
         table_name = "key_snippet"
+        indexes = ((("session", "created_at"), False),)
 
 
 class ResearchNote(BaseModel):
@@ -206,6 +242,7 @@ class ResearchNote(BaseModel):
 
     class Meta:
         table_name = "research_note"
+        indexes = ((("session", "created_at"), False),)
 
 
 class Trajectory(BaseModel):
@@ -250,8 +287,124 @@ class Trajectory(BaseModel):
         null=True, help_text="Additional error details like stack traces or context"
     )
     session = peewee.ForeignKeyField(Session, backref="trajectories", null=True)
+    # Payloads above the blob threshold are stored once in trajectory_blob and
+    # referenced by hash, with the inline column left NULL
+    tool_parameters_blob = peewee.TextField(
+        null=True, help_text="Hash of the trajectory_blob holding tool_parameters"
+    )
+    tool_result_blob = peewee.TextField(
+        null=True, help_text="Hash of the trajectory_blob holding tool_result"
+    )
+    step_data_blob = peewee.TextField(
+        null=True, help_text="Hash of the trajectory_blob holding step_data"
+    )
     # created_at and updated_at are inherited from BaseModel
 
 
     class Meta:
         table_name = "trajectory"
+        indexes = (
+            (("session", "record_type"), False),
+            (("session", "created_at"), False),
+        )
+
+
+class TrajectoryBlob(BaseModel):
+    """
+    Model representing a large trajectory payload stored out of line.
+
+    Blobs are keyed by the SHA-256 of the uncompressed JSON text, so a payload
+    repeated across trajectory records (e.g. the same file read twice) is
+    stored once. See ra_aid.database.blobs.
+    """
+
+    hash = peewee.TextField(primary_key=True, help_text="SHA-256 of the JSON text")
+    codec = peewee.TextField(help_text="Compression codec: zstd or zlib")
+    data = peewee.BlobField(help_text="Compressed JSON text")
+    size = peewee.IntegerField(help_text="Uncompressed size in bytes")
+    # created_at and updated_at are inherited from BaseModel
+
+    class Meta:
+        table_name = "trajectory_blob"
+
+
+class SessionUsage(BaseModel):
+    """
+    Model representing the aggregated model usage of a session.
+
+    This is a rollup of the model_usage trajectory records of each session,
+    maintained by SQLite triggers on the trajectory table (see
+    create_session_usage_triggers), so per-session and all-sessions usage
+    totals can be read without scanning the trajectory table.
+    """
+
+    session = peewee.ForeignKeyField(
+        Session, primary_key=True, backref="usage", on_delete="CASCADE"
+    )
+    total_cost = peewee.FloatField(default=0.0)
+    total_input_tokens = peewee.IntegerField(default=0)
+    total_output_tokens = peewee.IntegerField(default=0)
+    record_count = peewee.IntegerField(
+        default=0, help_text="Number of model_usage records aggregated"
+    )
+    # created_at and updated_at are inherited from BaseModel
+
+    class Meta:
+        table_name = "session_usage"
+
+
+# Add a new trajectory row's usage to its session's rollup, creating the row if needed
+_SESSION_USAGE_UPSERT = """
+    INSERT INTO session_usage (
+        session_id, total_cost, total_input_tokens, total_output_tokens,
+        record_count, created_at, updated_at
+    )
+    SELECT NEW.session_id, COALESCE(NEW.current_cost, 0.0),
+        COALESCE(NEW.input_tokens, 0), COALESCE(NEW.output_tokens, 0),
+        1, datetime('now', 'localtime'), datetime('now', 'localtime')
+    WHERE NEW.record_type = 'model_usage' AND NEW.session_id IS NOT NULL
+    ON CONFLICT (session_id) DO UPDATE SET
+        total_cost = total_cost + excluded.total_cost,
+        total_input_tokens = total_input_tokens + excluded.total_input_tokens,
+        total_output_tokens = total_output_tokens + excluded.total_output_tokens,
+        record_count = record_count + 1,
+        updated_at = excluded.updated_at;
+"""
+
+# Remove an old trajectory row's usage from its session's rollup
+_SESSION_USAGE_SUBTRACT = """
+    UPDATE session_usage SET
+        total_cost = total_cost - COALESCE(OLD.current_cost, 0.0),
+        total_input_tokens = total_input_tokens - COALESCE(OLD.input_tokens, 0),
+        total_output_tokens = total_output_tokens - COALESCE(OLD.output_tokens, 0),
+        record_count = record_count - 1,
+        updated_at = datetime('now', 'localtime')
+    WHERE session_id = OLD.session_id AND OLD.record_type = 'model_usage';
+"""
+
+SESSION_USAGE_TRIGGERS = {
+    "trajectory_session_usage_insert": (
+        "AFTER INSERT ON trajectory", _SESSION_USAGE_UPSERT
+    ),
+    "trajectory_session_usage_update": (
+        "AFTER UPDATE OF session_id, record_type, current_cost, input_tokens, "
+        "output_tokens ON trajectory",
+        _SESSION_USAGE_SUBTRACT + _SESSION_USAGE_UPSERT,
+    ),
+    "trajectory_session_usage_delete": (
+        "AFTER DELETE ON trajectory", _SESSION_USAGE_SUBTRACT
+    ),
+}
+
+
+def create_session_usage_triggers() -> None:
+    """
+    Create the triggers that keep the session_usage rollup in sync with the trajectory table.
+
+    The triggers are created in the database the Trajectory model is bound to,
+    where the trajectory and session_usage tables must already exist. Existing
+    triggers are left untouched, so this is safe to call on every startup.
+    """
+    db = Trajectory._meta.database
+    for name, (event, body) in SESSION_USAGE_TRIGGERS.items():
+        db.execute_sql(f'CREATE TRIGGER IF NOT EXISTS "{name}" {event} BEGIN {body} END')
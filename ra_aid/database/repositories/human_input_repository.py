@@ -5,12 +5,13 @@ This module provides a repository implementation for the HumanInput model,
 following the repository pattern for data access abstraction.
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import contextvars
 
 import peewee
 
 from ra_aid.database.models import HumanInput, Session
+from ra_aid.database.fts import search_fts
 from ra_aid.database.pydantic_models import HumanInputModel
 from ra_aid.logging_config import get_logger
 
@@ -119,6 +120,9 @@ class HumanInputRepository:
         if db is None:
             raise ValueError("Database connection is required for HumanInputRepository")
         self.db = db
+        # Input worked on by this repository's users, when inputs are handled
+        # concurrently (see ra_aid.batch); None for the most recent input
+        self.current_input_id: Optional[int] = None
         
     def _to_model(self, human_input: Optional[HumanInput]) -> Optional[HumanInputModel]:
         """
@@ -287,16 +291,51 @@ class HumanInputRepository:
             logger.error(f"Failed to fetch recent human inputs: {str(e)}")
             raise
 
+    def search(self, query: str, limit: int = 10) -> List[Tuple[HumanInputModel, float]]:
+        """
+        Search human inputs by relevance to a free-text query.
+
+        Uses the human_input_fts full-text index (BM25 ranking) when it exists.
+
+        Args:
+            query: Free-text query; rows matching any of its words are returned
+            limit: Maximum number of results
+
+        Returns:
+            List[Tuple[HumanInputModel, float]]: Matching human inputs with their scores, best
+                first; higher scores are better
+
+        Raises:
+            peewee.DatabaseError: If there's an error accessing the database
+        """
+        try:
+            hits = search_fts(self.db, "human_input_fts", query, limit)
+            if not hits:
+                return []
+            rows = {
+                row.id: row
+                for row in HumanInput.select().where(HumanInput.id.in_([row_id for row_id, _ in hits]))
+            }
+            return [(self._to_model(rows[row_id]), score) for row_id, score in hits if row_id in rows]
+        except peewee.DatabaseError as e:
+            logger.error(f"Failed to search human inputs: {str(e)}")
+            raise
+
     def get_most_recent_id(self) -> Optional[int]:
         """
         Get the ID of the most recent human input record.
         
+        If current_input_id is set, it is returned instead, so that concurrent
+        tasks each attribute their records to their own input.
+        
         Returns:
             Optional[int]: The ID of the most recent human input, or None if no records exist
             
         Raises:
             peewee.DatabaseError: If there's an error accessing the database
         """
+        if self.current_input_id is not None:
+            return self.current_input_id
         try:
             recent_inputs = self.get_recent(1)
             if recent_inputs and len(recent_inputs) > 0:
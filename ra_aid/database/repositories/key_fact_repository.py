@@ -7,12 +7,12 @@ following the repository pattern for data access abstraction.
 
 from typing import Dict, List, Optional
 import contextvars
-from contextlib import contextmanager
 
 import peewee
 
 from ra_aid.database.models import KeyFact
 from ra_aid.database.pydantic_models import KeyFactModel
+from ra_aid.database.repositories.memory_repository import MemoryRepository
 from ra_aid.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -96,7 +96,7 @@ def get_key_fact_repository() -> 'KeyFactRepository':
     return repo
 
 
-class KeyFactRepository:
+class KeyFactRepository(MemoryRepository[KeyFactModel]):
     """
     Repository for managing KeyFact database operations.
     
@@ -110,54 +110,93 @@ class KeyFactRepository:
                 all_facts = repo.get_all()
     """
     
-    def __init__(self, db):
-        """
-        Initialize the repository with a database connection.
-        
-        Args:
-            db: Database connection to use (required)
-        """
-        if db is None:
-            raise ValueError("Database connection is required for KeyFactRepository")
-        self.db = db
-    
-    def _to_model(self, fact: Optional[KeyFact]) -> Optional[KeyFactModel]:
+    model = KeyFact
+    pydantic_model = KeyFactModel
+    table = "key_fact"
+    noun = "key fact"
+    plural = "key facts"
+
+    def _dedupe_text(self, row: KeyFact) -> str:
+        """Text by which key facts are compared: their content."""
+        return row.content
+
+    def find_duplicate(self, content: str) -> Optional[KeyFactModel]:
         """
-        Convert a Peewee KeyFact object to a Pydantic KeyFactModel.
-        
+        Find a stored key fact that duplicates the given content.
+
+        Exact duplicates (ignoring case, punctuation and whitespace) and near
+        duplicates (see ra_aid.utils.dedupe) are found without a model call.
+
         Args:
-            fact: Peewee KeyFact instance or None
-            
+            content: The text content to look up
+
         Returns:
-            Optional[KeyFactModel]: Pydantic model representation or None if fact is None
+            Optional[KeyFactModel]: The earliest stored duplicate, or None
+
+        Raises:
+            peewee.DatabaseError: If there's an error accessing the database
         """
-        if fact is None:
-            return None
-        
-        return KeyFactModel.model_validate(fact, from_attributes=True)
-    
-    def create(self, content: str, human_input_id: Optional[int] = None) -> KeyFactModel:
+        return self._find_duplicate(content)
+
+    def create(
+        self, content: str, human_input_id: Optional[int] = None, deduplicate: bool = True
+    ) -> KeyFactModel:
         """
         Create a new key fact in the database.
         
         Args:
             content: The text content of the key fact
             human_input_id: Optional ID of the associated human input
+            deduplicate: If True and a duplicate of the content is already stored
+                (see find_duplicate), return it instead of storing the content again,
+                associated with human_input_id if one is given
             
         Returns:
-            KeyFactModel: The newly created key fact instance
+            KeyFactModel: The newly created key fact instance, or the stored duplicate
             
         Raises:
             peewee.DatabaseError: If there's an error creating the fact
         """
         try:
-            fact = KeyFact.create(content=content, human_input_id=human_input_id)
+            with self._duplicates_lock:
+                if deduplicate:
+                    duplicate = self.find_duplicate(content)
+                    if duplicate is not None:
+                        logger.debug(f"Not storing duplicate of key fact ID {duplicate.id}: {content}")
+                        return self._reassociate(duplicate, human_input_id)
+                fact = KeyFact.create(content=content, human_input_id=human_input_id)
+                self._wrote(1, added=[(fact.id, content)])
             logger.debug(f"Created key fact ID {fact.id}: {content}")
             return self._to_model(fact)
         except peewee.DatabaseError as e:
             logger.error(f"Failed to create key fact: {str(e)}")
             raise
     
+    def create_many(
+        self, contents: List[str], human_input_id: Optional[int] = None, deduplicate: bool = True
+    ) -> List[KeyFactModel]:
+        """
+        Create several key facts in a single transaction.
+
+        Args:
+            contents: The text contents of the key facts
+            human_input_id: Optional ID of the associated human input
+            deduplicate: If True, contents that duplicate a stored key fact (or an
+                earlier one of contents) are not stored again
+
+        Returns:
+            List[KeyFactModel]: For each of contents, the created key fact or the stored duplicate
+
+        Raises:
+            peewee.DatabaseError: If there's an error creating the key facts
+        """
+        return self._create_many(
+            lambda content: self.create(
+                content, human_input_id=human_input_id, deduplicate=deduplicate
+            ),
+            contents,
+        )
+
     def get(self, fact_id: int) -> Optional[KeyFactModel]:
         """
         Retrieve a key fact by its ID.
@@ -202,6 +241,7 @@ class KeyFactRepository:
             # Update the fact
             fact.content = content
             fact.save()
+            self._wrote(1, added=[(fact_id, content)])
             logger.debug(f"Updated key fact ID {fact_id}: {content}")
             return self._to_model(fact)
         except peewee.DatabaseError as e:
@@ -230,6 +270,7 @@ class KeyFactRepository:
             
             # Delete the fact
             fact.delete_instance()
+            self._wrote(1, removed=[fact_id])
             logger.debug(f"Deleted key fact ID {fact_id}")
             return True
         except peewee.DatabaseError as e:
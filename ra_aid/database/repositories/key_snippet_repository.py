@@ -12,10 +12,17 @@ import peewee
 
 from ra_aid.database.models import KeySnippet
 from ra_aid.database.pydantic_models import KeySnippetModel
+from ra_aid.database.repositories.memory_repository import MemoryRepository
 from ra_aid.logging_config import get_logger
+from ra_aid.utils.dedupe import normalize_code
 
 logger = get_logger(__name__)
 
+
+def _dedupe_text(filepath: str, snippet: str) -> str:
+    """Text by which snippets are compared: the same code from the same file is a duplicate."""
+    return f"{filepath}\n{normalize_code(snippet)}"
+
 # Create contextvar to hold the KeySnippetRepository instance
 key_snippet_repo_var = contextvars.ContextVar("key_snippet_repo", default=None)
 
@@ -100,7 +107,7 @@ def get_key_snippet_repository() -> 'KeySnippetRepository':
     return repo
 
 
-class KeySnippetRepository:
+class KeySnippetRepository(MemoryRepository[KeySnippetModel]):
     """
     Repository for managing KeySnippet database operations.
     
@@ -119,35 +126,39 @@ class KeySnippetRepository:
                 all_snippets = repo.get_all()
     """
     
-    def __init__(self, db):
-        """
-        Initialize the repository with a database connection.
-        
-        Args:
-            db: Database connection to use (required)
-        """
-        if db is None:
-            raise ValueError("Database connection is required for KeySnippetRepository")
-        self.db = db
-    
-    def _to_model(self, snippet: Optional[KeySnippet]) -> Optional[KeySnippetModel]:
+    model = KeySnippet
+    pydantic_model = KeySnippetModel
+    table = "key_snippet"
+    noun = "key snippet"
+    plural = "key snippets"
+    near_duplicates = False
+
+    def _dedupe_text(self, row: KeySnippet) -> str:
+        """Text by which key snippets are compared: their file and normalized code."""
+        return _dedupe_text(row.filepath, row.snippet)
+
+    def find_duplicate(self, filepath: str, snippet: str) -> Optional[KeySnippetModel]:
         """
-        Convert a Peewee KeySnippet object to a Pydantic KeySnippetModel.
-        
+        Find a stored key snippet with the same code from the same file.
+
+        Code is compared ignoring indentation, trailing whitespace and blank
+        lines; line numbers and descriptions are not compared.
+
         Args:
-            snippet: Peewee KeySnippet instance or None
-            
+            filepath: Path to the source file
+            snippet: The source code snippet text
+
         Returns:
-            Optional[KeySnippetModel]: Pydantic model representation or None if snippet is None
+            Optional[KeySnippetModel]: The earliest stored duplicate, or None
+
+        Raises:
+            peewee.DatabaseError: If there's an error accessing the database
         """
-        if snippet is None:
-            return None
-        
-        return KeySnippetModel.model_validate(snippet, from_attributes=True)
-    
+        return self._find_duplicate(_dedupe_text(filepath, snippet))
+
     def create(
         self, filepath: str, line_number: int, snippet: str, description: Optional[str] = None,
-        human_input_id: Optional[int] = None
+        human_input_id: Optional[int] = None, deduplicate: bool = True
     ) -> KeySnippetModel:
         """
         Create a new key snippet in the database.
@@ -158,27 +169,79 @@ class KeySnippetRepository:
             snippet: The source code snippet text
             description: Optional description of the significance
             human_input_id: Optional ID of the associated human input
+            deduplicate: If True and the same code from the same file is already
+                stored (see find_duplicate), return that snippet instead, updated
+                with the new line number and description and associated with
+                human_input_id if one is given
             
         Returns:
-            KeySnippetModel: The newly created key snippet instance
+            KeySnippetModel: The newly created key snippet instance, or the stored duplicate
             
         Raises:
             peewee.DatabaseError: If there's an error creating the snippet
         """
         try:
-            key_snippet = KeySnippet.create(
-                filepath=filepath,
-                line_number=line_number,
-                snippet=snippet,
-                description=description,
-                human_input_id=human_input_id
-            )
+            with self._duplicates_lock:
+                if deduplicate:
+                    duplicate = self.find_duplicate(filepath, snippet)
+                    if duplicate is not None:
+                        logger.debug(
+                            f"Not storing duplicate of key snippet ID {duplicate.id}: {filepath}:{line_number}"
+                        )
+                        duplicate = self._reassociate(duplicate, human_input_id)
+                        if duplicate.line_number == line_number and (
+                            description is None or description == duplicate.description
+                        ):
+                            return duplicate
+                        # The code may have moved; keep the most recent location
+                        return self.update(
+                            duplicate.id,
+                            filepath=duplicate.filepath,
+                            line_number=line_number,
+                            snippet=duplicate.snippet,
+                            description=description if description is not None else duplicate.description,
+                        )
+                key_snippet = KeySnippet.create(
+                    filepath=filepath,
+                    line_number=line_number,
+                    snippet=snippet,
+                    description=description,
+                    human_input_id=human_input_id
+                )
+                self._wrote(1, added=[(key_snippet.id, _dedupe_text(filepath, snippet))])
             logger.debug(f"Created key snippet ID {key_snippet.id}: {filepath}:{line_number}")
             return self._to_model(key_snippet)
         except peewee.DatabaseError as e:
             logger.error(f"Failed to create key snippet: {str(e)}")
             raise
     
+    def create_many(
+        self, snippets: List[Dict[str, Any]], human_input_id: Optional[int] = None,
+        deduplicate: bool = True
+    ) -> List[KeySnippetModel]:
+        """
+        Create several key snippets in a single transaction.
+
+        Args:
+            snippets: Keyword arguments of create (filepath, line_number, snippet and
+                optionally description) for each snippet
+            human_input_id: Optional ID of the associated human input
+            deduplicate: If True, snippets that duplicate a stored key snippet (or an
+                earlier one of snippets) are not stored again
+
+        Returns:
+            List[KeySnippetModel]: For each of snippets, the created key snippet or the stored duplicate
+
+        Raises:
+            peewee.DatabaseError: If there's an error creating the key snippets
+        """
+        return self._create_many(
+            lambda snippet: self.create(
+                **snippet, human_input_id=human_input_id, deduplicate=deduplicate
+            ),
+            snippets,
+        )
+
     def get(self, snippet_id: int) -> Optional[KeySnippetModel]:
         """
         Retrieve a key snippet by its ID.
@@ -236,6 +299,7 @@ class KeySnippetRepository:
             key_snippet.snippet = snippet
             key_snippet.description = description
             key_snippet.save()
+            self._wrote(1, added=[(snippet_id, _dedupe_text(filepath, snippet))])
             logger.debug(f"Updated key snippet ID {snippet_id}: {filepath}:{line_number}")
             return self._to_model(key_snippet)
         except peewee.DatabaseError as e:
@@ -264,6 +328,7 @@ class KeySnippetRepository:
             
             # Delete the snippet
             key_snippet.delete_instance()
+            self._wrote(1, removed=[snippet_id])
             logger.debug(f"Deleted key snippet ID {snippet_id}")
             return True
         except peewee.DatabaseError as e:
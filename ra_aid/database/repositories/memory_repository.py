@@ -0,0 +1,362 @@
+"""
+Shared implementation of the agent memory repositories.
+
+Key facts, key snippets and research notes are stored, deduplicated, garbage
+collected and searched the same way. MemoryRepository holds that shared
+behaviour; the repositories of each kind of memory add their own create,
+update and formatting methods.
+"""
+
+import datetime
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Generic, Iterable, List, Optional, Tuple, Type, TypeVar
+
+import peewee
+
+from ra_aid.database.fts import search_fts
+from ra_aid.database.memory_version import read_memory_version
+from ra_aid.database.section_cache import next_version
+from ra_aid.database.utils import MAX_IDS_PER_QUERY
+from ra_aid.logging_config import get_logger
+from ra_aid.utils.dedupe import DuplicateIndex, find_duplicate_groups
+
+logger = get_logger(__name__)
+
+# Pydantic model returned by a repository
+M = TypeVar("M")
+
+
+class MemoryRepository(ABC, Generic[M]):
+    """
+    Base class of the repositories of a kind of agent memory.
+
+    Subclasses set the class attributes below and implement _dedupe_text.
+
+    Attributes:
+        model: Peewee model of the stored rows
+        pydantic_model: Pydantic model returned for them
+        table: Table name, which also names the FTS index (<table>_fts) and the
+            version counter (see ra_aid.database.memory_version)
+        noun: What a row is, for messages, e.g. "key fact"
+        plural: The plural of noun
+        near_duplicates: Whether near duplicates are detected, rather than only exact ones
+    """
+
+    model: Type[peewee.Model]
+    pydantic_model: Type[Any]
+    table: str
+    noun: str
+    plural: str
+    near_duplicates: bool = True
+
+    def __init__(self, db):
+        """
+        Initialize the repository with a database connection.
+
+        Args:
+            db: Database connection to use (required)
+        """
+        if db is None:
+            raise ValueError(f"Database connection is required for {type(self).__name__}")
+        self.db = db
+        # Built from the stored rows on first use, then kept in sync with the
+        # version of the stored rows it reflects
+        self._duplicates: Optional[DuplicateIndex] = None
+        self._duplicates_version: Any = None
+        self._duplicates_lock = threading.RLock()
+        # Fallback version for databases without memory version counters
+        self._version = next_version()
+
+    @property
+    def version(self):
+        """
+        Version of the stored rows, so that what is rendered from them can be cached.
+
+        It is read from the database (see ra_aid.database.memory_version), so it
+        changes on every write, whoever makes it. Databases without the counter
+        (e.g. created from the models alone) fall back to a version that only
+        changes on writes through this repository.
+        """
+        # The database the model's queries actually run in
+        return read_memory_version(self.model._meta.database, self.table) or self._version
+
+    def _to_model(self, row: Optional[peewee.Model]) -> Optional[M]:
+        """
+        Convert a Peewee row to its Pydantic model.
+
+        Args:
+            row: Peewee model instance or None
+
+        Returns:
+            Optional[M]: Pydantic model representation or None if row is None
+        """
+        if row is None:
+            return None
+
+        return self.pydantic_model.model_validate(row, from_attributes=True)
+
+    @abstractmethod
+    def _dedupe_text(self, row: peewee.Model) -> str:
+        """Return the text by which a row is compared with other rows for duplicates."""
+
+    def _duplicate_index(self) -> DuplicateIndex:
+        """Return the duplicate index of the stored rows, rebuilding it if others wrote to them."""
+        version = self.version
+        if self._duplicates is None or version != self._duplicates_version:
+            index = DuplicateIndex(near=self.near_duplicates)
+            for row in self.model.select().order_by(self.model.id):
+                index.add(row.id, self._dedupe_text(row))
+            self._duplicates = index
+            self._duplicates_version = version
+        return self._duplicates
+
+    def _wrote(
+        self,
+        changes: int,
+        added: Iterable[Tuple[int, str]] = (),
+        removed: Iterable[int] = (),
+    ) -> None:
+        """
+        Record a write made through this repository.
+
+        The duplicate index is updated in place. It stays current unless rows
+        were also written by someone else, which the database version shows:
+        then it is rebuilt on next use.
+
+        Args:
+            changes: Number of rows inserted, updated or deleted
+            added: ID and dedupe text of each inserted or updated row
+            removed: IDs of the deleted rows
+        """
+        with self._duplicates_lock:
+            self._version = next_version()
+            if self._duplicates is None:
+                return
+            for row_id, text in added:
+                self._duplicates.add(row_id, text)
+            for row_id in removed:
+                self._duplicates.remove(row_id)
+            synced = self._duplicates_version
+            version = self.version
+            if version == self._version or (
+                isinstance(synced, tuple) and version == (synced[0], synced[1] + changes)
+            ):
+                self._duplicates_version = version
+
+    def _find_duplicate(self, text: str) -> Optional[M]:
+        """
+        Find the earliest stored row whose dedupe text duplicates text.
+
+        Raises:
+            peewee.DatabaseError: If there's an error accessing the database
+        """
+        try:
+            with self._duplicates_lock:
+                index = self._duplicate_index()
+                while True:
+                    row_id = index.find(text)
+                    if row_id is None:
+                        return None
+                    row = self.model.get_or_none(self.model.id == row_id)
+                    if row is not None:
+                        return self._to_model(row)
+                    # Deleted by a write the version doesn't show (no version counter)
+                    index.remove(row_id)
+        except peewee.DatabaseError as e:
+            logger.error(f"Failed to look up duplicate {self.plural}: {str(e)}")
+            raise
+
+    def _reassociate(self, duplicate: M, human_input_id: Optional[int]) -> M:
+        """
+        Associate a stored duplicate with the human input that stored it again.
+
+        The row then counts as stored for that input, e.g. it is protected
+        from garbage collection while the input is current.
+
+        Args:
+            duplicate: The stored duplicate
+            human_input_id: ID of the human input storing it again, if any
+
+        Returns:
+            M: The duplicate, as now stored
+        """
+        if human_input_id is None or duplicate.human_input_id == human_input_id:
+            return duplicate
+        self.model.update(
+            human_input=human_input_id, updated_at=datetime.datetime.now()
+        ).where(self.model.id == duplicate.id).execute()
+        self._wrote(1)
+        return self._to_model(self.model.get_by_id(duplicate.id))
+
+    def _create_many(self, create: Callable[[Any], M], items: List[Any]) -> List[M]:
+        """
+        Create a row for each of items in a single transaction.
+
+        Args:
+            create: Creates (or finds the duplicate of) the row of an item
+            items: The items
+
+        Returns:
+            List[M]: The created rows, or stored duplicates, in item order
+
+        Raises:
+            peewee.DatabaseError: If there's an error creating the rows
+        """
+        try:
+            with self._duplicates_lock, self.db.atomic():
+                created = [create(item) for item in items]
+            self._version = next_version()  # Again, now that the rows are committed
+            logger.debug(f"Created {len(items)} {self.plural}")
+            return created
+        except peewee.DatabaseError as e:
+            logger.error(f"Failed to create {self.plural}: {str(e)}")
+            raise
+
+    def _delete_ids(self, ids: List[int]) -> None:
+        """Delete stored rows by ID, in the current transaction."""
+        for batch in peewee.chunked(ids, MAX_IDS_PER_QUERY):
+            self.model.delete().where(self.model.id.in_(batch)).execute()
+        self._wrote(len(ids), removed=ids)
+
+    def delete_many(
+        self, ids: Iterable[int], protected_human_input_id: Optional[int] = None
+    ) -> Tuple[List[M], List[M]]:
+        """
+        Delete several rows by ID in a single transaction.
+
+        IDs of rows that don't exist are ignored.
+
+        Args:
+            ids: IDs of the rows to delete
+            protected_human_input_id: ID of the human input whose rows must not be deleted
+
+        Returns:
+            Tuple[List[M], List[M]]: The deleted rows, and the rows that were kept
+                because they are protected
+
+        Raises:
+            peewee.DatabaseError: If there's an error deleting the rows
+        """
+        ids = list(dict.fromkeys(ids))
+        try:
+            with self.db.atomic():
+                rows = []
+                for batch in peewee.chunked(ids, MAX_IDS_PER_QUERY):
+                    rows.extend(self.model.select().where(self.model.id.in_(batch)))
+                position = {row_id: i for i, row_id in enumerate(ids)}
+                rows.sort(key=lambda row: position[row.id])
+                protected_ids = {
+                    row.id
+                    for row in rows
+                    if protected_human_input_id is not None
+                    and row.human_input_id == protected_human_input_id
+                }
+                protected = [row for row in rows if row.id in protected_ids]
+                deleted = [row for row in rows if row.id not in protected_ids]
+                self._delete_ids([row.id for row in deleted])
+            self._version = next_version()  # Again, now that the rows are committed
+            logger.debug(f"Deleted {self.plural} {[row.id for row in deleted]}")
+            return (
+                [self._to_model(row) for row in deleted],
+                [self._to_model(row) for row in protected],
+            )
+        except peewee.DatabaseError as e:
+            logger.error(f"Failed to delete {self.plural}: {str(e)}")
+            raise
+
+    def delete_duplicates(
+        self, protected_human_input_id: Optional[int] = None
+    ) -> List[Tuple[M, int]]:
+        """
+        Delete rows that duplicate other stored rows, without a model call.
+
+        Of each group of duplicates the earliest row is kept, unless some of the
+        group are associated with the protected human input: then those are kept
+        (and never deleted) instead.
+
+        Args:
+            protected_human_input_id: ID of the human input whose rows must not be deleted
+
+        Returns:
+            List[Tuple[M, int]]: The deleted rows, each with the ID of the row it duplicated
+
+        Raises:
+            peewee.DatabaseError: If there's an error accessing the database
+        """
+        try:
+            rows = {row.id: row for row in self.model.select().order_by(self.model.id)}
+            deleted = []
+            groups = find_duplicate_groups(
+                ((row_id, self._dedupe_text(row)) for row_id, row in rows.items()),
+                near=self.near_duplicates,
+            )
+            for group in groups:
+                protected = [
+                    row_id
+                    for row_id in group
+                    if protected_human_input_id is not None
+                    and rows[row_id].human_input_id == protected_human_input_id
+                ]
+                kept = protected or group[:1]
+                deleted.extend(
+                    (self._to_model(rows[row_id]), kept[0]) for row_id in group if row_id not in kept
+                )
+            if deleted:
+                ids = [row.id for row, _ in deleted]
+                with self.db.atomic():
+                    self._delete_ids(ids)
+                self._version = next_version()  # Again, now that the rows are committed
+                logger.debug(f"Deleted {len(ids)} duplicate {self.plural}: {ids}")
+            return deleted
+        except peewee.DatabaseError as e:
+            logger.error(f"Failed to delete duplicate {self.plural}: {str(e)}")
+            raise
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[M, float]]:
+        """
+        Search the stored rows by relevance to a free-text query.
+
+        Uses the table's full-text index (BM25 ranking) when it exists.
+
+        Args:
+            query: Free-text query; rows matching any of its words are returned
+            limit: Maximum number of results
+
+        Returns:
+            List[Tuple[M, float]]: Matching rows with their scores, best first;
+                higher scores are better
+
+        Raises:
+            peewee.DatabaseError: If there's an error accessing the database
+        """
+        try:
+            hits = search_fts(self.db, f"{self.table}_fts", query, limit)
+            if not hits:
+                return []
+            rows = {
+                row.id: row
+                for row in self.model.select().where(
+                    self.model.id.in_([row_id for row_id, _ in hits])
+                )
+            }
+            return [(self._to_model(rows[row_id]), score) for row_id, score in hits if row_id in rows]
+        except peewee.DatabaseError as e:
+            logger.error(f"Failed to search {self.plural}: {str(e)}")
+            raise
+
+    def count(self) -> int:
+        """
+        Count the stored rows without loading them.
+
+        Returns:
+            int: Number of rows
+
+        Raises:
+            peewee.DatabaseError: If there's an error accessing the database
+        """
+        try:
+            return self.model.select().count()
+        except peewee.DatabaseError as e:
+            logger.error(f"Failed to count {self.plural}: {str(e)}")
+            raise
@@ -2,6 +2,7 @@ import contextvars
 import os
 from typing import Dict, List, Optional
 
+from ra_aid.database.section_cache import get_section_cache, next_version
 # Import is_binary_file from memory.py
 from ra_aid.utils.file_utils import is_binary_file
 
@@ -23,6 +24,8 @@ class RelatedFilesRepository:
         """
         self._related_files: Dict[int, str] = {}
         self._id_counter: int = 1
+        # Changes on every write, so that format_related_files can be cached
+        self.version = next_version()
     
     def get_all(self) -> Dict[int, str]:
         """
@@ -71,6 +74,7 @@ class RelatedFilesRepository:
         file_id = self._id_counter
         self._id_counter += 1
         self._related_files[file_id] = normalized_path
+        self.version = next_version()
         
         return file_id
     
@@ -85,6 +89,7 @@ class RelatedFilesRepository:
             Optional[str]: The path of the removed file, or None if the file ID was not found
         """
         if file_id in self._related_files:
+            self.version = next_version()
             return self._related_files.pop(file_id)
         return None
     
@@ -95,7 +100,14 @@ class RelatedFilesRepository:
         Returns:
             List[str]: Formatted strings for each related file
         """
-        return [f"ID#{file_id} {filepath}" for file_id, filepath in sorted(self._related_files.items())]
+        formatted = get_section_cache().get(
+            "related_files",
+            self.version,
+            lambda: tuple(
+                f"ID#{file_id} {filepath}" for file_id, filepath in sorted(self._related_files.items())
+            ),
+        )
+        return list(formatted)
         
     def get_next_id(self) -> int:
         """
@@ -7,12 +7,12 @@ following the repository pattern for data access abstraction.
 
 from typing import Dict, List, Optional
 import contextvars
-from contextlib import contextmanager
 
 import peewee
 
 from ra_aid.database.models import ResearchNote
 from ra_aid.database.pydantic_models import ResearchNoteModel
+from ra_aid.database.repositories.memory_repository import MemoryRepository
 from ra_aid.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -96,7 +96,7 @@ def get_research_note_repository() -> 'ResearchNoteRepository':
     return repo
 
 
-class ResearchNoteRepository:
+class ResearchNoteRepository(MemoryRepository[ResearchNoteModel]):
     """
     Repository for managing ResearchNote database operations.
     
@@ -110,54 +110,93 @@ class ResearchNoteRepository:
                 all_notes = repo.get_all()
     """
     
-    def __init__(self, db):
-        """
-        Initialize the repository with a database connection.
-        
-        Args:
-            db: Database connection to use (required)
-        """
-        if db is None:
-            raise ValueError("Database connection is required for ResearchNoteRepository")
-        self.db = db
-    
-    def _to_model(self, note: Optional[ResearchNote]) -> Optional[ResearchNoteModel]:
+    model = ResearchNote
+    pydantic_model = ResearchNoteModel
+    table = "research_note"
+    noun = "research note"
+    plural = "research notes"
+
+    def _dedupe_text(self, row: ResearchNote) -> str:
+        """Text by which research notes are compared: their content."""
+        return row.content
+
+    def find_duplicate(self, content: str) -> Optional[ResearchNoteModel]:
         """
-        Convert a Peewee ResearchNote object to a Pydantic ResearchNoteModel.
-        
+        Find a stored research note that duplicates the given content.
+
+        Exact duplicates (ignoring case, punctuation and whitespace) and near
+        duplicates (see ra_aid.utils.dedupe) are found without a model call.
+
         Args:
-            note: Peewee ResearchNote instance or None
-            
+            content: The text content to look up
+
         Returns:
-            Optional[ResearchNoteModel]: Pydantic model representation or None if note is None
+            Optional[ResearchNoteModel]: The earliest stored duplicate, or None
+
+        Raises:
+            peewee.DatabaseError: If there's an error accessing the database
         """
-        if note is None:
-            return None
-        
-        return ResearchNoteModel.model_validate(note, from_attributes=True)
-    
-    def create(self, content: str, human_input_id: Optional[int] = None) -> ResearchNoteModel:
+        return self._find_duplicate(content)
+
+    def create(
+        self, content: str, human_input_id: Optional[int] = None, deduplicate: bool = True
+    ) -> ResearchNoteModel:
         """
         Create a new research note in the database.
         
         Args:
             content: The text content of the research note
             human_input_id: Optional ID of the associated human input
+            deduplicate: If True and a duplicate of the content is already stored
+                (see find_duplicate), return it instead of storing the content again,
+                associated with human_input_id if one is given
             
         Returns:
-            ResearchNoteModel: The newly created research note instance
+            ResearchNoteModel: The newly created research note instance, or the stored duplicate
             
         Raises:
             peewee.DatabaseError: If there's an error creating the note
         """
         try:
-            note = ResearchNote.create(content=content, human_input_id=human_input_id)
+            with self._duplicates_lock:
+                if deduplicate:
+                    duplicate = self.find_duplicate(content)
+                    if duplicate is not None:
+                        logger.debug(f"Not storing duplicate of research note ID {duplicate.id}: {content[:50]}...")
+                        return self._reassociate(duplicate, human_input_id)
+                note = ResearchNote.create(content=content, human_input_id=human_input_id)
+                self._wrote(1, added=[(note.id, content)])
             logger.debug(f"Created research note ID {note.id}: {content[:50]}...")
             return self._to_model(note)
         except peewee.DatabaseError as e:
             logger.error(f"Failed to create research note: {str(e)}")
             raise
     
+    def create_many(
+        self, contents: List[str], human_input_id: Optional[int] = None, deduplicate: bool = True
+    ) -> List[ResearchNoteModel]:
+        """
+        Create several research notes in a single transaction.
+
+        Args:
+            contents: The text contents of the research notes
+            human_input_id: Optional ID of the associated human input
+            deduplicate: If True, contents that duplicate a stored research note (or an
+                earlier one of contents) are not stored again
+
+        Returns:
+            List[ResearchNoteModel]: For each of contents, the created research note or the stored duplicate
+
+        Raises:
+            peewee.DatabaseError: If there's an error creating the research notes
+        """
+        return self._create_many(
+            lambda content: self.create(
+                content, human_input_id=human_input_id, deduplicate=deduplicate
+            ),
+            contents,
+        )
+
     def get(self, note_id: int) -> Optional[ResearchNoteModel]:
         """
         Retrieve a research note by its ID.
@@ -202,6 +241,7 @@ class ResearchNoteRepository:
             # Update the note
             note.content = content
             note.save()
+            self._wrote(1, added=[(note_id, content)])
             logger.debug(f"Updated research note ID {note_id}: {content[:50]}...")
             return self._to_model(note)
         except peewee.DatabaseError as e:
@@ -230,6 +270,7 @@ class ResearchNoteRepository:
             
             # Delete the note
             note.delete_instance()
+            self._wrote(1, removed=[note_id])
             logger.debug(f"Deleted research note ID {note_id}")
             return True
         except peewee.DatabaseError as e:
@@ -253,6 +294,28 @@ class ResearchNoteRepository:
             logger.error(f"Failed to fetch all research notes: {str(e)}")
             raise
     
+    def get_by_human_input(self, human_input_id: int) -> List[ResearchNoteModel]:
+        """
+        Retrieve the research notes stored for a human input.
+
+        Args:
+            human_input_id: The ID of the human input
+
+        Returns:
+            List[ResearchNoteModel]: Its research notes, oldest first
+
+        Raises:
+            peewee.DatabaseError: If there's an error accessing the database
+        """
+        try:
+            notes = ResearchNote.select().where(
+                ResearchNote.human_input == human_input_id
+            ).order_by(ResearchNote.id)
+            return [self._to_model(note) for note in notes]
+        except peewee.DatabaseError as e:
+            logger.error(f"Failed to fetch research notes of human input {human_input_id}: {str(e)}")
+            raise
+    
     def get_notes_dict(self) -> Dict[int, str]:
         """
         Retrieve all research notes as a dictionary mapping IDs to content.
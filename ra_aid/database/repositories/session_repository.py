@@ -495,6 +495,27 @@ class SessionRepository:
             logger.error(f"Failed to get all session IDs: {str(e)}")
             return []
 
+    def get_all_with_display_names(self) -> List[SessionModel]:
+        """
+        Get all sessions, including their display names, with a single query.
+
+        Returns:
+            List[SessionModel]: All sessions ordered by creation time (newest first)
+        """
+        try:
+            query = (
+                Session.select(
+                    Session,
+                    self._get_display_name_subquery().alias("display_name"),
+                )
+                .order_by(Session.created_at.desc())
+                .dicts()
+            )
+            return [self._to_model(row) for row in query]
+        except peewee.DatabaseError as e:
+            logger.error(f"Failed to get all sessions: {str(e)}")
+            return []
+
     def _get_display_name_subquery(self):
         """
         Create a subquery for computing the display_name field.
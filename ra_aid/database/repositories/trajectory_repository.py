@@ -6,15 +6,25 @@ following the repository pattern for data access abstraction. It handles
 operations for storing and retrieving agent action trajectories.
 """
 
-from typing import Dict, List, Optional, Any, Union, Callable
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Union, Callable
+import atexit
 import contextvars
+import datetime
 import json
 import logging
+import queue
 import sys
+import threading
 
 import peewee
 
-from ra_aid.database.models import Trajectory, HumanInput
+from ra_aid.config import (
+    DEFAULT_TRAJECTORY_BATCH_SIZE,
+    DEFAULT_TRAJECTORY_BLOB_THRESHOLD,
+    DEFAULT_TRAJECTORY_QUEUE_SIZE,
+)
+from ra_aid.database.blobs import blob_refs, externalize, load_payloads
+from ra_aid.database.models import Trajectory, HumanInput, SessionUsage
 from ra_aid.database.pydantic_models import TrajectoryModel
 from ra_aid.database.repositories.session_repository import get_session_repository
 from ra_aid.logging_config import get_logger
@@ -43,14 +53,18 @@ class TrajectoryRepositoryManager:
                 all_trajectories = repo.get_all()
     """
 
-    def __init__(self, db):
+    def __init__(self, db, write_behind: bool = False):
         """
         Initialize the TrajectoryRepositoryManager.
 
         Args:
             db: Database connection to use (required)
+            write_behind: Whether trajectory records are written asynchronously
+                          by a background writer (default: False)
         """
         self.db = db
+        self.write_behind = write_behind
+        self.repo = None
 
     def __enter__(self) -> "TrajectoryRepository":
         """
@@ -59,9 +73,9 @@ class TrajectoryRepositoryManager:
         Returns:
             TrajectoryRepository: The initialized repository
         """
-        repo = TrajectoryRepository(self.db)
-        trajectory_repo_var.set(repo)
-        return repo
+        self.repo = TrajectoryRepository(self.db, write_behind=self.write_behind)
+        trajectory_repo_var.set(self.repo)
+        return self.repo
 
     def __exit__(
         self,
@@ -77,6 +91,11 @@ class TrajectoryRepositoryManager:
             exc_val: The exception value if an exception was raised
             exc_tb: The traceback if an exception was raised
         """
+        # Flush any queued trajectory records before the database goes away
+        if self.repo is not None:
+            self.repo.close()
+            self.repo = None
+
         # Reset the contextvar to None
         trajectory_repo_var.set(None)
 
@@ -103,6 +122,239 @@ def get_trajectory_repository() -> "TrajectoryRepository":
     return repo
 
 
+def _trajectory_model(
+    trajectory: Trajectory, payloads: Optional[Dict[str, str]] = None
+) -> TrajectoryModel:
+    """
+    Convert a Peewee Trajectory object to a Pydantic TrajectoryModel.
+
+    JSON fields stored out of line are read from ``payloads`` when given, and
+    otherwise loaded (and decompressed) from the trajectory_blob table.
+
+    Args:
+        trajectory: Peewee Trajectory instance
+        payloads: Optional JSON text of blobs already at hand, by hash
+
+    Returns:
+        TrajectoryModel: Pydantic model representation
+    """
+    refs = blob_refs(trajectory)
+    if not refs:
+        return TrajectoryModel.model_validate(trajectory, from_attributes=True)
+
+    if payloads is None or not all(digest in payloads for digest in refs.values()):
+        payloads = {**(payloads or {}), **load_payloads(refs.values())}
+    data = {name: getattr(trajectory, name, None) for name in TrajectoryModel.model_fields}
+    for field, digest in refs.items():
+        data[field] = payloads.get(digest)
+    return TrajectoryModel.model_validate(data)
+
+
+class TrajectoryWriter:
+    """
+    Background writer that persists trajectory records in batches.
+
+    Records are placed on a bounded in-process queue by the producing thread and
+    written by a single daemon thread, several rows per transaction, so callers
+    never wait on a commit. Because there is exactly one writer, records are
+    inserted (and reported through ``on_written``) in submission order.
+
+    Example:
+        writer = TrajectoryWriter(db, on_written=print)
+        writer.submit({"tool_name": "ripgrep_search", ...})
+        writer.flush()  # Block until everything queued so far is committed
+        writer.close()
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        db,
+        on_written: Optional[Callable[[TrajectoryModel], None]] = None,
+        max_queue_size: int = DEFAULT_TRAJECTORY_QUEUE_SIZE,
+        batch_size: int = DEFAULT_TRAJECTORY_BATCH_SIZE,
+        blob_threshold: Optional[int] = DEFAULT_TRAJECTORY_BLOB_THRESHOLD,
+    ):
+        """
+        Initialize the writer and start its background thread.
+
+        Args:
+            db: Database connection to write to
+            on_written: Optional callback invoked with each TrajectoryModel after
+                        the batch containing it has been committed
+            max_queue_size: Maximum number of pending records; submit() blocks
+                            when the queue is full
+            batch_size: Maximum number of records written per transaction
+            blob_threshold: Minimum size in bytes of JSON payloads stored in
+                            the trajectory_blob table; None or 0 stores all inline
+        """
+        self.db = db
+        self.on_written = on_written
+        self.batch_size = max(1, batch_size)
+        self.blob_threshold = blob_threshold
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._closed = False
+        self._drain_lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run, name="trajectory-writer", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, row: Dict[str, Any]) -> None:
+        """
+        Queue a trajectory row for writing.
+
+        Args:
+            row: Field values for Trajectory.create (JSON fields already encoded)
+
+        If the writer thread has died, the row (and any still queued) is
+        written synchronously instead.
+
+        Raises:
+            RuntimeError: If the writer has been closed
+        """
+        if self._closed:
+            raise RuntimeError("TrajectoryWriter is closed")
+        if not self._thread.is_alive():
+            self._drain()
+            self._write_batch([row])
+            return
+        self._queue.put(row)
+
+    def flush(self) -> None:
+        """
+        Block until every record submitted so far has been written.
+
+        Calling flush from the writer thread itself (e.g. from a create hook)
+        is a no-op, since waiting there would deadlock.
+        """
+        if threading.current_thread() is self._thread:
+            return
+        if self._thread.is_alive():
+            self._queue.join()
+        else:
+            self._drain()
+
+    def _drain(self) -> None:
+        """Write the rows left in the queue by a writer thread that died, in the calling thread."""
+        with self._drain_lock:
+            batch = []
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                self._queue.task_done()
+                if item is not self._STOP:
+                    batch.append(item)
+            if batch:
+                logger.warning(
+                    f"Trajectory writer thread is not running, writing {len(batch)} records synchronously"
+                )
+                self._write_batch(batch)
+
+    def close(self) -> None:
+        """
+        Flush pending records and stop the background thread.
+
+        Safe to call more than once.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
+        else:
+            self._drain()
+
+    def _run(self) -> None:
+        """Writer thread main loop."""
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is self._STOP:
+                self._queue.task_done()
+                break
+
+            batch = [item]
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(item)
+
+            try:
+                self._write_batch(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+        # Release this thread's connection
+        try:
+            if not self.db.is_closed():
+                self.db.close()
+        except Exception as e:
+            logger.debug(f"Error closing trajectory writer connection: {str(e)}")
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """
+        Write a batch of rows in a single transaction, then report them in order.
+
+        Args:
+            batch: Rows to insert
+        """
+        try:
+            # Drop references to human inputs that don't exist, matching the
+            # behaviour of synchronous creation
+            human_input_ids = {
+                row["human_input"] for row in batch if row.get("human_input") is not None
+            }
+            if human_input_ids:
+                existing = {
+                    human_input.id
+                    for human_input in HumanInput.select(HumanInput.id).where(
+                        HumanInput.id.in_(list(human_input_ids))
+                    )
+                }
+                for row in batch:
+                    if row.get("human_input") is not None and row["human_input"] not in existing:
+                        logger.warning(f"Human input with ID {row['human_input']} not found")
+                        row["human_input"] = None
+
+            payloads: Dict[str, str] = {}
+            with self.db.atomic():
+                trajectories = []
+                for row in batch:
+                    payloads.update(externalize(row, self.blob_threshold))
+                    trajectories.append(Trajectory.create(**row))
+            logger.debug(f"Wrote batch of {len(trajectories)} trajectory records")
+        except Exception as e:
+            # Drop the batch rather than let the writer thread die: a dead
+            # writer would leave every later record queued and unwritten
+            logger.error(
+                f"Failed to write batch of {len(batch)} trajectory records: {str(e)}",
+                exc_info=not isinstance(e, peewee.DatabaseError),
+            )
+            return
+
+        if self.on_written is None:
+            return
+        for trajectory in trajectories:
+            try:
+                self.on_written(_trajectory_model(trajectory, payloads))
+            except Exception as e:
+                logger.error(f"Error handling written trajectory: {str(e)}", exc_info=True)
+
+
 class TrajectoryRepository:
     """
     Repository for managing Trajectory database operations.
@@ -115,6 +367,14 @@ class TrajectoryRepository:
     It also supports registering hooks that are executed after a new trajectory record
     is successfully created.
 
+    When constructed with ``write_behind=True``, create() hands records to a
+    background TrajectoryWriter instead of inserting them inline. Reads flush the
+    writer first, so they always observe every record created before them.
+
+    JSON payloads of at least ``blob_threshold`` bytes are stored compressed and
+    deduplicated in the trajectory_blob table (see ra_aid.database.blobs) and
+    decompressed only when a record is converted to a model.
+
     Example:
         with DatabaseManager() as db:
             with TrajectoryRepositoryManager(db) as repo:
@@ -127,18 +387,62 @@ class TrajectoryRepository:
 
     # _create_hooks: List[Callable[[TrajectoryModel], None]] = [] # Removed class variable
 
-    def __init__(self, db):
+    def __init__(
+        self,
+        db,
+        write_behind: bool = False,
+        blob_threshold: Optional[int] = DEFAULT_TRAJECTORY_BLOB_THRESHOLD,
+    ):
         """
         Initialize the repository with a database connection.
 
         Args:
             db: Database connection to use (required)
+            write_behind: Whether to write records asynchronously through a
+                          background TrajectoryWriter (default: False). Ignored
+                          for in-memory databases, which are not shared between threads.
+            blob_threshold: Minimum size in bytes of JSON payloads stored in the
+                            trajectory_blob table; None or 0 stores all inline
         """
         if db is None:
             raise ValueError("Database connection is required for TrajectoryRepository")
         self.db = db
+        self.blob_threshold = blob_threshold
         self._create_hooks: List[Callable[[TrajectoryModel], None]] = [] # Initialized instance variable
 
+        self._writer: Optional[TrajectoryWriter] = None
+        if write_behind:
+            if getattr(db, "_is_in_memory", False):
+                logger.debug("Trajectory write-behind disabled for in-memory database")
+            else:
+                self._writer = TrajectoryWriter(
+                    db, on_written=self._run_create_hooks, blob_threshold=blob_threshold
+                )
+
+    @property
+    def write_behind(self) -> bool:
+        """Whether records are currently written by a background writer."""
+        return self._writer is not None
+
+    def flush(self) -> None:
+        """
+        Block until all queued trajectory records have been written.
+
+        This is a no-op when write-behind is disabled.
+        """
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self) -> None:
+        """
+        Flush queued records and stop the background writer, if any.
+
+        After closing, create() falls back to synchronous writes.
+        """
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
     # @classmethod # Removed decorator
     def register_create_hook(self, hook: Callable[[TrajectoryModel], None]) -> None: # Changed cls to self
         """
@@ -157,13 +461,34 @@ class TrajectoryRepository:
         self._create_hooks.append(hook) # Changed cls._create_hooks to self._create_hooks
         logger.info(f"Registered trajectory create hook: {hook.__name__}")
 
+    def _run_create_hooks(self, model: TrajectoryModel) -> None:
+        """
+        Execute registered create hooks for a newly created trajectory.
+
+        Args:
+            model: The created trajectory as a Pydantic model
+        """
+        for hook in self._create_hooks: # Changed TrajectoryRepository._create_hooks to self._create_hooks
+            try:
+                hook(model)
+            except Exception as hook_exc:
+                logger.error(
+                    f"Error executing trajectory create hook {hook.__name__}: {hook_exc}",
+                    exc_info=True # Add stack trace to log
+                )
+                # Do not re-raise, allow other hooks to run
 
-    def _to_model(self, trajectory: Optional[Trajectory]) -> Optional[TrajectoryModel]:
+    def _to_model(
+        self,
+        trajectory: Optional[Trajectory],
+        payloads: Optional[Dict[str, str]] = None,
+    ) -> Optional[TrajectoryModel]:
         """
         Convert a Peewee Trajectory object to a Pydantic TrajectoryModel.
 
         Args:
             trajectory: Peewee Trajectory instance or None
+            payloads: Optional JSON text of blobs already at hand, by hash
 
         Returns:
             Optional[TrajectoryModel]: Pydantic model representation or None if trajectory is None
@@ -171,7 +496,25 @@ class TrajectoryRepository:
         if trajectory is None:
             return None
 
-        return TrajectoryModel.model_validate(trajectory, from_attributes=True)
+        return _trajectory_model(trajectory, payloads)
+
+    def _to_models(self, trajectories: Iterable[Trajectory]) -> List[TrajectoryModel]:
+        """
+        Convert Peewee Trajectory objects to Pydantic models, reading their blobs in bulk.
+
+        Args:
+            trajectories: Peewee Trajectory instances
+
+        Returns:
+            List[TrajectoryModel]: Pydantic model representations, in order
+        """
+        trajectories = list(trajectories)
+        payloads = load_payloads(
+            digest
+            for trajectory in trajectories
+            for digest in blob_refs(trajectory).values()
+        )
+        return [self._to_model(trajectory, payloads) for trajectory in trajectories]
 
     def create(
         self,
@@ -193,6 +536,10 @@ class TrajectoryRepository:
         """
         Create a new trajectory record in the database and execute registered hooks.
 
+        In write-behind mode the record is queued rather than inserted: the returned
+        model has no ``id`` yet, and hooks run on the writer thread once the record
+        has been committed.
+
         Args:
             tool_name: Optional name of the tool that was executed
             tool_parameters: Optional parameters passed to the tool (will be JSON encoded)
@@ -225,6 +572,45 @@ class TrajectoryRepository:
             )
             step_data_json = json.dumps(step_data) if step_data is not None else None
 
+            new_session_id = session_id
+            if not session_id:
+                session_repo = get_session_repository()
+                session_record = session_repo.get_current_session_record()
+                new_session_id = session_record.get_id()
+
+            if self._writer is not None:
+                # Timestamps are taken now so ordering reflects submission time
+                now = datetime.datetime.now()
+                row = dict(
+                    created_at=now,
+                    updated_at=now,
+                    human_input=human_input_id,
+                    session=new_session_id,
+                    tool_name=tool_name or "",
+                    tool_parameters=tool_parameters_json,
+                    tool_result=tool_result_json,
+                    step_data=step_data_json,
+                    record_type=record_type,
+                    current_cost=current_cost,
+                    input_tokens=input_tokens,
+                    output_tokens=output_tokens,
+                    is_error=is_error,
+                    error_message=error_message,
+                    error_type=error_type,
+                    error_details=error_details,
+                )
+                self._writer.submit(row)
+                model_fields = {
+                    key: value
+                    for key, value in row.items()
+                    if key not in ("human_input", "session")
+                }
+                return TrajectoryModel(
+                    human_input_id=human_input_id,
+                    session_id=new_session_id,
+                    **model_fields,
+                )
+
             # Create human input reference if provided
             human_input = None
             if human_input_id is not None:
@@ -233,14 +619,7 @@ class TrajectoryRepository:
                 except peewee.DoesNotExist:
                     logger.warning(f"Human input with ID {human_input_id} not found")
 
-            new_session_id = session_id
-            if not session_id:
-                session_repo = get_session_repository()
-                session_record = session_repo.get_current_session_record()
-                new_session_id = session_record.get_id()
-                
-
-            trajectory = Trajectory.create(
+            row = dict(
                 human_input=human_input,
                 session=new_session_id,
                 tool_name=tool_name or "",  # Use empty string if tool_name is None
@@ -256,6 +635,9 @@ class TrajectoryRepository:
                 error_type=error_type,
                 error_details=error_details,
             )
+            with self.db.atomic():
+                payloads = externalize(row, self.blob_threshold)
+                trajectory = Trajectory.create(**row)
             if tool_name:
                 logger.debug(
                     f"Created trajectory record ID {trajectory.id} for tool: {tool_name}"
@@ -266,18 +648,10 @@ class TrajectoryRepository:
                 )
 
             # Convert to Pydantic model
-            model = self._to_model(trajectory)
+            model = self._to_model(trajectory, payloads)
 
             # Execute registered hooks
-            for hook in self._create_hooks: # Changed TrajectoryRepository._create_hooks to self._create_hooks
-                try:
-                    hook(model)
-                except Exception as hook_exc:
-                    logger.error(
-                        f"Error executing trajectory create hook {hook.__name__}: {hook_exc}",
-                        exc_info=True # Add stack trace to log
-                    )
-                    # Do not re-raise, allow other hooks to run
+            self._run_create_hooks(model)
 
             return model # Return the model after hooks have run (or attempted to run)
 
@@ -299,6 +673,7 @@ class TrajectoryRepository:
         Raises:
             peewee.DatabaseError: If there's an error accessing the database
         """
+        self.flush()
         try:
             trajectory = Trajectory.get_or_none(Trajectory.id == trajectory_id)
             return self._to_model(trajectory)
@@ -342,6 +717,7 @@ class TrajectoryRepository:
         Raises:
             peewee.DatabaseError: If there's an error updating the record
         """
+        self.flush()
         try:
             # First check if the trajectory exists
             peewee_trajectory = Trajectory.get_or_none(Trajectory.id == trajectory_id)
@@ -382,10 +758,12 @@ class TrajectoryRepository:
                 update_data["error_details"] = error_details
 
             if update_data:
-                query = Trajectory.update(**update_data).where(
-                    Trajectory.id == trajectory_id
-                )
-                query.execute()
+                with self.db.atomic():
+                    externalize(update_data, self.blob_threshold)
+                    query = Trajectory.update(**update_data).where(
+                        Trajectory.id == trajectory_id
+                    )
+                    query.execute()
                 logger.debug(f"Updated trajectory record ID {trajectory_id}")
                 return self.get(trajectory_id)
 
@@ -407,6 +785,7 @@ class TrajectoryRepository:
         Raises:
             peewee.DatabaseError: If there's an error deleting the record
         """
+        self.flush()
         try:
             # First check if the trajectory exists
             trajectory = Trajectory.get_or_none(Trajectory.id == trajectory_id)
@@ -434,9 +813,10 @@ class TrajectoryRepository:
         Raises:
             peewee.DatabaseError: If there's an error accessing the database
         """
+        self.flush()
         try:
             trajectories = Trajectory.select().order_by(Trajectory.id)
-            return {                trajectory.id: self._to_model(trajectory) for trajectory in trajectories            }
+            return {model.id: model for model in self._to_models(trajectories)}
         except peewee.DatabaseError as e:
             logger.error(f"Failed to fetch all trajectories: {str(e)}")
             raise
@@ -456,13 +836,14 @@ class TrajectoryRepository:
         Raises:
             peewee.DatabaseError: If there's an error accessing the database
         """
+        self.flush()
         try:
             trajectories = list(
                 Trajectory.select()
                 .where(Trajectory.human_input == human_input_id)
                 .order_by(Trajectory.id)
             )
-            return [self._to_model(trajectory) for trajectory in trajectories]
+            return self._to_models(trajectories)
         except peewee.DatabaseError as e:
             logger.error(
                 f"Failed to fetch trajectories for human input {human_input_id}: {str(e)}"
@@ -481,12 +862,39 @@ class TrajectoryRepository:
         """
         return self.get(trajectory_id)
 
+    @staticmethod
+    def _usage_totals(usage: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Build a usage totals dictionary from a session_usage row.
+
+        Args:
+            usage: A session_usage row as a dictionary, or None for a session without usage
+
+        Returns:
+            Dict[str, Any]: Dictionary containing total cost, tokens, input tokens, and output tokens
+        """
+        totals = {
+            "total_cost": float(usage["total_cost"]) if usage else 0.0,
+            "total_input_tokens": int(usage["total_input_tokens"]) if usage else 0,
+            "total_output_tokens": int(usage["total_output_tokens"]) if usage else 0,
+        }
+
+        # Calculate total tokens from input and output tokens
+        totals["total_tokens"] = (
+            totals["total_input_tokens"] + totals["total_output_tokens"]
+        )
+        return totals
+
     def get_session_usage_totals(self, session_id: int) -> Dict[str, Any]:
         """
-        Calculate total usage metrics for a session by summing all trajectory records.
+        Get total usage metrics for a session.
+
+        Totals are read from the session_usage rollup, which is kept up to date
+        with the session's model_usage trajectory records by database triggers,
+        so this is a single primary key lookup.
 
         Args:
-            session_id: The ID of the session to calculate totals for
+            session_id: The ID of the session to get totals for
 
         Returns:
             Dict[str, Any]: Dictionary containing total cost, tokens, input tokens, and output tokens
@@ -494,34 +902,15 @@ class TrajectoryRepository:
         Raises:
             peewee.DatabaseError: If there's an error accessing the database
         """
+        self.flush()
         try:
-            # Use SQL aggregation instead of Python computation
-            query = (
-                Trajectory
-                .select(
-                    peewee.fn.COALESCE(peewee.fn.SUM(Trajectory.current_cost), 0.0).alias('total_cost'),
-                    peewee.fn.COALESCE(peewee.fn.SUM(Trajectory.input_tokens), 0).alias('total_input_tokens'),
-                    peewee.fn.COALESCE(peewee.fn.SUM(Trajectory.output_tokens), 0).alias('total_output_tokens')
-                )
-                .where(
-                    (Trajectory.session == session_id)
-                    & (Trajectory.record_type == "model_usage")
-                )
+            usage = (
+                SessionUsage.select()
+                .where(SessionUsage.session == session_id)
                 .dicts()
-                .get()
-            )
-            
-            # Extract the results from the query
-            totals = {
-                "total_cost": float(query['total_cost']),
-                "total_input_tokens": int(query['total_input_tokens']),
-                "total_output_tokens": int(query['total_output_tokens'])
-            }
-            
-            # Calculate total tokens from input and output tokens
-            totals["total_tokens"] = (
-                totals["total_input_tokens"] + totals["total_output_tokens"]
+                .first()
             )
+            totals = self._usage_totals(usage)
 
             logger.debug(
                 f"Calculated session {session_id} totals: "
@@ -536,28 +925,132 @@ class TrajectoryRepository:
             logger.error(f"Failed to calculate session usage totals: {str(e)}")
             raise
 
-    def get_trajectories_by_session(self, session_id: int) -> List[TrajectoryModel]:
+    def get_last_session_completion(self, session_id: int) -> Optional[TrajectoryModel]:
         """
-        Retrieve all trajectory records associated with a specific session.
+        Get the most recent task completion record of a session.
+
+        Completion tools (e.g. task_completed) record their message in the
+        step_data of a "task_completion" record.
 
         Args:
-            session_id: The ID of the session to get trajectories for
+            session_id: The ID of the session
 
         Returns:
-            List[TrajectoryModel]: List of trajectory Pydantic models associated with the session
+            Optional[TrajectoryModel]: The latest completion record, or None if the
+                session has none
 
         Raises:
             peewee.DatabaseError: If there's an error accessing the database
         """
+        self.flush()
         try:
-            trajectories = list(
+            trajectory = (
                 Trajectory.select()
-                .where(Trajectory.session == session_id)
-                .order_by(Trajectory.created_at)
+                .where(
+                    (Trajectory.session == session_id)
+                    & (Trajectory.record_type == "task_completion")
+                )
+                .order_by(Trajectory.id.desc())
+                .first()
             )
-            return [self._to_model(trajectory) for trajectory in trajectories]
+            return self._to_model(trajectory)
+        except peewee.DatabaseError as e:
+            logger.error(
+                f"Failed to fetch the completion of session {session_id}: {str(e)}"
+            )
+            raise
+
+    def get_all_session_usage_totals(self) -> Dict[int, Dict[str, Any]]:
+        """
+        Get total usage metrics for every session that has recorded model usage.
+
+        Returns:
+            Dict[int, Dict[str, Any]]: Usage totals keyed by session ID, in the
+                format returned by get_session_usage_totals
+
+        Raises:
+            peewee.DatabaseError: If there's an error accessing the database
+        """
+        self.flush()
+        try:
+            return {
+                usage["session"]: self._usage_totals(usage)
+                for usage in SessionUsage.select().dicts()
+            }
+        except peewee.DatabaseError as e:
+            logger.error(f"Failed to fetch usage totals for all sessions: {str(e)}")
+            raise
+
+    def get_trajectories_by_session(
+        self,
+        session_id: int,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[TrajectoryModel]:
+        """
+        Retrieve trajectory records associated with a specific session.
+
+        Records are returned in ID order, the order of the streaming endpoint.
+        after_id and limit page through them using keyset pagination: pass the
+        ID of the last record of one page as after_id to get the next page.
+
+        Args:
+            session_id: The ID of the session to get trajectories for
+            after_id: Optional ID; only records with a greater ID are returned
+            limit: Optional maximum number of records to return
+
+        Returns:
+            List[TrajectoryModel]: List of trajectory Pydantic models associated with the session
+
+        Raises:
+            peewee.DatabaseError: If there's an error accessing the database
+        """
+        self.flush()
+        try:
+            query = Trajectory.select().where(Trajectory.session == session_id)
+            if after_id is not None:
+                query = query.where(Trajectory.id > after_id)
+            query = query.order_by(Trajectory.id)
+            if limit is not None:
+                query = query.limit(limit)
+
+            return self._to_models(query.iterator())
         except peewee.DatabaseError as e:
             logger.error(
                 f"Failed to fetch trajectories for session {session_id}: {str(e)}"
             )
             raise
+
+    def iter_trajectories_by_session(
+        self,
+        session_id: int,
+        after_id: Optional[int] = None,
+        batch_size: int = 500,
+    ) -> Iterator[TrajectoryModel]:
+        """
+        Lazily iterate over the trajectory records of a session in ID order.
+
+        Records are fetched in keyset-paginated batches, so memory use is bounded
+        by batch_size regardless of session length. Each batch is read with its
+        own short query, which keeps the generator safe to advance from
+        different threads (e.g. when streamed by a web server's thread pool).
+
+        Args:
+            session_id: The ID of the session to get trajectories for
+            after_id: Optional ID; only records with a greater ID are returned
+            batch_size: Number of records fetched per query (default: 500)
+
+        Yields:
+            TrajectoryModel: Trajectory Pydantic models associated with the session
+
+        Raises:
+            peewee.DatabaseError: If there's an error accessing the database
+        """
+        while True:
+            batch = self.get_trajectories_by_session(
+                session_id, after_id=after_id, limit=batch_size
+            )
+            yield from batch
+            if len(batch) < batch_size:
+                return
+            after_id = batch[-1].id
@@ -2,6 +2,8 @@ import contextvars
 from datetime import datetime
 from typing import Dict, List, Optional, TypedDict
 
+from ra_aid.database.section_cache import get_section_cache, next_version
+
 # Define WorkLogEntry TypedDict
 class WorkLogEntry(TypedDict):
     timestamp: str
@@ -24,6 +26,8 @@ class WorkLogRepository:
         Initialize an empty work log.
         """
         self._entries: List[WorkLogEntry] = []
+        # Changes on every write, so that format_work_log can be cached
+        self.version = next_version()
         
     def add_entry(self, event: str) -> None:
         """
@@ -34,6 +38,7 @@ class WorkLogRepository:
         """
         entry = WorkLogEntry(timestamp=datetime.now().isoformat(), event=event)
         self._entries.append(entry)
+        self.version = next_version()
         
     def get_all(self) -> List[WorkLogEntry]:
         """
@@ -49,6 +54,7 @@ class WorkLogRepository:
         Clear all work log entries.
         """
         self._entries.clear()
+        self.version = next_version()
         
     def format_work_log(self) -> str:
         """
@@ -63,6 +69,10 @@ class WorkLogRepository:
             
             Task #1 added: Create login form
         """
+        return get_section_cache().get("work_log", self.version, self._render_work_log)
+
+    def _render_work_log(self) -> str:
+        """Render the work log entries for format_work_log."""
         if not self._entries:
             return "No work log entries"
             
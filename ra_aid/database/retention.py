@@ -0,0 +1,527 @@
+"""
+Retention of old sessions and reclaiming of database space.
+
+Sessions, their trajectories, human inputs and memory are kept forever unless
+pruned. prune_sessions applies a RetentionPolicy (keep the last N sessions
+and/or the sessions of the last N days): each expired session is first
+exported to a gzip-compressed JSON archive in the archive directory, which
+import_session_archive can load back, then all expired sessions and the rows
+that belong to them are deleted in a single transaction.
+
+SQLite doesn't shrink the database file when rows are deleted; the freed
+pages are kept for reuse. Databases created with auto_vacuum=INCREMENTAL
+(every profile in DB_PROFILES sets it) can give them back to the operating
+system a few pages at a time with PRAGMA incremental_vacuum, which
+IncrementalVacuum runs on a background thread in short steps so other
+connections are never blocked for long. Databases created before that are
+converted once with a full VACUUM by enable_incremental_vacuum.
+"""
+
+import datetime
+import gzip
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Type
+
+import peewee
+
+from ra_aid.config import (
+    DEFAULT_TRAJECTORY_BLOB_THRESHOLD,
+    DEFAULT_VACUUM_MIN_FREE_PAGES,
+    DEFAULT_VACUUM_STEP_PAGES,
+)
+from ra_aid.database.blobs import (
+    BLOB_FIELDS,
+    blob_column,
+    blob_refs,
+    delete_orphaned_blobs,
+    externalize,
+    load_payloads,
+)
+from ra_aid.database.models import (
+    BaseModel,
+    HumanInput,
+    KeyFact,
+    KeySnippet,
+    ResearchNote,
+    Session,
+    SessionUsage,
+    Trajectory,
+)
+from ra_aid.database.utils import MAX_IDS_PER_QUERY
+from ra_aid.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+ARCHIVE_FORMAT = "ra-aid-session-archive"
+ARCHIVE_VERSION = 1
+
+# Models with rows belonging to a session (and possibly to one of its human
+# inputs), in the order they are archived and deleted
+SESSION_MODELS: List[Type[BaseModel]] = [Trajectory, KeyFact, KeySnippet, ResearchNote]
+
+_AUTO_VACUUM_MODES = {0: "none", 1: "full", 2: "incremental"}
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """
+    Which sessions to keep.
+
+    A session is kept if it is one of the ``keep_sessions`` most recent ones or
+    was started within the last ``keep_days`` days; limits that are None
+    don't keep anything on their own.
+
+    Attributes:
+        keep_sessions: Number of most recent sessions to keep
+        keep_days: Age in days of the oldest session to keep
+    """
+
+    keep_sessions: Optional[int] = None
+    keep_days: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if self.keep_sessions is None and self.keep_days is None:
+            raise ValueError("A retention policy needs keep_sessions or keep_days")
+        if (self.keep_sessions is not None and self.keep_sessions < 0) or (
+            self.keep_days is not None and self.keep_days < 0
+        ):
+            raise ValueError("Retention limits can't be negative")
+
+
+@dataclass
+class PruneResult:
+    """
+    Outcome of prune_sessions.
+
+    Attributes:
+        session_ids: IDs of the expired sessions
+        archives: Archive files written, one per expired session
+        deleted: Number of rows deleted from each table
+    """
+
+    session_ids: List[int] = field(default_factory=list)
+    archives: List[str] = field(default_factory=list)
+    deleted: Dict[str, int] = field(default_factory=dict)
+
+
+def expired_session_ids(
+    policy: RetentionPolicy, now: Optional[datetime.datetime] = None
+) -> List[int]:
+    """
+    Find the sessions a retention policy doesn't keep.
+
+    Args:
+        policy: The retention policy
+        now: Current time (default: datetime.now())
+
+    Returns:
+        List[int]: IDs of the expired sessions, oldest first
+    """
+    now = now or datetime.datetime.now()
+    cutoff = None
+    if policy.keep_days is not None:
+        cutoff = now - datetime.timedelta(days=policy.keep_days)
+
+    sessions = Session.select(Session.id, Session.created_at).order_by(
+        Session.created_at.desc(), Session.id.desc()
+    )
+    expired = []
+    for position, (session_id, created_at) in enumerate(sessions.tuples()):
+        if policy.keep_sessions is not None and position < policy.keep_sessions:
+            continue
+        if cutoff is not None and created_at >= cutoff:
+            continue
+        expired.append(session_id)
+    return expired[::-1]
+
+
+def _json_value(value: Any) -> Any:
+    """Convert a column value to JSON."""
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    return value
+
+
+def _rows(query: peewee.Query) -> List[Dict[str, Any]]:
+    """Return the rows of a query as JSON-compatible dictionaries."""
+    return [
+        {key: _json_value(value) for key, value in row.items()}
+        for row in query.dicts()
+    ]
+
+
+def export_session(session_id: int) -> Dict[str, Any]:
+    """
+    Collect a session and the rows that belong to it.
+
+    Trajectory payloads stored as blobs are included inline, so an archive
+    doesn't depend on the database it came from.
+
+    Args:
+        session_id: ID of the session
+
+    Returns:
+        Dict[str, Any]: The archive contents
+
+    Raises:
+        ValueError: If the session doesn't exist
+    """
+    session = Session.select().where(Session.id == session_id).dicts().first()
+    if session is None:
+        raise ValueError(f"Session {session_id} not found")
+
+    archive: Dict[str, Any] = {
+        "format": ARCHIVE_FORMAT,
+        "version": ARCHIVE_VERSION,
+        "exported_at": datetime.datetime.now().isoformat(),
+        "session": {key: _json_value(value) for key, value in session.items()},
+        HumanInput._meta.table_name: _rows(
+            HumanInput.select().where(HumanInput.session == session_id).order_by(HumanInput.id)
+        ),
+    }
+    for model in SESSION_MODELS:
+        archive[model._meta.table_name] = _rows(
+            model.select().where(model.session == session_id).order_by(model.id)
+        )
+
+    trajectories = archive[Trajectory._meta.table_name]
+    payloads = load_payloads(
+        digest for row in trajectories for digest in blob_refs(row).values()
+    )
+    for row in trajectories:
+        for json_field, digest in blob_refs(row).items():
+            row[json_field] = payloads.get(digest)
+        for json_field in BLOB_FIELDS:
+            row.pop(blob_column(json_field), None)
+    return archive
+
+
+def archive_path(archive_dir: str, session: Dict[str, Any]) -> Path:
+    """Return the path of the archive file of an exported session."""
+    started = str(session.get("start_time") or session.get("created_at") or "")
+    # e.g. session-12-20250311191232.json.gz
+    stamp = "".join(char for char in started[:19] if char.isdigit())
+    name = "-".join(part for part in ("session", str(session["id"]), stamp) if part)
+    return Path(archive_dir) / f"{name}.json.gz"
+
+
+def write_archive(archive: Dict[str, Any], archive_dir: str) -> str:
+    """
+    Write an exported session to a compressed archive file.
+
+    The file is written under a temporary name and renamed into place, so a
+    partially written archive is never left behind.
+
+    Args:
+        archive: Contents returned by export_session
+        archive_dir: Directory to write the archive to, created if needed
+
+    Returns:
+        str: Path of the archive file
+    """
+    os.makedirs(archive_dir, exist_ok=True)
+    path = archive_path(archive_dir, archive["session"])
+    temp_path = path.with_name(path.name + ".tmp")
+    with gzip.open(temp_path, "wt", encoding="utf-8") as f:
+        json.dump(archive, f)
+    os.replace(temp_path, path)
+    return str(path)
+
+
+def read_archive(path: str) -> Dict[str, Any]:
+    """
+    Read a session archive file.
+
+    Args:
+        path: Path of the archive
+
+    Returns:
+        Dict[str, Any]: The archive contents
+
+    Raises:
+        ValueError: If the file isn't a session archive this version can read
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        archive = json.load(f)
+    if archive.get("format") != ARCHIVE_FORMAT:
+        raise ValueError(f"{path} is not a session archive")
+    if archive.get("version", 0) > ARCHIVE_VERSION:
+        raise ValueError(
+            f"{path} has archive version {archive['version']}; "
+            f"at most {ARCHIVE_VERSION} is supported"
+        )
+    return archive
+
+
+def _restore_row(model: Type[BaseModel], row: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert an archived row back to field values for inserting it with a new ID."""
+    values = {}
+    for name, value in row.items():
+        model_field = model._meta.fields.get(name)
+        if model_field is None or model_field is model._meta.primary_key:
+            continue
+        if isinstance(model_field, peewee.DateTimeField) and isinstance(value, str):
+            value = datetime.datetime.fromisoformat(value)
+        values[name] = value
+    return values
+
+
+def import_session_archive(
+    path: str, blob_threshold: Optional[int] = DEFAULT_TRAJECTORY_BLOB_THRESHOLD
+) -> int:
+    """
+    Load an archived session back into the database.
+
+    Rows get new IDs, so an archive can be imported into any database, and
+    importing it twice creates two sessions. Everything is inserted in one
+    transaction.
+
+    Args:
+        path: Path of an archive written by write_archive
+        blob_threshold: Minimum size in bytes of trajectory payloads stored as
+            blobs; None or 0 stores all inline
+
+    Returns:
+        int: ID of the imported session
+    """
+    archive = read_archive(path)
+    db = Session._meta.database
+    with db.atomic():
+        session_id = Session.insert(**_restore_row(Session, archive["session"])).execute()
+
+        human_input_ids = {}
+        for row in archive.get(HumanInput._meta.table_name, []):
+            values = _restore_row(HumanInput, row)
+            values["session"] = session_id
+            human_input_ids[row["id"]] = HumanInput.insert(**values).execute()
+
+        for model in SESSION_MODELS:
+            for row in archive.get(model._meta.table_name, []):
+                values = _restore_row(model, row)
+                values["session"] = session_id
+                values["human_input"] = human_input_ids.get(values.get("human_input"))
+                if model is Trajectory:
+                    externalize(values, blob_threshold)
+                model.insert(**values).execute()
+
+    logger.info(f"Imported session archive {path} as session {session_id}")
+    return session_id
+
+
+def delete_sessions(session_ids: List[int]) -> Dict[str, int]:
+    """
+    Delete sessions and every row that belongs to them, in one transaction.
+
+    Rows of other sessions that refer to a deleted human input keep existing,
+    without the reference. Trajectory blobs no longer referenced are deleted.
+    Memory rows are deleted with direct queries; the memory version triggers
+    (see ra_aid.database.memory_version) invalidate prompt sections cached
+    from them.
+
+    Args:
+        session_ids: IDs of the sessions to delete
+
+    Returns:
+        Dict[str, int]: Number of rows deleted from each table
+    """
+    deleted = {
+        model._meta.table_name: 0
+        for model in [*SESSION_MODELS, HumanInput, SessionUsage, Session]
+    }
+    if not session_ids:
+        return deleted
+
+    db = Session._meta.database
+    with db.atomic():
+        for batch in peewee.chunked(session_ids, MAX_IDS_PER_QUERY):
+            human_input_ids = [
+                human_input_id
+                for (human_input_id,) in HumanInput.select(HumanInput.id)
+                .where(HumanInput.session.in_(batch))
+                .tuples()
+            ]
+            for model in SESSION_MODELS:
+                deleted[model._meta.table_name] += (
+                    model.delete().where(model.session.in_(batch)).execute()
+                )
+                for inputs in peewee.chunked(human_input_ids, MAX_IDS_PER_QUERY):
+                    model.update(human_input=None).where(
+                        model.human_input.in_(inputs)
+                    ).execute()
+            for model in (HumanInput, SessionUsage):
+                deleted[model._meta.table_name] += (
+                    model.delete().where(model.session.in_(batch)).execute()
+                )
+            deleted[Session._meta.table_name] += (
+                Session.delete().where(Session.id.in_(batch)).execute()
+            )
+        deleted["trajectory_blob"] = delete_orphaned_blobs()
+
+    logger.debug(f"Deleted {len(session_ids)} sessions: {deleted}")
+    return deleted
+
+
+def prune_sessions(
+    policy: RetentionPolicy,
+    archive_dir: Optional[str] = None,
+    dry_run: bool = False,
+    now: Optional[datetime.datetime] = None,
+) -> PruneResult:
+    """
+    Archive and delete the sessions a retention policy doesn't keep.
+
+    Archives are written before anything is deleted; if writing one fails,
+    nothing is deleted.
+
+    Args:
+        policy: The retention policy
+        archive_dir: Directory for the session archives; None deletes the
+            sessions without archiving them
+        dry_run: Only report the expired sessions
+        now: Current time (default: datetime.now())
+
+    Returns:
+        PruneResult: The expired sessions, archives written and rows deleted
+    """
+    result = PruneResult(session_ids=expired_session_ids(policy, now))
+    if dry_run or not result.session_ids:
+        return result
+
+    if archive_dir is not None:
+        for session_id in result.session_ids:
+            result.archives.append(write_archive(export_session(session_id), archive_dir))
+    result.deleted = delete_sessions(result.session_ids)
+    logger.info(f"Pruned {len(result.session_ids)} sessions")
+    return result
+
+
+def get_auto_vacuum(db: peewee.SqliteDatabase) -> str:
+    """
+    Return the auto_vacuum mode of a database.
+
+    Args:
+        db: The database
+
+    Returns:
+        str: "none", "full" or "incremental"
+    """
+    mode = db.execute_sql("PRAGMA auto_vacuum").fetchone()[0]
+    return _AUTO_VACUUM_MODES.get(mode, str(mode))
+
+
+def free_page_count(db: peewee.SqliteDatabase) -> int:
+    """Return the number of unused pages in a database file."""
+    return db.execute_sql("PRAGMA freelist_count").fetchone()[0]
+
+
+def enable_incremental_vacuum(db: peewee.SqliteDatabase) -> bool:
+    """
+    Switch a database to auto_vacuum=INCREMENTAL.
+
+    An existing database only changes mode when it is rebuilt, so this runs a
+    full VACUUM, which also frees every unused page, when the mode changes.
+
+    Args:
+        db: The database
+
+    Returns:
+        bool: True if the database was converted, False if it already used
+            incremental vacuum
+    """
+    if get_auto_vacuum(db) == "incremental":
+        return False
+    db.execute_sql("PRAGMA auto_vacuum = INCREMENTAL")
+    db.execute_sql("VACUUM")
+    logger.info("Converted database to incremental auto-vacuum")
+    return True
+
+
+class IncrementalVacuum(threading.Thread):
+    """
+    Background thread that returns a database's unused pages to the OS.
+
+    Pages are freed ``step_pages`` at a time, each step in its own short write
+    transaction, pausing between steps so other connections can write.
+    The thread stops once there are no unused pages left, when stop() is
+    called, or on the first database error (e.g. the database is locked).
+
+    Example:
+        vacuum = IncrementalVacuum(db)
+        vacuum.start()
+        vacuum.join()
+        print(vacuum.freed_pages)
+    """
+
+    def __init__(
+        self,
+        db: peewee.SqliteDatabase,
+        step_pages: int = DEFAULT_VACUUM_STEP_PAGES,
+        pause: float = 0.05,
+    ) -> None:
+        super().__init__(name="incremental-vacuum", daemon=True)
+        self.db = db
+        self.step_pages = max(1, step_pages)
+        self.pause = pause
+        self.freed_pages = 0
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        """Ask the thread to stop after the current step."""
+        self._stop_event.set()
+
+    def run(self) -> None:
+        """Free unused pages until none are left or the thread is stopped."""
+        try:
+            while not self._stop_event.is_set():
+                remaining = free_page_count(self.db)
+                if remaining <= 0:
+                    break
+                # Each returned row is one step of the pragma; read them all
+                self.db.execute_sql(
+                    f"PRAGMA incremental_vacuum({self.step_pages})"
+                ).fetchall()
+                self.freed_pages += remaining - free_page_count(self.db)
+                self._stop_event.wait(self.pause)
+        except peewee.DatabaseError as e:
+            logger.warning(f"Incremental vacuum stopped: {str(e)}")
+        finally:
+            # Release this thread's connection
+            try:
+                if not self.db.is_closed():
+                    self.db.close()
+            except Exception as e:
+                logger.debug(f"Error closing incremental vacuum connection: {str(e)}")
+        logger.debug(f"Incremental vacuum freed {self.freed_pages} pages")
+
+
+def start_background_vacuum(
+    db: Any, min_free_pages: int = DEFAULT_VACUUM_MIN_FREE_PAGES
+) -> Optional[IncrementalVacuum]:
+    """
+    Start an IncrementalVacuum if a database has enough unused pages to be worth it.
+
+    Args:
+        db: The database
+        min_free_pages: Unused pages needed to start the vacuum
+
+    Returns:
+        Optional[IncrementalVacuum]: The started thread, or None for in-memory
+            databases, databases without incremental auto-vacuum, or too few
+            unused pages
+    """
+    if not isinstance(db, peewee.SqliteDatabase) or getattr(db, "_is_in_memory", False):
+        return None
+    try:
+        if get_auto_vacuum(db) != "incremental" or free_page_count(db) < min_free_pages:
+            return None
+    except peewee.DatabaseError as e:
+        logger.debug(f"Could not check for unused database pages: {str(e)}")
+        return None
+
+    vacuum = IncrementalVacuum(db)
+    vacuum.start()
+    return vacuum
@@ -0,0 +1,94 @@
+"""
+Schema version stamp for fast startup checks.
+
+Checking for pending migrations with peewee_migrate means building a Router,
+listing the migrations directory and reading the migration history table on
+every start. Once all migrations are applied, ensure_migrations_applied
+stores the number of the newest migration in the database header with
+PRAGMA user_version; while that stamp is current, later starts skip the
+migration check and the creation of tables that already exist.
+
+Stamps are only ever raised, so an older ra-aid opening a database stamped
+by a newer one (whose schema is a superset) also takes the fast path.
+"""
+
+import functools
+import os
+import re
+from typing import Optional
+
+from ra_aid.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Matches migration files, e.g. 018_20261018_150000_add_trajectory_blobs.py
+MIGRATION_FILE_RE = re.compile(r"^(\d{3})_[^.]+\.py$")
+
+
+def source_migrations_dir() -> str:
+    """Return the migrations directory of the ra_aid package."""
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+
+
+@functools.lru_cache(maxsize=None)
+def latest_schema_version(migrations_dir: Optional[str] = None) -> int:
+    """
+    Return the schema version the migrations bring a database to.
+
+    This is the number of the newest migration file, e.g. 18 for
+    018_20261018_150000_add_trajectory_blobs.py.
+
+    Args:
+        migrations_dir: Directory of the migrations (default: the package's)
+
+    Returns:
+        int: The version, or 0 if there are no migrations
+    """
+    try:
+        names = os.listdir(migrations_dir or source_migrations_dir())
+    except OSError as e:
+        logger.debug(f"Could not list migrations: {str(e)}")
+        return 0
+    numbers = [int(match.group(1)) for match in map(MIGRATION_FILE_RE.match, names) if match]
+    return max(numbers, default=0)
+
+
+def get_schema_version(db) -> int:
+    """
+    Return the schema version stamped in a database.
+
+    Args:
+        db: The database
+
+    Returns:
+        int: The stamp, 0 for unstamped databases
+    """
+    version = db.execute_sql("PRAGMA user_version").fetchone()[0]
+    return version if isinstance(version, int) else 0
+
+
+def set_schema_version(db, version: int) -> None:
+    """
+    Stamp a database with a schema version, unless it has a higher one.
+
+    Args:
+        db: The database
+        version: The schema version
+    """
+    if get_schema_version(db) < version:
+        db.execute_sql(f"PRAGMA user_version = {int(version)}")
+        logger.debug(f"Stamped database with schema version {version}")
+
+
+def schema_is_current(db) -> bool:
+    """
+    Return whether a database has been migrated to the latest schema.
+
+    Args:
+        db: The database
+
+    Returns:
+        bool: True if the stamp is at least latest_schema_version()
+    """
+    latest = latest_schema_version()
+    return latest > 0 and get_schema_version(db) >= latest
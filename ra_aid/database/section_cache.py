@@ -0,0 +1,133 @@
+"""
+Versioned memoization of rendered prompt sections.
+
+Agents format the key facts, key snippets, research notes, related files and
+work log into every prompt, and until something is stored or deleted the
+rendered text is the same each time. Repositories expose a version that
+changes on every write, and SectionCache returns the text rendered for the
+current version instead of reading and formatting the data again.
+
+Key facts, key snippets and research notes are versioned by counters in the
+database, bumped by triggers (see ra_aid.database.memory_version), so writes
+made by other repository instances, direct model queries and other processes
+all change the version. The related files and work log live in their
+repository instance, whose version comes from next_version: a single
+process-wide counter, so two instances never share a version.
+"""
+
+import itertools
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple, TypeVar
+
+from ra_aid.logging_config import get_logger
+from ra_aid.utils.singleton import Singleton
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+_versions = itertools.count(1)
+_versions_lock = threading.Lock()
+
+
+def next_version() -> int:
+    """
+    Return a new data version, greater than every version returned before.
+
+    Returns:
+        int: The version
+    """
+    with _versions_lock:
+        return next(_versions)
+
+
+def _is_version(version: Any) -> bool:
+    """Return whether a value is a version (or tuple of versions) that can be cached on."""
+    if isinstance(version, tuple):
+        return all(_is_version(part) for part in version)
+    return isinstance(version, int) and not isinstance(version, bool)
+
+
+class SectionCache(metaclass=Singleton):
+    """
+    Least-recently-used cache of rendered sections, each valid for one data version.
+
+    There is a single instance per process; get it with get_section_cache().
+    Hit and miss counts are kept per section for profiling.
+    """
+
+    def __init__(self, max_entries: int = 128) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[Any, Any]]" = OrderedDict()
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+
+    def get(self, section: str, version: Any, render: Callable[[], T], key: Hashable = None) -> T:
+        """
+        Return the section rendered for a version, rendering it on a miss.
+
+        The version must be read before the data is: if the data changes while
+        it is rendered, the result is stored under the older version and not
+        returned again.
+
+        Args:
+            section: Name of the section, used for the hit and miss counts
+            version: Version of the data the section is rendered from; an int or
+                tuple of ints. Other values (e.g. test doubles) are never cached
+            render: Renders the section
+            key: Distinguishes different renderings of the same section and data
+
+        Returns:
+            The rendered section
+        """
+        cache_key = (section, key)
+        cacheable = _is_version(version)
+        with self._lock:
+            if cacheable:
+                entry = self._entries.get(cache_key)
+                if entry is not None and entry[0] == version:
+                    self._entries.move_to_end(cache_key)
+                    self.hits[section] += 1
+                    return entry[1]
+            self.misses[section] += 1
+
+        value = render()
+        if cacheable:
+            with self._lock:
+                self._entries[cache_key] = (version, value)
+                self._entries.move_to_end(cache_key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Return the hit and miss counts of each section.
+
+        Returns:
+            Dict[str, Dict[str, int]]: Section name -> {"hits": ..., "misses": ...}
+        """
+        with self._lock:
+            return {
+                section: {"hits": self.hits[section], "misses": self.misses[section]}
+                for section in sorted(set(self.hits) | set(self.misses))
+            }
+
+    def clear(self) -> None:
+        """Drop all cached sections and reset the counts."""
+        with self._lock:
+            self._entries.clear()
+            self.hits.clear()
+            self.misses.clear()
+
+
+def get_section_cache() -> SectionCache:
+    """
+    Get the process-wide section cache.
+
+    Returns:
+        SectionCache: The shared cache instance
+    """
+    return SectionCache()
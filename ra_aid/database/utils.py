@@ -15,6 +15,10 @@ from ra_aid.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# IDs bound per "WHERE id IN (...)" query, well below SQLite's limit on
+# host parameters (999 before SQLite 3.32)
+MAX_IDS_PER_QUERY = 500
+
 
 def ensure_tables_created(models: List[Type[BaseModel]] = None) -> None:
     """
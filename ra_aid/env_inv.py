@@ -1,11 +1,31 @@
+import hashlib
+import json
 import os
 import platform
 import shutil
 import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Callable, Iterable, List, Optional
+
+from ra_aid.config import (
+    DEFAULT_ENV_DISCOVERY_WORKERS,
+    DEFAULT_ENV_INVENTORY_MAX_AGE,
+    ENV_INVENTORY_CACHE_FILE,
+)
+from ra_aid.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Bump when the structure of the results changes, so that inventories
+# written by an older version are rebuilt
+ENV_INVENTORY_FORMAT = 1
+
 
 class EnvDiscovery:
-    def __init__(self):
+    def __init__(self, max_workers: Optional[int] = None):
         # Structured results dictionary.
         self.results = {
             "os": {},
@@ -20,6 +40,11 @@ class EnvDiscovery:
             "fd", "rg", "fzf", "git", "g++", "gcc", "clang", "cmake", "make",
             "pkg-config", "ninja", "autoconf", "automake", "libtool", "meson", "scons"
         ]
+        # Python interpreter names looked up on PATH (outside Windows).
+        self._python_names = ["python3", "python", "python2"]
+        for major in [2, 3]:
+            for minor in range(0, 15):
+                self._python_names.append(f"python{major}.{minor}")
         # Python environment tools.
         self._py_env_tools = {
             "virtualenv": "virtualenv",
@@ -207,6 +232,14 @@ class EnvDiscovery:
         self._distro = {}
         if platform.system() == "Linux":
             self._distro = self._get_linux_distro()
+        # Probes run their subprocesses on this pool while discover() runs.
+        # The probed commands are mostly CPU-bound, so the pool is no larger
+        # than the number of CPUs, which keeps them within their timeouts.
+        if max_workers is None:
+            max_workers = min(DEFAULT_ENV_DISCOVERY_WORKERS, os.cpu_count() or 1)
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._markdown: Optional[str] = None
 
     def _get_linux_distro(self):
         distro = {}
@@ -222,15 +255,162 @@ class EnvDiscovery:
         return distro
 
     def discover(self):
-        self._detect_os()
-        self._detect_cli_tools()
-        self._detect_python()
-        self._detect_python_env_tools()
-        self._detect_package_managers()
-        self._detect_libraries()
-        self._detect_node()
+        """
+        Probe the environment, running the probes and their subprocesses in parallel.
+
+        Returns:
+            dict: The structured results
+        """
+        self._markdown = None
+
+        def detect_python():
+            # venv availability depends on the interpreters found
+            self._detect_python()
+            self._detect_python_env_tools()
+
+        probes = [
+            self._detect_os,
+            self._detect_cli_tools,
+            detect_python,
+            self._detect_package_managers,
+            self._detect_libraries,
+            self._detect_node,
+        ]
+        # Probes get their own threads; the subprocesses they start are fanned
+        # out on a separate pool, so that a probe waiting for its subprocesses
+        # never holds a thread they need
+        with ThreadPoolExecutor(
+            max_workers=self._max_workers, thread_name_prefix="ra-aid-env"
+        ) as executor, ThreadPoolExecutor(
+            max_workers=len(probes), thread_name_prefix="ra-aid-env-probe"
+        ) as probe_pool:
+            self._executor = executor
+            try:
+                for future in [probe_pool.submit(probe) for probe in probes]:
+                    future.result()
+            finally:
+                self._executor = None
+        return self.results
+
+    def discover_cached(
+        self,
+        cache_path: str,
+        max_age: float = DEFAULT_ENV_INVENTORY_MAX_AGE,
+        refresh: bool = False,
+    ):
+        """
+        Load the results from an inventory file, or discover and write them.
+
+        The inventory is rebuilt when PATH, the version of Python, the binaries
+        the probes look for (or their modification times), the include
+        directories or the OS release change, or when it is older than max_age.
+
+        Args:
+            cache_path: Path of the inventory file
+            max_age: Seconds after which the inventory is rebuilt regardless
+            refresh: Rebuild the inventory even if it is current
+
+        Returns:
+            dict: The structured results
+        """
+        key = self._cache_key()
+        if not refresh and self._load_cache(cache_path, key, max_age):
+            logger.debug(f"Loaded environment inventory from {cache_path}")
+            return self.results
+        started = time.perf_counter()
+        self.discover()
+        logger.debug(
+            f"Discovered environment in {(time.perf_counter() - started) * 1000:.1f}ms"
+        )
+        self._save_cache(cache_path, key)
         return self.results
 
+    def _map(self, func: Callable[[Any], Any], items: Iterable[Any]) -> List[Any]:
+        """Apply func to every item, on the discovery pool while discover() runs."""
+        if self._executor is None:
+            return [func(item) for item in items]
+        return list(self._executor.map(func, items))
+
+    def _probed_binaries(self) -> List[str]:
+        """Names of every binary the probes look up on PATH."""
+        names = list(self._cli_tool_names)
+        names.extend(self._py_env_tools)
+        names.extend(self._package_managers)
+        names.extend(self._python_names)
+        names.extend(["py", "node", "npm", "nvm"])
+        return sorted(set(names))
+
+    def _cache_key(self) -> str:
+        """Fingerprint of everything the results are derived from."""
+
+        def mtime(path) -> Optional[int]:
+            try:
+                return os.stat(path).st_mtime_ns
+            except OSError:
+                return None
+
+        binaries = {}
+        for name in self._probed_binaries():
+            path = shutil.which(name)
+            if path:
+                binaries[name] = [path, mtime(path)]
+        fingerprint = {
+            "format": ENV_INVENTORY_FORMAT,
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "path": os.environ.get("PATH", ""),
+            "nvm_dir": os.environ.get("NVM_DIR"),
+            "nvm_home": Path.home().joinpath(".nvm").exists(),
+            "os_release": mtime("/etc/os-release"),
+            "include_paths": {str(p): mtime(p) for p in self._include_paths},
+            "binaries": binaries,
+        }
+        encoded = json.dumps(fingerprint, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _load_cache(self, cache_path: str, key: str, max_age: float) -> bool:
+        """Load the results from the inventory file if it matches key and is fresh."""
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                cached = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable environment inventory {cache_path}: {e}")
+            return False
+        if not isinstance(cached, dict) or cached.get("key") != key:
+            return False
+        created = cached.get("created", 0)
+        if not isinstance(created, (int, float)) or time.time() - created > max_age:
+            return False
+        self.results = cached["results"]
+        self._markdown = cached.get("markdown")
+        return True
+
+    def _save_cache(self, cache_path: str, key: str) -> None:
+        """Write the results atomically; failing to write is not an error."""
+        cached = {
+            "key": key,
+            "created": time.time(),
+            "results": self.results,
+            "markdown": self.format_markdown(),
+        }
+        directory = os.path.dirname(os.path.abspath(cache_path))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=directory, prefix=".env_inventory-", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(cached, f)
+                os.replace(tmp_path, cache_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.debug(f"Could not write environment inventory {cache_path}: {e}")
+
     def _detect_os(self):
         os_type = platform.system()
         os_info = {}
@@ -261,23 +441,24 @@ class EnvDiscovery:
         self.results["os"] = os_info
 
     def _detect_cli_tools(self):
-        tools_found = {}
-        for tool in self._cli_tool_names:
+        def probe(tool):
             path = shutil.which(tool)
-            if path:
-                version = None
-                if tool in ("g++", "gcc", "clang", "git"):
-                    try:
-                        out = subprocess.check_output([tool, "--version"], text=True, stderr=subprocess.STDOUT, timeout=1)
-                        version = out.splitlines()[0].strip()
-                    except Exception:
-                        version = None
-                tools_found[tool] = {"found": True}
-                if version:
-                    tools_found[tool]["version"] = version
-            else:
-                tools_found[tool] = {"found": False}
-        self.results["cli_tools"] = tools_found
+            if not path:
+                return {"found": False}
+            version = None
+            if tool in ("g++", "gcc", "clang", "git"):
+                try:
+                    out = subprocess.check_output([tool, "--version"], text=True, stderr=subprocess.STDOUT, timeout=1)
+                    version = out.splitlines()[0].strip()
+                except Exception:
+                    version = None
+            status = {"found": True}
+            if version:
+                status["version"] = version
+            return status
+
+        tools = self._cli_tool_names
+        self.results["cli_tools"] = dict(zip(tools, self._map(probe, tools)))
 
     def _detect_python(self):
         installations = []
@@ -300,25 +481,20 @@ class EnvDiscovery:
             if not installations:
                 try:
                     out = subprocess.check_output(["where", "python"], text=True, timeout=2)
-                    for path in out.splitlines():
-                        path = path.strip()
-                        if path and Path(path).name.lower().startswith("python"):
-                            ver = self._get_python_version(path)
-                            installations.append({"version": ver, "path": path})
+                    paths = [path.strip() for path in out.splitlines()]
+                    paths = [path for path in paths if path and Path(path).name.lower().startswith("python")]
+                    for path, ver in zip(paths, self._map(self._get_python_version, paths)):
+                        installations.append({"version": ver, "path": path})
                 except Exception:
                     pass
         else:
-            common_names = ["python3", "python", "python2"]
-            for major in [2, 3]:
-                for minor in range(0, 15):
-                    common_names.append(f"python{major}.{minor}")
-            seen_paths = set()
-            for name in common_names:
+            paths = []
+            for name in self._python_names:
                 path = shutil.which(name)
-                if path and path not in seen_paths:
-                    seen_paths.add(path)
-                    ver = self._get_python_version(path)
-                    installations.append({"version": ver, "path": path})
+                if path and path not in paths:
+                    paths.append(path)
+            for path, ver in zip(paths, self._map(self._get_python_version, paths)):
+                installations.append({"version": ver, "path": path})
 
         installations = sorted(installations, key=lambda x: x.get("version", "") or "")
         self.results["python"]["installations"] = installations
@@ -336,31 +512,36 @@ class EnvDiscovery:
         venv_available = any(inst for inst in self.results["python"]["installations"]
                              if inst.get("version") and inst["version"][0] == '3')
         env_tools_status["venv"] = {"available": venv_available, "built_in": True}
-        for tool, display_name in self._py_env_tools.items():
+
+        def probe(tool):
             found_path = shutil.which(tool)
-            if found_path:
+            if not found_path:
+                return {"installed": False}
+            version = None
+            try:
+                if tool == "pyenv":
+                    out = subprocess.check_output([tool, "--version"], text=True, timeout=1)
+                    version = out.strip().split()[-1]
+                elif tool in ("pipenv", "poetry", "conda", "pipx", "uv"):
+                    out = subprocess.check_output([tool, "--version"], text=True, timeout=2)
+                    version = out.strip().split()[-1]
+                elif tool == "virtualenv":
+                    out = subprocess.check_output([tool, "--version"], text=True, timeout=2)
+                    version = out.strip()
+            except Exception:
                 version = None
-                try:
-                    if tool == "pyenv":
-                        out = subprocess.check_output([tool, "--version"], text=True, timeout=1)
-                        version = out.strip().split()[-1]
-                    elif tool in ("pipenv", "poetry", "conda", "pipx", "uv"):
-                        out = subprocess.check_output([tool, "--version"], text=True, timeout=2)
-                        version = out.strip().split()[-1]
-                    elif tool == "virtualenv":
-                        out = subprocess.check_output([tool, "--version"], text=True, timeout=2)
-                        version = out.strip()
-                except Exception:
-                    version = None
-                env_tools_status[display_name] = {"installed": True}
-                if version:
-                    env_tools_status[display_name]["version"] = version
-            else:
-                env_tools_status[display_name] = {"installed": False}
+            status = {"installed": True}
+            if version:
+                status["version"] = version
+            return status
+
+        tools = list(self._py_env_tools)
+        for tool, status in zip(tools, self._map(probe, tools)):
+            env_tools_status[self._py_env_tools[tool]] = status
         self.results["python"]["env_tools"] = env_tools_status
 
     def _detect_package_managers(self):
-        pkg_status = {}
+        managers = []
         for mgr in self._package_managers:
             if platform.system() == "Windows":
                 if mgr in ("apt", "apt-get", "dnf", "yum", "pacman", "paru", "zypper", "brew"):
@@ -383,8 +564,11 @@ class EnvDiscovery:
                     if distro_id in ("opensuse", "suse"):
                         if mgr in ("apt", "apt-get", "dnf", "yum", "pacman", "paru"):
                             continue
+            managers.append(mgr)
+
+        def probe(mgr):
             path = shutil.which(mgr)
-            pkg_status[mgr] = {"found": bool(path)}
+            status = {"found": bool(path)}
             if path:
                 version = None
                 try:
@@ -399,13 +583,16 @@ class EnvDiscovery:
                 except Exception:
                     version = None
                 if version:
-                    pkg_status[mgr]["version"] = version
-        self.results["package_managers"] = pkg_status
+                    status["version"] = version
+            return status
+
+        self.results["package_managers"] = dict(zip(managers, self._map(probe, managers)))
 
     def _detect_libraries(self):
-        libs_found = {}
         have_pkg_config = bool(shutil.which("pkg-config"))
-        for lib, info in self._libraries.items():
+
+        def probe(item):
+            lib, info = item
             lib_info = {"found": False}
             found = False
             ver = None
@@ -439,7 +626,7 @@ class EnvDiscovery:
                         ).strip()
                     except Exception:
                         libs_flags = None
-                except subprocess.CalledProcessError:
+                except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
                     found = False
             if not found and info.get("headers"):
                 for header in info["headers"]:
@@ -457,8 +644,12 @@ class EnvDiscovery:
                 lib_info["libs"] = libs_flags
             if header_paths:
                 lib_info["header_paths"] = header_paths
-            libs_found[lib] = lib_info
-        self.results["libraries"] = libs_found
+            return lib_info
+
+        libs = list(self._libraries.items())
+        self.results["libraries"] = dict(
+            zip(self._libraries, self._map(probe, libs))
+        )
 
     def _detect_node(self):
         node_info = {}
@@ -499,6 +690,12 @@ class EnvDiscovery:
         self.results["node"] = node_info
 
     def format_markdown(self):
+        """Format the results for agent prompts; the text is built once per discovery."""
+        if self._markdown is None:
+            self._markdown = self._render_markdown()
+        return self._markdown
+
+    def _render_markdown(self):
         os_info = self.results.get("os", {})
         lines = []
         # OS Section
@@ -615,6 +812,40 @@ class EnvDiscovery:
         lines.append("")
         return "\n".join(lines)
 
+def env_inventory_path(state_dir: Optional[str] = None) -> str:
+    """
+    Path of the environment inventory file.
+
+    Args:
+        state_dir: Project state directory (default: .ra-aid in the current directory)
+
+    Returns:
+        str: The path of the inventory file
+    """
+    if state_dir is None:
+        state_dir = os.path.join(os.getcwd(), ".ra-aid")
+    return os.path.join(os.path.abspath(state_dir), ENV_INVENTORY_CACHE_FILE)
+
+
+def discover_environment(state_dir: Optional[str] = None, refresh: bool = False) -> str:
+    """
+    Discover the environment and return it formatted for agent prompts.
+
+    The inventory is kept in the project state directory and only rebuilt
+    when the tools on PATH change (see EnvDiscovery.discover_cached).
+
+    Args:
+        state_dir: Project state directory (default: .ra-aid in the current directory)
+        refresh: Rebuild the inventory even if it is current
+
+    Returns:
+        str: The environment inventory as markdown
+    """
+    env = EnvDiscovery()
+    env.discover_cached(env_inventory_path(state_dir), refresh=refresh)
+    return env.format_markdown()
+
+
 if __name__ == "__main__":
     env = EnvDiscovery()
     env.discover()
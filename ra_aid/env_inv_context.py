@@ -6,7 +6,8 @@ using context variables.
 """
 
 import contextvars
-from typing import Dict, Any, Optional, Type
+from concurrent.futures import Future
+from typing import Dict, Any, Optional, Type, Union
 
 # Create contextvar to hold the environment inventory
 env_inv_var = contextvars.ContextVar("env_inv", default=None)
@@ -33,12 +34,14 @@ class EnvInvManager:
             pass
     """
 
-    def __init__(self, env_data: Dict[str, Any]):
+    def __init__(self, env_data: Union[Dict[str, Any], Future]):
         """
         Initialize the EnvInvManager.
 
         Args:
-            env_data: Dictionary containing environment inventory data
+            env_data: Dictionary containing environment inventory data, or a
+                Future of it while discovery is still running (get_env_inv
+                waits for it on first use)
         """
         self.env_data = env_data
 
@@ -89,4 +92,6 @@ def get_env_inv() -> Dict[str, Any]:
             "No environment inventory available. "
             "Make sure to initialize one with EnvInvManager first."
         )
+    if isinstance(env_data, Future):
+        return env_data.result()
     return env_data
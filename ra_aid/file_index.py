@@ -0,0 +1,272 @@
+"""
+Process-wide cache of project file listings.
+
+Listing a project's files means running `git rev-parse` and two `git ls-files`
+commands (or walking the tree for non-git directories), and the listing is
+needed every time an agent prompt is built, by fuzzy_find_project_files and
+by list_directory_tree. ProjectFileIndex builds each listing once and reuses
+it until the project changes.
+
+Freshness is checked with a cheap fingerprint instead of re-listing: the
+modification times of the directories containing indexed files (creating,
+deleting or renaming a file updates its directory's mtime), the git index
+and the ignore files. When any of them changes, the listing is rebuilt on
+the next request.
+"""
+
+import os
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from ra_aid.file_listing import (
+    DirectoryAccessError,
+    FileListerError,
+    get_all_project_files,
+)
+from ra_aid.logging_config import get_logger
+from ra_aid.utils.singleton import Singleton
+
+logger = get_logger(__name__)
+
+Fingerprint = Tuple[Tuple[str, Optional[int]], ...]
+
+# Paths modified this close to (or after) the start of a build may have changed
+# while the value was being built, so such values are rebuilt on the next
+# request. This covers the coarse granularity of filesystem timestamps.
+RACY_WINDOW_NS = 10_000_000
+
+
+@dataclass
+class _CacheEntry:
+    """A cached value together with the paths it depends on."""
+
+    value: Any
+    watch_paths: Tuple[str, ...]
+    fingerprint: Fingerprint
+
+
+def path_fingerprint(paths: Iterable[str]) -> Fingerprint:
+    """Return the modification time of each path, or None for missing paths."""
+    result = []
+    for path in paths:
+        try:
+            result.append((path, os.stat(path).st_mtime_ns))
+        except OSError:
+            result.append((path, None))
+    return tuple(result)
+
+
+def _git_dir(directory: str) -> Optional[str]:
+    """Return the absolute git directory of a repository, or None if it can't be found."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--absolute-git-dir"],
+            cwd=directory,
+            capture_output=True,
+            text=True,
+        )
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip() or None
+
+
+def _excludes_file(directory: str) -> Optional[str]:
+    """Return the user's global git ignore file (core.excludesFile or its default), if any."""
+    try:
+        result = subprocess.run(
+            ["git", "config", "--path", "core.excludesFile"],
+            cwd=directory,
+            capture_output=True,
+            text=True,
+        )
+    except OSError:
+        return None
+    path = result.stdout.strip() if result.returncode == 0 else ""
+    if path:
+        return os.path.join(directory, os.path.expanduser(path))
+    config_home = os.environ.get("XDG_CONFIG_HOME") or os.path.join(
+        os.path.expanduser("~"), ".config"
+    )
+    return os.path.join(config_home, "git", "ignore")
+
+
+def listing_watch_paths(
+    directory: str, files: List[str], git_dir: Optional[str] = None
+) -> Tuple[str, ...]:
+    """
+    Return the paths whose modification times determine whether a listing is stale.
+
+    Args:
+        directory: Absolute path of the listed directory
+        files: The listing, relative to directory
+        git_dir: The repository's git directory, if already known (default:
+            ask git)
+
+    Returns:
+        Tuple[str, ...]: The directory itself, every directory containing (or
+            above) a listed file, the .gitignore file of each of them and, for
+            git repositories, the git index and the repository's and user's
+            exclude files
+    """
+    dirs = {""}
+    for file in files:
+        parent = os.path.dirname(file)
+        while parent not in dirs:
+            dirs.add(parent)
+            parent = os.path.dirname(parent)
+
+    paths = [os.path.join(directory, d) if d else directory for d in sorted(dirs)]
+    # Editing an ignore file doesn't change its directory's modification time
+    paths.extend(os.path.join(path, ".gitignore") for path in list(paths))
+
+    if git_dir is None:
+        git_dir = _git_dir(directory)
+    if git_dir:
+        paths.append(os.path.join(git_dir, "index"))
+        paths.append(os.path.join(git_dir, "info", "exclude"))
+        excludes_file = _excludes_file(directory)
+        if excludes_file:
+            paths.append(excludes_file)
+
+    return tuple(paths)
+
+
+class ProjectFileIndex(metaclass=Singleton):
+    """
+    Shared, self-invalidating cache of project file listings and other derived data.
+
+    There is a single instance per process; create it with ProjectFileIndex()
+    or get_project_file_index(). Cached values are keyed by resolved directory
+    and rebuilt when the modification time of any path they depend on changes.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._entries: Dict[Hashable, _CacheEntry] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def cached(
+        self,
+        key: Hashable,
+        build: Callable[[], Any],
+        watch_paths: Callable[[Any], Iterable[str]],
+    ) -> Any:
+        """
+        Return the cached value for key, rebuilding it if any watched path changed.
+
+        Args:
+            key: Cache key
+            build: Function computing the value
+            watch_paths: Function returning the paths a freshly built value depends on
+
+        Returns:
+            Any: The cached or freshly built value
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and path_fingerprint(entry.watch_paths) == entry.fingerprint:
+                self.hits += 1
+                return entry.value
+
+            self.misses += 1
+            logger.debug(f"Building project file index entry for {key}")
+            started_ns = time.time_ns()
+            value = build()
+            paths = tuple(watch_paths(value))
+            fingerprint = path_fingerprint(paths)
+            if any(
+                mtime is not None and mtime >= started_ns - RACY_WINDOW_NS
+                for _, mtime in fingerprint
+            ):
+                # Can't tell whether the value saw the latest change; don't trust it
+                fingerprint = ()
+            self._entries[key] = _CacheEntry(value, paths, fingerprint)
+            return value
+
+    def get_files(self, directory: str, include_hidden: bool = False) -> List[str]:
+        """
+        Get all files in a project, as returned by get_all_project_files.
+
+        Args:
+            directory: Path to the project directory
+            include_hidden: Whether to include hidden files (starting with .)
+
+        Returns:
+            List[str]: Sorted file paths relative to directory. The list is
+                shared between callers and must not be modified.
+
+        Raises:
+            FileListerError: If the files can't be listed (errors are not cached)
+        """
+        path = os.path.realpath(directory)
+        return self.cached(
+            ("files", path, include_hidden),
+            lambda: get_all_project_files(path, include_hidden=include_hidden),
+            lambda files: listing_watch_paths(path, files),
+        )
+
+    def get_file_listing(
+        self, directory: str, limit: Optional[int] = None, include_hidden: bool = False
+    ) -> Tuple[List[str], int]:
+        """
+        Cached equivalent of ra_aid.file_listing.get_file_listing.
+
+        Args:
+            directory: Path to the directory
+            limit: Optional maximum number of files to return
+            include_hidden: Whether to include hidden files (starting with .) in the results
+
+        Returns:
+            Tuple[List[str], int]: Tuple containing:
+                - List of file paths (truncated to limit if specified)
+                - Total number of files (before truncation)
+
+        Raises:
+            DirectoryNotFoundError: If directory does not exist
+            DirectoryAccessError: If directory cannot be accessed
+            GitCommandError: If git command fails
+            FileListerError: For other unexpected errors
+        """
+        try:
+            all_files = self.get_files(directory, include_hidden)
+        except FileListerError:
+            # Re-raise known exceptions
+            raise
+        except PermissionError as e:
+            raise DirectoryAccessError(f"Permission denied: {e}")
+        except Exception as e:
+            raise FileListerError(f"Unexpected error: {e}")
+
+        files = all_files[:limit] if limit is not None else list(all_files)
+        return files, len(all_files)
+
+    def invalidate(self, directory: Optional[str] = None) -> None:
+        """
+        Drop cached values, forcing them to be rebuilt on the next request.
+
+        Args:
+            directory: Only drop values for this directory (default: drop everything)
+        """
+        with self._lock:
+            if directory is None:
+                self._entries.clear()
+                return
+            path = os.path.realpath(directory)
+            for key in [k for k in self._entries if isinstance(k, tuple) and path in k]:
+                del self._entries[key]
+
+
+def get_project_file_index() -> ProjectFileIndex:
+    """
+    Get the process-wide project file index.
+
+    Returns:
+        ProjectFileIndex: The shared index instance
+    """
+    return ProjectFileIndex()
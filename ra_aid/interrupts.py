@@ -0,0 +1,29 @@
+"""
+Marking threads whose agents must not take Ctrl-C interrupts.
+
+Kept apart from ra_aid.agent_utils, which imports the whole agent stack, so
+that modules starting background work can use it cheaply.
+"""
+
+import threading
+from contextlib import contextmanager
+
+# Threads doing background work (e.g. memory GC) set this so their agents don't
+# take the Ctrl-C interrupt meant for the foreground agent
+_BACKGROUND_THREAD = threading.local()
+
+
+def in_background_section() -> bool:
+    """Whether the current thread runs in a background_section."""
+    return getattr(_BACKGROUND_THREAD, "active", False)
+
+
+@contextmanager
+def background_section():
+    """Run agents in the current thread without registering them for Ctrl-C interrupts."""
+    previous = in_background_section()
+    _BACKGROUND_THREAD.active = True
+    try:
+        yield
+    finally:
+        _BACKGROUND_THREAD.active = previous
@@ -0,0 +1,257 @@
+"""
+Relevance-budgeted agent memory for prompts.
+
+The research, planning and implementation prompts used to include every key
+fact, key snippet and research note, so prompts grew with project memory.
+build_memory_sections ranks the stored items against the current task with
+BM25, computed locally over the items themselves, and fills a token budget
+with the most relevant ones. Items that don't fit are listed by ID at the end
+of their section so the agent can fetch them with the read_memory tool.
+
+When everything fits, the sections are identical to formatting all of the
+memory, as before.
+"""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ra_aid.config import DEFAULT_MEMORY_TOKEN_BUDGET
+from ra_aid.database.section_cache import get_section_cache
+from ra_aid.database.repositories.config_repository import get_config_repository
+from ra_aid.database.repositories.key_fact_repository import get_key_fact_repository
+from ra_aid.database.repositories.key_snippet_repository import get_key_snippet_repository
+from ra_aid.database.repositories.research_note_repository import (
+    get_research_note_repository,
+)
+from ra_aid.logging_config import get_logger
+from ra_aid.model_formatters import format_key_facts_dict, format_research_notes_dict
+from ra_aid.model_formatters.key_snippets_formatter import format_key_snippets_dict
+from ra_aid.text.tokens import estimate_tokens
+
+logger = get_logger(__name__)
+
+# BM25 parameters
+_K1 = 1.2
+_B = 0.75
+
+_TERM_RE = re.compile(r"\w+")
+
+# Kind -> (label used in the overflow listing, formatter of an {id: item} dict)
+MEMORY_KINDS: Dict[str, Tuple[str, Callable[[Dict], str]]] = {
+    "key_facts": ("Key facts", format_key_facts_dict),
+    "key_snippets": ("Key snippets", format_key_snippets_dict),
+    "research_notes": ("Research notes", format_research_notes_dict),
+}
+
+
+@dataclass
+class MemorySections:
+    """
+    Formatted memory sections for a prompt.
+
+    Attributes:
+        key_facts: Formatted key facts
+        key_snippets: Formatted key snippets
+        research_notes: Formatted research notes
+        omitted: IDs of the items of each kind left out to fit the budget
+    """
+
+    key_facts: str = ""
+    key_snippets: str = ""
+    research_notes: str = ""
+    omitted: Dict[str, List[int]] = field(default_factory=dict)
+
+
+def _terms(text: str) -> List[str]:
+    return [term.lower() for term in _TERM_RE.findall(text)]
+
+
+def _item_text(kind: str, item) -> str:
+    """Return the searchable text of a memory item."""
+    if kind == "key_snippets":
+        return " ".join(
+            str(item.get(key) or "") for key in ("filepath", "description", "snippet")
+        )
+    return item
+
+
+def bm25_scores(query: str, documents: List[str]) -> List[float]:
+    """
+    Score documents against a query with Okapi BM25.
+
+    Args:
+        query: Free-text query
+        documents: Texts to score
+
+    Returns:
+        List[float]: The score of each document, in order; 0 if it shares no
+            word with the query
+    """
+    query_terms = set(_terms(query))
+    if not documents or not query_terms:
+        return [0.0] * len(documents)
+
+    counts = [Counter(term for term in _terms(doc) if term in query_terms) for doc in documents]
+    lengths = [len(_terms(doc)) for doc in documents]
+    average_length = (sum(lengths) / len(lengths)) or 1.0
+    document_frequency = Counter(term for doc_counts in counts for term in doc_counts)
+
+    scores = []
+    for doc_counts, length in zip(counts, lengths):
+        score = 0.0
+        for term, frequency in doc_counts.items():
+            df = document_frequency[term]
+            idf = math.log(1 + (len(documents) - df + 0.5) / (df + 0.5))
+            norm = frequency + _K1 * (1 - _B + _B * length / average_length)
+            score += idf * frequency * (_K1 + 1) / norm
+        scores.append(score)
+    return scores
+
+
+def select_memory(
+    query: str,
+    memory: Dict[str, Dict[int, object]],
+    token_budget: Optional[int],
+) -> Tuple[Dict[str, Dict[int, object]], Dict[str, List[int]]]:
+    """
+    Choose the memory items that best match a query within a token budget.
+
+    Items are taken in order of relevance (newest first among equally relevant
+    ones); an item that doesn't fit is skipped so that smaller, less relevant
+    ones can still fill the rest of the budget.
+
+    Args:
+        query: The current task
+        memory: Items of each kind in MEMORY_KINDS, by ID
+        token_budget: Maximum estimated tokens of the formatted items; None or
+            a value <= 0 selects everything
+
+    Returns:
+        Tuple: The selected items of each kind by ID, and the sorted IDs of the
+            omitted items of each kind that has any
+    """
+    if token_budget is None or token_budget <= 0:
+        return memory, {}
+
+    # Formatted sizes, measured the way the items will appear in the prompt
+    candidates = []
+    for priority, kind in enumerate(MEMORY_KINDS):
+        format_items = MEMORY_KINDS[kind][1]
+        for item_id, item in memory.get(kind, {}).items():
+            tokens = estimate_tokens(format_items({item_id: item})) + 1
+            candidates.append((kind, priority, item_id, item, tokens))
+    if sum(candidate[4] for candidate in candidates) <= token_budget:
+        return memory, {}
+
+    scores = bm25_scores(
+        query, [_item_text(kind, item) for kind, _, _, item, _ in candidates]
+    )
+    ranked = sorted(
+        zip(scores, candidates), key=lambda pair: (-pair[0], pair[1][1], -pair[1][2])
+    )
+
+    selected: Dict[str, Dict[int, object]] = {kind: {} for kind in memory}
+    omitted: Dict[str, List[int]] = {}
+    remaining = token_budget
+    for _, (kind, _, item_id, item, tokens) in ranked:
+        if tokens <= remaining:
+            selected[kind][item_id] = item
+            remaining -= tokens
+        else:
+            omitted.setdefault(kind, []).append(item_id)
+    return selected, {kind: sorted(ids) for kind, ids in omitted.items()}
+
+
+def format_omitted(kind: str, ids: List[int]) -> str:
+    """
+    Format the listing of memory items left out of a prompt.
+
+    Args:
+        kind: Kind of the items, a key of MEMORY_KINDS
+        ids: IDs of the omitted items
+
+    Returns:
+        str: A line naming the items and how to fetch them
+    """
+    label = MEMORY_KINDS[kind][0]
+    id_list = ", ".join(f"#{item_id}" for item_id in ids)
+    return (
+        f"{label} not shown to save space (less relevant to the current task): {id_list}. "
+        f'Use read_memory(kind="{kind}", ids=[...]) to fetch any you need.'
+    )
+
+
+def build_memory_sections(
+    query: str,
+    token_budget: Optional[int] = None,
+    kinds: Tuple[str, ...] = tuple(MEMORY_KINDS),
+) -> MemorySections:
+    """
+    Format the agent memory most relevant to a task for a prompt.
+
+    Args:
+        query: The current task, used to rank the memory items
+        token_budget: Maximum estimated tokens of the formatted memory; defaults
+            to the memory_token_budget config value. 0 includes everything
+        kinds: Kinds of memory to include, keys of MEMORY_KINDS
+
+    Returns:
+        MemorySections: The formatted sections; kinds not requested, or whose
+            repository is unavailable, are empty
+    """
+    if token_budget is None:
+        token_budget = get_config_repository().get(
+            "memory_token_budget", DEFAULT_MEMORY_TOKEN_BUDGET
+        )
+
+    repositories = {
+        "key_facts": (get_key_fact_repository, "get_facts_dict"),
+        "key_snippets": (get_key_snippet_repository, "get_snippets_dict"),
+        "research_notes": (get_research_note_repository, "get_notes_dict"),
+    }
+    available = {}
+    for kind in kinds:
+        try:
+            available[kind] = repositories[kind][0]()
+        except RuntimeError as e:
+            logger.error(f"Failed to access {kind} repository: {str(e)}")
+
+    def render() -> MemorySections:
+        memory = {
+            kind: getattr(repository, repositories[kind][1])()
+            for kind, repository in available.items()
+        }
+        return _format_sections(query, memory, token_budget)
+
+    # Rendered again only once something is stored or deleted
+    version = tuple(
+        getattr(available[kind], "version", None) if kind in available else 0
+        for kind in kinds
+    )
+    return get_section_cache().get(
+        "memory_sections", version, render, key=(query, token_budget, tuple(kinds))
+    )
+
+
+def _format_sections(
+    query: str, memory: Dict[str, Dict[int, object]], token_budget: Optional[int]
+) -> MemorySections:
+    """Select and format the memory for build_memory_sections."""
+    selected, omitted = select_memory(query, memory, token_budget)
+    if omitted:
+        logger.debug(
+            "Memory budget of %s tokens omitted %s",
+            token_budget,
+            {kind: len(ids) for kind, ids in omitted.items()},
+        )
+
+    sections = MemorySections(omitted=omitted)
+    for kind, items in selected.items():
+        text = MEMORY_KINDS[kind][1](items)
+        if kind in omitted:
+            text = "\n\n".join(part for part in (text, format_omitted(kind, omitted[kind])) if part)
+        setattr(sections, kind, text)
+    return sections
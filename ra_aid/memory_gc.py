@@ -0,0 +1,329 @@
+"""
+Background garbage collection of agent memory.
+
+emit_key_facts, emit_key_snippet and emit_research_notes used to load every
+stored row after each call just to count them and, past a threshold, run an
+LLM-backed GC agent inline, stalling the calling agent for as long as the GC
+agent took. MemoryGCScheduler instead receives the row count (a COUNT query)
+and, when a collection is due, runs the GC agent on a background worker.
+Different kinds of memory are collected concurrently; for each kind at most
+one collection is queued or running at a time.
+
+Before a GC agent sends the stored rows to a model, exact and near duplicates
+are deleted deterministically (see delete_duplicate_memory), which is often
+enough to get back under the threshold without a model call at all.
+
+Collections use hysteresis so that a GC agent which can't bring the count
+below the threshold (for example because the remaining rows belong to the
+current request and are protected) isn't started again on every emit: after
+a run, the next one only starts once the count exceeds both the threshold and
+the count the previous run left behind plus the policy's min_growth.
+"""
+
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from ra_aid.interrupts import background_section
+from ra_aid.logging_config import get_logger
+from ra_aid.utils.singleton import Singleton
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class GCPolicy:
+    """
+    When and how to collect one kind of memory.
+
+    Attributes:
+        threshold: Collect when more than this many rows are stored
+        min_growth: After a run, rows that must be added to what the run left
+            behind before the next run is started
+        count: Returns the number of stored rows
+        run: Runs the GC agent
+    """
+
+    threshold: int
+    min_growth: int
+    count: Callable[[], int]
+    run: Callable[[], None]
+
+
+def _count_key_facts() -> int:
+    from ra_aid.database.repositories.key_fact_repository import get_key_fact_repository
+
+    return get_key_fact_repository().count()
+
+
+def _count_key_snippets() -> int:
+    from ra_aid.database.repositories.key_snippet_repository import (
+        get_key_snippet_repository,
+    )
+
+    return get_key_snippet_repository().count()
+
+
+def _count_research_notes() -> int:
+    from ra_aid.database.repositories.research_note_repository import (
+        get_research_note_repository,
+    )
+
+    return get_research_note_repository().count()
+
+
+# The GC agents import ra_aid.tools.memory, so they are imported when run
+
+
+def _run_key_facts_gc() -> None:
+    from ra_aid.agents.key_facts_gc_agent import run_key_facts_gc_agent
+
+    run_key_facts_gc_agent(threshold=GC_POLICIES["key_facts"].threshold)
+
+
+def _run_key_snippets_gc() -> None:
+    from ra_aid.agents.key_snippets_gc_agent import run_key_snippets_gc_agent
+
+    run_key_snippets_gc_agent(threshold=GC_POLICIES["key_snippets"].threshold)
+
+
+def _run_research_notes_gc() -> None:
+    from ra_aid.agents.research_notes_gc_agent import run_research_notes_gc_agent
+
+    run_research_notes_gc_agent(threshold=GC_POLICIES["research_notes"].threshold)
+
+
+GC_POLICIES: Dict[str, GCPolicy] = {
+    "key_facts": GCPolicy(
+        threshold=50, min_growth=10, count=_count_key_facts, run=_run_key_facts_gc
+    ),
+    "key_snippets": GCPolicy(
+        threshold=35, min_growth=10, count=_count_key_snippets, run=_run_key_snippets_gc
+    ),
+    "research_notes": GCPolicy(
+        threshold=30, min_growth=5, count=_count_research_notes, run=_run_research_notes_gc
+    ),
+}
+
+
+@dataclass
+class _GCState:
+    """Scheduling state of one kind of memory."""
+
+    future: Optional[Future] = None
+    floor: int = 0
+
+
+def delete_duplicate_memory(
+    repository: Any,
+    kind: str,
+    tool_name: str,
+    describe: Callable[[Any], str],
+    protected_human_input_id: Optional[int] = None,
+) -> int:
+    """
+    Delete duplicate rows of a kind of memory before its GC agent runs.
+
+    The deletion is recorded in the trajectory and shown in a panel.
+
+    Args:
+        repository: Repository of the memory, with a delete_duplicates method
+        kind: Plural name of the memory shown to the user, e.g. "key facts"
+        tool_name: Name of the GC agent recorded in the trajectory
+        describe: Returns the line shown for a deleted row
+        protected_human_input_id: ID of the human input whose rows must not be deleted
+
+    Returns:
+        int: Number of deleted rows
+    """
+    from ra_aid.console.formatting import console_panel
+    from ra_aid.database.repositories.trajectory_repository import get_trajectory_repository
+    from ra_aid.tools.memory import log_work_event
+
+    try:
+        deleted = repository.delete_duplicates(protected_human_input_id)
+    except Exception as e:
+        logger.error(f"Failed to delete duplicate {kind}: {str(e)}")
+        return 0
+    if not deleted:
+        return 0
+
+    lines = [f"- {describe(row)} (duplicate of #{kept_id})" for row, kept_id in deleted]
+    log_work_event(f"Deleted {len(deleted)} duplicate {kind}.")
+    try:
+        get_trajectory_repository().create(
+            step_data={
+                "deleted_duplicates": [(row.id, kept_id) for row, kept_id in deleted],
+                "display_title": "Duplicates Deleted",
+            },
+            record_type="gc_operation",
+            human_input_id=protected_human_input_id,
+            tool_name=tool_name,
+        )
+    except Exception:
+        pass  # Continue if trajectory recording fails
+    console_panel(
+        f"Deleted {len(deleted)} duplicate {kind}:\n" + "\n".join(lines),
+        title="🗑 Duplicates Deleted",
+        border_style="green",
+    )
+    return len(deleted)
+
+
+def _database_is_in_memory() -> bool:
+    """Return whether the current database is in-memory (invisible to other threads)."""
+    from ra_aid.database.connection import db_var
+
+    return getattr(db_var.get(), "_is_in_memory", False) is True
+
+
+def _close_thread_connection() -> None:
+    """Close the current thread's connection to the current database, if any."""
+    from ra_aid.database.connection import db_var
+
+    db = db_var.get()
+    try:
+        if db is not None and not db.is_closed():
+            db.close()
+    except Exception as e:
+        logger.debug(f"Error closing memory GC connection: {str(e)}")
+
+
+class MemoryGCScheduler(metaclass=Singleton):
+    """
+    Schedules memory GC agents on background threads.
+
+    There is a single instance per process; create it with MemoryGCScheduler()
+    or get_memory_gc_scheduler(). Background runs see the context variables
+    (repositories, configuration) of the call that scheduled them, but run
+    without a parent agent context and don't take Ctrl-C interrupts meant for
+    the foreground agent. With an in-memory database, which other threads
+    can't see, collections run inline instead.
+    """
+
+    def __init__(self, policies: Optional[Dict[str, GCPolicy]] = None) -> None:
+        self.policies = dict(GC_POLICIES if policies is None else policies)
+        self._lock = threading.Lock()
+        self._states = {kind: _GCState() for kind in self.policies}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.runs = 0
+
+    def notify(self, kind: str, count: int) -> bool:
+        """
+        Report the current number of rows of a kind of memory, scheduling a collection if due.
+
+        Never waits for a collection to run (except with an in-memory database).
+
+        Args:
+            kind: Key of the policy in GC_POLICIES (e.g. "key_facts")
+            count: Number of stored rows
+
+        Returns:
+            bool: True if a collection was started
+        """
+        policy = self.policies[kind]
+        with self._lock:
+            state = self._states[kind]
+            if state.future is not None:
+                # Already queued or running; rows added meanwhile are counted
+                # when it finishes
+                return False
+            if count <= max(policy.threshold, state.floor + policy.min_growth):
+                return False
+
+            run_inline = _database_is_in_memory()
+            if run_inline:
+                state.future = Future()
+            else:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=max(1, len(self.policies)),
+                        thread_name_prefix="memory-gc",
+                    )
+                context = contextvars.copy_context()
+                state.future = self._executor.submit(
+                    context.run, self._collect, kind, True
+                )
+
+        logger.debug(f"Scheduled {kind} GC with {count} rows stored")
+        if run_inline:
+            self._collect(kind, False)
+        return True
+
+    def _collect(self, kind: str, in_background: bool) -> None:
+        """Run the GC agent for a kind of memory and record what it left behind."""
+        policy = self.policies[kind]
+        try:
+            if in_background:
+                from ra_aid.agent_context import agent_context_var
+
+                # Don't inherit (or affect) the state of the scheduling agent
+                agent_context_var.set(None)
+                with background_section():
+                    policy.run()
+            else:
+                policy.run()
+        except Exception as e:
+            logger.error(f"Failed to run {kind} GC: {str(e)}")
+
+        try:
+            count: Optional[int] = policy.count()
+        except Exception as e:
+            logger.error(f"Failed to count {kind} after GC: {str(e)}")
+            count = None
+
+        if in_background:
+            _close_thread_connection()
+
+        with self._lock:
+            state = self._states[kind]
+            future, state.future = state.future, None
+            if count is not None:
+                state.floor = count
+            self.runs += 1
+        if not in_background and future is not None and not future.done():
+            future.set_result(None)
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait until no collection is queued or running.
+
+        Args:
+            timeout: Maximum number of seconds to wait for each batch of collections
+        """
+        while True:
+            with self._lock:
+                futures = [s.future for s in self._states.values() if s.future is not None]
+            if not futures:
+                return
+            done, not_done = wait_futures(futures, timeout=timeout)
+            if not_done:
+                return
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Cancel queued collections and stop the background workers.
+
+        Args:
+            wait: Whether to wait for running collections to finish
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+            for state in self._states.values():
+                if state.future is not None and state.future.cancel():
+                    state.future = None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+def get_memory_gc_scheduler() -> MemoryGCScheduler:
+    """
+    Get the process-wide memory GC scheduler.
+
+    Returns:
+        MemoryGCScheduler: The shared scheduler instance
+    """
+    return MemoryGCScheduler()
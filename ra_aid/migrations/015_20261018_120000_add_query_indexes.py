@@ -0,0 +1,96 @@
+"""Peewee migrations -- 015_20261018_120000_add_query_indexes.py.
+
+This migration adds secondary indexes for the per-session and per-human-input
+lookups done by the repositories and the web UI:
+
+- trajectory (session_id, record_type): get_session_usage_totals
+- trajectory (session_id, created_at): get_trajectories_by_session
+- trajectory (human_input_id): get_trajectories_by_human_input
+- equivalent (session_id, created_at) and (human_input_id) indexes on the
+  human_input, key_fact, key_snippet and research_note tables
+- session (created_at): latest/recent session listings
+
+Index names follow peewee's naming for the model-level index declarations,
+so databases created from the models and databases upgraded by this
+migration end up with the same schema. The single-column human_input_id
+indexes normally exist already (peewee creates them for foreign keys);
+they are created here only for databases that lack them.
+
+Some examples (model - class or model name)::
+
+    > Model = migrator.orm['table_name']            # Return model in current state by name
+    > Model = migrator.ModelClass                   # Return model in current state by name
+
+    > migrator.sql(sql)                             # Run custom SQL
+    > migrator.run(func, *args, **kwargs)           # Run python function with the given args
+    > migrator.create_model(Model)                  # Create a model (could be used as decorator)
+    > migrator.remove_model(model, cascade=True)    # Remove a model
+    > migrator.add_fields(model, **fields)          # Add fields to a model
+    > migrator.change_fields(model, **fields)       # Change fields
+    > migrator.remove_fields(model, *field_names, cascade=True)
+    > migrator.rename_field(model, old_field_name, new_field_name)
+    > migrator.rename_table(model, new_table_name)
+    > migrator.add_index(model, *col_names, unique=False)
+    > migrator.add_not_null(model, *field_names)
+    > migrator.add_default(model, field_name, default)
+    > migrator.add_constraint(model, name, sql)
+    > migrator.drop_index(model, *col_names)
+    > migrator.drop_not_null(model, *field_names)
+    > migrator.drop_constraints(model, *constraints)
+
+"""
+
+from contextlib import suppress
+
+import peewee as pw
+from peewee_migrate import Migrator
+
+
+with suppress(ImportError):
+    import playhouse.postgres_ext as pw_pext
+
+
+# (index name, table name, columns, dropped on rollback)
+INDEXES = [
+    ("trajectory_session_id_record_type", "trajectory", ("session_id", "record_type"), True),
+    ("trajectory_session_id_created_at", "trajectory", ("session_id", "created_at"), True),
+    ("trajectory_human_input_id", "trajectory", ("human_input_id",), False),
+    ("humaninput_session_id_created_at", "human_input", ("session_id", "created_at"), True),
+    ("humaninput_created_at", "human_input", ("created_at",), True),
+    ("keyfact_session_id_created_at", "key_fact", ("session_id", "created_at"), True),
+    ("keyfact_human_input_id", "key_fact", ("human_input_id",), False),
+    ("keysnippet_session_id_created_at", "key_snippet", ("session_id", "created_at"), True),
+    ("keysnippet_human_input_id", "key_snippet", ("human_input_id",), False),
+    ("researchnote_session_id_created_at", "research_note", ("session_id", "created_at"), True),
+    ("researchnote_human_input_id", "research_note", ("human_input_id",), False),
+    ("session_created_at", "session", ("created_at",), True),
+]
+
+
+def _has_columns(database: pw.Database, table: str, columns) -> bool:
+    """Check whether a table exists and has all of the given columns."""
+    try:
+        database.execute_sql(f'SELECT {", ".join(columns)} FROM "{table}" LIMIT 1')
+        return True
+    except pw.OperationalError:
+        return False
+
+
+def migrate(migrator: Migrator, database: pw.Database, *, fake=False):
+    """Create secondary indexes for session and human input lookups."""
+
+    for name, table, columns, _ in INDEXES:
+        # Skip tables that don't exist (or predate the columns) in this database
+        if not _has_columns(database, table, columns):
+            continue
+
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        migrator.sql(f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table}" ({column_list})')
+
+
+def rollback(migrator: Migrator, database: pw.Database, *, fake=False):
+    """Drop the indexes added by this migration."""
+
+    for name, _, _, drop in INDEXES:
+        if drop:
+            migrator.sql(f'DROP INDEX IF EXISTS "{name}"')
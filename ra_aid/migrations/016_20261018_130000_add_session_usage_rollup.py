@@ -0,0 +1,136 @@
+"""Peewee migrations -- 016_20261018_130000_add_session_usage_rollup.py.
+
+This migration adds the session_usage table, a per-session rollup of the
+cost and token counts of model_usage trajectory records, together with the
+triggers that keep it up to date as trajectories are inserted, updated and
+deleted. Existing trajectories are aggregated into the rollup with a single
+GROUP BY query.
+
+The rollup is recomputed from scratch, so the migration is safe to apply to
+databases where the (empty) table was already created from the models.
+
+Some examples (model - class or model name)::
+
+    > Model = migrator.orm['table_name']            # Return model in current state by name
+    > Model = migrator.ModelClass                   # Return model in current state by name
+
+    > migrator.sql(sql)                             # Run custom SQL
+    > migrator.run(func, *args, **kwargs)           # Run python function with the given args
+    > migrator.create_model(Model)                  # Create a model (could be used as decorator)
+    > migrator.remove_model(model, cascade=True)    # Remove a model
+    > migrator.add_fields(model, **fields)          # Add fields to a model
+    > migrator.change_fields(model, **fields)       # Change fields
+    > migrator.remove_fields(model, *field_names, cascade=True)
+    > migrator.rename_field(model, old_field_name, new_field_name)
+    > migrator.rename_table(model, new_table_name)
+    > migrator.add_index(model, *col_names, unique=False)
+    > migrator.add_not_null(model, *field_names)
+    > migrator.add_default(model, field_name, default)
+    > migrator.add_constraint(model, name, sql)
+    > migrator.drop_index(model, *col_names)
+    > migrator.drop_not_null(model, *field_names)
+    > migrator.drop_constraints(model, *constraints)
+
+"""
+
+from contextlib import suppress
+
+import peewee as pw
+from peewee_migrate import Migrator
+
+
+with suppress(ImportError):
+    import playhouse.postgres_ext as pw_pext
+
+
+CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS "session_usage" (
+    "session_id" INTEGER NOT NULL PRIMARY KEY,
+    "created_at" DATETIME NOT NULL,
+    "updated_at" DATETIME NOT NULL,
+    "total_cost" REAL NOT NULL,
+    "total_input_tokens" INTEGER NOT NULL,
+    "total_output_tokens" INTEGER NOT NULL,
+    "record_count" INTEGER NOT NULL,
+    FOREIGN KEY ("session_id") REFERENCES "session" ("id") ON DELETE CASCADE
+)
+"""
+
+BACKFILL = """
+INSERT INTO session_usage (
+    session_id, total_cost, total_input_tokens, total_output_tokens,
+    record_count, created_at, updated_at
+)
+SELECT session_id, COALESCE(SUM(current_cost), 0.0),
+    COALESCE(SUM(input_tokens), 0), COALESCE(SUM(output_tokens), 0),
+    COUNT(*), datetime('now', 'localtime'), datetime('now', 'localtime')
+FROM trajectory
+WHERE record_type = 'model_usage'
+    AND session_id IN (SELECT id FROM session)
+GROUP BY session_id
+"""
+
+UPSERT = """
+    INSERT INTO session_usage (
+        session_id, total_cost, total_input_tokens, total_output_tokens,
+        record_count, created_at, updated_at
+    )
+    SELECT NEW.session_id, COALESCE(NEW.current_cost, 0.0),
+        COALESCE(NEW.input_tokens, 0), COALESCE(NEW.output_tokens, 0),
+        1, datetime('now', 'localtime'), datetime('now', 'localtime')
+    WHERE NEW.record_type = 'model_usage' AND NEW.session_id IS NOT NULL
+    ON CONFLICT (session_id) DO UPDATE SET
+        total_cost = total_cost + excluded.total_cost,
+        total_input_tokens = total_input_tokens + excluded.total_input_tokens,
+        total_output_tokens = total_output_tokens + excluded.total_output_tokens,
+        record_count = record_count + 1,
+        updated_at = excluded.updated_at;
+"""
+
+SUBTRACT = """
+    UPDATE session_usage SET
+        total_cost = total_cost - COALESCE(OLD.current_cost, 0.0),
+        total_input_tokens = total_input_tokens - COALESCE(OLD.input_tokens, 0),
+        total_output_tokens = total_output_tokens - COALESCE(OLD.output_tokens, 0),
+        record_count = record_count - 1,
+        updated_at = datetime('now', 'localtime')
+    WHERE session_id = OLD.session_id AND OLD.record_type = 'model_usage';
+"""
+
+TRIGGERS = {
+    "trajectory_session_usage_insert": ("AFTER INSERT ON trajectory", UPSERT),
+    "trajectory_session_usage_update": (
+        "AFTER UPDATE OF session_id, record_type, current_cost, input_tokens, "
+        "output_tokens ON trajectory",
+        SUBTRACT + UPSERT,
+    ),
+    "trajectory_session_usage_delete": ("AFTER DELETE ON trajectory", SUBTRACT),
+}
+
+
+def migrate(migrator: Migrator, database: pw.Database, *, fake=False):
+    """Create the session_usage rollup table, its triggers, and backfill it."""
+
+    # The rollup needs the session table and the trajectory usage columns
+    try:
+        database.execute_sql("SELECT id FROM session LIMIT 1")
+        database.execute_sql(
+            "SELECT session_id, record_type, current_cost, input_tokens, "
+            "output_tokens FROM trajectory LIMIT 1"
+        )
+    except pw.OperationalError:
+        return
+
+    migrator.sql(CREATE_TABLE)
+    for name, (event, body) in TRIGGERS.items():
+        migrator.sql(f'CREATE TRIGGER IF NOT EXISTS "{name}" {event} BEGIN {body} END')
+    migrator.sql("DELETE FROM session_usage")
+    migrator.sql(BACKFILL)
+
+
+def rollback(migrator: Migrator, database: pw.Database, *, fake=False):
+    """Drop the session_usage triggers and table."""
+
+    for name in TRIGGERS:
+        migrator.sql(f'DROP TRIGGER IF EXISTS "{name}"')
+    migrator.sql('DROP TABLE IF EXISTS "session_usage"')
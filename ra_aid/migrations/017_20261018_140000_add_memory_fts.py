@@ -0,0 +1,58 @@
+"""Peewee migrations -- 017_20261018_140000_add_memory_fts.py.
+
+This migration adds SQLite FTS5 full-text indexes over the key_fact,
+key_snippet, research_note and human_input tables (see ra_aid.database.fts),
+together with the triggers that keep them in sync as rows are inserted,
+updated and deleted. The indexes of existing rows are built once.
+
+SQLite builds without FTS5 are left unchanged; memory search then falls
+back to scanning the tables.
+
+Some examples (model - class or model name)::
+
+    > Model = migrator.orm['table_name']            # Return model in current state by name
+    > Model = migrator.ModelClass                   # Return model in current state by name
+
+    > migrator.sql(sql)                             # Run custom SQL
+    > migrator.run(func, *args, **kwargs)           # Run python function with the given args
+    > migrator.create_model(Model)                  # Create a model (could be used as decorator)
+    > migrator.remove_model(model, cascade=True)    # Remove a model
+    > migrator.add_fields(model, **fields)          # Add fields to a model
+    > migrator.change_fields(model, **fields)       # Change fields
+    > migrator.remove_fields(model, *field_names, cascade=True)
+    > migrator.rename_field(model, old_field_name, new_field_name)
+    > migrator.rename_table(model, new_table_name)
+    > migrator.add_index(model, *col_names, unique=False)
+    > migrator.add_not_null(model, *field_names)
+    > migrator.add_default(model, field_name, default)
+    > migrator.add_constraint(model, name, sql)
+    > migrator.drop_index(model, *col_names)
+    > migrator.drop_not_null(model, *field_names)
+    > migrator.drop_constraints(model, *constraints)
+
+"""
+
+from contextlib import suppress
+
+import peewee as pw
+from peewee_migrate import Migrator
+
+from ra_aid.database.fts import MEMORY_FTS_TABLES, create_memory_fts, drop_statements
+
+
+with suppress(ImportError):
+    import playhouse.postgres_ext as pw_pext
+
+
+def migrate(migrator: Migrator, database: pw.Database, *, fake=False):
+    """Create the memory FTS tables and triggers, and index existing rows."""
+
+    migrator.run(create_memory_fts, database)
+
+
+def rollback(migrator: Migrator, database: pw.Database, *, fake=False):
+    """Drop the memory FTS triggers and tables."""
+
+    for fts_table in MEMORY_FTS_TABLES:
+        for statement in drop_statements(fts_table):
+            migrator.sql(statement)
@@ -0,0 +1,88 @@
+"""Peewee migrations -- 018_20261018_150000_add_trajectory_blobs.py.
+
+This migration adds the trajectory_blob table, which stores large trajectory
+JSON payloads compressed and deduplicated by hash (see ra_aid.database.blobs),
+and the tool_parameters_blob, tool_result_blob and step_data_blob columns of
+the trajectory table that reference it. Existing payloads at or above the
+default blob threshold are moved into the new table.
+
+Some examples (model - class or model name)::
+
+    > Model = migrator.orm['table_name']            # Return model in current state by name
+    > Model = migrator.ModelClass                   # Return model in current state by name
+
+    > migrator.sql(sql)                             # Run custom SQL
+    > migrator.run(func, *args, **kwargs)           # Run python function with the given args
+    > migrator.create_model(Model)                  # Create a model (could be used as decorator)
+    > migrator.remove_model(model, cascade=True)    # Remove a model
+    > migrator.add_fields(model, **fields)          # Add fields to a model
+    > migrator.change_fields(model, **fields)       # Change fields
+    > migrator.remove_fields(model, *field_names, cascade=True)
+    > migrator.rename_field(model, old_field_name, new_field_name)
+    > migrator.rename_table(model, new_table_name)
+    > migrator.add_index(model, *col_names, unique=False)
+    > migrator.add_not_null(model, *field_names)
+    > migrator.add_default(model, field_name, default)
+    > migrator.add_constraint(model, name, sql)
+    > migrator.drop_index(model, *col_names)
+    > migrator.drop_not_null(model, *field_names)
+    > migrator.drop_constraints(model, *constraints)
+
+"""
+
+from contextlib import suppress
+
+import peewee as pw
+from peewee_migrate import Migrator
+
+from ra_aid.config import DEFAULT_TRAJECTORY_BLOB_THRESHOLD
+from ra_aid.database.blobs import (
+    BLOB_FIELDS,
+    blob_column,
+    externalize_existing,
+    inline_existing,
+)
+
+
+with suppress(ImportError):
+    import playhouse.postgres_ext as pw_pext
+
+
+CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS "trajectory_blob" (
+    "hash" TEXT NOT NULL PRIMARY KEY,
+    "created_at" DATETIME NOT NULL,
+    "updated_at" DATETIME NOT NULL,
+    "codec" TEXT NOT NULL,
+    "data" BLOB NOT NULL,
+    "size" INTEGER NOT NULL
+)
+"""
+
+
+def migrate(migrator: Migrator, database: pw.Database, *, fake=False):
+    """Create the trajectory_blob table, reference it, and move large payloads."""
+
+    try:
+        database.execute_sql("SELECT id FROM trajectory LIMIT 1")
+    except pw.OperationalError:
+        # Table doesn't exist, nothing to do
+        return
+
+    migrator.sql(CREATE_TABLE)
+    # The columns already exist if the table was created from the current models
+    columns = {column.name for column in database.get_columns("trajectory")}
+    for field in BLOB_FIELDS:
+        column = blob_column(field)
+        if column not in columns:
+            migrator.sql(f'ALTER TABLE "trajectory" ADD COLUMN "{column}" TEXT')
+    migrator.run(externalize_existing, database, DEFAULT_TRAJECTORY_BLOB_THRESHOLD)
+
+
+def rollback(migrator: Migrator, database: pw.Database, *, fake=False):
+    """Move blob payloads back inline, then drop the references and the table."""
+
+    migrator.run(inline_existing, database)
+    for field in BLOB_FIELDS:
+        migrator.sql(f'ALTER TABLE "trajectory" DROP COLUMN "{blob_column(field)}"')
+    migrator.sql('DROP TABLE IF EXISTS "trajectory_blob"')
@@ -0,0 +1,58 @@
+"""Peewee migrations -- 019_20261018_160000_add_memory_versions.py.
+
+This migration adds the memory_version table, with a version counter for each
+of the key_fact, key_snippet and research_note tables, together with the
+triggers that bump a table's counter whenever one of its rows is inserted,
+updated or deleted (see ra_aid.database.memory_version). Cached prompt
+sections rendered from agent memory are keyed on these counters.
+
+Some examples (model - class or model name)::
+
+    > Model = migrator.orm['table_name']            # Return model in current state by name
+    > Model = migrator.ModelClass                   # Return model in current state by name
+
+    > migrator.sql(sql)                             # Run custom SQL
+    > migrator.run(func, *args, **kwargs)           # Run python function with the given args
+    > migrator.create_model(Model)                  # Create a model (could be used as decorator)
+    > migrator.remove_model(model, cascade=True)    # Remove a model
+    > migrator.add_fields(model, **fields)          # Add fields to a model
+    > migrator.change_fields(model, **fields)       # Change fields
+    > migrator.remove_fields(model, *field_names, cascade=True)
+    > migrator.rename_field(model, old_field_name, new_field_name)
+    > migrator.rename_table(model, new_table_name)
+    > migrator.add_index(model, *col_names, unique=False)
+    > migrator.add_not_null(model, *field_names)
+    > migrator.add_default(model, field_name, default)
+    > migrator.add_constraint(model, name, sql)
+    > migrator.drop_index(model, *col_names)
+    > migrator.drop_not_null(model, *field_names)
+    > migrator.drop_constraints(model, *constraints)
+
+"""
+
+from contextlib import suppress
+
+import peewee as pw
+from peewee_migrate import Migrator
+
+from ra_aid.database.memory_version import (
+    create_memory_versions,
+    drop_memory_version_statements,
+)
+
+
+with suppress(ImportError):
+    import playhouse.postgres_ext as pw_pext
+
+
+def migrate(migrator: Migrator, database: pw.Database, *, fake=False):
+    """Create the memory version counters and their triggers."""
+
+    migrator.run(create_memory_versions, database)
+
+
+def rollback(migrator: Migrator, database: pw.Database, *, fake=False):
+    """Drop the memory version triggers and table."""
+
+    for statement in drop_memory_version_statements():
+        migrator.sql(statement)
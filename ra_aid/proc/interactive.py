@@ -5,6 +5,9 @@ with full raw input passthrough for interactive commands.
 
 It uses a pseudo-tty and integrates pyte's HistoryScreen to simulate
 a terminal and capture the final scrollback history (non-blank lines).
+When nobody can interact with the command (stdin is not a terminal), the
+command is run with plain pipes instead, keeping only the head and tail of
+its output in a bounded buffer.
 The interface remains compatible with external callers expecting a tuple (output, return_code),
 where output is a bytes object (UTF-8 encoded).
 """
@@ -12,12 +15,15 @@ where output is a bytes object (UTF-8 encoded).
 import errno
 import io
 import os
+import re
 import shutil
 import signal
 import subprocess
 import sys
+import threading
 import time
-from typing import List, Optional, Tuple
+from collections import deque
+from typing import Deque, List, Optional, Tuple
 
 import pyte
 from pyte.screens import HistoryScreen
@@ -25,7 +31,6 @@ from pyte.screens import HistoryScreen
 # Platform-specific imports
 if sys.platform == "win32":
     import msvcrt
-    import threading
 else:
     import select
     import termios
@@ -133,8 +138,231 @@ def render_line(line, columns: int) -> str:
         return str(line)
 
 
+# Maximum size of the output returned to callers
+OUTPUT_LIMIT_BYTES = 8000
+
+# Pipe mode settings: read size, and how much of the start and end of the
+# output is retained while the command runs
+PIPE_READ_SIZE = 64 * 1024
+PIPE_HEAD_BYTES = 2000
+PIPE_TAIL_BYTES = 64 * 1024
+
+# CSI, OSC and two-character escape sequences
+ANSI_ESCAPE_RE = re.compile(
+    rb"\x1b(?:\[[0-?]*[ -/]*[@-~]|\][^\x07\x1b]*(?:\x07|\x1b\\)|[@-Z\\-_])"
+)
+
+
+class HeadTailBuffer:
+    """
+    Bounded buffer keeping the first and last bytes of a stream.
+
+    The head is filled first; everything after it goes to a ring of chunks
+    whose oldest chunks are discarded once more than tail_size bytes are
+    held, so memory use doesn't grow with the length of the stream.
+    """
+
+    def __init__(self, head_size: int = PIPE_HEAD_BYTES, tail_size: int = PIPE_TAIL_BYTES):
+        self.head_size = head_size
+        self.tail_size = tail_size
+        self.total_bytes = 0
+        self._head = bytearray()
+        self._tail: Deque[bytes] = deque()
+        self._tail_bytes = 0
+
+    def write(self, data: bytes) -> None:
+        """Append data to the stream."""
+        self.total_bytes += len(data)
+        if len(self._head) < self.head_size:
+            room = self.head_size - len(self._head)
+            self._head += data[:room]
+            data = data[room:]
+        if not data:
+            return
+        self._tail.append(data)
+        self._tail_bytes += len(data)
+        while self._tail_bytes - len(self._tail[0]) >= self.tail_size:
+            self._tail_bytes -= len(self._tail.popleft())
+
+    @property
+    def head(self) -> bytes:
+        """The first bytes of the stream."""
+        return bytes(self._head)
+
+    @property
+    def tail(self) -> bytes:
+        """The last bytes of the stream that followed the head."""
+        return b"".join(self._tail)[-self.tail_size :]
+
+    @property
+    def omitted_bytes(self) -> int:
+        """Number of bytes between the head and the tail that were discarded."""
+        return self.total_bytes - len(self._head) - min(self._tail_bytes, self.tail_size)
+
+
+def clean_output_lines(data: bytes) -> List[str]:
+    """
+    Turn raw command output into the non-blank lines a terminal would show.
+
+    Escape sequences are removed, text before a carriage return is treated as
+    overwritten and trailing whitespace is stripped, approximating what the
+    pyte screen produces for the PTY path.
+
+    Args:
+        data: Raw output bytes
+
+    Returns:
+        List[str]: The non-blank output lines
+    """
+    text = ANSI_ESCAPE_RE.sub(b"", data).decode("utf-8", errors="ignore")
+    lines = []
+    for line in text.replace("\r\n", "\n").split("\n"):
+        line = line.rstrip("\r").rsplit("\r", 1)[-1].rstrip()
+        if line.strip():
+            lines.append(line)
+    return lines
+
+
+def _format_head_tail(buffer: HeadTailBuffer, suffix: str, limit: int) -> bytes:
+    """Build the returned output from a HeadTailBuffer, keeping it within limit bytes."""
+    head = buffer.head
+    tail = buffer.tail
+
+    # Move the head's last (possibly partial) line over to the tail, where it
+    # continues, or drop it if the bytes following it were discarded
+    cut = head.rfind(b"\n") + 1
+    if tail and cut:
+        head, partial = head[:cut], head[cut:]
+        if buffer.omitted_bytes == 0:
+            tail = partial + tail
+        else:
+            tail = tail[tail.find(b"\n") + 1 :]
+
+    head_text = "\n".join(clean_output_lines(head))
+    tail_text = "\n".join(clean_output_lines(tail))
+    suffix_bytes = suffix.encode("utf-8")
+
+    if buffer.omitted_bytes == 0:
+        combined = "\n".join(filter(None, [head_text, tail_text])).encode("utf-8")
+        if len(combined) + len(suffix_bytes) <= limit:
+            return combined + suffix_bytes
+
+    head_bytes = head_text.encode("utf-8")
+    marker = f"[... output truncated, {buffer.total_bytes} bytes in total ...]\n"
+    if head_bytes:
+        marker = "\n" + marker
+    marker_bytes = marker.encode("utf-8")
+    budget = max(limit - len(head_bytes) - len(marker_bytes) - len(suffix_bytes), 0)
+
+    tail_bytes = tail_text.encode("utf-8")
+    if len(tail_bytes) > budget:
+        tail_bytes = tail_bytes[len(tail_bytes) - budget :]
+        # Start at a line boundary, and never in the middle of a character
+        newline = tail_bytes.find(b"\n")
+        if newline != -1:
+            tail_bytes = tail_bytes[newline + 1 :]
+        tail_bytes = tail_bytes.decode("utf-8", errors="ignore").encode("utf-8")
+    return head_bytes + marker_bytes + tail_bytes + suffix_bytes
+
+
+def _stdin_is_tty() -> bool:
+    """Return whether stdin is an interactive terminal."""
+    try:
+        return sys.stdin is not None and sys.stdin.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+
+def run_piped_command(
+    cmd: List[str], env: dict, expected_runtime_seconds: int = 30
+) -> Tuple[bytes, int]:
+    """
+    Run a non-interactive command with plain pipes instead of a terminal emulator.
+
+    Output (stdout and stderr combined) is echoed as it arrives, read in large
+    chunks and retained in a HeadTailBuffer, so commands producing a lot of
+    output don't pay for terminal emulation or grow memory use.
+
+    Args:
+        cmd: A list containing the command and its arguments
+        env: Environment variables for the command
+        expected_runtime_seconds: Expected runtime in seconds. The command is
+            terminated after 2x and killed after 3x this value.
+
+    Returns:
+        Tuple[bytes, int]: The UTF-8 encoded output, limited to
+            OUTPUT_LIMIT_BYTES and keeping both its start and end, and the
+            return code
+    """
+    popen_kwargs = {}
+    if sys.platform != "win32":
+        popen_kwargs["start_new_session"] = True
+
+    proc = subprocess.Popen(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        bufsize=0,
+        env=env,
+        **popen_kwargs,
+    )
+
+    finished = threading.Event()
+    was_terminated = False
+
+    def stop_process(force: bool = False) -> None:
+        try:
+            if sys.platform == "win32":
+                if force:
+                    proc.kill()
+                else:
+                    proc.terminate()
+            else:
+                os.killpg(proc.pid, signal.SIGKILL if force else signal.SIGTERM)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def watchdog() -> None:
+        nonlocal was_terminated
+        if finished.wait(2 * expected_runtime_seconds):
+            return
+        was_terminated = True
+        stop_process()
+        if not finished.wait(expected_runtime_seconds):
+            stop_process(force=True)
+
+    watchdog_thread = threading.Thread(target=watchdog, daemon=True)
+    watchdog_thread.start()
+
+    buffer = HeadTailBuffer()
+    stdout_fd = proc.stdout.fileno()
+    try:
+        while True:
+            data = os.read(stdout_fd, PIPE_READ_SIZE)
+            if not data:
+                break
+            buffer.write(data)
+            os.write(1, data)
+    except KeyboardInterrupt:
+        stop_process()
+    finally:
+        proc.stdout.close()
+        proc.wait()
+        finished.set()
+        watchdog_thread.join()
+
+    suffix = ""
+    if was_terminated:
+        suffix = f"\n[Process exceeded timeout ({expected_runtime_seconds} seconds expected)]"
+
+    return _format_head_tail(buffer, suffix, OUTPUT_LIMIT_BYTES), proc.returncode
+
+
 def run_interactive_command(
-    cmd: List[str], expected_runtime_seconds: int = 30
+    cmd: List[str],
+    expected_runtime_seconds: int = 30,
+    use_pipes: Optional[bool] = None,
 ) -> Tuple[bytes, int]:
     """
     Runs an interactive command with output capture, capturing final scrollback history.
@@ -159,12 +387,19 @@ def run_interactive_command(
     - Handles raw terminal mode for proper input forwarding
     - Uses process groups for proper signal handling
 
+    When stdin is not an interactive terminal on Unix, nobody can type into
+    the command, so by default it is run through run_piped_command instead:
+    no PTY or terminal emulation, large reads, and only the head and tail of
+    the output retained.
+
     Args:
       cmd: A list containing the command and its arguments.
       expected_runtime_seconds: Expected runtime in seconds, defaults to 30.
         If process exceeds 2x this value, it will be terminated gracefully.
         If process exceeds 3x this value, it will be killed forcefully.
         Must be between 1 and 1800 seconds (30 minutes).
+      use_pipes: Run the command with plain pipes instead of a terminal.
+        Defaults to doing so when stdin is not an interactive terminal (Unix only).
 
     Returns:
       A tuple of (captured_output, return_code), where captured_output is a UTF-8 encoded
@@ -206,6 +441,11 @@ def run_interactive_command(
         }
     )
 
+    if use_pipes is None:
+        use_pipes = sys.platform != "win32" and not _stdin_is_tty()
+    if use_pipes:
+        return run_piped_command(cmd, env, expected_runtime_seconds)
+
     # Create process based on platform
     proc, master_fd = create_process(cmd, env, cols, rows)
 
@@ -452,15 +692,15 @@ def run_interactive_command(
         timeout_msg = f"\n[Process exceeded timeout ({expected_runtime_seconds} seconds expected)]"
         final_output += timeout_msg
 
-    # Limit output to the last 8000 bytes
+    # Limit output to the last OUTPUT_LIMIT_BYTES bytes
     if isinstance(final_output, str):
-        final_output = final_output[-8000:]
+        final_output = final_output[-OUTPUT_LIMIT_BYTES:]
         final_output = final_output.encode("utf-8")
     elif isinstance(final_output, bytes):
-        final_output = final_output[-8000:]
+        final_output = final_output[-OUTPUT_LIMIT_BYTES:]
     else:
         # Handle any unexpected type
-        final_output = str(final_output)[-8000:].encode("utf-8")
+        final_output = str(final_output)[-OUTPUT_LIMIT_BYTES:].encode("utf-8")
 
     return final_output, proc.returncode
 
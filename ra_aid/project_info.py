@@ -12,8 +12,9 @@ __all__ = [
 ]
 
 from ra_aid.console.formatting import cpm
-from ra_aid.file_listing import FileListerError, get_file_listing
-from ra_aid.project_state import ProjectStateError, is_new_project
+from ra_aid.file_listing import FileListerError
+from ra_aid.project_snapshot import get_project_snapshot
+from ra_aid.project_state import ProjectStateError
 from ra_aid.database.repositories.trajectory_repository import get_trajectory_repository
 from ra_aid.database.repositories.human_input_repository import (
     get_human_input_repository,
@@ -58,13 +59,16 @@ def get_project_info(directory: str, file_limit: Optional[int] = None) -> Projec
         FileListerError: If there are errors listing files
     """
     try:
-        # Check if project is new
-        new_status = is_new_project(directory)
-
-        # Get file listing
-        files, total = get_file_listing(directory, limit=file_limit)
+        # New-project status and file listing, reused from this process or
+        # from the previous run while the project is unchanged
+        snapshot = get_project_snapshot(directory)
+        files = (
+            snapshot.files[:file_limit] if file_limit is not None else list(snapshot.files)
+        )
 
-        return ProjectInfo(is_new=new_status, files=files, total_files=total)
+        return ProjectInfo(
+            is_new=snapshot.is_new, files=files, total_files=len(snapshot.files)
+        )
 
     except (ProjectStateError, FileListerError):
         # Re-raise known errors
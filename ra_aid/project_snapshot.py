@@ -0,0 +1,258 @@
+"""
+Persistent project snapshots.
+
+Every agent prompt includes the project info: whether the project is new and
+its file listing. Within a process the listing is cached by ProjectFileIndex;
+this module also keeps a snapshot of both in the project's .ra-aid directory,
+so that the next ra-aid run in an unchanged git work tree starts warm.
+
+A snapshot is keyed by the git HEAD and is only used while the modification
+times of the git index, the ignore files, the project directory and every
+directory containing a listed file are unchanged, the same check that
+ProjectFileIndex makes within a process. A commit, checkout or staged change
+rewrites the index, and creating, deleting or renaming a file updates its
+directory. Hashing `git status --untracked-files=all` instead would walk the
+whole work tree, which costs as much as listing it again.
+"""
+
+import json
+import os
+import subprocess
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+from ra_aid.config import PROJECT_SNAPSHOT_FILE
+from ra_aid.file_index import (
+    RACY_WINDOW_NS,
+    get_project_file_index,
+    listing_watch_paths,
+    path_fingerprint,
+)
+from ra_aid.logging_config import get_logger
+from ra_aid.project_state import is_new_project
+
+logger = get_logger(__name__)
+
+# Bump when the snapshot contents change, so that files written by an older
+# version are rebuilt
+PROJECT_SNAPSHOT_FORMAT = 2
+
+
+@dataclass
+class ProjectSnapshot:
+    """Project information shared by every agent prompt.
+
+    Attributes:
+        is_new: Whether the project is new/empty
+        files: Every file in the project listing (no limit applied). The list
+            is shared between callers and must not be modified.
+    """
+
+    is_new: bool
+    files: List[str]
+
+
+def git_state(directory: str) -> Optional[Tuple[str, Optional[str]]]:
+    """
+    Get the git directory and HEAD commit of a work tree.
+
+    Args:
+        directory: Path of the project directory
+
+    Returns:
+        Optional[Tuple[str, Optional[str]]]: The absolute git directory and
+            the HEAD commit (None before the first commit), or None if the
+            directory is not in a git work tree
+    """
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--absolute-git-dir", "HEAD"],
+            cwd=directory,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode == 0:
+            git_dir, head = result.stdout.split()
+            return git_dir, head
+        # HEAD can't be resolved in a repository without commits
+        result = subprocess.run(
+            ["git", "rev-parse", "--absolute-git-dir"],
+            cwd=directory,
+            capture_output=True,
+            text=True,
+        )
+    except (OSError, ValueError):
+        return None
+    if result.returncode != 0 or not result.stdout.strip():
+        return None
+    return result.stdout.strip(), None
+
+
+def project_snapshot_path(directory: str, state_dir: Optional[str] = None) -> str:
+    """
+    Path of the snapshot file of a project.
+
+    Args:
+        directory: Absolute path of the project directory
+        state_dir: Project state directory (default: .ra-aid in the project directory)
+
+    Returns:
+        str: The path of the snapshot file
+    """
+    if state_dir is None:
+        state_dir = os.path.join(directory, ".ra-aid")
+    return os.path.join(state_dir, PROJECT_SNAPSHOT_FILE)
+
+
+def load_project_snapshot(
+    path: str, key: Dict[str, object]
+) -> Optional[Tuple[ProjectSnapshot, Tuple[str, ...]]]:
+    """
+    Load a snapshot file if it was written for key and is still fresh.
+
+    Args:
+        path: Path of the snapshot file
+        key: Project directory and HEAD the snapshot must have been built for
+
+    Returns:
+        Optional[Tuple[ProjectSnapshot, Tuple[str, ...]]]: The snapshot and the
+            paths it depends on, or None if it is missing, unreadable or stale
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            stored = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.debug(f"Ignoring unreadable project snapshot {path}: {e}")
+        return None
+    if not isinstance(stored, dict) or stored.get("key") != key:
+        return None
+    try:
+        fingerprint = tuple((p, mtime) for p, mtime in stored["fingerprint"])
+        snapshot = ProjectSnapshot(**stored["snapshot"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    watch_paths = tuple(p for p, _ in fingerprint)
+    if path_fingerprint(watch_paths) != fingerprint:
+        return None
+    return snapshot, watch_paths
+
+
+def save_project_snapshot(
+    path: str,
+    key: Dict[str, object],
+    snapshot: ProjectSnapshot,
+    watch_paths: Tuple[str, ...],
+    started_ns: int,
+) -> None:
+    """
+    Write a snapshot file atomically.
+
+    Nothing is written unless the state directory already exists (ra-aid
+    creates it when it opens the project database), or when a watched path
+    was modified while the snapshot was being built. Failing to write is not
+    an error.
+
+    Args:
+        path: Path of the snapshot file
+        key: Project directory and HEAD the snapshot was built for
+        snapshot: The snapshot to write
+        watch_paths: Paths whose modification times the snapshot depends on
+        started_ns: When building the snapshot started (time.time_ns())
+    """
+    directory = os.path.dirname(path)
+    if not os.path.isdir(directory):
+        return
+    fingerprint = path_fingerprint(watch_paths)
+    if any(
+        mtime is not None and mtime >= started_ns - RACY_WINDOW_NS
+        for _, mtime in fingerprint
+    ):
+        # Can't tell whether the listing saw the latest change
+        return
+    try:
+        fd, tmp_path = tempfile.mkstemp(
+            dir=directory, prefix=".project_snapshot-", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "key": key,
+                        "fingerprint": fingerprint,
+                        "snapshot": asdict(snapshot),
+                    },
+                    f,
+                )
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        logger.debug(f"Could not write project snapshot {path}: {e}")
+
+
+def _build_project_snapshot(
+    directory: str, state_dir: Optional[str], watch_paths: Dict[str, Tuple[str, ...]]
+) -> ProjectSnapshot:
+    """Load the snapshot of a project from disk, or build it and save it."""
+    index = get_project_file_index()
+    state = git_state(directory)
+    if state is not None:
+        git_dir, head = state
+        key = {"format": PROJECT_SNAPSHOT_FORMAT, "directory": directory, "head": head}
+        path = project_snapshot_path(directory, state_dir)
+        loaded = load_project_snapshot(path, key)
+        if loaded is not None:
+            snapshot, watch_paths["paths"] = loaded
+            logger.debug(f"Loaded project snapshot from {path}")
+            # Seed the listing used by the file tools with the stored one
+            index.cached(
+                ("files", directory, False),
+                lambda: snapshot.files,
+                lambda files: watch_paths["paths"],
+            )
+            return snapshot
+
+    started_ns = time.time_ns()
+    is_new = is_new_project(directory)
+    files, _ = index.get_file_listing(directory)
+    snapshot = ProjectSnapshot(is_new=is_new, files=files)
+    if state is not None:
+        watch_paths["paths"] = listing_watch_paths(directory, files, git_dir)
+        save_project_snapshot(path, key, snapshot, watch_paths["paths"], started_ns)
+    return snapshot
+
+
+def get_project_snapshot(
+    directory: str, state_dir: Optional[str] = None
+) -> ProjectSnapshot:
+    """
+    Get the new-project status and file listing of a project.
+
+    Repeated calls in a process (e.g. by nested agents) are answered by the
+    shared ProjectFileIndex; the first call in a process loads the snapshot
+    written by a previous run when the project has not changed since.
+
+    Args:
+        directory: Path to the project directory
+        state_dir: Project state directory (default: .ra-aid in the project directory)
+
+    Returns:
+        ProjectSnapshot: The project's snapshot
+
+    Raises:
+        ProjectStateError: If the project state can't be checked
+        FileListerError: If the files can't be listed
+    """
+    path = os.path.realpath(directory)
+    watch_paths: Dict[str, Tuple[str, ...]] = {}
+    return get_project_file_index().cached(
+        ("project_snapshot", path),
+        lambda: _build_project_snapshot(path, state_dir, watch_paths),
+        lambda snapshot: watch_paths.get("paths")
+        or listing_watch_paths(path, snapshot.files),
+    )
@@ -32,7 +32,8 @@ def get_all_sessions_usage() -> Tuple[List[Dict[str, Any]], int]:
     """
     Get usage statistics for all sessions.
     
-    This function retrieves all sessions and calculates their usage metrics.
+    This function retrieves all sessions and their usage metrics, using one
+    query for the sessions and one for the session_usage rollup.
     
     Returns:
         Tuple[List[Dict[str, Any]], int]: A tuple containing:
@@ -50,49 +51,46 @@ def get_all_sessions_usage() -> Tuple[List[Dict[str, Any]], int]:
             
         # Initialize database connection using DatabaseManager context
         with DatabaseManager() as db:
-            # Get all session IDs
-            with SessionRepositoryManager(db) as session_repo:
-                session_ids = session_repo.get_all_session_ids()
-                
-                if not session_ids:
+            with SessionRepositoryManager(db) as session_repo, \
+                    TrajectoryRepositoryManager(db) as trajectory_repo:
+                # Get all sessions with their display names in one query
+                sessions = session_repo.get_all_with_display_names()
+
+                if not sessions:
                     return [create_empty_result("No sessions found in database")], 1
-                
-                # Get usage totals for each session
+
+                # Get usage totals for all sessions from the rollup in one query
+                usage_by_session = trajectory_repo.get_all_session_usage_totals()
+
                 results = []
-                with TrajectoryRepositoryManager(db) as trajectory_repo:
-                    for session_id in session_ids:
-                        # Get session details
-                        session = session_repo.get(session_id)
-                        if not session:
-                            continue
-                            
-                        # Get usage totals for the session
-                        usage_totals = trajectory_repo.get_session_usage_totals(session_id)
-                        
-                        # Create result object with session info and usage totals
-                        result = {
-                            "session_id": session.id,
-                            "session_start_time": session.start_time.isoformat() if session.start_time else None,
-                            "session_display_name": session.display_name,
-                            **usage_totals  # Unpack usage totals directly
-                        }
-                        
-                        results.append(result)
-                    
-                    # Calculate grand totals
-                    grand_total = {
-                        "session_id": "all",
-                        "session_display_name": "All Sessions",
-                        "total_cost": sum(r["total_cost"] for r in results),
-                        "total_input_tokens": sum(r["total_input_tokens"] for r in results),
-                        "total_output_tokens": sum(r["total_output_tokens"] for r in results),
-                        "total_tokens": sum(r["total_tokens"] for r in results)
+                for session in sessions:
+                    # Sessions without model usage have no rollup row
+                    usage_totals = usage_by_session.get(session.id) or create_empty_result()
+
+                    # Create result object with session info and usage totals
+                    result = {
+                        "session_id": session.id,
+                        "session_start_time": session.start_time.isoformat() if session.start_time else None,
+                        "session_display_name": session.display_name,
+                        **usage_totals  # Unpack usage totals directly
                     }
-                    
-                    # Add grand total to the beginning of the results
-                    results.insert(0, grand_total)
-                    
-                    return results, 0
+
+                    results.append(result)
+
+                # Calculate grand totals
+                grand_total = {
+                    "session_id": "all",
+                    "session_display_name": "All Sessions",
+                    "total_cost": sum(r["total_cost"] for r in results),
+                    "total_input_tokens": sum(r["total_input_tokens"] for r in results),
+                    "total_output_tokens": sum(r["total_output_tokens"] for r in results),
+                    "total_tokens": sum(r["total_tokens"] for r in results)
+                }
+
+                # Add grand total to the beginning of the results
+                results.insert(0, grand_total)
+
+                return results, 0
     except Exception as e:
         return [create_empty_result(str(e))], 1
 
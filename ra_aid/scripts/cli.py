@@ -10,6 +10,7 @@ import json
 import argparse
 from ra_aid.scripts.last_session_usage import get_latest_session_usage
 from ra_aid.scripts.all_sessions_usage import get_all_sessions_usage
+from ra_aid.scripts.session_retention import import_archives, prune_old_sessions, vacuum
 
 def session_usage_command():
     """
@@ -33,6 +34,44 @@ def all_sessions_usage_command():
     print(json.dumps(results, indent=2))
     return status_code
 
+def prune_command(args):
+    """
+    Command-line entry point for pruning old sessions.
+
+    Sessions outside the retention policy are archived and deleted, and the
+    results are output as JSON to stdout.
+    """
+    result, status_code = prune_old_sessions(
+        keep_sessions=args.keep_sessions,
+        keep_days=args.keep_days,
+        archive=not args.no_archive,
+        archive_dir=args.archive_dir,
+        dry_run=args.dry_run,
+        vacuum=not args.no_vacuum,
+    )
+    print(json.dumps(result, indent=2))
+    return status_code
+
+def import_archive_command(args):
+    """
+    Command-line entry point for importing archived sessions.
+
+    The new session IDs are output as JSON to stdout.
+    """
+    result, status_code = import_archives(args.archives)
+    print(json.dumps(result, indent=2))
+    return status_code
+
+def vacuum_command():
+    """
+    Command-line entry point for reclaiming unused database space.
+
+    The pages freed and the new database size are output as JSON to stdout.
+    """
+    result, status_code = vacuum()
+    print(json.dumps(result, indent=2))
+    return status_code
+
 def main():
     """Main entry point for the CLI."""
     parser = argparse.ArgumentParser(description="RA.Aid utility scripts")
@@ -43,13 +82,51 @@ def main():
     
     # All sessions command
     all_parser = subparsers.add_parser("all", help="Get usage statistics for all sessions")
-    
+
+    # Session retention commands
+    prune_parser = subparsers.add_parser(
+        "prune", help="Archive and delete sessions outside a retention policy"
+    )
+    prune_parser.add_argument(
+        "--keep-sessions", type=int, help="Keep this many most recent sessions"
+    )
+    prune_parser.add_argument(
+        "--keep-days", type=float, help="Keep the sessions started in the last N days"
+    )
+    prune_parser.add_argument(
+        "--archive-dir", help="Directory for session archives (default: .ra-aid/archive)"
+    )
+    prune_parser.add_argument(
+        "--no-archive", action="store_true", help="Delete sessions without archiving them"
+    )
+    prune_parser.add_argument(
+        "--no-vacuum", action="store_true", help="Don't reclaim the freed space"
+    )
+    prune_parser.add_argument(
+        "--dry-run", action="store_true", help="Only list the sessions that would be pruned"
+    )
+
+    import_parser = subparsers.add_parser(
+        "import-archive", help="Import sessions archived by prune"
+    )
+    import_parser.add_argument("archives", nargs="+", help="Session archive files")
+
+    subparsers.add_parser(
+        "vacuum", help="Return unused database space to the operating system"
+    )
+
     args = parser.parse_args()
     
     if args.command == "latest" or not args.command:
         return session_usage_command()
     elif args.command == "all":
         return all_sessions_usage_command()
+    elif args.command == "prune":
+        return prune_command(args)
+    elif args.command == "import-archive":
+        return import_archive_command(args)
+    elif args.command == "vacuum":
+        return vacuum_command()
     else:
         parser.print_help()
         return 1
@@ -0,0 +1,156 @@
+"""
+Module to prune old sessions, re-import archived ones and reclaim database space.
+
+This module provides the functions behind the prune, import-archive and
+vacuum commands of the RA.Aid utility CLI (see ra_aid.scripts.cli).
+"""
+
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..database import DatabaseManager, ensure_migrations_applied
+from ..database.retention import (
+    IncrementalVacuum,
+    RetentionPolicy,
+    enable_incremental_vacuum,
+    free_page_count,
+    import_session_archive,
+    prune_sessions,
+)
+
+
+def _migrate() -> Optional[str]:
+    """Apply pending migrations, returning an error message if that fails."""
+    try:
+        if not ensure_migrations_applied():
+            return "Database migrations failed"
+    except Exception as e:
+        return f"Database migration error: {str(e)}"
+    return None
+
+
+def vacuum_database(db) -> Dict[str, Any]:
+    """
+    Return the unused pages of a database file to the operating system.
+
+    Databases not yet using incremental auto-vacuum are converted, which
+    rebuilds the file with a full VACUUM. Otherwise the pages are freed by an
+    IncrementalVacuum thread, in steps short enough not to block other ra-aid
+    processes using the database.
+
+    Args:
+        db: The database
+
+    Returns:
+        Dict[str, Any]: Whether the database was converted, the pages freed
+            and the database file size in bytes
+    """
+    free_before = free_page_count(db)
+    converted = enable_incremental_vacuum(db)
+    if not converted:
+        vacuum = IncrementalVacuum(db)
+        vacuum.start()
+        vacuum.join()
+    return {
+        "converted": converted,
+        "freed_pages": free_before - free_page_count(db),
+        "size_bytes": os.path.getsize(db.database),
+    }
+
+
+def prune_old_sessions(
+    keep_sessions: Optional[int] = None,
+    keep_days: Optional[float] = None,
+    archive: bool = True,
+    archive_dir: Optional[str] = None,
+    dry_run: bool = False,
+    vacuum: bool = True,
+) -> Tuple[Dict[str, Any], int]:
+    """
+    Archive and delete the sessions outside a retention policy.
+
+    Args:
+        keep_sessions: Number of most recent sessions to keep
+        keep_days: Age in days of the oldest session to keep
+        archive: Whether to archive the sessions before deleting them
+        archive_dir: Directory for the archives (default: .ra-aid/archive)
+        dry_run: Only report the sessions that would be pruned
+        vacuum: Whether to reclaim the freed space afterwards
+
+    Returns:
+        Tuple[Dict[str, Any], int]: A tuple containing:
+            - Dictionary with the pruned sessions, archives and deleted row counts
+            - Status code (0 for success, 1 for error)
+    """
+    try:
+        policy = RetentionPolicy(keep_sessions=keep_sessions, keep_days=keep_days)
+    except ValueError as e:
+        return {"error": str(e)}, 1
+
+    error = _migrate()
+    if error:
+        return {"error": error}, 1
+
+    try:
+        with DatabaseManager() as db:
+            if archive and archive_dir is None:
+                archive_dir = os.path.join(os.path.dirname(db.database), "archive")
+            result = prune_sessions(
+                policy, archive_dir=archive_dir if archive else None, dry_run=dry_run
+            )
+            output: Dict[str, Any] = {
+                "dry_run": dry_run,
+                "session_ids": result.session_ids,
+                "archives": result.archives,
+                "deleted": result.deleted,
+            }
+            if vacuum and result.deleted:
+                output["vacuum"] = vacuum_database(db)
+            return output, 0
+    except Exception as e:
+        return {"error": str(e)}, 1
+
+
+def import_archives(paths: List[str]) -> Tuple[Dict[str, Any], int]:
+    """
+    Import archived sessions.
+
+    Args:
+        paths: Paths of session archive files
+
+    Returns:
+        Tuple[Dict[str, Any], int]: A tuple containing:
+            - Dictionary mapping each archive path to its new session ID
+            - Status code (0 for success, 1 for error)
+    """
+    error = _migrate()
+    if error:
+        return {"error": error}, 1
+
+    try:
+        with DatabaseManager():
+            return {
+                "sessions": {path: import_session_archive(path) for path in paths}
+            }, 0
+    except Exception as e:
+        return {"error": str(e)}, 1
+
+
+def vacuum() -> Tuple[Dict[str, Any], int]:
+    """
+    Reclaim the unused space of the database file.
+
+    Returns:
+        Tuple[Dict[str, Any], int]: A tuple containing:
+            - Dictionary in the format returned by vacuum_database
+            - Status code (0 for success, 1 for error)
+    """
+    error = _migrate()
+    if error:
+        return {"error": error}, 1
+
+    try:
+        with DatabaseManager() as db:
+            return vacuum_database(db), 0
+    except Exception as e:
+        return {"error": str(e)}, 1
@@ -7,8 +7,9 @@ It implements routes for creating, listing, and retrieving sessions
 with proper validation and error handling.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 import peewee
 from pydantic import BaseModel, Field
 
@@ -205,18 +206,32 @@ async def create_session(
     "/{session_id}/trajectory",
     response_model=List[TrajectoryModel],
     summary="Get session trajectories",
-    description="Get all trajectory records associated with a specific session",
+    description=(
+        "Get trajectory records associated with a specific session. "
+        "Pass after_id and/or limit to page through the records in ID order."
+    ),
 )
 async def get_session_trajectories(
     session_id: int,
+    after_id: Optional[int] = Query(
+        None, ge=0, description="Only return records with an ID greater than this"
+    ),
+    limit: Optional[int] = Query(
+        None, ge=1, le=1000, description="Maximum number of records to return"
+    ),
     session_repo: SessionRepository = Depends(get_repository),
     trajectory_repo: TrajectoryRepository = Depends(get_trajectory_repository),
 ) -> List[TrajectoryModel]:
     """
-    Get all trajectory records for a specific session.
+    Get trajectory records for a specific session.
+    
+    Records are always returned in ID order, so clients can page through
+    long sessions by passing the last ID they received as after_id.
     
     Args:
         session_id: The ID of the session to get trajectories for
+        after_id: Optional ID; only records with a greater ID are returned
+        limit: Optional maximum number of records to return
         session_repo: SessionRepository dependency injection
         trajectory_repo: TrajectoryRepository dependency injection
         
@@ -244,7 +259,9 @@ async def get_session_trajectories(
             )
             
         # Get trajectories for the session
-        trajectories = trajectory_repo.get_trajectories_by_session(session_id)
+        trajectories = trajectory_repo.get_trajectories_by_session(
+            session_id, after_id=after_id, limit=limit
+        )
         
         # Log the number of trajectories found
         logger.info(f"Found {len(trajectories)} trajectories for session ID: {session_id}")
@@ -285,4 +302,68 @@ async def get_session_trajectories(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Database error: {str(e)}",
-        )
\ No newline at end of file
+        )
+
+
+@router.get(
+    "/{session_id}/trajectory/stream",
+    summary="Stream session trajectories",
+    description=(
+        "Stream all trajectory records of a session as newline-delimited JSON, "
+        "in ID order, without loading the whole session into memory"
+    ),
+    response_class=StreamingResponse,
+)
+async def stream_session_trajectories(
+    session_id: int,
+    after_id: Optional[int] = Query(
+        None, ge=0, description="Only stream records with an ID greater than this"
+    ),
+    batch_size: int = Query(
+        500, ge=1, le=5000, description="Number of records fetched per database query"
+    ),
+    session_repo: SessionRepository = Depends(get_repository),
+    trajectory_repo: TrajectoryRepository = Depends(get_trajectory_repository),
+) -> StreamingResponse:
+    """
+    Stream the trajectory records of a session as NDJSON.
+    
+    Records are read in keyset-paginated batches and written one JSON object
+    per line, so memory use stays bounded for sessions with many records.
+    
+    Args:
+        session_id: The ID of the session to stream trajectories for
+        after_id: Optional ID; only records with a greater ID are streamed
+        batch_size: Number of records fetched per database query
+        session_repo: SessionRepository dependency injection
+        trajectory_repo: TrajectoryRepository dependency injection
+        
+    Returns:
+        StreamingResponse: An application/x-ndjson response
+        
+    Raises:
+        HTTPException: With a 404 status code if the session is not found
+        HTTPException: With a 500 status code if there's a database error
+    """
+    try:
+        session = session_repo.get(session_id)
+    except peewee.DatabaseError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(e)}",
+        )
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Session with ID {session_id} not found",
+        )
+
+    async def ndjson_lines() -> AsyncIterator[str]:
+        # Iterate on the event loop thread like the other endpoints do, since
+        # SQLite connections are per-thread; each batch is a short query.
+        for trajectory in trajectory_repo.iter_trajectories_by_session(
+            session_id, after_id=after_id, batch_size=batch_size
+        ):
+            yield trajectory.model_dump_json() + "\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
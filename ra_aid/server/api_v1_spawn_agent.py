@@ -18,7 +18,7 @@ from ra_aid.database.repositories.trajectory_repository import TrajectoryReposit
 from ra_aid.database.repositories.work_log_repository import WorkLogRepositoryManager
 from ra_aid.database.repositories.config_repository import ConfigRepositoryManager, get_config_repository
 from ra_aid.env_inv_context import EnvInvManager
-from ra_aid.env_inv import EnvDiscovery
+from ra_aid.env_inv import discover_environment
 from ra_aid.llm import initialize_llm, get_model_default_temperature
 
 # Create logger
@@ -93,14 +93,12 @@ def run_agent_thread(
         # Initialize database connection
         db = DatabaseManager()
         
-        env_discovery = EnvDiscovery()
-        env_discovery.discover()
-        env_data = env_discovery.format_markdown()
+        env_data = discover_environment()
         
         # Get the thread configuration from kwargs
         thread_config = kwargs.get("thread_config", {})
         
-        with DatabaseManager() as db, \
+        with DatabaseManager(profile=source_config_repo.get("db_profile")) as db, \
              SessionRepositoryManager(db) as session_repo, \
              KeyFactRepositoryManager(db) as key_fact_repo, \
              KeySnippetRepositoryManager(db) as key_snippet_repo, \
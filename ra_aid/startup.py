@@ -0,0 +1,239 @@
+"""
+Concurrent startup steps for the ra-aid command.
+
+Most of what ra-aid does before its first LLM call is waiting: on subprocesses
+during environment discovery and the dependency check, on the network for the
+version check, on SQLite for migrations. StartupPipeline runs those steps on a
+thread pool, each as soon as the steps it requires have finished, while the
+main thread sets up the database and repositories. Per-step timings are
+logged at debug level (--log-level debug).
+
+Steps run in a copy of the context they were added from, so the repositories
+held in context variables by the main thread are available to them.
+"""
+
+import contextlib
+import contextvars
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from ra_aid.config import DEFAULT_STARTUP_WORKERS
+from ra_aid.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class StepTiming:
+    """When a startup step ran, relative to the start of the pipeline."""
+
+    name: str
+    thread: str
+    started: float
+    finished: float
+
+    @property
+    def duration(self) -> float:
+        """Run time of the step in seconds."""
+        return self.finished - self.started
+
+
+class StartupPipeline:
+    """
+    Runs startup steps concurrently according to their dependencies.
+
+    Steps added with add() run on a thread pool once every step they require
+    has finished; a step whose requirement failed fails with the same
+    exception. step() times work done on the calling thread. result() waits
+    for a step and returns its value, or raises what it raised (including
+    SystemExit, e.g. from check_dependencies).
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_STARTUP_WORKERS):
+        """
+        Initialize the pipeline.
+
+        Args:
+            max_workers: Number of threads running steps concurrently
+        """
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="ra-aid-startup"
+        )
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self.timings: List[StepTiming] = []
+        self._logged = 0
+
+    def __enter__(self) -> "StartupPipeline":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def add(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        *args: Any,
+        requires: Iterable[str] = (),
+        **kwargs: Any,
+    ) -> Future:
+        """
+        Schedule a step.
+
+        Args:
+            name: Unique name of the step
+            func: Function to run
+            *args: Positional arguments for func
+            requires: Names of steps that must finish before this one starts
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Future: The future of the step's result
+
+        Raises:
+            ValueError: If the name is taken or a required step is unknown
+        """
+        requires = list(requires)
+        with self._lock:
+            if name in self._futures:
+                raise ValueError(f"Startup step already exists: {name}")
+            unknown = [dep for dep in requires if dep not in self._futures]
+            if unknown:
+                raise ValueError(
+                    f"Startup step {name} requires unknown steps: {', '.join(unknown)}"
+                )
+            future: Future = Future()
+            self._futures[name] = future
+            dependencies = [self._futures[dep] for dep in requires]
+
+        context = contextvars.copy_context()
+        remaining = [len(dependencies)]
+
+        def submit() -> None:
+            try:
+                self._executor.submit(
+                    self._run, name, future, dependencies, context, func, args, kwargs
+                )
+            except RuntimeError:
+                # The pipeline was closed before the step's requirements finished
+                future.cancel()
+
+        def on_dependency_done(_: Future) -> None:
+            with self._lock:
+                remaining[0] -= 1
+                ready = remaining[0] == 0
+            if ready:
+                submit()
+
+        if not dependencies:
+            submit()
+        for dependency in dependencies:
+            dependency.add_done_callback(on_dependency_done)
+        return future
+
+    def _run(
+        self,
+        name: str,
+        future: Future,
+        dependencies: List[Future],
+        context: contextvars.Context,
+        func: Callable[..., Any],
+        args: tuple,
+        kwargs: Dict[str, Any],
+    ) -> None:
+        """Run a step whose dependencies have finished, resolving its future."""
+        if not future.set_running_or_notify_cancel():
+            return
+        for dependency in dependencies:
+            error = dependency.exception()
+            if error is not None:
+                future.set_exception(error)
+                return
+        with self._timed(name):
+            try:
+                value = context.run(func, *args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(value)
+
+    @contextlib.contextmanager
+    def _timed(self, name: str) -> Iterator[None]:
+        """Record the run time of a step."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            timing = StepTiming(
+                name=name,
+                thread=threading.current_thread().name,
+                started=started - self._origin,
+                finished=time.perf_counter() - self._origin,
+            )
+            with self._lock:
+                self.timings.append(timing)
+
+    def step(self, name: str) -> contextlib.AbstractContextManager:
+        """
+        Time a step run on the calling thread.
+
+        Args:
+            name: Name of the step
+
+        Returns:
+            A context manager around the step's work
+        """
+        return self._timed(name)
+
+    def result(self, name: str, timeout: Optional[float] = None) -> Any:
+        """
+        Wait for a step to finish and return its result.
+
+        Args:
+            name: Name of the step
+            timeout: Seconds to wait (default: no limit)
+
+        Returns:
+            Any: The value returned by the step
+
+        Raises:
+            KeyError: If there is no such step
+            BaseException: Whatever the step raised
+        """
+        future = self._futures[name]
+        if not future.done():
+            waited = time.perf_counter()
+            try:
+                return future.result(timeout)
+            finally:
+                logger.debug(
+                    f"Waited {(time.perf_counter() - waited) * 1000:.1f}ms "
+                    f"for startup step {name}"
+                )
+        return future.result()
+
+    def log_timings(self) -> None:
+        """Log the timings of the steps finished since the last call, at debug level."""
+        with self._lock:
+            timings = sorted(self.timings[self._logged :], key=lambda t: t.started)
+            self._logged = len(self.timings)
+        for timing in timings:
+            logger.debug(
+                f"Startup step {timing.name}: {timing.duration * 1000:.1f}ms "
+                f"(+{timing.started * 1000:.1f}ms to +{timing.finished * 1000:.1f}ms "
+                f"on {timing.thread})"
+            )
+
+    def close(self) -> None:
+        """
+        Stop accepting steps and log the timings not logged yet.
+
+        Steps still running finish in the background.
+        """
+        self._executor.shutdown(wait=False)
+        self.log_timings()
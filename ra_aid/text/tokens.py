@@ -0,0 +1,33 @@
+from typing import List, Optional, Union
+
+from langchain_core.messages import BaseMessage
+
+
+def estimate_tokens(content: Optional[Union[str, BaseMessage]]) -> int:
+    """Estimate token count for a message or string.
+
+    A conservative estimate of one token per two bytes of UTF-8, used where
+    counting with the model's tokenizer would be too slow.
+
+    Args:
+        content: A message or string; None counts as empty
+
+    Returns:
+        Estimated token count
+    """
+    if content is None:
+        return 0
+
+    if isinstance(content, BaseMessage):
+        text = content.content
+    else:
+        text = content
+
+    # create-react-agent tool calls can be lists
+    if isinstance(text, List):
+        text = str(text)
+
+    if not text:
+        return 0
+
+    return len(text.encode("utf-8")) // 2.0
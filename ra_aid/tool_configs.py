@@ -20,9 +20,11 @@ from ra_aid.tools import (
     mark_research_complete_no_implementation_required,
     put_complete_file_contents,
     read_file_tool,
+    read_memory,
     ripgrep_search,
     run_programming_task,
     run_shell_command,
+    search_memory,
     task_completed,
     web_search_tavily,
 )
@@ -141,6 +143,8 @@ def get_read_only_tools(
         # delete_key_facts,
         # delete_key_snippets,
         # deregister_related_files,
+        search_memory,
+        read_memory,
         list_directory_tree,
         read_file_tool,
         fuzzy_find_project_files,
@@ -329,7 +333,8 @@ def get_web_research_tools(expert_enabled: bool = True):
     Returns:
         list: List of tools configured for web research
     """
-    tools = [web_search_tavily, emit_research_notes, task_completed]
+    # read_memory fetches key facts and snippets left out of the prompt to fit the memory budget
+    tools = [web_search_tavily, emit_research_notes, read_memory, task_completed]
 
     if expert_enabled:
         tools.append(emit_expert_context)
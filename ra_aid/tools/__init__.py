@@ -10,6 +10,8 @@ from .memory import (
     emit_related_files,
     emit_research_notes,
     plan_implementation_completed,
+    read_memory,
+    search_memory,
     task_completed,
 )
 from .programmer import run_programming_task
@@ -32,10 +34,12 @@ __all__ = [
     "fuzzy_find_project_files",
     "list_directory_tree",
     "read_file_tool",
+    "read_memory",
     "run_programming_task",
     "run_shell_command",
     "put_complete_file_contents",
     "ripgrep_search",
+    "search_memory",
     "file_str_replace",
     "monorepo_detected",
     "existing_project_detected",
@@ -1,19 +1,42 @@
 import fnmatch
 import logging
-from typing import List, Tuple, Dict, Optional, Any
+import os
+import re
+import threading
+from array import array
+from collections import Counter, OrderedDict
+from typing import List, Tuple, Dict, Optional, Any, Pattern
 
-from fuzzywuzzy import process
 from git import Repo, exc
 from langchain_core.tools import tool
+from rapidfuzz import fuzz, process, utils
 from rich.console import Console
 from rich.markdown import Markdown
 from rich.panel import Panel
 
 from ra_aid.console.formatting import console_panel, cpm
-from ra_aid.file_listing import get_all_project_files, FileListerError
+from ra_aid.file_index import get_project_file_index
+from ra_aid.file_listing import FileListerError
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 console = Console()
 
+# Candidate lists at least this large are scored with process.cdist on all
+# CPU cores (requires numpy)
+PARALLEL_MIN_CANDIDATES = 20_000
+
+# Candidate lists at least this large get a trigram index, used to shortlist
+# the candidates sharing the most trigrams with the search term before scoring
+TRIGRAM_MIN_CANDIDATES = 50_000
+TRIGRAM_SHORTLIST_SIZE = 5_000
+
+# Number of (repo, filter) candidate sets kept in memory
+MAX_CACHED_CANDIDATE_SETS = 8
+
 
 def record_trajectory(
     tool_name: str,
@@ -67,6 +90,238 @@ DEFAULT_EXCLUDE_PATTERNS = [
 ]
 
 
+def _trigrams(text: str) -> set:
+    """Return the set of 3-character substrings of text."""
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _compile_patterns(patterns: Optional[List[str]]) -> Optional[Pattern]:
+    """Compile fnmatch patterns into a single regular expression (None if there are none)."""
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in patterns))
+
+
+class FuzzyCandidates:
+    """
+    Prebuilt search data for one project and one set of include/exclude patterns.
+
+    Holds the filtered candidate paths, their preprocessed (lowercased,
+    punctuation-stripped) forms and, for very large projects, a trigram index.
+    Each path gets a stable ID, so when the project's file list changes only
+    the added and removed paths are processed (see update).
+
+    Instances are shared by every agent of the process, so update and search
+    hold the instance's lock: a search never sees a half-applied update.
+    """
+
+    def __init__(
+        self,
+        source: List[str],
+        include_paths: Optional[List[str]],
+        exclude_patterns: List[str],
+    ) -> None:
+        self._include = _compile_patterns(include_paths)
+        self._exclude = _compile_patterns(exclude_patterns)
+        self._lock = threading.Lock()
+        self._reset()
+        self.update(source)
+
+    def _reset(self) -> None:
+        """Drop all candidates."""
+        # The file listing the candidates were built from
+        self.source: List[str] = []
+        # Indexed by candidate ID; removed candidates are left as None
+        self.paths: List[Optional[str]] = []
+        self.processed: List[Optional[str]] = []
+        self._ids: Dict[str, int] = {}
+        self.trigram_index: Optional[Dict[str, array]] = None
+
+    @property
+    def size(self) -> int:
+        """Number of current candidates."""
+        return len(self._ids)
+
+    def _is_candidate(self, path: str) -> bool:
+        """Check a path against the include and exclude patterns."""
+        if self._exclude is not None and self._exclude.match(path):
+            return False
+        return self._include is None or bool(self._include.match(path))
+
+    def _index(self, candidate_id: int) -> None:
+        """Add a candidate to the trigram index."""
+        for trigram in _trigrams(self.processed[candidate_id]):
+            postings = self.trigram_index.get(trigram)
+            if postings is None:
+                postings = self.trigram_index[trigram] = array("I")
+            postings.append(candidate_id)
+
+    def update(self, source: List[str]) -> None:
+        """
+        Bring the candidates up to date with a new project file listing.
+
+        Args:
+            source: The project's current file listing
+        """
+        with self._lock:
+            self._update(source)
+
+    def _update(self, source: List[str]) -> None:
+        """Apply a new file listing; the caller holds the lock."""
+        if source is self.source:
+            return
+
+        removed = set(self.source).difference(source) if self.source else set()
+        added = set(source).difference(self.source) if self.source else source
+        # Rebuild from scratch once too many slots are dead
+        if len(removed) > len(self._ids) // 2 and self._ids:
+            self._reset()
+            removed, added = set(), source
+        self.source = source
+
+        for path in removed:
+            candidate_id = self._ids.pop(path, None)
+            if candidate_id is not None:
+                # Removed IDs stay in the trigram postings; scoring skips None
+                self.paths[candidate_id] = None
+                self.processed[candidate_id] = None
+
+        for path in added:
+            if not self._is_candidate(path):
+                continue
+            candidate_id = len(self.paths)
+            self._ids[path] = candidate_id
+            self.paths.append(path)
+            self.processed.append(utils.default_process(path))
+            if self.trigram_index is not None:
+                self._index(candidate_id)
+
+        if self.trigram_index is None and self.size >= TRIGRAM_MIN_CANDIDATES:
+            self.trigram_index = {}
+            for candidate_id in self._ids.values():
+                self._index(candidate_id)
+
+    def _shortlist(self, query: str) -> Optional[List[int]]:
+        """Return the IDs of the candidates sharing the most trigrams with query."""
+        if self.trigram_index is None or len(query) < 3:
+            return None
+        postings = [self.trigram_index.get(t, ()) for t in _trigrams(query)]
+        # Trigrams found in a large share of the paths (like "py ") barely
+        # narrow the search and are the most expensive to count, so skip them
+        # unless nothing else is left
+        common = self.size // 4
+        selective = [p for p in postings if len(p) <= common]
+        counts: Counter = Counter()
+        for p in selective or postings:
+            counts.update(p)
+        return [
+            i for i, _ in counts.most_common(TRIGRAM_SHORTLIST_SIZE)
+            if self.processed[i] is not None
+        ]
+
+    def _score(
+        self, query: str, ids: Optional[List[int]], limit: int, threshold: int
+    ) -> List[Tuple[str, int]]:
+        """Score query against the given candidates (default: all of them)."""
+        choices = self.processed if ids is None else [self.processed[i] for i in ids]
+        # Scores are reported as integers, so keep candidates that round up to
+        # the threshold
+        cutoff = max(threshold - 0.5, 0)
+
+        if numpy is not None and len(choices) >= PARALLEL_MIN_CANDIDATES:
+            scores = process.cdist(
+                [query],
+                [c or "" for c in choices],
+                scorer=fuzz.WRatio,
+                score_cutoff=cutoff,
+                workers=-1,
+            )[0]
+            top = numpy.argsort(-scores, kind="stable")[:limit]
+            matches = [(int(i), float(scores[i])) for i in top if scores[i] > 0]
+        else:
+            # process.extract skips the None entries of removed candidates
+            matches = [
+                (i, score)
+                for _, score, i in process.extract(
+                    query, choices, scorer=fuzz.WRatio, limit=limit, score_cutoff=cutoff
+                )
+            ]
+
+        results = []
+        for i, score in matches:
+            path = self.paths[i if ids is None else ids[i]]
+            if path is not None and round(score) >= threshold:
+                results.append((path, int(round(score))))
+        return results
+
+    def search(self, search_term: str, limit: int, threshold: int) -> List[Tuple[str, int]]:
+        """
+        Find the candidates best matching search_term.
+
+        Args:
+            search_term: String to match against file paths
+            limit: Maximum number of results
+            threshold: Minimum similarity score (0-100)
+
+        Returns:
+            List of (file_path, match_score) tuples, best matches first
+        """
+        query = utils.default_process(search_term)
+        with self._lock:
+            shortlist = self._shortlist(query)
+            if shortlist is not None:
+                results = self._score(query, shortlist, limit, threshold)
+                if results:
+                    return results
+            # Small candidate sets, short terms, or no shortlisted match (e.g. typos)
+            return self._score(query, None, limit, threshold)
+
+
+_candidate_cache: "OrderedDict[tuple, FuzzyCandidates]" = OrderedDict()
+_candidate_cache_lock = threading.Lock()
+
+
+def get_fuzzy_candidates(
+    repo_path: str,
+    include_hidden: bool,
+    include_paths: Optional[List[str]],
+    exclude_patterns: List[str],
+) -> FuzzyCandidates:
+    """
+    Get the prebuilt search data for a project, updated to its current file list.
+
+    Args:
+        repo_path: Path to project directory
+        include_hidden: Whether to include hidden files
+        include_paths: Optional list of path patterns to include
+        exclude_patterns: Path patterns to exclude
+
+    Returns:
+        FuzzyCandidates: Search data for the project's current file list
+
+    Raises:
+        FileListerError: If there's an error accessing or listing files
+    """
+    source = get_project_file_index().get_files(repo_path, include_hidden=include_hidden)
+    key = (
+        os.path.realpath(repo_path),
+        include_hidden,
+        tuple(include_paths or ()),
+        tuple(exclude_patterns),
+    )
+    with _candidate_cache_lock:
+        candidates = _candidate_cache.get(key)
+        if candidates is None:
+            candidates = FuzzyCandidates(source, include_paths, exclude_patterns)
+            _candidate_cache[key] = candidates
+            while len(_candidate_cache) > MAX_CACHED_CANDIDATE_SETS:
+                _candidate_cache.popitem(last=False)
+        else:
+            candidates.update(source)
+            _candidate_cache.move_to_end(key)
+        return candidates
+
+
 @tool
 def fuzzy_find_project_files(
     search_term: str,
@@ -137,25 +392,14 @@ def fuzzy_find_project_files(
     all_exclude_patterns = DEFAULT_EXCLUDE_PATTERNS + (exclude_patterns or [])
     
     try:
-        # Get all project files using the common utility function
-        all_files = get_all_project_files(
-            repo_path, 
-            include_hidden=include_hidden, 
-            exclude_patterns=all_exclude_patterns
+        # Get the prebuilt candidates for the project's current file list
+        candidates = get_fuzzy_candidates(
+            repo_path, include_hidden, include_paths, all_exclude_patterns
         )
-        
-        # Apply include patterns if specified
-        if include_paths:
-            filtered_files = []
-            for pattern in include_paths:
-                filtered_files.extend(f for f in all_files if fnmatch.fnmatch(f, pattern))
-            all_files = filtered_files
-
-        # Perform fuzzy matching
-        matches = process.extract(search_term, all_files, limit=max_results)
+        total_files = candidates.size
 
-        # Filter by threshold
-        filtered_matches = [(path, score) for path, score in matches if score >= threshold]
+        # Perform fuzzy matching, keeping matches above the threshold
+        filtered_matches = candidates.search(search_term, max_results, threshold)
 
         # Build info panel content
         info_sections = []
@@ -182,7 +426,7 @@ def fuzzy_find_project_files(
         # Results statistics section
         stats_section = [
             "## Results Statistics",
-            f"**Total Files Scanned**: {len(all_files)}",
+            f"**Total Files Scanned**: {total_files}",
             f"**Matches Found**: {len(filtered_matches)}",
         ]
         info_sections.append("\n".join(stats_section))
@@ -211,7 +455,7 @@ def fuzzy_find_project_files(
             step_data={
                 "search_term": search_term,
                 "display_title": "Fuzzy Find Results",
-                "total_files": len(all_files),
+                "total_files": total_files,
                 "matches_found": len(filtered_matches)
             },
             record_type="tool_execution"
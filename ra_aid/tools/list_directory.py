@@ -12,6 +12,7 @@ from rich.panel import Panel
 from rich.tree import Tree
 
 from ra_aid.console.formatting import cpm
+from ra_aid.file_index import get_project_file_index
 
 console = Console()
 
@@ -204,10 +205,15 @@ def list_directory_tree(
     if not root_path.exists():
         return f"Error: Path does not exist: {path}"
     
-    # Load .gitignore patterns if present (only needed for directories)
+    # Load .gitignore patterns if present (only needed for directories), reusing
+    # the parsed patterns until the ignore files change
     spec = None
     if root_path.is_dir():
-        spec = load_gitignore_patterns(root_path)
+        spec = get_project_file_index().cached(
+            ("gitignore_spec", str(root_path)),
+            lambda: load_gitignore_patterns(root_path),
+            lambda _: [str(root_path / ".gitignore"), str(root_path / ".aiderignore")],
+        )
         # Create tree for directory
         tree = Tree(f"📁 {root_path}/")
         config = DirScanConfig(
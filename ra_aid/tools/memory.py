@@ -22,6 +22,7 @@ from ra_aid.database.repositories.trajectory_repository import get_trajectory_re
 from ra_aid.database.repositories.work_log_repository import get_work_log_repository
 from ra_aid.model_formatters import key_snippets_formatter
 from ra_aid.logging_config import get_logger
+from ra_aid.memory_gc import get_memory_gc_scheduler
 
 logger = get_logger(__name__)
 
@@ -92,18 +93,15 @@ def emit_research_notes(notes: str) -> str:
         
         log_work_event(f"Stored research note #{note_id}.")
         
-        # Check if we need to clean up notes (more than 30)
+        # Schedule a background clean up if there are too many notes
         try:
-            all_notes = get_research_note_repository().get_all()
-            if len(all_notes) > 30:
-                # Trigger the research notes cleaner agent
-                try:
-                    from ra_aid.agents.research_notes_gc_agent import run_research_notes_gc_agent
-                    run_research_notes_gc_agent()
-                except Exception as e:
-                    logger.error(f"Failed to run research notes cleaner: {str(e)}")
+            get_memory_gc_scheduler().notify(
+                "research_notes", get_research_note_repository().count()
+            )
         except RuntimeError as e:
             logger.error(f"Failed to access research note repository: {str(e)}")
+        except Exception as e:
+            logger.error(f"Failed to schedule research notes cleaner: {str(e)}")
             
         return f"Research note #{note_id} stored."
     except RuntimeError as e:
@@ -131,15 +129,16 @@ def emit_key_facts(facts: List[str]) -> str:
     except Exception as e:
         logger.warning(f"Failed to get recent human input: {str(e)}")
     
-    for fact in facts:
-        try:
-            # Create fact in database using repository
-            created_fact = get_key_fact_repository().create(fact, human_input_id=human_input_id)
-            fact_id = created_fact.id
-        except RuntimeError as e:
-            logger.error(f"Failed to access key fact repository: {str(e)}")
-            console.print(f"Error storing fact: {str(e)}", style="red")
-            continue
+    try:
+        # Create all facts in a single transaction using repository
+        created_facts = get_key_fact_repository().create_many(facts, human_input_id=human_input_id)
+    except RuntimeError as e:
+        logger.error(f"Failed to access key fact repository: {str(e)}")
+        console.print(f"Error storing facts: {str(e)}", style="red")
+        created_facts = []
+
+    for fact, created_fact in zip(facts, created_facts):
+        fact_id = created_fact.id
 
         # Record to trajectory before displaying panel
         try:
@@ -170,22 +169,125 @@ def emit_key_facts(facts: List[str]) -> str:
 
     log_work_event(f"Stored {len(facts)} key facts.")
     
-    # Check if we need to clean up facts (more than 30)
+    # Schedule a background clean up if there are too many facts
     try:
-        all_facts = get_key_fact_repository().get_all()
-        if len(all_facts) > 50:
-            # Trigger the key facts cleaner agent
-            try:
-                from ra_aid.agents.key_facts_gc_agent import run_key_facts_gc_agent
-                run_key_facts_gc_agent()
-            except Exception as e:
-                logger.error(f"Failed to run key facts cleaner: {str(e)}")
+        get_memory_gc_scheduler().notify("key_facts", get_key_fact_repository().count())
     except RuntimeError as e:
         logger.error(f"Failed to access key fact repository: {str(e)}")
+    except Exception as e:
+        logger.error(f"Failed to schedule key facts cleaner: {str(e)}")
     
     return "Facts stored."
 
 
+# Kind accepted by search_memory and read_memory -> (label, repository accessor, formatter)
+_MEMORY_SEARCH_KINDS = {
+    "key_facts": (
+        "Key fact",
+        lambda: get_key_fact_repository(),
+        lambda fact: fact.content,
+    ),
+    "key_snippets": (
+        "Key snippet",
+        lambda: get_key_snippet_repository(),
+        lambda snippet: (
+            f"{snippet.filepath}:{snippet.line_number}"
+            + (f" - {snippet.description}" if snippet.description else "")
+            + f"\n```\n{snippet.snippet}\n```"
+        ),
+    ),
+    "research_notes": (
+        "Research note",
+        lambda: get_research_note_repository(),
+        lambda note: note.content,
+    ),
+    "human_inputs": (
+        "Human input",
+        lambda: get_human_input_repository(),
+        lambda human_input: human_input.content,
+    ),
+}
+
+
+@tool("search_memory")
+def search_memory(query: str, kinds: Optional[List[str]] = None, limit: int = 10) -> str:
+    """Search stored key facts, key snippets, research notes and past human inputs by relevance.
+
+    Use this to recall what was previously learned about a topic instead of re-researching it.
+
+    Args:
+        query: Words describing what to look for
+        kinds: Kinds of memory to search: key_facts, key_snippets, research_notes, human_inputs (default: all)
+        limit: Maximum number of results
+    """
+    kinds = list(kinds or _MEMORY_SEARCH_KINDS)
+    unknown = [kind for kind in kinds if kind not in _MEMORY_SEARCH_KINDS]
+    if unknown:
+        return (
+            f"Unknown memory kinds: {', '.join(unknown)}. "
+            f"Valid kinds: {', '.join(_MEMORY_SEARCH_KINDS)}."
+        )
+
+    hits = []
+    for position, kind in enumerate(kinds):
+        label, get_repository, format_row = _MEMORY_SEARCH_KINDS[kind]
+        try:
+            found = get_repository().search(query, limit)
+        except RuntimeError as e:
+            logger.warning(f"No repository available for {kind}: {str(e)}")
+            continue
+        except Exception as e:
+            logger.error(f"Failed to search {kind}: {str(e)}")
+            continue
+        # BM25 scores depend on each table's document count and lengths, so they
+        # are only compared within a table: scaled by the table's best hit
+        best = max((score for _, score in found), default=0.0)
+        for rank, (row, score) in enumerate(found):
+            relevance = score / best if best > 0 else 1.0
+            hits.append((rank, position, relevance, label, row, format_row))
+
+    if not hits:
+        return f"No memory matches '{query}'."
+
+    # Round-robin over the kinds: the n-th best hit of each kind comes before
+    # the (n+1)-th best of any
+    hits.sort(key=lambda hit: (hit[0], hit[1]))
+    results = [
+        f"{label} #{row.id} (relevance {relevance:.2f}):\n{format_row(row)}"
+        for _, _, relevance, label, row, format_row in hits[:limit]
+    ]
+    return "\n\n".join(results)
+
+
+@tool("read_memory")
+def read_memory(kind: str, ids: List[int]) -> str:
+    """Fetch stored key facts, key snippets, research notes or past human inputs by ID.
+
+    Use this for memory items listed as not shown in your prompt when they look relevant.
+
+    Args:
+        kind: Kind of memory: key_facts, key_snippets, research_notes or human_inputs
+        ids: IDs of the items to fetch
+    """
+    if kind not in _MEMORY_SEARCH_KINDS:
+        return f"Unknown memory kind: {kind}. Valid kinds: {', '.join(_MEMORY_SEARCH_KINDS)}."
+
+    label, get_repository, format_row = _MEMORY_SEARCH_KINDS[kind]
+    results = []
+    try:
+        repository = get_repository()
+        for item_id in ids:
+            row = repository.get(item_id)
+            if row is None:
+                results.append(f"{label} #{item_id} not found.")
+            else:
+                results.append(f"{label} #{row.id}:\n{format_row(row)}")
+    except RuntimeError as e:
+        logger.error(f"Failed to access {kind} repository: {str(e)}")
+        return f"Failed to read {kind}."
+    return "\n\n".join(results)
+
+
 
 
 @tool("emit_key_snippet")
@@ -282,15 +384,13 @@ def emit_key_snippet(snippet_info: SnippetInfo) -> str:
 
     log_work_event(f"Stored code snippet #{snippet_id}.")
     
-    # Check if we need to clean up snippets (more than 20)
-    all_snippets = get_key_snippet_repository().get_all()
-    if len(all_snippets) > 35:
-        # Trigger the key snippets cleaner agent
-        try:
-            from ra_aid.agents.key_snippets_gc_agent import run_key_snippets_gc_agent
-            run_key_snippets_gc_agent()
-        except Exception as e:
-            logger.error(f"Failed to run key snippets cleaner: {str(e)}")
+    # Schedule a background clean up if there are too many snippets
+    try:
+        get_memory_gc_scheduler().notify(
+            "key_snippets", get_key_snippet_repository().count()
+        )
+    except Exception as e:
+        logger.error(f"Failed to schedule key snippets cleaner: {str(e)}")
     
     return f"Snippet #{snippet_id} stored."
 
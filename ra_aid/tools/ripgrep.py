@@ -1,3 +1,8 @@
+import base64
+import json
+import subprocess
+import tempfile
+from dataclasses import dataclass, field
 from typing import Dict, List, Union, Optional
 
 from langchain_core.tools import tool
@@ -5,13 +10,19 @@ from rich.console import Console
 from rich.markdown import Markdown
 from rich.panel import Panel
 
+from ra_aid.config import (
+    DEFAULT_RIPGREP_MAX_MATCHES,
+    DEFAULT_RIPGREP_MAX_MATCHES_PER_FILE,
+)
 from ra_aid.console.formatting import console_panel, cpm
 from ra_aid.database.repositories.human_input_repository import get_human_input_repository
 from ra_aid.database.repositories.trajectory_repository import get_trajectory_repository
 from ra_aid.proc.interactive import run_interactive_command
+from ra_aid.logging_config import get_logger
 from ra_aid.text.processing import truncate_output
 
 console = Console()
+logger = get_logger(__name__)
 
 DEFAULT_EXCLUDE_DIRS = [
     ".git",
@@ -71,6 +82,231 @@ FILE_TYPE_MAP = {
 }
 
 
+@dataclass
+class RipgrepLine:
+    """A matching or context line reported by rg.
+
+    Attributes:
+        path: File the line belongs to
+        line_number: 1-based line number (None if rg didn't report it)
+        text: Line content without the trailing newline
+        is_match: True for matching lines, False for context lines
+    """
+
+    path: str
+    line_number: Optional[int]
+    text: str
+    is_match: bool
+
+
+@dataclass
+class RipgrepResult:
+    """Structured result of a ripgrep search.
+
+    Attributes:
+        lines: Matching and context lines, in the order rg reported them
+        match_count: Number of matching lines kept
+        truncated_files: Files that had more matches than the per-file cap
+        truncated: Whether the search stopped at the global match cap
+        return_code: rg's exit code (0 if the search was stopped early)
+        stderr: Error output from rg
+    """
+
+    lines: List[RipgrepLine] = field(default_factory=list)
+    match_count: int = 0
+    truncated_files: List[str] = field(default_factory=list)
+    truncated: bool = False
+    return_code: int = 0
+    stderr: str = ""
+
+
+class RipgrepJsonUnsupportedError(Exception):
+    """Raised when the installed rg doesn't support --json output."""
+
+    pass
+
+
+def _decode_data(data: Optional[Dict]) -> str:
+    """Decode an rg --json data object, which holds either text or base64 bytes."""
+    if not data:
+        return ""
+    if "text" in data:
+        return data["text"]
+    return base64.b64decode(data.get("bytes", "")).decode("utf-8", errors="replace")
+
+
+def _drop_trailing_context(
+    lines: List[RipgrepLine], last_match_line: Optional[int], after_context: int
+) -> None:
+    """Remove context lines that only belong to a match that was not kept."""
+    while (
+        lines
+        and not lines[-1].is_match
+        and last_match_line is not None
+        and lines[-1].line_number is not None
+        and lines[-1].line_number > last_match_line + after_context
+    ):
+        lines.pop()
+
+
+def run_ripgrep_json(
+    cmd: List[str],
+    max_matches_per_file: int = DEFAULT_RIPGREP_MAX_MATCHES_PER_FILE,
+    max_matches: int = DEFAULT_RIPGREP_MAX_MATCHES,
+    after_context: int = 0,
+) -> RipgrepResult:
+    """Run an rg --json command and parse its output as it is produced.
+
+    The match caps are enforced while reading: once a file reaches the per-file
+    cap its remaining lines are skipped, and once the global cap is reached rg
+    is stopped, so large searches don't produce (or parse) output that would be
+    thrown away.
+
+    Args:
+        cmd: rg command line, including --json
+        max_matches_per_file: Maximum number of matches kept per file
+        max_matches: Maximum number of matches kept overall
+        after_context: Number of context lines requested after each match
+
+    Returns:
+        RipgrepResult: The parsed matches and context lines
+
+    Raises:
+        RipgrepJsonUnsupportedError: If rg doesn't understand --json
+        OSError: If rg can't be started
+    """
+    result = RipgrepResult()
+    file_matches = 0
+    last_match_line: Optional[int] = None
+    skip_file = False
+    stopping = False
+    stopped_early = False
+
+    with tempfile.TemporaryFile() as stderr_file:
+        process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=stderr_file,
+        )
+        try:
+            for raw_line in process.stdout:
+                try:
+                    event = json.loads(raw_line)
+                except ValueError:
+                    raise RipgrepJsonUnsupportedError("rg did not produce JSON output")
+                kind = event.get("type")
+                data = event.get("data") or {}
+
+                if kind == "begin":
+                    if stopping:
+                        stopped_early = True
+                        break
+                    file_matches = 0
+                    last_match_line = None
+                    skip_file = False
+                elif kind == "end":
+                    if stopping:
+                        stopped_early = True
+                        break
+                elif kind in ("match", "context") and not skip_file:
+                    line = RipgrepLine(
+                        path=_decode_data(data.get("path")),
+                        line_number=data.get("line_number"),
+                        text=_decode_data(data.get("lines")).rstrip("\r\n"),
+                        is_match=kind == "match",
+                    )
+                    if line.is_match:
+                        if stopping:
+                            _drop_trailing_context(result.lines, last_match_line, after_context)
+                            stopped_early = True
+                            break
+                        if file_matches >= max_matches_per_file:
+                            _drop_trailing_context(result.lines, last_match_line, after_context)
+                            result.truncated_files.append(line.path)
+                            skip_file = True
+                            continue
+                        file_matches += 1
+                        result.match_count += 1
+                        last_match_line = line.line_number
+                        if result.match_count >= max_matches:
+                            # Keep reading this match's trailing context, then stop
+                            stopping = True
+                    result.lines.append(line)
+        finally:
+            if process.poll() is None and (stopped_early or stopping):
+                process.kill()
+            process.stdout.close()
+            return_code = process.wait()
+
+        stderr_file.seek(0)
+        result.stderr = stderr_file.read().decode("utf-8", errors="replace").strip()
+
+    if stopping:
+        result.truncated = True
+        result.return_code = 0
+    else:
+        result.return_code = return_code
+
+    if return_code == 2 and not result.lines and "json" in result.stderr.lower():
+        raise RipgrepJsonUnsupportedError(result.stderr)
+
+    return result
+
+
+def format_ripgrep_result(result: RipgrepResult, show_separators: bool = False) -> str:
+    """Format a RipgrepResult like rg's grouped plain-text output.
+
+    Each file's path is followed by its lines as ``line:text`` for matches and
+    ``line-text`` for context, with notes where matches were omitted.
+
+    Args:
+        result: Parsed search result
+        show_separators: Whether to separate non-contiguous groups with ``--``
+            (rg does this when context lines are shown)
+
+    Returns:
+        str: The formatted search output
+    """
+    truncated_files = set(result.truncated_files)
+    output: List[str] = []
+    prev_path: Optional[str] = None
+    prev_line: Optional[int] = None
+
+    def end_file(path: str) -> None:
+        if path in truncated_files:
+            output.append("[More matches in this file were omitted]")
+
+    for line in result.lines:
+        if line.path != prev_path:
+            if prev_path is not None:
+                end_file(prev_path)
+                output.append("")
+            output.append(line.path)
+        elif (
+            show_separators
+            and prev_line is not None
+            and line.line_number is not None
+            and line.line_number > prev_line + 1
+        ):
+            output.append("--")
+        separator = ":" if line.is_match else "-"
+        output.append(f"{line.line_number}{separator}{line.text}")
+        prev_path, prev_line = line.path, line.line_number
+
+    if prev_path is not None:
+        end_file(prev_path)
+
+    if result.truncated:
+        output.append("")
+        output.append(
+            f"[Search stopped after {result.match_count} matches. "
+            "Use a more specific pattern, file_type or include_paths to see the rest]"
+        )
+
+    return "\n".join(output)
+
+
 @tool
 def ripgrep_search(
     pattern: str,
@@ -102,46 +338,57 @@ def ripgrep_search(
                        If provided, rg will only search these paths.
         fixed_string: Whether to treat pattern as a literal string instead of regex (default: False)
     """
-    # Build rg command with options
-    cmd = ["rg", "--color", "always"]
+    # Build rg command options
+    options = []
 
     if before_context_lines is not None:
-        cmd.extend(["-B", str(before_context_lines)])
+        options.extend(["-B", str(before_context_lines)])
 
     if after_context_lines is not None:
-        cmd.extend(["-A", str(after_context_lines)])
+        options.extend(["-A", str(after_context_lines)])
 
     if not case_sensitive:
-        cmd.append("-i")
+        options.append("-i")
 
     if include_hidden:
-        cmd.append("--hidden")
+        options.append("--hidden")
 
     if follow_links:
-        cmd.append("--follow")
+        options.append("--follow")
 
     if file_type:
         mapped_type = FILE_TYPE_MAP.get(file_type)
         if mapped_type:
-            cmd.extend(["-t", mapped_type])
+            options.extend(["-t", mapped_type])
         else:
-             cmd.extend(["-t", file_type]) # Pass original if not in map
+             options.extend(["-t", file_type]) # Pass original if not in map
 
     # Add exclusions
     exclusions = DEFAULT_EXCLUDE_DIRS + (exclude_dirs or [])
     for dir in exclusions:
-        cmd.extend(["--glob", f"!{dir}"])
+        options.extend(["--glob", f"!{dir}"])
 
     # Add fixed string flag if specified
     if fixed_string:
-        cmd.append("-F")
+        options.append("-F")
 
     # Add the search pattern
-    cmd.append(pattern)
+    options.append(pattern)
 
     # Add include paths if specified
     if include_paths:
-        cmd.extend(include_paths)
+        options.extend(include_paths)
+
+    # Structured output is read from a pipe; the colored command is only used
+    # with rg versions that don't support --json
+    json_cmd = [
+        "rg",
+        "--json",
+        # One extra match per file tells us whether the file was truncated
+        "--max-count",
+        str(DEFAULT_RIPGREP_MAX_MATCHES_PER_FILE + 1),
+    ] + options
+    cmd = ["rg", "--color", "always"] + options
 
     # Build info string for display
     info_lines = []
@@ -206,10 +453,29 @@ def ripgrep_search(
         border_style="bright_blue"
     )
     try:
-        print()
-        output, return_code = run_interactive_command(cmd)
-        print()
-        decoded_output = output.decode() if output else ""
+        try:
+            result = run_ripgrep_json(
+                json_cmd, after_context=after_context_lines or 0
+            )
+            decoded_output = format_ripgrep_result(
+                result,
+                show_separators=bool(before_context_lines or after_context_lines),
+            )
+            if result.stderr:
+                decoded_output = "\n".join(filter(None, [decoded_output, result.stderr]))
+            return_code = result.return_code
+            if return_code == 0 and decoded_output:
+                console_panel(
+                    truncate_output(decoded_output),
+                    title="🔎 Ripgrep Results",
+                    border_style="bright_blue",
+                )
+        except RipgrepJsonUnsupportedError:
+            logger.debug("rg does not support --json, falling back to terminal output")
+            print()
+            output, return_code = run_interactive_command(cmd)
+            print()
+            decoded_output = output.decode() if output else ""
 
         # Update trajectory with results
         trajectory_repo.create(
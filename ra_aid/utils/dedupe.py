@@ -0,0 +1,287 @@
+"""
+Deterministic duplicate detection for stored memory.
+
+Key facts, key snippets and research notes are often emitted more than once
+with trivial differences (case, punctuation, whitespace, a changed word in a
+long note). These helpers detect such duplicates locally, without a model
+call:
+
+- Exact duplicates: texts with the same normalized form (Unicode-normalized,
+  case-folded, with punctuation and whitespace differences removed) have the
+  same digest.
+- Near duplicates (prose only): MinHash signatures of word shingles, bucketed
+  by band (locality-sensitive hashing), find candidates without comparing a
+  text against every stored one. A candidate is only accepted when the exact
+  Jaccard similarity of the two shingle sets reaches a threshold and both texts
+  mention exactly the same numbers and identifiers, so "timeout is 30 seconds"
+  and "timeout is 60 seconds" are never merged.
+
+Code is compared by exact normalized digest only, since changing a single token
+of a code snippet can change its meaning entirely.
+"""
+
+import hashlib
+import random
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Generic, Hashable, Iterable, List, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+# Words, keeping dotted and slashed identifiers such as paths and versions together
+_TOKEN_RE = re.compile(r"\w+(?:[./:]\w+)*")
+
+SHINGLE_SIZE = 3
+# Minimum shingle-set Jaccard similarity of near duplicates
+NEAR_DUPLICATE_SIMILARITY = 0.9
+# Texts sharing all MinHash values of one band are compared. With 16 bands of
+# 4 values, texts at the similarity threshold are compared with a probability
+# above 0.9999999, while texts with a similarity of 0.3 are compared with a
+# probability of about 0.12.
+MINHASH_BANDS = 16
+MINHASH_BAND_SIZE = 4
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5EED)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(MINHASH_BANDS * MINHASH_BAND_SIZE)
+]
+# Texts with fewer tokens only match exactly
+MIN_NEAR_DUPLICATE_TOKENS = 8
+
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN_RE.findall(unicodedata.normalize("NFKC", text).casefold())
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize prose for duplicate detection.
+
+    Args:
+        text: Text to normalize
+
+    Returns:
+        str: The case-folded words of the text separated by single spaces
+    """
+    return " ".join(_tokens(text))
+
+
+def normalize_code(code: str) -> str:
+    """
+    Normalize code for duplicate detection.
+
+    Removes common indentation, trailing whitespace and blank lines, keeping
+    everything else (including case and punctuation).
+
+    Args:
+        code: Code to normalize
+
+    Returns:
+        str: The normalized code
+    """
+    lines = [line.rstrip() for line in code.expandtabs().splitlines()]
+    lines = [line for line in lines if line]
+    indent = min((len(line) - len(line.lstrip()) for line in lines), default=0)
+    return "\n".join(line[indent:] for line in lines)
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def minhash(features: Iterable[str]) -> Tuple[int, ...]:
+    """
+    Compute the MinHash signature of a collection of features.
+
+    The share of equal values in the signatures of two collections estimates
+    their Jaccard similarity.
+
+    Args:
+        features: Features (e.g. shingles) of a text
+
+    Returns:
+        Tuple[int, ...]: MINHASH_BANDS * MINHASH_BAND_SIZE minimum hash values
+    """
+    hashes = [_hash64(feature) for feature in features]
+    if not hashes:
+        return ()
+    return tuple(
+        min((a * value + b) % _MERSENNE_PRIME for value in hashes) for a, b in _PERMUTATIONS
+    )
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    """
+    Duplicate-detection fingerprint of a text.
+
+    Attributes:
+        digest: Hash of the normalized text
+        signature: MinHash signature of the shingles (empty if only matched exactly)
+        shingles: Word shingles of the text (empty if only matched exactly)
+        markers: Tokens containing digits (numbers, versions, line numbers, ...)
+    """
+
+    digest: str
+    signature: Tuple[int, ...] = ()
+    shingles: FrozenSet[str] = frozenset()
+    markers: Tuple[str, ...] = ()
+
+    def is_near_duplicate(self, other: "Fingerprint") -> bool:
+        """Return whether another fingerprint belongs to a near duplicate of this one."""
+        if not self.shingles or not other.shingles:
+            return False
+        if self.markers != other.markers:
+            return False
+        shared = len(self.shingles & other.shingles)
+        union = len(self.shingles) + len(other.shingles) - shared
+        return shared / union >= NEAR_DUPLICATE_SIMILARITY
+
+
+def fingerprint(text: str, near: bool = True) -> Fingerprint:
+    """
+    Fingerprint a text for duplicate detection.
+
+    Args:
+        text: Prose, or code normalized with normalize_code
+        near: Whether near duplicates should be detected, rather than only exact ones
+
+    Returns:
+        Fingerprint: The fingerprint
+    """
+    if not near:
+        return Fingerprint(hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest())
+
+    tokens = _tokens(text)
+    digest = hashlib.blake2b(" ".join(tokens).encode("utf-8"), digest_size=16).hexdigest()
+    if len(tokens) < MIN_NEAR_DUPLICATE_TOKENS:
+        return Fingerprint(digest)
+    shingles = frozenset(
+        " ".join(tokens[i : i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)
+    )
+    markers = tuple(sorted(token for token in tokens if any(c.isdigit() for c in token)))
+    return Fingerprint(digest, minhash(shingles), shingles, markers)
+
+
+def _bands(signature: Tuple[int, ...]) -> List[Tuple[int, Tuple[int, ...]]]:
+    return [
+        (band, signature[band * MINHASH_BAND_SIZE : (band + 1) * MINHASH_BAND_SIZE])
+        for band in range(len(signature) // MINHASH_BAND_SIZE)
+    ]
+
+
+class DuplicateIndex(Generic[K]):
+    """
+    Index of texts by key for finding duplicates of new texts.
+
+    Example:
+        index = DuplicateIndex()
+        index.add(1, "The API uses JWT tokens for authentication.")
+        index.find("the API uses JWT tokens for authentication")  # -> 1
+    """
+
+    def __init__(self, near: bool = True) -> None:
+        """
+        Initialize an empty index.
+
+        Args:
+            near: Whether near duplicates are detected, rather than only exact ones
+        """
+        self.near = near
+        self._fingerprints: Dict[K, Fingerprint] = {}
+        self._order: Dict[K, int] = {}
+        self._added = 0
+        self._by_digest: Dict[str, List[K]] = {}
+        self._by_band: Dict[Tuple[int, Tuple[int, ...]], List[K]] = {}
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._fingerprints
+
+    def add(self, key: K, text: str) -> None:
+        """
+        Add (or replace) the text stored under a key.
+
+        Args:
+            key: Key of the text, e.g. a row ID
+            text: The text
+        """
+        self.remove(key)
+        fp = fingerprint(text, self.near)
+        self._fingerprints[key] = fp
+        self._order[key] = self._added
+        self._added += 1
+        self._by_digest.setdefault(fp.digest, []).append(key)
+        for band in _bands(fp.signature):
+            self._by_band.setdefault(band, []).append(key)
+
+    def remove(self, key: K) -> None:
+        """
+        Remove the text stored under a key, if any.
+
+        Args:
+            key: Key of the text
+        """
+        fp = self._fingerprints.pop(key, None)
+        if fp is None:
+            return
+        del self._order[key]
+        self._by_digest[fp.digest].remove(key)
+        if not self._by_digest[fp.digest]:
+            del self._by_digest[fp.digest]
+        for band in _bands(fp.signature):
+            self._by_band[band].remove(key)
+            if not self._by_band[band]:
+                del self._by_band[band]
+
+    def find(self, text: str) -> Optional[K]:
+        """
+        Find a stored duplicate of a text.
+
+        Args:
+            text: The text to look up
+
+        Returns:
+            Optional[K]: The key of the earliest added duplicate, or None
+        """
+        return self._find(fingerprint(text, self.near))
+
+    def _find(self, fp: Fingerprint) -> Optional[K]:
+        exact = self._by_digest.get(fp.digest)
+        if exact:
+            return exact[0]
+        candidates = {key for band in _bands(fp.signature) for key in self._by_band.get(band, ())}
+        for key in sorted(candidates, key=self._order.__getitem__):
+            if fp.is_near_duplicate(self._fingerprints[key]):
+                return key
+        return None
+
+
+def find_duplicate_groups(items: Iterable[Tuple[K, str]], near: bool = True) -> List[List[K]]:
+    """
+    Group texts with their duplicates.
+
+    Each text joins the group of the first earlier text it duplicates, so a
+    group's first key is the earliest text and the others are its duplicates.
+
+    Args:
+        items: (key, text) pairs, in order of age
+        near: Whether near duplicates are detected, rather than only exact ones
+
+    Returns:
+        List[List[K]]: Groups with more than one key, in order of their first key
+    """
+    index: DuplicateIndex[K] = DuplicateIndex(near)
+    groups: Dict[K, List[K]] = {}
+    for key, text in items:
+        original = index.find(text)
+        if original is None:
+            index.add(key, text)
+            groups[key] = [key]
+        else:
+            groups[original].append(key)
+    return [group for group in groups.values() if len(group) > 1]
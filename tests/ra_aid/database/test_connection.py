@@ -18,10 +18,13 @@ import peewee
 import pytest
 
 from ra_aid.database.connection import (
+    DB_PROFILES,
+    DEFAULT_DB_PROFILE,
     DatabaseManager,
     close_db,
     db_var,
     get_db,
+    get_db_pragmas,
     init_db,
 )
 
@@ -184,6 +187,46 @@ class TestCloseDb:
         close_db()
 
 
+class TestDbProfiles:
+    """Tests for database performance profiles."""
+
+    def test_get_db_pragmas_default(self):
+        """Test that the default profile is used when none is given."""
+        assert get_db_pragmas() == DB_PROFILES[DEFAULT_DB_PROFILE]
+        assert get_db_pragmas()["journal_mode"] == "wal"
+
+    def test_get_db_pragmas_returns_copy(self):
+        """Test that callers can't modify the shared profile definitions."""
+        pragmas = get_db_pragmas("fast")
+        pragmas["cache_size"] = 0
+        assert DB_PROFILES["fast"]["cache_size"] != 0
+
+    def test_get_db_pragmas_unknown_profile(self):
+        """Test that an unknown profile name raises ValueError."""
+        with pytest.raises(ValueError, match="Unknown database profile"):
+            get_db_pragmas("turbo")
+
+    def test_fast_profile_applied_on_connect(self, cleanup_db, tmp_path):
+        """Test that the fast profile's pragmas are applied to a file database."""
+        db = init_db(base_dir=str(tmp_path), profile="fast")
+
+        assert db._profile == "fast"
+        assert db.execute_sql("PRAGMA journal_mode").fetchone()[0] == "wal"
+        # synchronous=NORMAL is reported as 1
+        assert db.execute_sql("PRAGMA synchronous").fetchone()[0] == 1
+        # temp_store=MEMORY is reported as 2
+        assert db.execute_sql("PRAGMA temp_store").fetchone()[0] == 2
+        assert db.execute_sql("PRAGMA busy_timeout").fetchone()[0] == 5000
+        assert db.execute_sql("PRAGMA foreign_keys").fetchone()[0] == 1
+
+    def test_durable_profile_applied_on_connect(self, cleanup_db, tmp_path):
+        """Test that the durable profile uses a rollback journal with full sync."""
+        with DatabaseManager(base_dir=str(tmp_path), profile="durable") as db:
+            assert db.execute_sql("PRAGMA journal_mode").fetchone()[0] == "delete"
+            # synchronous=FULL is reported as 2
+            assert db.execute_sql("PRAGMA synchronous").fetchone()[0] == 2
+
+
 class TestDatabaseManager:
     """Tests for the DatabaseManager class."""
 
@@ -0,0 +1,196 @@
+"""
+Tests for the memory full-text indexes and repository search.
+"""
+
+from unittest.mock import patch
+
+import peewee
+import pytest
+
+from ra_aid.database.connection import close_db, db_var, init_db
+from ra_aid.database.fts import (
+    MEMORY_FTS_TABLES,
+    create_memory_fts,
+    drop_statements,
+    fts_match_query,
+    search_fts,
+)
+from ra_aid.database.migrations import MigrationManager
+from ra_aid.database.models import (
+    HumanInput,
+    KeyFact,
+    KeySnippet,
+    ResearchNote,
+    Session,
+    Trajectory,
+)
+from ra_aid.database.repositories.human_input_repository import HumanInputRepository
+from ra_aid.database.repositories.key_fact_repository import KeyFactRepository
+from ra_aid.database.repositories.key_snippet_repository import KeySnippetRepository
+from ra_aid.database.repositories.research_note_repository import ResearchNoteRepository
+
+MODELS = [Session, HumanInput, KeyFact, KeySnippet, ResearchNote, Trajectory]
+
+
+@pytest.fixture
+def fts_db(tmp_path):
+    """Set up a file database with the memory tables and their FTS indexes."""
+    db_var.set(None)
+    db = init_db(base_dir=str(tmp_path))
+
+    with db.bind_ctx(MODELS):
+        db.create_tables(MODELS)
+        assert create_memory_fts(db) is True
+        yield db
+
+    close_db()
+    db_var.set(None)
+
+
+def fts_row_ids(db, fts_table, query):
+    """Return the row IDs an FTS table matches for a query."""
+    cursor = db.execute_sql(
+        f"SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH ? ORDER BY rowid",
+        (fts_match_query(query),),
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def test_match_query_quotes_terms():
+    """Test that FTS5 syntax in free text is not interpreted."""
+    assert fts_match_query('NEAR(foo "bar") AND Foo*') == '"near" OR "foo" OR "bar" OR "and"'
+    assert fts_match_query("  -- ") is None
+
+
+def test_triggers_keep_index_in_sync(fts_db):
+    """Test that inserts, updates and deletes are reflected in the index."""
+    repo = KeyFactRepository(fts_db)
+    fact = repo.create("The parser lives in src/parser.py", deduplicate=False)
+    assert fts_row_ids(fts_db, "key_fact_fts", "parser") == [fact.id]
+
+    repo.update(fact.id, "The lexer lives in src/lexer.py")
+    assert fts_row_ids(fts_db, "key_fact_fts", "parser") == []
+    assert fts_row_ids(fts_db, "key_fact_fts", "lexer") == [fact.id]
+
+    repo.delete(fact.id)
+    assert fts_row_ids(fts_db, "key_fact_fts", "lexer") == []
+
+
+def test_existing_rows_are_indexed(tmp_path):
+    """Test that creating the indexes on an existing database indexes its rows."""
+    db_var.set(None)
+    db = init_db(base_dir=str(tmp_path))
+
+    with db.bind_ctx(MODELS):
+        db.create_tables(MODELS)
+        note = ResearchNote.create(content="Retries use exponential backoff")
+        assert create_memory_fts(db) is True
+        # Safe to run again without indexing the rows twice
+        assert create_memory_fts(db) is True
+
+        assert fts_row_ids(db, "research_note_fts", "backoff") == [note.id]
+        count = db.execute_sql("SELECT COUNT(*) FROM research_note_fts").fetchone()[0]
+        assert count == 1
+
+    close_db()
+    db_var.set(None)
+
+
+def test_search_ranks_by_relevance(fts_db):
+    """Test that rows matching more of the query rank higher."""
+    repo = KeyFactRepository(fts_db)
+    database = repo.create("The project uses a sqlite database", deduplicate=False)
+    migrations = repo.create(
+        "Database migrations are applied by the sqlite migration manager", deduplicate=False
+    )
+    repo.create("The CLI is built with argparse", deduplicate=False)
+
+    results = repo.search("sqlite database migrations")
+    assert [fact.id for fact, _ in results] == [migrations.id, database.id]
+    assert results[0][1] > results[1][1] > 0
+    # Porter stemming matches other forms of a word
+    assert [fact.id for fact, _ in repo.search("migrate")] == [migrations.id]
+    assert repo.search("unrelated") == []
+    assert len(repo.search("sqlite", limit=1)) == 1
+
+
+def test_search_all_memory_kinds(fts_db):
+    """Test that every kind of memory can be searched."""
+    session = Session.create()
+    human_input = HumanInputRepository(fts_db).create(
+        "Please add a retry decorator", source="cli"
+    )
+    snippet = KeySnippetRepository(fts_db).create(
+        filepath="src/retry.py",
+        line_number=3,
+        snippet="def retry(times):\n    pass",
+        description="Retry decorator",
+    )
+    note = ResearchNoteRepository(fts_db).create("Retries are not implemented yet")
+
+    assert session.id is not None
+    assert [row.id for row, _ in HumanInputRepository(fts_db).search("retry")] == [
+        human_input.id
+    ]
+    assert [row.id for row, _ in KeySnippetRepository(fts_db).search("retry.py")] == [
+        snippet.id
+    ]
+    assert [row.id for row, _ in ResearchNoteRepository(fts_db).search("retries")] == [note.id]
+
+
+def test_search_without_fts_tables(fts_db):
+    """Test the LIKE fallback used when SQLite has no FTS5."""
+    repo = KeyFactRepository(fts_db)
+    one = repo.create("The cache is stored in redis", deduplicate=False)
+    both = repo.create("The redis cache is flushed on deploy", deduplicate=False)
+    for statement in drop_statements("key_fact_fts"):
+        fts_db.execute_sql(statement)
+
+    results = repo.search("redis deploy")
+    assert [fact.id for fact, _ in results] == [both.id, one.id]
+    assert [score for _, score in results] == [2.0, 1.0]
+    assert search_fts(fts_db, "key_fact_fts", "   ") == []
+
+
+def test_missing_fts5_is_reported(fts_db):
+    """Test that a SQLite build without FTS5 is tolerated."""
+    for statement in drop_statements("key_fact_fts"):
+        fts_db.execute_sql(statement)
+
+    original = fts_db.execute_sql
+
+    def execute_sql(sql, *args, **kwargs):
+        if "USING fts5" in sql:
+            raise peewee.OperationalError("no such module: fts5")
+        return original(sql, *args, **kwargs)
+
+    with patch.object(fts_db, "execute_sql", side_effect=execute_sql):
+        assert create_memory_fts(fts_db) is False
+
+
+def test_migration_adds_indexes(tmp_path):
+    """Test that migrating an existing database indexes its memory."""
+    db_var.set(None)
+    db = init_db(base_dir=str(tmp_path))
+
+    with db.bind_ctx(MODELS):
+        db.create_tables(MODELS)
+        fact = KeyFact.create(content="Builds run with make")
+
+        manager = MigrationManager(db_path=str(tmp_path / "pk.db"))
+        assert manager.apply_migrations() is True
+
+        for fts_table in MEMORY_FTS_TABLES:
+            cursor = db.execute_sql("SELECT 1 FROM sqlite_master WHERE name = ?", (fts_table,))
+            assert cursor.fetchone() is not None
+        assert [row.id for row, _ in KeyFactRepository(db).search("make")] == [fact.id]
+
+        # The triggers index new rows
+        new_fact = KeyFact.create(content="Tests run with make test")
+        assert {row.id for row, _ in KeyFactRepository(db).search("make")} == {
+            fact.id,
+            new_fact.id,
+        }
+
+    close_db()
+    db_var.set(None)
@@ -8,7 +8,8 @@ from unittest.mock import patch
 import peewee
 
 from ra_aid.database.connection import DatabaseManager, db_var
-from ra_aid.database.models import KeyFact, BaseModel
+from ra_aid.database.memory_version import create_memory_versions
+from ra_aid.database.models import KeyFact, BaseModel, HumanInput, Session
 from ra_aid.database.repositories.key_fact_repository import (
     KeyFactRepository, 
     KeyFactRepositoryManager,
@@ -16,6 +17,7 @@ from ra_aid.database.repositories.key_fact_repository import (
     key_fact_repo_var
 )
 from ra_aid.database.pydantic_models import KeyFactModel
+from ra_aid.database.repositories.memory_repository import MemoryRepository
 
 
 @pytest.fixture
@@ -287,4 +289,151 @@ def test_to_model_method(setup_db):
     assert pydantic_fact.updated_at == peewee_fact.updated_at
     
     # Test with None input
-    assert repo._to_model(None) is None
\ No newline at end of file
+    assert repo._to_model(None) is None
+
+def test_create_returns_stored_duplicate(setup_db):
+    """Test that creating a duplicate of a stored fact returns the stored fact."""
+    repo = KeyFactRepository(db=setup_db)
+    fact = repo.create("The API uses JWT tokens.")
+
+    duplicate = repo.create("the api uses JWT tokens")
+
+    assert duplicate.id == fact.id
+    assert duplicate.content == "The API uses JWT tokens."
+    assert repo.count() == 1
+    assert repo.create("the api uses JWT tokens", deduplicate=False).id != fact.id
+
+
+def test_find_duplicate_sees_changes(setup_db):
+    """Test that the duplicate index follows updates and deletes, including direct ones."""
+    repo = KeyFactRepository(db=setup_db)
+    fact = repo.create("Fact 1")
+    assert repo.find_duplicate("fact 1").id == fact.id
+
+    repo.update(fact.id, "Fact 2")
+    assert repo.find_duplicate("fact 1") is None
+    assert repo.find_duplicate("fact 2").id == fact.id
+
+    repo.delete(fact.id)
+    assert repo.find_duplicate("fact 2") is None
+
+    other = repo.create("Fact 3")
+    KeyFact.delete().where(KeyFact.id == other.id).execute()
+    assert repo.find_duplicate("Fact 3") is None
+
+
+def test_delete_duplicates(setup_db):
+    """Test that duplicates are deleted, keeping the earliest or the protected facts."""
+    setup_db.create_tables([Session, HumanInput], safe=True)
+    previous_input = HumanInput.create(content="first task", source="cli")
+    current_input = HumanInput.create(content="second task", source="cli")
+    repo = KeyFactRepository(db=setup_db)
+    first = KeyFact.create(content="Fact 1")
+    KeyFact.create(content="Fact 2")
+    second = KeyFact.create(content="fact 1.")
+    old = KeyFact.create(content="Fact 3", human_input=previous_input)
+    current = KeyFact.create(content="FACT 3", human_input=current_input)
+
+    deleted = repo.delete_duplicates(protected_human_input_id=current_input.id)
+
+    assert [(fact.id, kept_id) for fact, kept_id in deleted] == [
+        (second.id, first.id),
+        (old.id, current.id),
+    ]
+    assert [fact.content for fact in repo.get_all()] == ["Fact 1", "Fact 2", "FACT 3"]
+    assert repo.delete_duplicates() == []
+
+
+def test_create_many(setup_db):
+    """Test creating several facts at once, deduplicating within the batch."""
+    repo = KeyFactRepository(db=setup_db)
+    stored = repo.create("Fact 1")
+
+    facts = repo.create_many(["Fact 2", "fact 1", "Fact 3", "fact 2!"])
+
+    assert [fact.content for fact in facts] == ["Fact 2", "Fact 1", "Fact 3", "Fact 2"]
+    assert facts[1].id == stored.id
+    assert facts[3].id == facts[0].id
+    assert repo.count() == 3
+
+
+def test_delete_many(setup_db):
+    """Test deleting several facts at once, skipping missing and protected ones."""
+    setup_db.create_tables([Session, HumanInput], safe=True)
+    current_input = HumanInput.create(content="task", source="cli")
+    repo = KeyFactRepository(db=setup_db)
+    first, second, third = repo.create_many(["Fact 1", "Fact 2", "Fact 3"])
+    protected = repo.create("Fact 4", human_input_id=current_input.id)
+
+    with patch.object(KeyFact, "select", wraps=KeyFact.select) as select:
+        deleted, kept = repo.delete_many(
+            [third.id, first.id, 999, protected.id, first.id],
+            protected_human_input_id=current_input.id,
+        )
+
+    assert select.call_count == 1
+    assert [fact.id for fact in deleted] == [third.id, first.id]
+    assert [fact.id for fact in kept] == [protected.id]
+    assert [fact.id for fact in repo.get_all()] == [second.id, protected.id]
+    assert repo.find_duplicate("Fact 1") is None
+
+
+def test_duplicate_is_associated_with_new_human_input(setup_db):
+    """Test that storing a duplicate again protects it for the new human input."""
+    setup_db.create_tables([Session, HumanInput], safe=True)
+    previous_input = HumanInput.create(content="first task", source="cli")
+    current_input = HumanInput.create(content="second task", source="cli")
+    repo = KeyFactRepository(db=setup_db)
+    fact = repo.create("The API uses JWT tokens.", human_input_id=previous_input.id)
+
+    duplicate = repo.create("the api uses JWT tokens", human_input_id=current_input.id)
+    assert duplicate.id == fact.id
+    assert duplicate.human_input_id == current_input.id
+    assert repo.create("The API uses JWT tokens.").human_input_id == current_input.id
+
+    deleted, kept = repo.delete_many([fact.id], protected_human_input_id=current_input.id)
+    assert deleted == []
+    assert [fact.id for fact in kept] == [fact.id]
+
+
+@pytest.fixture
+def versioned_db(cleanup_db):
+    """Set up an in-memory database with the key fact tables and their version counter."""
+    with DatabaseManager(in_memory=True) as db:
+        with db.bind_ctx([Session, HumanInput, KeyFact]):
+            db.create_tables([Session, HumanInput, KeyFact], safe=True)
+            create_memory_versions(db)
+            yield db
+
+
+def test_duplicate_index_sees_other_writers(versioned_db):
+    """Test that the duplicate index is rebuilt after writes made elsewhere."""
+    repo = KeyFactRepository(db=versioned_db)
+    other = KeyFactRepository(db=versioned_db)
+    fact = repo.create("Fact 1")
+    assert repo.find_duplicate("fact 1").id == fact.id
+
+    added = other.create("Fact 2")
+    assert repo.find_duplicate("fact 2").id == added.id
+
+    KeyFact.update(content="Fact 3").where(KeyFact.id == fact.id).execute()
+    assert repo.find_duplicate("fact 1") is None
+    assert repo.find_duplicate("fact 3").id == fact.id
+
+    # The repository's own writes keep its index without rebuilding it
+    with patch.object(repo, "_dedupe_text", wraps=repo._dedupe_text) as dedupe_text:
+        repo.create("Fact 4")
+        assert repo.find_duplicate("fact 4") is not None
+    dedupe_text.assert_not_called()
+
+
+def test_memory_repository_requires_dedupe_text(setup_db):
+    """Test that a memory repository without _dedupe_text can't be created."""
+
+    class IncompleteRepository(MemoryRepository[KeyFactModel]):
+        model = KeyFact
+        pydantic_model = KeyFactModel
+        table = "key_fact"
+
+    with pytest.raises(TypeError, match="_dedupe_text"):
+        IncompleteRepository(setup_db)
@@ -5,7 +5,7 @@ Tests for the KeySnippetRepository class.
 import pytest
 
 from ra_aid.database.connection import DatabaseManager, db_var
-from ra_aid.database.models import KeySnippet
+from ra_aid.database.models import HumanInput, KeySnippet, Session
 from ra_aid.database.pydantic_models import KeySnippetModel
 from ra_aid.database.repositories.key_snippet_repository import KeySnippetRepository
 
@@ -341,4 +341,76 @@ def test_to_model_conversion(setup_db):
     assert pydantic_snippet.description == peewee_snippet.description
     
     # Test conversion of None
-    assert repo._to_model(None) is None
\ No newline at end of file
+    assert repo._to_model(None) is None
+
+def test_create_returns_stored_duplicate(setup_db):
+    """Test that the same code from the same file is stored once, at its latest location."""
+    repo = KeySnippetRepository(db=setup_db)
+    snippet = repo.create(
+        filepath="app.py", line_number=10, snippet="def f():\n    return 1\n", description="f"
+    )
+
+    moved = repo.create(filepath="app.py", line_number=12, snippet="    def f():\n        return 1")
+    other_file = repo.create(filepath="lib.py", line_number=10, snippet="def f():\n    return 1\n")
+    changed = repo.create(filepath="app.py", line_number=10, snippet="def f():\n    return 2\n")
+
+    assert moved.id == snippet.id
+    assert moved.line_number == 12
+    assert moved.description == "f"
+    assert moved.snippet == "def f():\n    return 1\n"
+    assert other_file.id != snippet.id
+    assert changed.id != snippet.id
+    assert repo.count() == 3
+
+
+def test_delete_duplicates(setup_db):
+    """Test that duplicate snippets are deleted, keeping the earliest."""
+    repo = KeySnippetRepository(db=setup_db)
+    first = repo.create(filepath="app.py", line_number=1, snippet="x = 1")
+    second = repo.create(filepath="app.py", line_number=5, snippet="x = 1  ", deduplicate=False)
+    repo.create(filepath="app.py", line_number=9, snippet="X = 1", deduplicate=False)
+
+    deleted = repo.delete_duplicates()
+
+    assert [(snippet.id, kept_id) for snippet, kept_id in deleted] == [(second.id, first.id)]
+    assert repo.count() == 2
+
+
+def test_create_and_delete_many(setup_db):
+    """Test creating and deleting several snippets at once."""
+    repo = KeySnippetRepository(db=setup_db)
+
+    snippets = repo.create_many(
+        [
+            {"filepath": "a.py", "line_number": 1, "snippet": "x = 1"},
+            {"filepath": "b.py", "line_number": 2, "snippet": "y = 2", "description": "y"},
+            {"filepath": "a.py", "line_number": 1, "snippet": "x = 1 "},
+        ]
+    )
+    assert snippets[2].id == snippets[0].id
+    assert snippets[1].description == "y"
+
+    deleted, protected = repo.delete_many([snippets[1].id])
+
+    assert [snippet.filepath for snippet in deleted] == ["b.py"]
+    assert protected == []
+    assert repo.count() == 1
+
+
+def test_moved_duplicate_is_associated_with_new_human_input(setup_db):
+    """Test that a snippet stored again, at a new location, moves to the new human input."""
+    setup_db.create_tables([Session, HumanInput], safe=True)
+    previous_input = HumanInput.create(content="first task", source="cli")
+    current_input = HumanInput.create(content="second task", source="cli")
+    repo = KeySnippetRepository(db=setup_db)
+    snippet = repo.create(
+        filepath="app.py", line_number=10, snippet="x = 1", human_input_id=previous_input.id
+    )
+
+    moved = repo.create(
+        filepath="app.py", line_number=12, snippet="x = 1", human_input_id=current_input.id
+    )
+
+    assert moved.id == snippet.id
+    assert moved.line_number == 12
+    assert moved.human_input_id == current_input.id
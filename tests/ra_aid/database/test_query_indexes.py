@@ -0,0 +1,157 @@
+"""
+Query-plan tests for the secondary indexes added by migration 015.
+
+The fixture builds a database as it looked before migration 015 (tables
+created from the models, without the new indexes) and then applies the source
+migrations, so these tests verify that upgraded databases get the indexes and
+that SQLite actually uses them for the repository queries.
+"""
+
+import importlib
+from unittest.mock import patch
+
+import pytest
+
+from ra_aid.database.connection import close_db, db_var, init_db
+from ra_aid.database.migrations import MigrationManager
+from ra_aid.database.models import (
+    HumanInput,
+    KeyFact,
+    KeySnippet,
+    ResearchNote,
+    Session,
+    Trajectory,
+)
+from ra_aid.database.repositories.session_repository import SessionRepository
+from ra_aid.database.repositories.trajectory_repository import TrajectoryRepository
+
+MODELS = [Session, HumanInput, KeyFact, KeySnippet, ResearchNote, Trajectory]
+
+index_migration = importlib.import_module(
+    "ra_aid.migrations.015_20261018_120000_add_query_indexes"
+)
+
+
+@pytest.fixture
+def migrated_db(tmp_path):
+    """Create a pre-015 database and upgrade it by applying the source migrations."""
+    db_var.set(None)
+    db = init_db(base_dir=str(tmp_path))
+
+    with db.bind_ctx(MODELS):
+        db.create_tables(MODELS)
+        for name, _, _, added in index_migration.INDEXES:
+            if added:
+                db.execute_sql(f'DROP INDEX IF EXISTS "{name}"')
+
+        manager = MigrationManager(db_path=str(tmp_path / "pk.db"))
+        assert manager.apply_migrations() is True
+
+        yield db
+
+    close_db()
+    db_var.set(None)
+
+
+def explain_executed_queries(db, func):
+    """
+    Run func, capturing the SELECT statements it executes, and return their query plans.
+
+    Returns:
+        list[str]: One string per SELECT, containing the concatenated plan details
+    """
+    statements = []
+    original_execute_sql = db.execute_sql
+
+    def recording_execute_sql(sql, params=None, *args, **kwargs):
+        if sql.lstrip().upper().startswith("SELECT"):
+            statements.append((sql, params))
+        return original_execute_sql(sql, params, *args, **kwargs)
+
+    with patch.object(db, "execute_sql", side_effect=recording_execute_sql):
+        func()
+
+    plans = []
+    for sql, params in statements:
+        rows = original_execute_sql(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+        plans.append(" | ".join(str(row[-1]) for row in rows))
+    return plans
+
+
+def index_names(db):
+    """Return the names of all indexes in the database."""
+    cursor = db.execute_sql("SELECT name FROM sqlite_master WHERE type = 'index'")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def test_migration_creates_indexes(migrated_db):
+    """Test that migrating a database creates all the secondary indexes."""
+    names = index_names(migrated_db)
+    for expected in [
+        "trajectory_session_id_record_type",
+        "trajectory_session_id_created_at",
+        "trajectory_human_input_id",
+        "humaninput_session_id_created_at",
+        "keyfact_session_id_created_at",
+        "keysnippet_session_id_created_at",
+        "researchnote_session_id_created_at",
+        "session_created_at",
+    ]:
+        assert expected in names
+
+
+def test_model_and_migration_indexes_match(migrated_db):
+    """Test that creating tables from the models yields the same index names."""
+    migrated = index_names(migrated_db)
+
+    migrated_db.drop_tables(MODELS)
+    migrated_db.create_tables(MODELS)
+    created = index_names(migrated_db)
+
+    assert migrated == created
+
+
+@pytest.mark.parametrize("after_id, limit", [(None, None), (10, 50)])
+def test_session_trajectories_use_index(migrated_db, after_id, limit):
+    """Test that get_trajectories_by_session searches a session_id index, already in id order."""
+    repo = TrajectoryRepository(migrated_db)
+    plans = explain_executed_queries(
+        migrated_db,
+        lambda: repo.get_trajectories_by_session(1, after_id=after_id, limit=limit),
+    )
+    assert plans
+    assert "USING INDEX trajectory_session_id" in plans[0]
+    assert "TEMP B-TREE" not in plans[0]
+
+
+def test_session_usage_totals_use_rollup(migrated_db):
+    """Test that get_session_usage_totals is a primary key lookup on the session_usage rollup."""
+    repo = TrajectoryRepository(migrated_db)
+    with patch.object(migrated_db, "execute_sql", wraps=migrated_db.execute_sql) as spy:
+        repo.get_session_usage_totals(1)
+    assert "session_usage" in spy.call_args_list[0].args[0]
+
+    plans = explain_executed_queries(
+        migrated_db, lambda: repo.get_session_usage_totals(1)
+    )
+    assert len(plans) == 1
+    assert "USING INTEGER PRIMARY KEY" in plans[0]
+
+
+def test_human_input_trajectories_use_index(migrated_db):
+    """Test that get_trajectories_by_human_input uses the human_input_id index."""
+    repo = TrajectoryRepository(migrated_db)
+    plans = explain_executed_queries(
+        migrated_db, lambda: repo.get_trajectories_by_human_input(1)
+    )
+    assert plans
+    assert "trajectory_human_input_id" in plans[0]
+
+
+def test_recent_sessions_use_index(migrated_db):
+    """Test that listing recent sessions walks the created_at index instead of sorting."""
+    repo = SessionRepository(migrated_db)
+    plans = explain_executed_queries(migrated_db, lambda: repo.get_recent(limit=10))
+    assert plans
+    assert "session_created_at" in plans[0]
+    assert "TEMP B-TREE" not in plans[0]
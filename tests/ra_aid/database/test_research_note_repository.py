@@ -290,4 +290,43 @@ def test_to_model_method(setup_db):
     assert pydantic_note.updated_at == peewee_note.updated_at
     
     # Test with None
-    assert repo._to_model(None) is None
\ No newline at end of file
+    assert repo._to_model(None) is None
+
+def test_create_returns_stored_duplicate(setup_db):
+    """Test that creating a near duplicate of a stored note returns the stored note."""
+    repo = ResearchNoteRepository(db=setup_db)
+    content = (
+        "The project stores agent memory in SQLite through peewee repositories, "
+        "one repository per table, each made available through a context variable."
+    )
+    note = repo.create(content)
+
+    duplicate = repo.create(content.replace("variable.", "variable. Really."))
+
+    assert duplicate.id == note.id
+    assert repo.count() == 1
+
+
+def test_delete_duplicates(setup_db):
+    """Test that duplicate notes are deleted, keeping the earliest."""
+    repo = ResearchNoteRepository(db=setup_db)
+    first = repo.create("Note 1")
+    repo.create("Note 2")
+    second = repo.create("note 1", deduplicate=False)
+
+    deleted = repo.delete_duplicates()
+
+    assert [(note.id, kept_id) for note, kept_id in deleted] == [(second.id, first.id)]
+    assert repo.count() == 2
+
+
+def test_create_and_delete_many(setup_db):
+    """Test creating and deleting several notes at once."""
+    repo = ResearchNoteRepository(db=setup_db)
+
+    notes = repo.create_many(["Note 1", "Note 2", "Note 3"])
+    deleted, protected = repo.delete_many([notes[0].id, notes[2].id, 999])
+
+    assert [note.content for note in deleted] == ["Note 1", "Note 3"]
+    assert protected == []
+    assert [note.content for note in repo.get_all()] == ["Note 2"]
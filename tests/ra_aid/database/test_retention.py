@@ -0,0 +1,204 @@
+"""
+Tests for session retention, archival and incremental vacuum.
+"""
+
+import datetime
+import os
+
+import peewee
+import pytest
+
+from ra_aid.database.connection import close_db, db_var, init_db
+from ra_aid.database.models import (
+    HumanInput,
+    KeyFact,
+    KeySnippet,
+    ResearchNote,
+    Session,
+    SessionUsage,
+    Trajectory,
+    TrajectoryBlob,
+    create_session_usage_triggers,
+)
+from ra_aid.database.memory_version import create_memory_versions
+from ra_aid.database.repositories.key_fact_repository import KeyFactRepository
+from ra_aid.database.repositories.research_note_repository import ResearchNoteRepository
+from ra_aid.database.repositories.trajectory_repository import TrajectoryRepository
+from ra_aid.database.retention import (
+    IncrementalVacuum,
+    RetentionPolicy,
+    delete_sessions,
+    enable_incremental_vacuum,
+    expired_session_ids,
+    free_page_count,
+    get_auto_vacuum,
+    import_session_archive,
+    prune_sessions,
+)
+from ra_aid.scripts.session_retention import prune_old_sessions
+
+MODELS = [
+    Session,
+    HumanInput,
+    KeyFact,
+    KeySnippet,
+    ResearchNote,
+    Trajectory,
+    TrajectoryBlob,
+    SessionUsage,
+]
+
+NOW = datetime.datetime(2026, 10, 18, 12, 0)
+LARGE_RESULT = {"output": "x" * 10000}
+
+
+@pytest.fixture
+def retention_db(tmp_path):
+    """Set up a file database with every session table."""
+    db_var.set(None)
+    db = init_db(base_dir=str(tmp_path))
+
+    with db.bind_ctx(MODELS):
+        db.create_tables(MODELS)
+        create_session_usage_triggers()
+        yield db
+
+    close_db()
+    db_var.set(None)
+
+
+def create_session(db, days_ago, result=None):
+    """Create a session with a human input, memory and trajectories."""
+    created = NOW - datetime.timedelta(days=days_ago)
+    session = Session.create(created_at=created, start_time=created, command_line="ra-aid")
+    human_input = HumanInput.create(content="Fix the parser", source="cli", session=session)
+    KeyFact.create(content=f"Fact from {days_ago} days ago", session=session, human_input=human_input)
+    ResearchNote.create(content="A note", session=session)
+    repo = TrajectoryRepository(db, blob_threshold=1024)
+    repo.create(
+        tool_name="read_file",
+        tool_result=result or LARGE_RESULT,
+        human_input_id=human_input.id,
+        session_id=session.id,
+    )
+    repo.create(record_type="model_usage", input_tokens=10, session_id=session.id)
+    return session, human_input
+
+
+def test_policy_selects_expired_sessions(retention_db):
+    """Test that sessions are kept by count or age, whichever keeps more."""
+    sessions = [create_session(retention_db, days)[0] for days in (30, 10, 5, 1)]
+    ids = [session.id for session in sessions]
+
+    assert expired_session_ids(RetentionPolicy(keep_sessions=2), NOW) == ids[:2]
+    assert expired_session_ids(RetentionPolicy(keep_days=7), NOW) == ids[:2]
+    assert expired_session_ids(RetentionPolicy(keep_sessions=1, keep_days=12), NOW) == ids[:1]
+    assert expired_session_ids(RetentionPolicy(keep_sessions=0), NOW) == ids
+
+    with pytest.raises(ValueError):
+        RetentionPolicy()
+    with pytest.raises(ValueError):
+        RetentionPolicy(keep_sessions=-1)
+
+
+def test_prune_archives_and_deletes(retention_db, tmp_path):
+    """Test that expired sessions are archived, then deleted with their rows and blobs."""
+    old, old_input = create_session(retention_db, 30, result={"output": "o" * 5000})
+    kept, _ = create_session(retention_db, 1)
+    # Memory of a kept session referring to an input of the pruned one
+    fact = KeyFact.create(content="Carried over", session=kept, human_input=old_input)
+
+    dry = prune_sessions(RetentionPolicy(keep_sessions=1), dry_run=True, now=NOW)
+    assert dry.session_ids == [old.id] and dry.deleted == {}
+    assert Session.select().count() == 2
+
+    archive_dir = str(tmp_path / "archive")
+    result = prune_sessions(RetentionPolicy(keep_sessions=1), archive_dir=archive_dir, now=NOW)
+
+    assert result.session_ids == [old.id]
+    assert len(result.archives) == 1 and os.path.exists(result.archives[0])
+    assert result.deleted["session"] == 1
+    assert result.deleted["trajectory"] == 2
+    assert result.deleted["trajectory_blob"] == 1
+    assert [s.id for s in Session.select()] == [kept.id]
+    assert HumanInput.select().where(HumanInput.session == old.id).count() == 0
+    assert SessionUsage.select().where(SessionUsage.session == old.id).count() == 0
+    assert KeyFact.get_by_id(fact.id).human_input is None
+    # The kept session's blob is still referenced
+    assert TrajectoryBlob.select().count() == 1
+
+
+def test_delete_sessions_changes_memory_version(retention_db):
+    """Test that deleting sessions invalidates memory cached through the repositories."""
+    create_memory_versions(retention_db)
+    old, _ = create_session(retention_db, 30)
+    create_session(retention_db, 1)
+    facts = KeyFactRepository(retention_db)
+    notes = ResearchNoteRepository(retention_db)
+    versions = (facts.version, notes.version)
+
+    delete_sessions([old.id])
+
+    assert facts.version != versions[0]
+    assert notes.version != versions[1]
+    assert "30 days ago" not in str(facts.get_facts_dict())
+
+
+def test_archive_round_trip(retention_db, tmp_path):
+    """Test that an archived session can be imported back with all its rows."""
+    old, _ = create_session(retention_db, 30)
+    create_session(retention_db, 1)
+    result = prune_sessions(
+        RetentionPolicy(keep_sessions=1), archive_dir=str(tmp_path / "archive"), now=NOW
+    )
+    assert TrajectoryBlob.select().count() == 1
+
+    session_id = import_session_archive(result.archives[0])
+
+    session = Session.get_by_id(session_id)
+    assert session.created_at == NOW - datetime.timedelta(days=30)
+    assert [f.content for f in KeyFact.select().where(KeyFact.session == session_id)] == [
+        "Fact from 30 days ago"
+    ]
+    human_input = HumanInput.get(HumanInput.session == session_id)
+    trajectories = TrajectoryRepository(retention_db).get_trajectories_by_session(session_id)
+    assert [t.tool_result for t in trajectories] == [LARGE_RESULT, None]
+    assert trajectories[0].human_input_id == human_input.id
+    # Identical payloads share the existing blob; usage is rolled up again
+    assert TrajectoryBlob.select().count() == 1
+    assert SessionUsage.get_by_id(session_id).total_input_tokens == 10
+
+
+def test_incremental_vacuum_frees_pages(retention_db):
+    """Test that the background vacuum returns the pages freed by deletes."""
+    assert get_auto_vacuum(retention_db) == "incremental"
+    create_session(retention_db, 1)
+    KeyFact.insert_many([{"content": "y" * 2000}] * 500).execute()
+    KeyFact.delete().execute()
+    assert free_page_count(retention_db) > 0
+
+    vacuum = IncrementalVacuum(retention_db, step_pages=16, pause=0)
+    vacuum.start()
+    vacuum.join(timeout=30)
+
+    assert free_page_count(retention_db) == 0
+    assert vacuum.freed_pages > 0
+
+
+def test_enable_incremental_vacuum_converts_database(tmp_path):
+    """Test that a database created without auto-vacuum is converted once."""
+    db = peewee.SqliteDatabase(str(tmp_path / "legacy.db"))
+    db.execute_sql("CREATE TABLE t (x TEXT)")
+    assert get_auto_vacuum(db) == "none"
+
+    assert enable_incremental_vacuum(db) is True
+    assert get_auto_vacuum(db) == "incremental"
+    assert enable_incremental_vacuum(db) is False
+    db.close()
+
+
+def test_prune_command_requires_a_policy():
+    """Test that the prune command refuses to run without a retention limit."""
+    result, status_code = prune_old_sessions()
+    assert status_code == 1
+    assert "keep_sessions or keep_days" in result["error"]
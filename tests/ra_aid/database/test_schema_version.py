@@ -0,0 +1,106 @@
+"""
+Tests for the schema version stamp and the squashed migration baseline.
+"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from ra_aid.database.connection import DatabaseManager, db_var
+from ra_aid.database.migrations import (
+    MIGRATIONS_TABLE,
+    ensure_migrations_applied,
+    init_migrations,
+)
+from ra_aid.database.models import database_proxy
+from ra_aid.database.schema import (
+    get_schema_version,
+    latest_schema_version,
+    schema_is_current,
+    set_schema_version,
+    source_migrations_dir,
+)
+
+
+@pytest.fixture
+def fresh_db():
+    """Start each test like a new process, with no database connected yet."""
+    previous = database_proxy.obj
+    db_var.set(None)
+    database_proxy.initialize(None)
+    yield
+    db_var.set(None)
+    database_proxy.initialize(previous)
+
+
+def applied_migrations(db):
+    """Return the names recorded in the migration history table."""
+    cursor = db.execute_sql(f'SELECT name FROM "{MIGRATIONS_TABLE}" ORDER BY id')
+    return [row[0] for row in cursor.fetchall()]
+
+
+def test_latest_schema_version_is_newest_migration(tmp_path):
+    """Test that the latest version is the number of the newest migration file."""
+    names = [n for n in os.listdir(source_migrations_dir()) if n[:3].isdigit()]
+    assert latest_schema_version() == max(int(n[:3]) for n in names)
+
+    for name in ("__init__.py", "002_add_key_fact.py", "010_add_session.py", "notes.txt"):
+        (tmp_path / name).touch()
+    assert latest_schema_version(str(tmp_path)) == 10
+    assert latest_schema_version(str(tmp_path / "missing")) == 0
+
+
+def test_fresh_database_records_baseline(fresh_db):
+    """Test that a new database is created from the models and stamped at once."""
+    with DatabaseManager() as db:
+        assert db._schema_created is True
+        with patch("ra_aid.database.migrations.Router.run") as run:
+            assert ensure_migrations_applied() is True
+        run.assert_not_called()
+
+        names = sorted(
+            n[:-3] for n in os.listdir(source_migrations_dir()) if n[:3].isdigit()
+        )
+        assert applied_migrations(db) == names
+        assert get_schema_version(db) == latest_schema_version()
+        assert "trajectory_blob" in db.get_tables()
+
+
+def test_current_stamp_skips_migration_discovery(fresh_db):
+    """Test that a stamped database starts without building a migration router."""
+    with DatabaseManager():
+        assert ensure_migrations_applied() is True
+
+    db_var.set(None)
+    database_proxy.initialize(None)
+    with DatabaseManager() as db:
+        assert not hasattr(db, "_schema_created")
+        assert schema_is_current(db)
+        with patch("ra_aid.database.migrations.init_migrations") as init:
+            assert ensure_migrations_applied() is True
+        init.assert_not_called()
+
+
+def test_outdated_stamp_checks_migrations(fresh_db):
+    """Test that an older stamp runs the migration check and is raised again."""
+    with DatabaseManager() as db:
+        assert ensure_migrations_applied() is True
+        db.execute_sql("PRAGMA user_version = 1")
+        assert not schema_is_current(db)
+
+        with patch(
+            "ra_aid.database.migrations.init_migrations", wraps=init_migrations
+        ) as init:
+            assert ensure_migrations_applied() is True
+        init.assert_called_once()
+        assert get_schema_version(db) == latest_schema_version()
+
+
+def test_stamp_is_never_lowered(fresh_db):
+    """Test that a database stamped by a newer version keeps its stamp."""
+    with DatabaseManager() as db:
+        set_schema_version(db, 500)
+        set_schema_version(db, 3)
+        assert get_schema_version(db) == 500
+        assert schema_is_current(db)
@@ -0,0 +1,196 @@
+"""
+Tests for the versioned cache of rendered prompt sections.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ra_aid.database.connection import DatabaseManager, db_var
+from ra_aid.database.memory_version import create_memory_versions, read_memory_version
+from ra_aid.database.models import BaseModel, HumanInput, KeyFact, Session
+from ra_aid.database.repositories.key_fact_repository import KeyFactRepository
+from ra_aid.database.repositories.related_files_repository import RelatedFilesRepository
+from ra_aid.database.repositories.work_log_repository import WorkLogRepository
+from ra_aid.database.section_cache import SectionCache, get_section_cache, next_version
+from ra_aid.memory_context import build_memory_sections
+from ra_aid.utils.singleton import Singleton
+
+
+@pytest.fixture
+def cache():
+    """Use a fresh process-wide section cache."""
+    Singleton._instances.pop(SectionCache, None)
+    yield get_section_cache()
+    Singleton._instances.pop(SectionCache, None)
+
+
+@pytest.fixture
+def key_fact_db():
+    """Set up an in-memory database with the KeyFact table."""
+    db_var.set(None)
+    with DatabaseManager(in_memory=True) as db:
+        with patch.object(BaseModel._meta, "database", db):
+            db.create_tables([KeyFact], safe=True)
+            yield db
+    db_var.set(None)
+
+
+def test_versions_increase():
+    """Test that versions are unique and increasing across callers."""
+    first = next_version()
+    assert next_version() > first
+    assert WorkLogRepository().version != WorkLogRepository().version
+
+
+def test_hits_until_version_changes(cache):
+    """Test that a section is rendered again only for a new version."""
+    render = MagicMock(side_effect=["first", "second"])
+
+    assert cache.get("section", 1, render) == "first"
+    assert cache.get("section", 1, render) == "first"
+    assert cache.get("section", 2, render) == "second"
+    assert render.call_count == 2
+    assert cache.stats() == {"section": {"hits": 1, "misses": 2}}
+
+    cache.clear()
+    assert cache.stats() == {}
+
+
+def test_keys_and_eviction(cache):
+    """Test that renderings are cached per key and the least recently used is evicted."""
+    cache.max_entries = 2
+    cache.get("section", 1, lambda: "a", key="a")
+    cache.get("section", 1, lambda: "b", key="b")
+    cache.get("section", 1, lambda: "not used", key="a")
+    cache.get("section", 1, lambda: "c", key="c")
+
+    assert cache.get("section", 1, lambda: "a again", key="a") == "a"
+    assert cache.get("section", 1, lambda: "b again", key="b") == "b again"
+
+
+def test_uncacheable_versions(cache):
+    """Test that values that aren't versions, like test doubles, are never cached."""
+    render = MagicMock(return_value="text")
+    for version in (MagicMock(), None, (1, MagicMock())):
+        cache.get("section", version, render)
+        cache.get("section", version, render)
+    assert render.call_count == 6
+    assert cache.stats()["section"]["hits"] == 0
+
+
+def test_work_log_is_cached(cache):
+    """Test that the work log is formatted once per change."""
+    repo = WorkLogRepository()
+    repo.add_entry("First event")
+    formatted = repo.format_work_log()
+
+    assert repo.format_work_log() is formatted
+    repo.add_entry("Second event")
+    assert "Second event" in repo.format_work_log()
+    repo.clear()
+    assert repo.format_work_log() == "No work log entries"
+    assert cache.stats()["work_log"] == {"hits": 1, "misses": 3}
+
+
+def test_related_files_are_cached(cache, tmp_path):
+    """Test that the related files are formatted once per change."""
+    path = tmp_path / "module.py"
+    path.write_text("x = 1\n")
+    repo = RelatedFilesRepository()
+    file_id = repo.add_file(str(path))
+
+    formatted = repo.format_related_files()
+    formatted.append("changed by the caller")
+    assert repo.format_related_files() == [f"ID#{file_id} {path}"]
+
+    version = repo.version
+    repo.add_file(str(path))  # Already related: not a change
+    assert repo.version == version
+    repo.remove_file(file_id)
+    assert repo.format_related_files() == []
+    assert cache.stats()["related_files"] == {"hits": 1, "misses": 2}
+
+
+def test_key_fact_writes_change_version(key_fact_db):
+    """Test that every kind of write to the key facts changes the version."""
+    repo = KeyFactRepository(key_fact_db)
+    versions = [repo.version]
+
+    fact = repo.create("The build uses make")
+    versions.append(repo.version)
+    repo.create("The build uses make")  # Duplicate: not stored
+    assert repo.version == versions[-1]
+
+    repo.update(fact.id, "The build uses ninja")
+    versions.append(repo.version)
+    created = repo.create_many(["Tests use pytest", "Docs use mkdocs"])
+    versions.append(repo.version)
+    repo.delete_many([created[0].id])
+    versions.append(repo.version)
+    repo.delete(fact.id)
+    versions.append(repo.version)
+
+    assert versions == sorted(set(versions))
+    repo.get_all()
+    repo.count()
+    assert repo.version == versions[-1]
+
+
+def test_memory_sections_are_cached(cache, key_fact_db):
+    """Test that prompt memory is read and formatted again only after a write."""
+    repo = KeyFactRepository(key_fact_db)
+    repo.create("The build uses make")
+
+    with patch(
+        "ra_aid.memory_context.get_key_fact_repository", return_value=repo
+    ), patch.object(repo, "get_facts_dict", wraps=repo.get_facts_dict) as get_facts_dict:
+        first = build_memory_sections("build", token_budget=0, kinds=("key_facts",))
+        second = build_memory_sections("build", token_budget=0, kinds=("key_facts",))
+        assert second is first
+        assert get_facts_dict.call_count == 1
+
+        repo.create("Tests use pytest")
+        third = build_memory_sections("build", token_budget=0, kinds=("key_facts",))
+        assert "Tests use pytest" in third.key_facts
+        assert get_facts_dict.call_count == 2
+
+    assert cache.stats()["memory_sections"] == {"hits": 1, "misses": 2}
+
+
+@pytest.fixture
+def versioned_db():
+    """Set up an in-memory database with the key fact tables and their version counter."""
+    db_var.set(None)
+    with DatabaseManager(in_memory=True) as db:
+        with db.bind_ctx([Session, HumanInput, KeyFact]):
+            db.create_tables([Session, HumanInput, KeyFact], safe=True)
+            create_memory_versions(db)
+            yield db
+    db_var.set(None)
+
+
+def test_version_sees_writes_outside_the_repository(cache, versioned_db):
+    """Test that writes by other repositories and direct queries change the version."""
+    key_fact_db = versioned_db
+    repo = KeyFactRepository(key_fact_db)
+    other = KeyFactRepository(key_fact_db)
+    fact = repo.create("The build uses make")
+    assert other.version == repo.version
+
+    with patch("ra_aid.memory_context.get_key_fact_repository", return_value=repo):
+        first = build_memory_sections("build", token_budget=0, kinds=("key_facts",))
+        assert build_memory_sections("build", token_budget=0, kinds=("key_facts",)) is first
+
+        other.create("Tests use pytest")
+        assert "Tests use pytest" in build_memory_sections(
+            "build", token_budget=0, kinds=("key_facts",)
+        ).key_facts
+
+        KeyFact.delete().where(KeyFact.id == fact.id).execute()
+        assert "The build uses make" not in build_memory_sections(
+            "build", token_budget=0, kinds=("key_facts",)
+        ).key_facts
+
+    assert read_memory_version(key_fact_db, "key_fact") == repo.version
+    assert read_memory_version(key_fact_db, "research_note") is None
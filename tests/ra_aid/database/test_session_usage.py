@@ -0,0 +1,199 @@
+"""
+Tests for the session_usage rollup table, its triggers and backfill migration.
+"""
+
+from contextlib import contextmanager
+from unittest.mock import patch
+
+import pytest
+
+from ra_aid.database.connection import close_db, db_var, init_db
+from ra_aid.database.migrations import MigrationManager
+from ra_aid.database.models import (
+    HumanInput,
+    KeyFact,
+    KeySnippet,
+    ResearchNote,
+    Session,
+    SessionUsage,
+    Trajectory,
+    create_session_usage_triggers,
+)
+from ra_aid.database.repositories.session_repository import SessionRepository
+from ra_aid.database.repositories.trajectory_repository import TrajectoryRepository
+from ra_aid.scripts.all_sessions_usage import get_all_sessions_usage
+
+MODELS = [Session, HumanInput, KeyFact, KeySnippet, ResearchNote, Trajectory, SessionUsage]
+
+
+@pytest.fixture
+def usage_db(tmp_path):
+    """Set up a file database with the rollup table and its triggers."""
+    db_var.set(None)
+    db = init_db(base_dir=str(tmp_path))
+
+    with db.bind_ctx(MODELS):
+        db.create_tables(MODELS)
+        create_session_usage_triggers()
+        yield db
+
+    close_db()
+    db_var.set(None)
+
+
+def create_usage(session, cost, input_tokens, output_tokens, record_type="model_usage"):
+    """Create a trajectory record with usage metrics."""
+    return Trajectory.create(
+        session=session,
+        record_type=record_type,
+        current_cost=cost,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+    )
+
+
+def test_rollup_tracks_inserts_updates_and_deletes(usage_db):
+    """Test that the triggers keep session_usage in sync with model_usage trajectories."""
+    repo = TrajectoryRepository(usage_db)
+    session1 = Session.create()
+    session2 = Session.create()
+
+    first = create_usage(session1, 0.01, 100, 50)
+    create_usage(session1, 0.02, 200, None)
+    create_usage(session1, 9.99, 999, 999, record_type="tool_execution")
+    assert repo.get_session_usage_totals(session1.id) == {
+        "total_cost": pytest.approx(0.03),
+        "total_input_tokens": 300,
+        "total_output_tokens": 50,
+        "total_tokens": 350,
+    }
+    assert SessionUsage.get_by_id(session1.id).record_count == 2
+
+    # Moving a record to another session moves its usage with it
+    first.session = session2
+    first.save()
+    assert repo.get_session_usage_totals(session1.id)["total_input_tokens"] == 200
+    assert repo.get_session_usage_totals(session2.id)["total_input_tokens"] == 100
+
+    first.delete_instance()
+    assert repo.get_session_usage_totals(session2.id)["total_tokens"] == 0
+    assert SessionUsage.get_by_id(session2.id).record_count == 0
+
+
+def test_rollup_matches_full_aggregation(usage_db):
+    """Test that the rollup agrees with summing the trajectory table directly."""
+    repo = TrajectoryRepository(usage_db)
+    sessions = [Session.create() for _ in range(3)]
+    for i in range(30):
+        create_usage(sessions[i % 3], 0.001 * i, i, 2 * i)
+
+    for session in sessions:
+        rows = Trajectory.select().where(
+            (Trajectory.session == session) & (Trajectory.record_type == "model_usage")
+        )
+        totals = repo.get_session_usage_totals(session.id)
+        assert totals["total_cost"] == pytest.approx(sum(r.current_cost for r in rows))
+        assert totals["total_input_tokens"] == sum(r.input_tokens for r in rows)
+        assert totals["total_output_tokens"] == sum(r.output_tokens for r in rows)
+
+
+def test_get_all_session_usage_totals(usage_db):
+    """Test fetching the totals of every session in a single query."""
+    repo = TrajectoryRepository(usage_db)
+    session1 = Session.create()
+    session2 = Session.create()
+    Session.create()  # A session without model usage has no rollup row
+    create_usage(session1, 0.5, 10, 20)
+    create_usage(session2, 0.25, 1, 2)
+
+    with patch.object(usage_db, "execute_sql", wraps=usage_db.execute_sql) as spy:
+        totals = repo.get_all_session_usage_totals()
+
+    assert spy.call_count == 1
+    assert set(totals) == {session1.id, session2.id}
+    assert totals[session1.id]["total_tokens"] == 30
+    assert totals[session2.id]["total_cost"] == pytest.approx(0.25)
+
+
+def test_migration_backfills_rollup(tmp_path):
+    """Test that migrating an existing database aggregates its usage into session_usage."""
+    db_var.set(None)
+    db = init_db(base_dir=str(tmp_path))
+    legacy_models = [m for m in MODELS if m is not SessionUsage]
+
+    with db.bind_ctx(MODELS):
+        # A database from before the rollup existed, already holding usage records
+        db.create_tables(legacy_models)
+        session1 = Session.create()
+        session2 = Session.create()
+        create_usage(session1, 0.01, 100, 50)
+        create_usage(session1, 0.02, 200, 100)
+        create_usage(session1, 5.0, 5, 5, record_type="tool_execution")
+        create_usage(session2, None, 7, None)
+
+        manager = MigrationManager(db_path=str(tmp_path / "pk.db"))
+        assert manager.apply_migrations() is True
+
+        repo = TrajectoryRepository(db)
+        assert repo.get_session_usage_totals(session1.id) == {
+            "total_cost": pytest.approx(0.03),
+            "total_input_tokens": 300,
+            "total_output_tokens": 150,
+            "total_tokens": 450,
+        }
+        assert repo.get_session_usage_totals(session2.id)["total_tokens"] == 7
+
+        # The migration also installs the triggers for new records
+        create_usage(session2, 0.1, 3, 0)
+        assert repo.get_session_usage_totals(session2.id)["total_tokens"] == 10
+
+    close_db()
+    db_var.set(None)
+
+
+def test_all_sessions_usage_script(usage_db):
+    """Test that the all-sessions usage script combines sessions and rollups."""
+    session1 = Session.create(command_line="ra-aid -m first")
+    session2 = Session.create(command_line="ra-aid -m second")
+    HumanInput.create(content="Fix the parser", source="cli", session=session1)
+    create_usage(session1, 0.5, 10, 20)
+
+    @contextmanager
+    def database_manager():
+        yield usage_db
+
+    # Use the real SessionRepository instead of the autouse mock from conftest
+    with patch(
+        "ra_aid.database.repositories.session_repository.SessionRepository",
+        SessionRepository,
+    ), patch(
+        "ra_aid.scripts.all_sessions_usage.ensure_migrations_applied", return_value=True
+    ), patch("ra_aid.scripts.all_sessions_usage.DatabaseManager", database_manager):
+        results, status_code = get_all_sessions_usage()
+
+    assert status_code == 0
+    grand_total, *per_session = results
+    assert grand_total["total_tokens"] == 30
+    by_id = {r["session_id"]: r for r in per_session}
+    assert by_id[session1.id]["session_display_name"] == "Fix the parser"
+    assert by_id[session1.id]["total_cost"] == pytest.approx(0.5)
+    assert by_id[session2.id]["session_display_name"] == "ra-aid -m second"
+    assert by_id[session2.id]["total_tokens"] == 0
+
+
+def test_get_all_with_display_names(usage_db):
+    """Test listing all sessions with display names in a single query."""
+    older = Session.create(command_line="x" * 100)
+    newer = Session.create(command_line="ra-aid")
+    HumanInput.create(content="first input", source="cli", session=newer)
+    HumanInput.create(content="second input", source="cli", session=newer)
+    repo = SessionRepository(usage_db)
+
+    with patch.object(usage_db, "execute_sql", wraps=usage_db.execute_sql) as spy:
+        sessions = repo.get_all_with_display_names()
+
+    assert spy.call_count == 1
+    assert {s.id: s.display_name for s in sessions} == {
+        older.id: "x" * 80 + "...",
+        newer.id: "first input",
+    }
@@ -0,0 +1,166 @@
+"""
+Tests for out-of-line storage of large trajectory payloads.
+"""
+
+import json
+
+import pytest
+
+from ra_aid.database import blobs
+from ra_aid.database.connection import close_db, db_var, init_db
+from ra_aid.database.migrations import MigrationManager
+from ra_aid.database.models import (
+    HumanInput,
+    KeyFact,
+    KeySnippet,
+    ResearchNote,
+    Session,
+    Trajectory,
+    TrajectoryBlob,
+)
+from ra_aid.database.repositories.trajectory_repository import TrajectoryRepository
+
+MODELS = [Session, HumanInput, KeyFact, KeySnippet, ResearchNote, Trajectory, TrajectoryBlob]
+
+LARGE_RESULT = {"output": "line of command output\n" * 400}
+
+
+@pytest.fixture
+def blob_db(tmp_path):
+    """Set up a file database with the trajectory and trajectory_blob tables."""
+    db_var.set(None)
+    db = init_db(base_dir=str(tmp_path))
+
+    with db.bind_ctx(MODELS):
+        db.create_tables(MODELS)
+        yield db
+
+    close_db()
+    db_var.set(None)
+
+
+@pytest.mark.parametrize("codec", ["zlib", "zstd"])
+def test_codecs_round_trip(codec):
+    """Test that each codec restores the original bytes."""
+    if codec == "zstd" and blobs.zstandard is None:
+        pytest.skip("zstandard is not installed")
+    data = json.dumps(LARGE_RESULT).encode("utf-8")
+    compressed = blobs.compress(data, codec)
+    assert len(compressed) < len(data)
+    assert blobs.decompress(compressed, codec) == data
+
+    with pytest.raises(ValueError):
+        blobs.decompress(compressed, "lz4")
+
+
+def test_large_payloads_are_stored_once(blob_db):
+    """Test that large payloads move to deduplicated blobs and read back unchanged."""
+    session = Session.create()
+    repo = TrajectoryRepository(blob_db, blob_threshold=1024)
+
+    created = [
+        repo.create(
+            tool_name="run_shell_command",
+            tool_parameters={"command": "make"},
+            tool_result=LARGE_RESULT,
+            session_id=session.id,
+        )
+        for _ in range(3)
+    ]
+    assert created[0].tool_result == LARGE_RESULT
+
+    row = Trajectory.get_by_id(created[0].id)
+    assert row.tool_result is None
+    assert row.tool_result_blob is not None
+    # Small payloads stay inline
+    assert json.loads(row.tool_parameters) == {"command": "make"}
+    assert row.tool_parameters_blob is None
+
+    assert TrajectoryBlob.select().count() == 1
+    assert TrajectoryBlob.get().size == len(json.dumps(LARGE_RESULT))
+
+    assert repo.get(created[1].id).tool_result == LARGE_RESULT
+    by_session = repo.get_trajectories_by_session(session.id)
+    assert [t.tool_result for t in by_session] == [LARGE_RESULT] * 3
+    assert all(t.tool_parameters == {"command": "make"} for t in by_session)
+
+
+def test_update_moves_payloads_in_and_out(blob_db):
+    """Test that updating a payload replaces its blob reference or inline value."""
+    session = Session.create()
+    repo = TrajectoryRepository(blob_db, blob_threshold=1024)
+    trajectory = repo.create(tool_name="read_file", session_id=session.id)
+
+    updated = repo.update(trajectory.id, tool_result=LARGE_RESULT)
+    assert updated.tool_result == LARGE_RESULT
+    assert Trajectory.get_by_id(trajectory.id).tool_result_blob is not None
+
+    updated = repo.update(trajectory.id, tool_result={"output": "short"})
+    assert updated.tool_result == {"output": "short"}
+    assert Trajectory.get_by_id(trajectory.id).tool_result_blob is None
+
+
+def test_threshold_disabled_keeps_payloads_inline(blob_db):
+    """Test that a threshold of 0 stores everything inline, as before."""
+    session = Session.create()
+    repo = TrajectoryRepository(blob_db, blob_threshold=0)
+    trajectory = repo.create(tool_result=LARGE_RESULT, session_id=session.id)
+
+    assert json.loads(Trajectory.get_by_id(trajectory.id).tool_result) == LARGE_RESULT
+    assert TrajectoryBlob.select().count() == 0
+
+
+def test_write_behind_stores_blobs(blob_db):
+    """Test that the background writer stores large payloads and reports them whole."""
+    session = Session.create()
+    repo = TrajectoryRepository(blob_db, write_behind=True, blob_threshold=1024)
+    written = []
+    repo.register_create_hook(written.append)
+    try:
+        for i in range(5):
+            repo.create(
+                tool_name=f"tool_{i}", tool_result=LARGE_RESULT, session_id=session.id
+            )
+        trajectories = repo.get_trajectories_by_session(session.id)
+    finally:
+        repo.close()
+
+    assert [t.tool_result for t in trajectories] == [LARGE_RESULT] * 5
+    assert [model.tool_result for model in written] == [LARGE_RESULT] * 5
+    assert TrajectoryBlob.select().count() == 1
+
+
+def test_migration_moves_existing_payloads(tmp_path):
+    """Test that migrating an existing database moves its large payloads into blobs."""
+    db_var.set(None)
+    db = init_db(base_dir=str(tmp_path))
+
+    with db.bind_ctx(MODELS):
+        # A database from before blob storage existed
+        db.create_tables([m for m in MODELS if m is not TrajectoryBlob])
+        for field in blobs.BLOB_FIELDS:
+            db.execute_sql(f'ALTER TABLE trajectory DROP COLUMN "{blobs.blob_column(field)}"')
+        large = json.dumps({"output": "x" * 10000})
+        for result in (large, large, json.dumps({"output": "small"})):
+            db.execute_sql(
+                "INSERT INTO trajectory (created_at, updated_at, tool_name, tool_result, "
+                "is_error) VALUES (datetime('now'), datetime('now'), 'tool', ?, 0)",
+                (result,),
+            )
+
+        manager = MigrationManager(db_path=str(tmp_path / "pk.db"))
+        assert manager.apply_migrations() is True
+
+        rows = list(Trajectory.select().order_by(Trajectory.id))
+        assert [row.tool_result is None for row in rows] == [True, True, False]
+        assert TrajectoryBlob.select().count() == 1
+
+        repo = TrajectoryRepository(db)
+        assert [t.tool_result for t in repo.get_all().values()] == [
+            {"output": "x" * 10000},
+            {"output": "x" * 10000},
+            {"output": "small"},
+        ]
+
+    close_db()
+    db_var.set(None)
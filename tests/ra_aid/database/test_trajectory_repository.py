@@ -9,7 +9,15 @@ from unittest.mock import patch, MagicMock, call
 
 
 from ra_aid.database.connection import DatabaseManager, db_var
-from ra_aid.database.models import Trajectory, HumanInput, Session, BaseModel
+from ra_aid.database.models import (
+    Trajectory,
+    TrajectoryBlob,
+    HumanInput,
+    Session,
+    SessionUsage,
+    BaseModel,
+    create_session_usage_triggers,
+)
 from ra_aid.database.repositories.trajectory_repository import (
     TrajectoryRepository,
     TrajectoryRepositoryManager,
@@ -74,7 +82,10 @@ def setup_db(cleanup_db):
         with patch.object(BaseModel._meta, "database", db):
             # Create the required tables
             with db.atomic():
-                db.create_tables([Trajectory, HumanInput, Session], safe=True)
+                db.create_tables(
+                    [Trajectory, TrajectoryBlob, HumanInput, Session, SessionUsage], safe=True
+                )
+                create_session_usage_triggers()
 
                 # Create a test session record
                 Session.create(id=1, name="Test Session")
@@ -84,7 +95,9 @@ def setup_db(cleanup_db):
             # Clean up
             with db.atomic():
                 Trajectory.drop_table(safe=True)
+                TrajectoryBlob.drop_table(safe=True)
                 HumanInput.drop_table(safe=True)
+                SessionUsage.drop_table(safe=True)
                 Session.drop_table(safe=True)
 
 
@@ -636,6 +649,64 @@ def test_get_trajectories_by_session(setup_db, mock_session_repository, cleanup_
         assert trajectory.tool_name.startswith("tool_s2")
 
 
+def test_get_trajectories_by_session_keyset_pages(setup_db, mock_session_repository, cleanup_repo):
+    """Test paging through a session's trajectories with after_id and limit."""
+    repo = TrajectoryRepository(db=setup_db)
+    other_session = Session.create(id=2).id
+
+    for i in range(5):
+        repo.create(tool_name=f"tool_{i}", session_id=1)
+        repo.create(tool_name=f"other_{i}", session_id=other_session)
+
+    first_page = repo.get_trajectories_by_session(1, limit=2)
+    assert [t.tool_name for t in first_page] == ["tool_0", "tool_1"]
+
+    second_page = repo.get_trajectories_by_session(1, after_id=first_page[-1].id, limit=2)
+    assert [t.tool_name for t in second_page] == ["tool_2", "tool_3"]
+
+    rest = repo.get_trajectories_by_session(1, after_id=second_page[-1].id)
+    assert [t.tool_name for t in rest] == ["tool_4"]
+
+    assert repo.get_trajectories_by_session(1, after_id=rest[-1].id, limit=2) == []
+
+
+def test_get_trajectories_by_session_orders_by_id(setup_db, mock_session_repository, cleanup_repo):
+    """Test that full and paged listings use the same (ID) order."""
+    import datetime
+
+    repo = TrajectoryRepository(db=setup_db)
+    first = repo.create(tool_name="first", session_id=1)
+    second = repo.create(tool_name="second", session_id=1)
+    # A clock going backwards must not reorder the listing
+    Trajectory.update(created_at=datetime.datetime(2000, 1, 1)).where(
+        Trajectory.id == second.id
+    ).execute()
+
+    assert [t.id for t in repo.get_trajectories_by_session(1)] == [first.id, second.id]
+    assert repo.get_trajectories_by_session(1) == repo.get_trajectories_by_session(1, limit=10)
+
+
+def test_iter_trajectories_by_session(setup_db, mock_session_repository, cleanup_repo):
+    """Test that iter_trajectories_by_session yields every record in ID order in batches."""
+    repo = TrajectoryRepository(db=setup_db)
+    for i in range(7):
+        repo.create(tool_name=f"tool_{i}", session_id=1)
+
+    with patch.object(
+        repo, "get_trajectories_by_session", wraps=repo.get_trajectories_by_session
+    ) as spy:
+        trajectories = list(repo.iter_trajectories_by_session(1, batch_size=3))
+
+    assert [t.tool_name for t in trajectories] == [f"tool_{i}" for i in range(7)]
+    ids = [t.id for t in trajectories]
+    assert ids == sorted(ids)
+    # Batches of 3, 3 and 1; the short final batch ends the iteration
+    assert spy.call_count == 3
+
+    resumed = list(repo.iter_trajectories_by_session(1, after_id=ids[4], batch_size=3))
+    assert [t.id for t in resumed] == ids[5:]
+
+
 def test_trajectory_repository_manager(setup_db, cleanup_repo, mock_session_repository):
     """Test the TrajectoryRepositoryManager context manager."""
     # Use the context manager to create a repository
@@ -782,3 +853,145 @@ def test_create_hook_error_handling_instance(setup_db, cleanup_repo, mock_sessio
         assert trajectory_model.tool_name == "hook_error_test"
 
 # --- End Tests for Hook Mechanism ---
+
+
+# --- Tests for Write-Behind Mode ---
+
+@pytest.fixture
+def setup_file_db(cleanup_db, tmp_path):
+    """Set up a file-backed database, which the background writer thread can share."""
+    with DatabaseManager(base_dir=str(tmp_path / "db")) as db:
+        # Bind the models directly so the writer thread uses the same database
+        with db.bind_ctx([Trajectory, TrajectoryBlob, HumanInput, Session]):
+            with db.atomic():
+                db.create_tables([Trajectory, TrajectoryBlob, HumanInput, Session], safe=True)
+                Session.create(id=1, name="Test Session")
+
+            yield db
+
+            with db.atomic():
+                Trajectory.drop_table(safe=True)
+                TrajectoryBlob.drop_table(safe=True)
+                HumanInput.drop_table(safe=True)
+                Session.drop_table(safe=True)
+
+
+def test_write_behind_disabled_for_in_memory_db(setup_db, cleanup_repo):
+    """Test that write-behind falls back to synchronous writes for in-memory databases."""
+    repo = TrajectoryRepository(db=setup_db, write_behind=True)
+    assert repo.write_behind is False
+
+    trajectory = repo.create(tool_name="sync_tool")
+    assert trajectory.id is not None
+
+
+def test_write_behind_create_and_flush_on_read(setup_file_db, cleanup_repo, mock_session_repository):
+    """Test that queued records become visible to reads in submission order."""
+    repo = TrajectoryRepository(db=setup_file_db, write_behind=True)
+    try:
+        assert repo.write_behind is True
+
+        queued = [
+            repo.create(tool_name=f"tool_{i}", tool_parameters={"index": i})
+            for i in range(25)
+        ]
+        # Queued records have no ID until the writer commits them
+        assert all(model.id is None for model in queued)
+        assert queued[0].session_id == 1
+        assert queued[0].tool_parameters == {"index": 0}
+
+        # Reads act as a flush barrier
+        trajectories = repo.get_trajectories_by_session(1)
+        assert [t.tool_name for t in trajectories] == [f"tool_{i}" for i in range(25)]
+        assert len(repo.get_all()) == 25
+    finally:
+        repo.close()
+
+
+def test_write_behind_hooks_fire_in_order(setup_file_db, cleanup_repo, mock_session_repository):
+    """Test that create hooks run after commit, in submission order, with IDs assigned."""
+    repo = TrajectoryRepository(db=setup_file_db, write_behind=True)
+    seen = []
+
+    def record_hook(model):
+        seen.append((model.id, model.tool_name))
+
+    repo.register_create_hook(record_hook)
+    try:
+        for i in range(10):
+            repo.create(tool_name=f"tool_{i}")
+        repo.flush()
+    finally:
+        repo.close()
+
+    assert [name for _, name in seen] == [f"tool_{i}" for i in range(10)]
+    ids = [trajectory_id for trajectory_id, _ in seen]
+    assert all(trajectory_id is not None for trajectory_id in ids)
+    assert ids == sorted(ids)
+
+
+def test_write_behind_missing_human_input(setup_file_db, cleanup_repo, mock_session_repository):
+    """Test that references to unknown human inputs are dropped, as in synchronous mode."""
+    repo = TrajectoryRepository(db=setup_file_db, write_behind=True)
+    try:
+        repo.create(tool_name="orphan", human_input_id=9999)
+        trajectories = list(repo.get_all().values())
+    finally:
+        repo.close()
+
+    assert len(trajectories) == 1
+    assert trajectories[0].human_input_id is None
+
+
+def test_write_behind_manager_flushes_on_exit(setup_file_db, cleanup_repo, mock_session_repository):
+    """Test that leaving the manager context writes all queued records."""
+    with TrajectoryRepositoryManager(setup_file_db, write_behind=True) as repo:
+        for i in range(5):
+            repo.create(tool_name=f"tool_{i}")
+
+    assert repo.write_behind is False
+    assert Trajectory.select().count() == 5
+
+
+def test_write_behind_survives_failing_batch(setup_file_db, cleanup_repo, mock_session_repository):
+    """Test that an unexpected error drops its batch without stopping the writer."""
+    from ra_aid.database.repositories import trajectory_repository
+
+    repo = TrajectoryRepository(db=setup_file_db, write_behind=True)
+    externalize = trajectory_repository.externalize
+    try:
+        with patch.object(
+            trajectory_repository, "externalize", side_effect=TypeError("bad row")
+        ):
+            repo.create(tool_name="dropped")
+            repo.flush()
+        with patch.object(trajectory_repository, "externalize", wraps=externalize):
+            repo.create(tool_name="kept")
+            repo.flush()
+        assert repo._writer._thread.is_alive()
+        names = [t.tool_name for t in repo.get_all().values()]
+    finally:
+        repo.close()
+
+    assert names == ["kept"]
+
+
+def test_write_behind_dead_writer_writes_synchronously(setup_file_db, cleanup_repo, mock_session_repository):
+    """Test that records are still written if the writer thread is gone."""
+    repo = TrajectoryRepository(db=setup_file_db, write_behind=True)
+    writer = repo._writer
+    try:
+        # Stop the thread without closing the writer, as if it had died
+        writer._queue.put(writer._STOP)
+        writer._thread.join()
+        # A record queued before the thread was noticed to be dead
+        writer._queue.put({"tool_name": "stranded", "session": 1, "record_type": "tool_execution"})
+
+        repo.create(tool_name="after")
+        names = [t.tool_name for t in repo.get_all().values()]
+    finally:
+        repo.close()
+
+    assert names == ["stranded", "after"]
+
+# --- End Tests for Write-Behind Mode ---
@@ -5,7 +5,14 @@ import tempfile
 
 import pytest
 
-from ra_aid.proc.interactive import run_interactive_command
+from unittest.mock import patch
+
+from ra_aid.proc.interactive import (
+    OUTPUT_LIMIT_BYTES,
+    HeadTailBuffer,
+    clean_output_lines,
+    run_interactive_command,
+)
 
 
 def test_basic_command():
@@ -190,7 +197,9 @@ def test_strip_trailing_whitespace():
 
 def test_tty_available():
     """Test that commands have access to a TTY."""
-    output, retcode = run_interactive_command(["/bin/bash", "-c", "tty"])
+    output, retcode = run_interactive_command(
+        ["/bin/bash", "-c", "tty"], use_pipes=False
+    )
     output_cleaned = output.lstrip(b"^D")
     print(f"Cleaned TTY Output: {output_cleaned}")
     # Check if the output contains a valid TTY path.
@@ -198,3 +207,63 @@ def test_tty_available():
         b"/dev/pts/" in output_cleaned or b"/dev/ttys" in output_cleaned
     ), f"Unexpected TTY output: {output_cleaned}"
     assert retcode == 0
+
+
+def test_pipes_selected_when_stdin_is_not_a_tty():
+    """Test that non-interactive runs use pipes and interactive runs a TTY."""
+    with patch("ra_aid.proc.interactive._stdin_is_tty", return_value=False):
+        output, _ = run_interactive_command(["/bin/bash", "-c", "tty"])
+    assert b"not a tty" in output
+
+    with patch("ra_aid.proc.interactive._stdin_is_tty", return_value=True), patch(
+        "ra_aid.proc.interactive.run_piped_command"
+    ) as mock_piped:
+        output, _ = run_interactive_command(["/bin/bash", "-c", "tty"])
+    mock_piped.assert_not_called()
+    assert b"/dev/pts/" in output or b"/dev/ttys" in output
+
+
+def test_pipe_output_keeps_head_and_tail():
+    """Test that large piped output keeps its first and last lines."""
+    cmd = 'for i in $(seq 1 100000); do echo "Line $i of test output"; done'
+    output, retcode = run_interactive_command(
+        ["/bin/bash", "-c", cmd], use_pipes=True
+    )
+    lines = output.splitlines()
+
+    assert len(output) <= OUTPUT_LIMIT_BYTES
+    assert lines[0] == b"Line 1 of test output"
+    assert lines[-1] == b"Line 100000 of test output"
+    assert any(b"output truncated" in line for line in lines)
+    assert retcode == 0
+
+
+def test_pipe_output_timeout():
+    """Test that piped commands are terminated after twice the expected runtime."""
+    output, retcode = run_interactive_command(
+        ["/bin/bash", "-c", "echo started; sleep 30"],
+        expected_runtime_seconds=1,
+        use_pipes=True,
+    )
+    assert b"started" in output
+    assert b"[Process exceeded timeout (1 seconds expected)]" in output
+    assert retcode != 0
+
+
+def test_head_tail_buffer_is_bounded():
+    """Test that the buffer keeps the head and a bounded tail of the stream."""
+    buffer = HeadTailBuffer(head_size=10, tail_size=100)
+    for i in range(1000):
+        buffer.write(b"%04d\n" % i)
+
+    assert buffer.head == b"0000\n0001\n"
+    assert buffer.tail.endswith(b"0999\n")
+    assert len(buffer.tail) == 100
+    assert buffer.total_bytes == 5000
+    assert buffer.omitted_bytes == 5000 - 10 - 100
+
+
+def test_clean_output_lines():
+    """Test that escape sequences, overwritten text and blank lines are removed."""
+    data = b"\x1b[31mred\x1b[0m  \r\n\r\nprogress 10%\rprogress 100%\ndone\t\n"
+    assert clean_output_lines(data) == ["red", "progress 100%", "done"]
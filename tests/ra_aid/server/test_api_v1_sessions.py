@@ -9,6 +9,7 @@ import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import MagicMock
 import datetime
+import json
 
 from ra_aid.server.api_v1_sessions import router, get_repository
 from ra_aid.database.pydantic_models import SessionModel, TrajectoryModel
@@ -232,7 +233,7 @@ def test_get_session_trajectories(client, mock_repo, mock_trajectory_repo, mock_
     
     # Verify correct method calls
     mock_repo.get.assert_called_once_with(1)
-    mock_trajectory_repo.get_trajectories_by_session.assert_called_once_with(1)
+    mock_trajectory_repo.get_trajectories_by_session.assert_called_once_with(1, after_id=None, limit=None)
 
 
 def test_get_session_trajectories_not_found(client, mock_repo, mock_trajectory_repo):
@@ -246,4 +247,52 @@ def test_get_session_trajectories_not_found(client, mock_repo, mock_trajectory_r
     assert "not found" in response.json()["detail"]
     mock_repo.get.assert_called_once_with(999)
     # Ensure the trajectory repository is not called
-    mock_trajectory_repo.get_trajectories_by_session.assert_not_called()
\ No newline at end of file
+    mock_trajectory_repo.get_trajectories_by_session.assert_not_called()
+
+def test_get_session_trajectories_paged(client, mock_repo, mock_trajectory_repo, mock_trajectories):
+    """Test that after_id and limit are passed through for keyset pagination."""
+    mock_trajectory_repo.get_trajectories_by_session.return_value = mock_trajectories[1:]
+
+    response = client.get("/v1/session/1/trajectory?after_id=1&limit=50")
+
+    assert response.status_code == 200
+    assert [t["id"] for t in response.json()] == [2]
+    mock_trajectory_repo.get_trajectories_by_session.assert_called_once_with(
+        1, after_id=1, limit=50
+    )
+
+
+def test_get_session_trajectories_invalid_limit(client, mock_trajectory_repo):
+    """Test that out-of-range page sizes are rejected."""
+    response = client.get("/v1/session/1/trajectory?limit=0")
+
+    assert response.status_code == 422
+    mock_trajectory_repo.get_trajectories_by_session.assert_not_called()
+
+
+def test_stream_session_trajectories(client, mock_repo, mock_trajectory_repo, mock_trajectories):
+    """Test streaming a session's trajectories as newline-delimited JSON."""
+    mock_trajectory_repo.iter_trajectories_by_session.return_value = iter(mock_trajectories)
+
+    response = client.get("/v1/session/1/trajectory/stream?after_id=0&batch_size=10")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = response.text.splitlines()
+    assert len(lines) == len(mock_trajectories)
+    records = [json.loads(line) for line in lines]
+    assert [r["id"] for r in records] == [t.id for t in mock_trajectories]
+    assert records[0] == json.loads(mock_trajectories[0].model_dump_json())
+    mock_trajectory_repo.iter_trajectories_by_session.assert_called_once_with(
+        1, after_id=0, batch_size=10
+    )
+
+
+def test_stream_session_trajectories_not_found(client, mock_repo, mock_trajectory_repo):
+    """Test streaming trajectories for a session that doesn't exist."""
+    mock_repo.get.return_value = None
+
+    response = client.get("/v1/session/999/trajectory/stream")
+
+    assert response.status_code == 404
+    mock_trajectory_repo.iter_trajectories_by_session.assert_not_called()
@@ -0,0 +1,198 @@
+"""Tests for batch mode (ra-aid --batch)."""
+
+import io
+import json
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ra_aid import agent_utils
+from ra_aid.batch import (
+    BatchRunner,
+    BatchTask,
+    default_batch_output_path,
+    load_batch_tasks,
+)
+from ra_aid.database.connection import close_db, db_var, init_db
+from ra_aid.database.models import (
+    HumanInput,
+    ResearchNote,
+    Session,
+    SessionUsage,
+    Trajectory,
+    TrajectoryBlob,
+    create_session_usage_triggers,
+)
+from ra_aid.database.repositories.config_repository import get_config_repository
+from ra_aid.database.repositories.human_input_repository import (
+    get_human_input_repository,
+)
+from ra_aid.database.repositories.research_note_repository import (
+    ResearchNoteRepositoryManager,
+    get_research_note_repository,
+)
+from ra_aid.database.repositories.session_repository import (
+    SessionRepository,
+    get_session_repository,
+)
+from ra_aid.database.repositories.trajectory_repository import (
+    get_trajectory_repository,
+)
+from ra_aid.exceptions import ToolExecutionError
+from ra_aid.tools.memory import task_completed
+
+MODELS = [Session, HumanInput, Trajectory, TrajectoryBlob, SessionUsage]
+
+
+@pytest.fixture
+def batch_db(tmp_path):
+    """Set up a file database, which worker threads can share, with real sessions."""
+    db_var.set(None)
+    db = init_db(base_dir=str(tmp_path / "db"))
+
+    with db.bind_ctx(MODELS):
+        db.create_tables(MODELS)
+        create_session_usage_triggers()
+        # conftest replaces SessionRepository with a mock
+        with patch(
+            "ra_aid.database.repositories.session_repository.SessionRepository",
+            SessionRepository,
+        ):
+            yield db
+
+    close_db()
+    db_var.set(None)
+
+
+def test_load_batch_tasks(tmp_path):
+    """Test that tasks get ids from the file or their line number."""
+    path = tmp_path / "tasks.jsonl"
+    path.write_text(
+        '{"id": "a", "message": "first"}\n'
+        "\n"
+        '{"message": "second", "research_only": false}\n'
+    )
+    assert load_batch_tasks(str(path)) == [
+        BatchTask("a", "first"),
+        BatchTask("3", "second", research_only=False),
+    ]
+    assert default_batch_output_path(str(path)) == str(tmp_path / "tasks.results.jsonl")
+    assert default_batch_output_path("tasks.txt") == "tasks.txt.results.jsonl"
+
+
+@pytest.mark.parametrize(
+    "content, error",
+    [
+        ("{not json}\n", "tasks.jsonl:1: invalid JSON"),
+        ('{"id": "a"}\n', 'expected an object with a "message" string'),
+        ('"just a string"\n', 'expected an object with a "message" string'),
+        ('{"message": "m", "research_only": "yes"}\n', '"research_only" must be a boolean'),
+        ('{"id": 1, "message": "m"}\n{"id": "1", "message": "m"}\n', "tasks.jsonl:2: duplicate task id"),
+    ],
+)
+def test_load_batch_tasks_errors(tmp_path, content, error):
+    """Test that invalid lines are reported with their line number."""
+    path = tmp_path / "tasks.jsonl"
+    path.write_text(content)
+    with pytest.raises(ValueError, match=error):
+        load_batch_tasks(str(path))
+
+
+def test_run_tasks_concurrently(batch_db):
+    """Test that tasks run concurrently, each in its own session, with their usage."""
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def fake_research_agent(message, model, **kwargs):
+        with lock:
+            running.append(message)
+            peak.append(len(running))
+        session_id = get_session_repository().get_current_session_id()
+        assert kwargs["thread_id"] == str(session_id)
+        assert kwargs["research_only"] is (message != "implement")
+        assert get_config_repository().get("research_only") is kwargs["research_only"]
+        # Records are attributed to the task's own input, not the latest one
+        human_input = get_human_input_repository().get_most_recent_id()
+        assert HumanInput.get_by_id(human_input).content == message
+
+        time.sleep(0.2)
+        get_trajectory_repository().create(
+            record_type="model_usage",
+            current_cost=0.01,
+            input_tokens=10 * len(message),
+            output_tokens=5,
+        )
+        with lock:
+            running.remove(message)
+        if message == "fail":
+            raise ValueError("model unavailable")
+        return f"answer to {message}"
+
+    tasks = [
+        BatchTask("1", "one"),
+        BatchTask("2", "fail"),
+        BatchTask("3", "three"),
+        BatchTask("4", "implement", research_only=False),
+    ]
+    output = io.StringIO()
+    runner = BatchRunner("model", concurrency=3, research_only=True)
+    with patch("ra_aid.batch.run_research_agent", side_effect=fake_research_agent):
+        results = runner.run(tasks, output)
+
+    assert max(peak) == 3
+    assert [result.id for result in results] == ["1", "2", "3", "4"]
+    assert [result.status for result in results] == ["completed", "failed", "completed", "completed"]
+    assert results[0].result == "answer to one"
+    assert results[1].error == "model unavailable"
+    assert results[2].usage == {
+        "total_cost": pytest.approx(0.01),
+        "total_input_tokens": 50,
+        "total_output_tokens": 5,
+        "total_tokens": 55,
+    }
+    assert len({result.session_id for result in results}) == 4
+    assert all(result.latency >= 0.2 for result in results)
+
+    lines = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert sorted(line["id"] for line in lines) == ["1", "2", "3", "4"]
+    assert {line["id"]: line["usage"]["total_tokens"] for line in lines}["4"] == 95
+    assert json.loads(Session.get_by_id(results[0].session_id).machine_info) == {
+        "agent_type": "research-only",
+        "batch_task": "1",
+    }
+
+
+def test_results_of_real_agent_runs(batch_db):
+    """Test results and statuses from what run_agent_with_retry actually returns."""
+
+    def fake_stream(agent, msg_list):
+        message = msg_list[0].content
+        if message == "answer":
+            task_completed.invoke({"message": "The answer is 42"})
+        elif message == "notes":
+            get_research_note_repository().create(
+                "The config lives in config.py",
+                human_input_id=get_human_input_repository().get_most_recent_id(),
+            )
+        elif message == "crash":
+            raise ToolExecutionError("400 Bad Request")
+
+    def fake_research_agent(message, model, **kwargs):
+        return agent_utils.run_agent_with_retry(MagicMock(), message)
+
+    tasks = [BatchTask("1", "answer"), BatchTask("2", "notes"), BatchTask("3", "crash")]
+    runner = BatchRunner("model", concurrency=2, research_only=True)
+    with batch_db.bind_ctx([ResearchNote]), ResearchNoteRepositoryManager(batch_db), patch(
+        "ra_aid.batch.run_research_agent", side_effect=fake_research_agent
+    ), patch("ra_aid.agent_utils._run_agent_stream", side_effect=fake_stream):
+        batch_db.create_tables([ResearchNote])
+        results = runner.run(tasks, io.StringIO())
+
+    assert [result.status for result in results] == ["completed", "completed", "failed"]
+    assert results[0].result == "The answer is 42"
+    assert results[1].result == "The config lives in config.py"
+    assert results[2].result is None
+    assert results[2].error == "Agent has crashed: Unretryable error: 400 Bad Request"
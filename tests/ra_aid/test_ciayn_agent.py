@@ -174,6 +174,43 @@ def test_trim_chat_history_both_limits():
     assert result[1] == chat_history[-1]
 
 
+def test_trim_chat_history_caches_token_estimates():
+    """Test that each message's tokens are estimated once across trims."""
+    agent = CiaynAgent(Mock(), [], max_history_messages=100, max_tokens=1000)
+    initial_messages = [HumanMessage(content="Initial")]
+    chat_history = [HumanMessage(content=f"Message {i}") for i in range(20)]
+
+    with unittest.mock.patch.object(
+        CiaynAgent, "_estimate_tokens", wraps=CiaynAgent._estimate_tokens
+    ) as mock_estimate:
+        agent._trim_chat_history(initial_messages, chat_history)
+        assert mock_estimate.call_count == 21
+
+        chat_history.append(AIMessage(content="New message"))
+        agent._trim_chat_history(initial_messages, chat_history)
+        assert mock_estimate.call_count == 22
+
+        # Changed content is re-estimated
+        chat_history[0].content = "Edited message"
+        agent._trim_chat_history(initial_messages, chat_history)
+        assert mock_estimate.call_count == 23
+
+
+def test_trim_chat_history_long_history_running_total():
+    """Test token trimming of a long history against the expected cut-off."""
+    agent = CiaynAgent(Mock(), [], max_history_messages=10000, max_tokens=1000)
+    initial_messages = [HumanMessage(content="Init")]  # 2 tokens
+    chat_history = [HumanMessage(content="x" * 20) for _ in range(5000)]  # 10 tokens each
+
+    result = agent._trim_chat_history(initial_messages, chat_history)
+
+    # 2 + 99 * 10 <= 1000 < 2 + 100 * 10
+    assert len(result) == 100
+    assert result[0] is initial_messages[0]
+    # The caller's history is trimmed in place, as before
+    assert len(chat_history) == 99
+
+
 # Fallback tests
 class TestCiaynAgentFallback(unittest.TestCase):
     def setUp(self):
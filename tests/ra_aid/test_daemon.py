@@ -0,0 +1,136 @@
+"""Tests for the ra-aid daemon and its forwarding client."""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+from argparse import Namespace
+
+import pytest
+
+from ra_aid.daemon import can_forward, daemon_socket_path, daemon_supported, forward
+from ra_aid.daemon.protocol import request
+
+pytestmark = pytest.mark.skipif(
+    not daemon_supported(), reason="daemons need fork and Unix sockets"
+)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# A daemon whose commands report what they received instead of running agents
+SERVER_SCRIPT = textwrap.dedent(
+    """
+    import os
+    import sys
+
+    sys.path.insert(0, {repo_root!r})
+
+    from ra_aid.daemon.server import DaemonServer
+
+    def runner(argv):
+        print("argv", " ".join(argv))
+        print("cwd", os.getcwd())
+        print("env", os.environ.get("RA_AID_DAEMON_TEST"))
+        print("stdin", sys.stdin.read().strip())
+        print("failing", file=sys.stderr)
+        raise SystemExit(3)
+
+    DaemonServer(sys.argv[1], runner=runner).serve()
+    """
+)
+
+
+@pytest.fixture
+def runtime_dir(monkeypatch):
+    """A short private runtime directory, as socket paths are limited in length."""
+    path = tempfile.mkdtemp(prefix="rad-")
+    monkeypatch.setenv("XDG_RUNTIME_DIR", path)
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+@pytest.fixture
+def daemon(tmp_path, runtime_dir):
+    """Run a daemon for tmp_path (the mocked current directory) until the test ends."""
+    script = tmp_path / "server.py"
+    script.write_text(SERVER_SCRIPT.format(repo_root=REPO_ROOT))
+    process = subprocess.Popen(
+        [sys.executable, str(script), str(tmp_path)],
+        env=dict(os.environ, XDG_RUNTIME_DIR=runtime_dir),
+    )
+    deadline = time.monotonic() + 30
+    while request(str(tmp_path), {"command": "status"}) is None:
+        assert process.poll() is None, "daemon exited"
+        assert time.monotonic() < deadline, "daemon not ready"
+        time.sleep(0.05)
+    yield process
+    if process.poll() is None:
+        process.terminate()
+    process.wait(timeout=10)
+
+
+def test_socket_path_per_project(tmp_path, runtime_dir):
+    """Test that each project gets its own socket in a private directory."""
+    first = daemon_socket_path(str(tmp_path / "a"))
+    assert first == daemon_socket_path(str(tmp_path / "a" / "."))
+    assert first != daemon_socket_path(str(tmp_path / "b"))
+    assert first.startswith(os.path.join(runtime_dir, f"ra-aid-{os.getuid()}") + os.sep)
+
+
+def test_can_forward():
+    """Test that server mode and --no-daemon always run in process."""
+    assert can_forward(Namespace(server=False, no_daemon=False))
+    assert not can_forward(Namespace(server=True, no_daemon=False))
+    assert not can_forward(Namespace(server=False, no_daemon=True))
+
+
+def test_forward_without_daemon(tmp_path, runtime_dir):
+    """Test that commands run locally when no daemon serves the project."""
+    assert forward(["-m", "task"], str(tmp_path)) is None
+
+    # A socket left behind by a daemon that is gone
+    socket_path = daemon_socket_path(str(tmp_path))
+    os.makedirs(os.path.dirname(socket_path), mode=0o700)
+    open(socket_path, "w").close()
+    assert forward(["-m", "task"], str(tmp_path)) is None
+
+
+def test_forward_runs_in_daemon(tmp_path, daemon, monkeypatch):
+    """Test that a forwarded command gets the client's arguments, environment and stdio."""
+    monkeypatch.setenv("RA_AID_DAEMON_TEST", "from client")
+    stdin = tmp_path / "stdin"
+    stdin.write_text("typed input\n")
+    out, err = tmp_path / "out", tmp_path / "err"
+    with open(stdin) as i, open(out, "w") as o, open(err, "w") as e:
+        status = forward(["-m", "task"], str(tmp_path), [i.fileno(), o.fileno(), e.fileno()])
+
+    assert status == 3
+    assert out.read_text().splitlines() == [
+        "argv -m task",
+        f"cwd {tmp_path}",
+        "env from client",
+        "stdin typed input",
+    ]
+    assert err.read_text() == "failing\n"
+
+    status = request(str(tmp_path), {"command": "status"})
+    assert status["pid"] == daemon.pid
+    assert status["runs"] == 1
+
+
+def test_version_mismatch_runs_locally(tmp_path, daemon, monkeypatch):
+    """Test that a daemon of another ra-aid version leaves the command to the client."""
+    monkeypatch.setattr("ra_aid.daemon.client.__version__", "0.0.0")
+    assert forward(["-m", "task"], str(tmp_path)) is None
+    assert request(str(tmp_path), {"command": "status"})["runs"] == 0
+
+
+def test_stop(tmp_path, daemon):
+    """Test that a stopped daemon removes its socket."""
+    assert request(str(tmp_path), {"command": "stop"}) == {"stopping": True}
+    assert daemon.wait(timeout=10) == 0
+    assert not os.path.exists(daemon_socket_path(str(tmp_path)))
+    assert forward(["-m", "task"], str(tmp_path)) is None
@@ -0,0 +1,134 @@
+"""Tests for the cached, parallel environment inventory."""
+
+import json
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from ra_aid.env_inv import EnvDiscovery, discover_environment, env_inventory_path
+
+RESULTS = {
+    "os": {"name": "Linux", "wsl": False},
+    "cli_tools": {"git": {"found": True, "version": "git version 2.39.2"}},
+    "python": {"installations": [], "env_tools": {}},
+    "package_managers": {},
+    "libraries": {},
+    "node": {"node_version": None, "npm_version": None, "nvm_installed": False},
+}
+
+
+def fake_discover(self):
+    """Stand-in for a full discovery, which takes seconds."""
+    self._markdown = None
+    self.results = json.loads(json.dumps(RESULTS))
+    return self.results
+
+
+@pytest.fixture
+def discover():
+    with patch.object(EnvDiscovery, "discover", autospec=True, side_effect=fake_discover) as mock:
+        yield mock
+
+
+def test_inventory_is_reused(tmp_path, discover):
+    """Test that a second run loads the inventory instead of probing again."""
+    first = discover_environment(str(tmp_path))
+    assert os.path.exists(env_inventory_path(str(tmp_path)))
+    assert discover_environment(str(tmp_path)) == first
+    assert "git version 2.39.2" in first
+    assert discover.call_count == 1
+
+
+def test_inventory_is_rebuilt_when_tools_change(tmp_path, monkeypatch, discover):
+    """Test that changes to PATH or to a probed binary invalidate the inventory."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    tool = bin_dir / "rg"
+    tool.write_text("#!/bin/sh\n")
+    tool.chmod(0o755)
+    monkeypatch.setenv("PATH", str(bin_dir))
+    state_dir = str(tmp_path / ".ra-aid")
+
+    discover_environment(state_dir)
+    discover_environment(state_dir)
+    assert discover.call_count == 1
+
+    stat = tool.stat()
+    os.utime(tool, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    discover_environment(state_dir)
+    assert discover.call_count == 2
+
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{tmp_path}")
+    discover_environment(state_dir)
+    assert discover.call_count == 3
+
+    discover_environment(state_dir, refresh=True)
+    assert discover.call_count == 4
+
+
+def test_stale_or_unreadable_inventory_is_rebuilt(tmp_path, discover):
+    """Test that an expired or corrupt inventory file is replaced."""
+    cache_path = env_inventory_path(str(tmp_path))
+    EnvDiscovery().discover_cached(cache_path)
+    EnvDiscovery().discover_cached(cache_path, max_age=0)
+    assert discover.call_count == 2
+
+    with open(cache_path, "w") as f:
+        f.write("{not json")
+    env = EnvDiscovery()
+    assert env.discover_cached(cache_path) == RESULTS
+    assert discover.call_count == 3
+    with open(cache_path) as f:
+        assert json.load(f)["results"] == RESULTS
+
+
+def test_unwritable_state_dir_is_not_an_error(tmp_path, discover):
+    """Test that discovery still returns the inventory when it cannot be saved."""
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    assert "Operating System" in discover_environment(str(blocker / "state"))
+
+
+def test_format_markdown_is_memoized():
+    """Test that the markdown is rendered once until the next discovery."""
+    env = EnvDiscovery()
+    env.results = RESULTS
+    with patch.object(env, "_render_markdown", wraps=env._render_markdown) as render:
+        assert env.format_markdown() is env.format_markdown()
+    render.assert_called_once()
+
+
+def test_probes_fan_out_subprocesses():
+    """Test that discover() runs probe subprocesses on its pool with the same results."""
+    threads = set()
+
+    def check_output(cmd, **kwargs):
+        threads.add(threading.current_thread().name)
+        if cmd[0] == "pkg-config":
+            return "1.0" if kwargs.get("text") else b""
+        return f"{cmd[0]} 1.0"
+
+    def probe_serially(env):
+        for probe in (
+            env._detect_os,
+            env._detect_cli_tools,
+            env._detect_python,
+            env._detect_python_env_tools,
+            env._detect_package_managers,
+            env._detect_libraries,
+            env._detect_node,
+        ):
+            probe()
+        return env.results
+
+    with patch("ra_aid.env_inv.shutil.which", side_effect=lambda name: f"/usr/bin/{name}"), patch(
+        "ra_aid.env_inv.subprocess.check_output", side_effect=check_output
+    ):
+        expected = probe_serially(EnvDiscovery())
+        threads.clear()
+        results = EnvDiscovery(max_workers=4).discover()
+
+    assert results == expected
+    assert any(name.startswith("ra-aid-env_") for name in threads)
@@ -0,0 +1,92 @@
+"""
+Import-time budget of the ra-aid entry point.
+
+ra_aid.cli must answer --help and --version without importing the agent
+stack. These tests run the entry point under ``python -X importtime`` and fail
+when it imports a heavy dependency or exceeds its time budget.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from ra_aid.__version__ import __version__
+
+# Cumulative import time allowed for ra_aid.cli, in milliseconds. Parsing the
+# command line takes ~20ms; importing the agent stack takes seconds.
+IMPORT_TIME_BUDGET_MS = 300
+
+# Packages that only the chosen mode may import
+HEAVY_MODULES = [
+    "litellm",
+    "langchain_core",
+    "langgraph",
+    "fastapi",
+    "peewee",
+    "rich",
+    "ra_aid.agent_utils",
+    "ra_aid.database",
+]
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def run_importtime(code: str) -> subprocess.CompletedProcess:
+    """Run Python code with -X importtime from the repository root."""
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=REPO_ROOT,
+        env=env,
+        timeout=120,
+    )
+
+
+def parse_importtime(stderr: str) -> dict:
+    """Map each imported module to its cumulative import time in microseconds."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+@pytest.fixture(scope="module")
+def cli_imports():
+    """Import times of ra_aid.cli, after a warm-up run that writes bytecode."""
+    run_importtime("import ra_aid.cli")
+    result = run_importtime("import ra_aid.cli")
+    assert result.returncode == 0, result.stderr
+    return parse_importtime(result.stderr)
+
+
+def test_entry_point_skips_heavy_imports(cli_imports):
+    """Test that importing the entry point imports no heavy dependency."""
+    heavy = sorted(
+        name
+        for name in cli_imports
+        if any(name == m or name.startswith(m + ".") for m in HEAVY_MODULES)
+    )
+    assert heavy == []
+
+
+def test_entry_point_import_time_budget(cli_imports):
+    """Test that the entry point imports within its time budget."""
+    assert cli_imports["ra_aid.cli"] / 1000 <= IMPORT_TIME_BUDGET_MS
+
+
+def test_version_does_not_import_agents():
+    """Test that --version is answered by the entry point alone."""
+    result = run_importtime(
+        "import sys; sys.argv = ['ra-aid', '--version']; "
+        "from ra_aid.cli import main; main()"
+    )
+    assert result.returncode == 0
+    assert result.stdout.strip() == f"ra-aid {__version__}"
+    assert "litellm" not in parse_importtime(result.stderr)
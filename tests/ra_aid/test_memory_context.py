@@ -0,0 +1,120 @@
+"""Tests for relevance-budgeted memory in agent prompts."""
+
+from unittest.mock import patch
+
+import pytest
+
+from ra_aid.memory_context import (
+    bm25_scores,
+    build_memory_sections,
+    estimate_tokens,
+    select_memory,
+)
+from ra_aid.model_formatters import format_key_facts_dict, format_research_notes_dict
+from ra_aid.model_formatters.key_snippets_formatter import format_key_snippets_dict
+
+FACTS = {
+    1: "The CLI entry point is ra_aid/__main__.py",
+    2: "Database migrations live in ra_aid/migrations",
+    3: "Tests are run with pytest",
+    4: "The web UI is served by FastAPI",
+}
+SNIPPETS = {
+    1: {
+        "filepath": "ra_aid/database/migrations.py",
+        "line_number": 10,
+        "snippet": "def apply_migrations():\n    pass",
+        "description": "Applies pending database migrations",
+    },
+}
+NOTES = {1: "The frontend is written in React and talks to the FastAPI server"}
+
+
+@pytest.fixture
+def memory_repositories():
+    """Serve FACTS, SNIPPETS and NOTES from mocked repositories."""
+    with patch("ra_aid.memory_context.get_key_fact_repository") as facts, patch(
+        "ra_aid.memory_context.get_key_snippet_repository"
+    ) as snippets, patch("ra_aid.memory_context.get_research_note_repository") as notes:
+        facts.return_value.get_facts_dict.return_value = dict(FACTS)
+        snippets.return_value.get_snippets_dict.return_value = dict(SNIPPETS)
+        notes.return_value.get_notes_dict.return_value = dict(NOTES)
+        yield facts, snippets, notes
+
+
+def fact_tokens(*fact_ids):
+    """Return the budget needed for the given facts."""
+    return sum(estimate_tokens(format_key_facts_dict({i: FACTS[i]})) + 1 for i in fact_ids)
+
+
+def test_bm25_prefers_matching_and_rare_terms():
+    """Test that documents sharing more, rarer words with the query score higher."""
+    scores = bm25_scores(
+        "database migrations",
+        ["database migrations are applied", "the database is sqlite", "unrelated text"],
+    )
+    assert scores[0] > scores[1] > scores[2] == 0
+    assert bm25_scores("", ["anything"]) == [0.0]
+
+
+def test_everything_fits_is_unchanged(memory_repositories):
+    """Test that memory within the budget is formatted exactly as before."""
+    sections = build_memory_sections("database migrations", token_budget=100000)
+
+    assert sections.key_facts == format_key_facts_dict(FACTS)
+    assert sections.key_snippets == format_key_snippets_dict(SNIPPETS)
+    assert sections.research_notes == format_research_notes_dict(NOTES)
+    assert sections.omitted == {}
+
+
+def test_budget_keeps_most_relevant_items():
+    """Test that the most relevant items are kept and the rest are omitted."""
+    selected, omitted = select_memory(
+        "how are database migrations applied",
+        {"key_facts": dict(FACTS)},
+        token_budget=fact_tokens(2, 3),
+    )
+
+    # Fact 2 matches the task; the rest of the budget goes to other facts that fit
+    assert 2 in selected["key_facts"]
+    assert set(selected["key_facts"]) | set(omitted["key_facts"]) == set(FACTS)
+    assert omitted["key_facts"] == sorted(omitted["key_facts"])
+    used = sum(fact_tokens(i) for i in selected["key_facts"])
+    assert used <= fact_tokens(2, 3)
+
+
+def test_budget_is_shared_across_kinds(memory_repositories):
+    """Test that a snippet relevant to the task beats unrelated facts."""
+    snippet_tokens = estimate_tokens(format_key_snippets_dict(SNIPPETS)) + 1
+    sections = build_memory_sections(
+        "database migrations", token_budget=snippet_tokens + fact_tokens(2)
+    )
+
+    assert sections.key_snippets == format_key_snippets_dict(SNIPPETS)
+    assert sections.key_facts.startswith(format_key_facts_dict({2: FACTS[2]}))
+    assert sections.omitted == {"key_facts": [1, 3, 4], "research_notes": [1]}
+    # The overflow is listed by ID so the agent can fetch it
+    assert "#1, #3, #4" in sections.key_facts
+    assert 'read_memory(kind="key_facts"' in sections.key_facts
+    assert sections.research_notes.startswith("Research notes not shown")
+
+
+def test_budget_from_config(memory_repositories, mock_config_repository):
+    """Test that the budget comes from the memory_token_budget config value."""
+    mock_config_repository.set("memory_token_budget", 1)
+    sections = build_memory_sections("anything", kinds=("key_facts",))
+    assert sections.omitted == {"key_facts": [1, 2, 3, 4]}
+    assert sections.key_snippets == ""
+
+    mock_config_repository.set("memory_token_budget", 0)
+    assert build_memory_sections("anything").omitted == {}
+
+
+def test_unavailable_repository_is_skipped(memory_repositories):
+    """Test that a missing repository leaves its section empty."""
+    facts, _, _ = memory_repositories
+    facts.side_effect = RuntimeError("No KeyFactRepository available")
+
+    sections = build_memory_sections("database", token_budget=0)
+    assert sections.key_facts == ""
+    assert sections.research_notes == format_research_notes_dict(NOTES)
@@ -0,0 +1,213 @@
+"""Tests for the background memory GC scheduler."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ra_aid.agent_context import agent_context, get_current_context
+from ra_aid.memory_gc import GCPolicy, MemoryGCScheduler, get_memory_gc_scheduler
+from ra_aid.utils.singleton import Singleton
+
+
+class FakeMemory:
+    """A kind of memory whose GC run removes rows down to a target, optionally blocking."""
+
+    def __init__(self, count, keep=10):
+        self.count = count
+        self.keep = keep
+        self.runs = 0
+        self.run_threads = []
+        self.release = threading.Event()
+        self.release.set()
+        self.started = threading.Event()
+
+    def run(self):
+        self.runs += 1
+        self.run_threads.append(threading.current_thread())
+        self.started.set()
+        self.release.wait(5)
+        self.count = min(self.count, self.keep)
+
+    def policy(self, threshold=20, min_growth=5):
+        return GCPolicy(
+            threshold=threshold, min_growth=min_growth, count=lambda: self.count, run=self.run
+        )
+
+
+@pytest.fixture
+def make_scheduler():
+    """Create fresh schedulers, shutting them down after the test."""
+    schedulers = []
+
+    def make(policies):
+        Singleton._instances.pop(MemoryGCScheduler, None)
+        scheduler = MemoryGCScheduler(policies)
+        schedulers.append(scheduler)
+        return scheduler
+
+    yield make
+    for scheduler in schedulers:
+        scheduler.shutdown()
+    Singleton._instances.pop(MemoryGCScheduler, None)
+
+
+def test_scheduler_is_process_wide(make_scheduler):
+    """Test that the accessor returns the shared instance."""
+    scheduler = make_scheduler({})
+    assert get_memory_gc_scheduler() is scheduler
+
+
+def test_below_threshold_does_not_run(make_scheduler):
+    """Test that nothing is scheduled until the threshold is exceeded."""
+    memory = FakeMemory(20)
+    scheduler = make_scheduler({"facts": memory.policy(threshold=20)})
+
+    assert not scheduler.notify("facts", 20)
+    scheduler.wait(5)
+    assert memory.runs == 0
+
+
+def test_runs_in_background_without_blocking(make_scheduler):
+    """Test that notify returns while the GC agent is still running on another thread."""
+    memory = FakeMemory(25)
+    memory.release.clear()
+    scheduler = make_scheduler({"facts": memory.policy()})
+
+    assert scheduler.notify("facts", 25)
+    assert memory.started.wait(5)
+    # Still running: further notifications are coalesced
+    assert not scheduler.notify("facts", 26)
+
+    memory.release.set()
+    scheduler.wait(5)
+    assert memory.runs == 1
+    assert memory.run_threads[0] is not threading.current_thread()
+    assert memory.run_threads[0].name.startswith("memory-gc")
+
+
+def test_hysteresis(make_scheduler):
+    """Test that a run that can't get below the threshold isn't repeated on every emit."""
+    memory = FakeMemory(25, keep=24)
+    scheduler = make_scheduler({"facts": memory.policy(threshold=20, min_growth=5)})
+
+    assert scheduler.notify("facts", 25)
+    scheduler.wait(5)
+    assert memory.count == 24
+
+    # The run left 24 rows, so the next one waits until more than 29 are stored
+    assert not scheduler.notify("facts", 25)
+    assert not scheduler.notify("facts", 29)
+    assert scheduler.notify("facts", 30)
+    scheduler.wait(5)
+    assert memory.runs == 2
+
+
+def test_kinds_run_concurrently(make_scheduler):
+    """Test that different kinds of memory are collected at the same time."""
+    facts = FakeMemory(25)
+    notes = FakeMemory(25)
+    facts.release.clear()
+    scheduler = make_scheduler({"facts": facts.policy(), "notes": notes.policy()})
+
+    scheduler.notify("facts", 25)
+    assert facts.started.wait(5)
+    scheduler.notify("notes", 25)
+    assert notes.started.wait(5)
+
+    facts.release.set()
+    scheduler.wait(5)
+    assert (facts.runs, notes.runs) == (1, 1)
+
+
+def test_shutdown_cancels_queued_collections(make_scheduler):
+    """Test that shutdown drops collections that haven't started."""
+    facts = FakeMemory(25)
+    notes = FakeMemory(25)
+    facts.release.clear()
+    scheduler = make_scheduler({"facts": facts.policy(), "notes": notes.policy()})
+
+    # A single worker, so that the second collection is queued behind the first
+    with patch(
+        "ra_aid.memory_gc.ThreadPoolExecutor",
+        lambda **kwargs: ThreadPoolExecutor(**{**kwargs, "max_workers": 1}),
+    ):
+        scheduler.notify("facts", 25)
+        assert facts.started.wait(5)
+        scheduler.notify("notes", 25)
+
+    scheduler.shutdown(wait=False)
+    facts.release.set()
+    scheduler.wait(5)
+    assert (facts.runs, notes.runs) == (1, 0)
+
+
+def test_background_run_is_isolated_from_agent_context(make_scheduler):
+    """Test that GC agents don't see or mark the scheduling agent's context."""
+    seen = []
+
+    def run():
+        seen.append(get_current_context())
+
+    scheduler = make_scheduler(
+        {"facts": GCPolicy(threshold=1, min_growth=1, count=lambda: 0, run=run)}
+    )
+    with agent_context() as ctx:
+        scheduler.notify("facts", 5)
+        scheduler.wait(5)
+        assert get_current_context() is ctx
+
+    assert seen == [None]
+
+
+def test_failed_run_is_not_retried_immediately(make_scheduler):
+    """Test that a failing GC agent is logged and doesn't block later runs."""
+    memory = FakeMemory(25)
+    run = MagicMock(side_effect=RuntimeError("model unavailable"))
+    scheduler = make_scheduler(
+        {"facts": GCPolicy(threshold=20, min_growth=5, count=lambda: memory.count, run=run)}
+    )
+
+    assert scheduler.notify("facts", 25)
+    scheduler.wait(5)
+    assert not scheduler.notify("facts", 26)
+    assert scheduler.notify("facts", 31)
+    scheduler.wait(5)
+    assert run.call_count == 2
+
+
+def test_in_memory_database_runs_inline(make_scheduler):
+    """Test that collections run in the calling thread when other threads can't see the database."""
+    memory = FakeMemory(25)
+    scheduler = make_scheduler({"facts": memory.policy()})
+
+    with patch("ra_aid.memory_gc._database_is_in_memory", return_value=True):
+        assert scheduler.notify("facts", 25)
+
+    assert memory.runs == 1
+    assert memory.run_threads == [threading.current_thread()]
+    scheduler.wait(5)
+
+
+def test_duplicates_are_deleted_without_model_call():
+    """Test that the GC agent skips the model when deleting duplicates is enough."""
+    from ra_aid.agents.key_facts_gc_agent import run_key_facts_gc_agent
+    facts = [MagicMock(id=i, content=f"Fact {i % 3}", human_input_id=None) for i in range(1, 7)]
+    repo = MagicMock()
+    repo.get_all.side_effect = [facts, facts[:3]]
+    repo.delete_duplicates.return_value = [(fact, fact.id - 3) for fact in facts[3:]]
+
+    with patch(
+        "ra_aid.agents.key_facts_gc_agent.get_key_fact_repository", return_value=repo
+    ), patch("ra_aid.agents.key_facts_gc_agent.get_human_input_repository") as human_input, patch(
+        "ra_aid.agents.key_facts_gc_agent.agent_utils"
+    ) as agent_utils, patch("ra_aid.agents.key_facts_gc_agent.console_panel"), patch(
+        "ra_aid.console.formatting.console_panel"
+    ) as duplicates_panel:
+        human_input.return_value.get_most_recent_id.return_value = 7
+        run_key_facts_gc_agent(threshold=5)
+
+    repo.delete_duplicates.assert_called_once_with(7)
+    assert "Deleted 3 duplicate key facts" in duplicates_panel.call_args[0][0]
+    agent_utils.create_agent.assert_not_called()
@@ -0,0 +1,112 @@
+"""Tests for the concurrent startup pipeline."""
+
+import contextvars
+import threading
+import time
+
+import pytest
+
+from ra_aid.env_inv_context import EnvInvManager, get_env_inv
+from ra_aid.startup import StartupPipeline
+
+request_var = contextvars.ContextVar("request", default=None)
+
+
+def test_independent_steps_run_concurrently():
+    """Test that steps without requirements run at the same time."""
+    barrier = threading.Barrier(3, timeout=5)
+
+    with StartupPipeline(max_workers=3) as startup:
+        for name in ("env_discovery", "version_check", "dependencies"):
+            startup.add(name, barrier.wait)
+        # Would time out if the steps ran one after another
+        for name in ("env_discovery", "version_check", "dependencies"):
+            startup.result(name)
+
+    assert {timing.name for timing in startup.timings} == {
+        "env_discovery",
+        "version_check",
+        "dependencies",
+    }
+    assert len({timing.thread for timing in startup.timings}) == 3
+
+
+def test_steps_wait_for_their_requirements():
+    """Test that a step starts only after the steps it requires have finished."""
+    order = []
+
+    def record(name, delay=0):
+        time.sleep(delay)
+        order.append(name)
+        return name
+
+    with StartupPipeline() as startup:
+        startup.add("database", record, "database", delay=0.05)
+        startup.add("memory", record, "memory", requires=["database"])
+        startup.add("llm", record, "llm", requires=["database", "memory"])
+        assert startup.result("llm") == "llm"
+
+    assert order == ["database", "memory", "llm"]
+
+
+def test_failures_propagate_to_dependents():
+    """Test that errors, including SystemExit, are raised by result()."""
+
+    def fail():
+        raise SystemExit(1)
+
+    with StartupPipeline() as startup:
+        startup.add("dependencies", fail)
+        startup.add("llm", lambda: "model", requires=["dependencies"])
+
+        with pytest.raises(SystemExit):
+            startup.result("dependencies")
+        with pytest.raises(SystemExit):
+            startup.result("llm")
+
+
+def test_steps_see_the_callers_context():
+    """Test that steps run with the context variables set when they were added."""
+    token = request_var.set("repository")
+    try:
+        with StartupPipeline() as startup:
+            startup.add("read", request_var.get)
+            assert startup.result("read") == "repository"
+    finally:
+        request_var.reset(token)
+
+
+def test_invalid_steps_are_rejected():
+    """Test that duplicate names and unknown requirements raise ValueError."""
+    with StartupPipeline() as startup:
+        startup.add("database", lambda: None)
+        with pytest.raises(ValueError):
+            startup.add("database", lambda: None)
+        with pytest.raises(ValueError):
+            startup.add("llm", lambda: None, requires=["missing"])
+
+
+def test_main_thread_steps_are_timed():
+    """Test that work timed with step() is recorded next to pooled steps."""
+    with StartupPipeline() as startup:
+        with startup.step("database"):
+            time.sleep(0.01)
+
+    (timing,) = startup.timings
+    assert timing.name == "database"
+    assert timing.thread == threading.current_thread().name
+    assert timing.duration >= 0.01
+
+
+def test_environment_inventory_waits_for_discovery():
+    """Test that get_env_inv resolves an inventory still being discovered."""
+    discovered = threading.Event()
+
+    def discover():
+        discovered.wait(5)
+        return "## Environment"
+
+    with StartupPipeline() as startup:
+        with EnvInvManager(startup.add("env_discovery", discover)):
+            discovered.set()
+            assert get_env_inv() == "## Environment"
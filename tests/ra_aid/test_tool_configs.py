@@ -69,7 +69,7 @@ def test_get_implementation_tools():
 def test_get_web_research_tools():
     # Test with expert enabled
     tools = get_web_research_tools(expert_enabled=True)
-    assert len(tools) == 5
+    assert len(tools) == 6
     assert all(callable(tool) for tool in tools)
 
     # Get tool names and verify exact matches
@@ -79,19 +79,20 @@ def test_get_web_research_tools():
         "ask_expert",
         "web_search_tavily",
         "emit_research_notes",
+        "read_memory",
         "task_completed",
     ]
     assert sorted(tool_names) == sorted(expected_names)
 
     # Test without expert enabled
     tools_no_expert = get_web_research_tools(expert_enabled=False)
-    assert len(tools_no_expert) == 3
+    assert len(tools_no_expert) == 4
     assert all(callable(tool) for tool in tools_no_expert)
 
     # Verify exact tool names when expert is disabled
     tool_names_no_expert = [tool.name for tool in tools_no_expert]
     assert sorted(tool_names_no_expert) == sorted(
-        ["web_search_tavily", "emit_research_notes", "task_completed"]
+        ["web_search_tavily", "emit_research_notes", "read_memory", "task_completed"]
     )
 
 
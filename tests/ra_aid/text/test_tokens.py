@@ -0,0 +1,18 @@
+from langchain_core.messages import AIMessage, HumanMessage
+
+from ra_aid.text.tokens import estimate_tokens
+
+
+def test_estimate_tokens():
+    """Test token estimation of strings and messages."""
+    assert estimate_tokens(None) == 0
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("hello world") == 5  # 11 bytes
+    assert estimate_tokens("🚀") == 2  # 4 bytes
+    assert estimate_tokens(HumanMessage(content="test message")) == 6
+
+
+def test_estimate_tokens_list_content():
+    """Test that list content (tool calls) is estimated from its text."""
+    content = [{"type": "text", "text": "hi"}]
+    assert estimate_tokens(AIMessage(content=content)) == len(str(content)) // 2
@@ -3,6 +3,11 @@ from git import Repo
 from git.exc import InvalidGitRepositoryError
 
 from ra_aid.tools import fuzzy_find_project_files
+from ra_aid.tools.fuzzy_find import (
+    DEFAULT_EXCLUDE_PATTERNS,
+    FuzzyCandidates,
+    get_fuzzy_candidates,
+)
 
 
 @pytest.fixture
@@ -197,3 +202,96 @@ def test_excluding_system_dirs(non_git_repo):
         {"search_term": "module", "repo_path": str(non_git_repo)}
     )
     assert len(results_cache) == 0  # Should not find __pycache__ files
+
+
+def test_candidates_follow_file_changes(git_repo):
+    """Test that the prebuilt candidates are cached and updated when the file list changes"""
+    first = get_fuzzy_candidates(str(git_repo), False, None, DEFAULT_EXCLUDE_PATTERNS)
+    assert get_fuzzy_candidates(str(git_repo), False, None, DEFAULT_EXCLUDE_PATTERNS) is first
+    size = first.size
+
+    (git_repo / "lib/new_helper.py").write_text("def helper(): pass")
+    (git_repo / "draft.py").unlink()
+    updated = get_fuzzy_candidates(str(git_repo), False, None, DEFAULT_EXCLUDE_PATTERNS)
+
+    assert updated is first
+    assert updated.size == size
+    assert "lib/new_helper.py" in updated.paths
+    assert "draft.py" not in updated.paths
+    assert updated.search("new helper", 5, 60)[0][0] == "lib/new_helper.py"
+    assert updated.search("draft", 5, 90) == []
+
+
+def test_incremental_update_keeps_trigram_index(monkeypatch):
+    """Test that added and removed files are reflected in the trigram index"""
+    monkeypatch.setattr("ra_aid.tools.fuzzy_find.TRIGRAM_MIN_CANDIDATES", 100)
+    files = [f"src/module_{i}.py" for i in range(200)]
+    candidates = FuzzyCandidates(files, None, DEFAULT_EXCLUDE_PATTERNS)
+    index = candidates.trigram_index
+    assert index is not None
+
+    candidates.update(files[1:] + ["src/payments_webhook.py"])
+    assert candidates.trigram_index is index
+    assert candidates.size == 200
+    assert candidates.search("payments webhook", 1, 60)[0][0] == "src/payments_webhook.py"
+    assert all(path != "src/module_0.py" for path, _ in candidates.search("module_0", 200, 0))
+
+
+def test_include_paths_do_not_duplicate(git_repo):
+    """Test that files matching several include patterns are listed once"""
+    results = fuzzy_find_project_files.invoke(
+        {"search_term": "utils", "repo_path": str(git_repo), "include_paths": ["lib/*", "*.py"]}
+    )
+    paths = [match[0] for match in results]
+    assert len(paths) == len(set(paths))
+
+
+def test_trigram_shortlist_matches_full_scan(monkeypatch):
+    """Test that the trigram shortlist finds the same best matches as scoring every file"""
+    files = [f"pkg{i % 37}/module_{i}/handler_{i}.py" for i in range(3000)]
+    files += ["services/payments/stripe_webhook.py", "services/payments/refunds.py"]
+
+    full = FuzzyCandidates(files, None, DEFAULT_EXCLUDE_PATTERNS)
+    assert full.trigram_index is None
+
+    monkeypatch.setattr("ra_aid.tools.fuzzy_find.TRIGRAM_MIN_CANDIDATES", 1000)
+    monkeypatch.setattr("ra_aid.tools.fuzzy_find.TRIGRAM_SHORTLIST_SIZE", 200)
+    indexed = FuzzyCandidates(files, None, DEFAULT_EXCLUDE_PATTERNS)
+    assert indexed.trigram_index is not None
+
+    for term in ["stripe webhook", "handler_2999", "refunds"]:
+        assert indexed.search(term, 5, 60)[0] == full.search(term, 5, 60)[0]
+
+    # Too few shortlisted matches fall back to scoring everything
+    assert indexed.search("mian", 5, 0) == full.search("mian", 5, 0)
+
+
+def test_search_during_concurrent_updates(monkeypatch):
+    """Test that searches racing with updates of the shared candidates stay consistent"""
+    import threading
+
+    monkeypatch.setattr("ra_aid.tools.fuzzy_find.TRIGRAM_MIN_CANDIDATES", 100)
+    old = [f"src/old_{i}.py" for i in range(300)]
+    new = [f"src/new_{i}.py" for i in range(300)]
+    candidates = FuzzyCandidates(old, None, DEFAULT_EXCLUDE_PATTERNS)
+    errors = []
+
+    def search():
+        try:
+            for _ in range(50):
+                for path, _ in candidates.search("src new 12", 10, 0):
+                    assert path in old or path in new
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    searchers = [threading.Thread(target=search) for _ in range(3)]
+    for thread in searchers:
+        thread.start()
+    for i in range(50):
+        # Fresh lists, as the file index returns after each change
+        candidates.update(list(new if i % 2 == 0 else old))
+    for thread in searchers:
+        thread.join()
+
+    assert errors == []
+    assert candidates.size == 300
@@ -0,0 +1,150 @@
+import shutil
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ra_aid.tools.ripgrep import (
+    RipgrepJsonUnsupportedError,
+    format_ripgrep_result,
+    ripgrep_search,
+    run_ripgrep_json,
+)
+
+pytestmark = pytest.mark.skipif(shutil.which("rg") is None, reason="rg is not installed")
+
+
+@pytest.fixture(autouse=True)
+def mock_trajectory_repository():
+    """Mock the TrajectoryRepository to avoid database operations during tests"""
+    with patch('ra_aid.database.repositories.trajectory_repository.trajectory_repo_var') as mock_repo_var:
+        mock_repo = MagicMock()
+        mock_repo_var.get.return_value = mock_repo
+        yield mock_repo
+
+
+@pytest.fixture(autouse=True)
+def mock_human_input_repository():
+    """Mock the HumanInputRepository to avoid database operations during tests"""
+    with patch('ra_aid.database.repositories.human_input_repository.human_input_repo_var') as mock_repo_var:
+        mock_repo = MagicMock()
+        mock_repo.get_most_recent_id.return_value = 1
+        mock_repo_var.get.return_value = mock_repo
+        yield mock_repo
+
+
+@pytest.fixture
+def search_dir(tmp_path, monkeypatch):
+    """Create a directory with files to search and make it the working directory"""
+    (tmp_path / "a.py").write_text("import os\nneedle = 1\nx = 2\nneedle = 3\n")
+    (tmp_path / "b.txt").write_text("nothing here\n")
+    (tmp_path / "many.txt").write_text("".join(f"needle {i}\n" for i in range(100)))
+    (tmp_path / "sparse.txt").write_text(
+        "".join(f"needle {i}\nother {i}\n" for i in range(100))
+    )
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def rg(*args):
+    return ["rg", "--json", *args]
+
+
+def test_structured_matches_and_context(search_dir):
+    """Test that matches and context lines are parsed with their paths and line numbers"""
+    result = run_ripgrep_json(rg("-A", "1", "needle", "a.py"), after_context=1)
+
+    assert result.return_code == 0
+    assert result.match_count == 2
+    assert [(l.path, l.line_number, l.text, l.is_match) for l in result.lines] == [
+        ("a.py", 2, "needle = 1", True),
+        ("a.py", 3, "x = 2", False),
+        ("a.py", 4, "needle = 3", True),
+    ]
+
+
+def test_per_file_cap(search_dir):
+    """Test that matches beyond the per-file cap are dropped and the file is marked"""
+    result = run_ripgrep_json(rg("needle", "many.txt", "a.py"), max_matches_per_file=5)
+
+    many = [l for l in result.lines if l.path == "many.txt"]
+    assert len(many) == 5
+    assert result.truncated_files == ["many.txt"]
+    assert not result.truncated
+    assert len([l for l in result.lines if l.path == "a.py"]) == 2
+
+
+def test_global_cap_stops_search(search_dir):
+    """Test that reaching the global cap stops the search and keeps trailing context"""
+    result = run_ripgrep_json(
+        rg("-A", "1", "needle", "sparse.txt"), max_matches=3, after_context=1
+    )
+
+    assert result.truncated
+    assert result.return_code == 0
+    assert result.match_count == 3
+    assert [l.text for l in result.lines] == [
+        "needle 0", "other 0", "needle 1", "other 1", "needle 2", "other 2"
+    ]
+
+
+def test_no_matches(search_dir):
+    """Test that a search without matches keeps rg's return code"""
+    result = run_ripgrep_json(rg("does-not-occur"))
+
+    assert result.return_code == 1
+    assert result.lines == []
+
+
+def test_non_json_output_is_detected(search_dir):
+    """Test that output from an rg without --json support triggers the fallback"""
+    with pytest.raises(RipgrepJsonUnsupportedError):
+        run_ripgrep_json(["rg", "needle", "a.py"])
+
+
+def test_format_result(search_dir):
+    """Test the grouped plain-text formatting of results"""
+    result = run_ripgrep_json(rg("-B", "1", "needle|nothing", "a.py", "b.txt"))
+    result.truncated_files = ["b.txt"]
+
+    assert format_ripgrep_result(result, show_separators=True) == "\n".join(
+        [
+            "a.py",
+            "1-import os",
+            "2:needle = 1",
+            "3-x = 2",
+            "4:needle = 3",
+            "",
+            "b.txt",
+            "1:nothing here",
+            "[More matches in this file were omitted]",
+        ]
+    )
+
+
+def test_tool_uses_json_output(search_dir):
+    """Test the tool end to end without the terminal emulator"""
+    with patch("ra_aid.tools.ripgrep.run_interactive_command") as mock_interactive:
+        result = ripgrep_search.invoke({"pattern": "needle", "include_paths": ["a.py"]})
+
+    mock_interactive.assert_not_called()
+    assert result == {
+        "output": "a.py\n2:needle = 1\n4:needle = 3",
+        "return_code": 0,
+        "success": True,
+    }
+
+
+def test_tool_falls_back_to_terminal_output(search_dir):
+    """Test that the colored terminal path is used when --json is unsupported"""
+    with patch(
+        "ra_aid.tools.ripgrep.run_ripgrep_json",
+        side_effect=RipgrepJsonUnsupportedError("unknown flag --json"),
+    ), patch(
+        "ra_aid.tools.ripgrep.run_interactive_command",
+        return_value=(b"a.py:2:needle = 1", 0),
+    ) as mock_interactive:
+        result = ripgrep_search.invoke({"pattern": "needle"})
+
+    assert mock_interactive.call_args[0][0][:3] == ["rg", "--color", "always"]
+    assert result["output"] == "a.py:2:needle = 1"
+    assert result["success"]
@@ -0,0 +1,107 @@
+"""Tests for deterministic duplicate detection."""
+
+from ra_aid.utils.dedupe import (
+    DuplicateIndex,
+    find_duplicate_groups,
+    fingerprint,
+    normalize_code,
+    normalize_text,
+)
+
+NOTE = (
+    "The authentication module in ra_aid/auth.py uses JWT tokens stored in the "
+    "auth_tokens table with a 30 minute expiry, and refresh tokens are rotated on "
+    "every login by the session service so old tokens stop working immediately."
+)
+
+
+def test_normalize_text():
+    """Test that case, punctuation and whitespace differences are removed."""
+    assert normalize_text("  The API,  uses JWT!\n") == "the api uses jwt"
+    assert normalize_text("See ra_aid/auth.py v1.2.3") == "see ra_aid/auth.py v1.2.3"
+
+
+def test_normalize_code():
+    """Test that indentation, trailing whitespace and blank lines are removed."""
+    code = "    def f():\n\n        return 1   \n"
+    assert normalize_code(code) == "def f():\n    return 1"
+
+
+def test_exact_duplicates():
+    """Test that texts differing only in case and punctuation are duplicates."""
+    index = DuplicateIndex()
+    index.add(1, "Fact 1")
+    index.add(2, "Fact 2")
+
+    assert index.find("fact 1.") == 1
+    assert index.find("FACT  2") == 2
+    assert index.find("Fact 3") is None
+
+
+def test_near_duplicates():
+    """Test that a small change to a long text is a near duplicate."""
+    index = DuplicateIndex()
+    index.add(1, NOTE)
+
+    assert index.find(NOTE.replace("immediately", "at once")) == 1
+    assert index.find(NOTE + " Really.") == 1
+
+
+def test_different_numbers_are_not_near_duplicates():
+    """Test that texts mentioning different numbers or identifiers are kept apart."""
+    index = DuplicateIndex()
+    index.add(1, NOTE)
+
+    assert index.find(NOTE.replace("30", "60")) is None
+    assert index.find(NOTE.replace("auth.py", "login.py")) is None
+
+
+def test_dissimilar_texts_are_not_near_duplicates():
+    """Test that changes in the middle of a text beyond the threshold aren't merged."""
+    index = DuplicateIndex()
+    index.add(1, NOTE)
+
+    assert index.find(NOTE.replace("every", "each").replace("old", "stale")) is None
+
+
+def test_exact_only_index():
+    """Test that an exact-only index doesn't match near duplicates."""
+    index = DuplicateIndex(near=False)
+    index.add(1, NOTE)
+
+    assert fingerprint(NOTE, near=False).shingles == frozenset()
+    assert index.find(NOTE) == 1
+    assert index.find(NOTE + " Really.") is None
+
+
+def test_remove():
+    """Test that removed texts are no longer found."""
+    index = DuplicateIndex()
+    index.add(1, NOTE)
+    index.add(2, "Fact 2")
+    index.remove(1)
+    index.remove(3)
+
+    assert 1 not in index
+    assert len(index) == 1
+    assert index.find(NOTE) is None
+
+
+def test_find_returns_earliest():
+    """Test that the earliest added duplicate is returned."""
+    index = DuplicateIndex()
+    index.add(5, NOTE)
+    index.add(2, NOTE + " Really.")
+
+    assert index.find(NOTE + " Truly.") == 5
+    # Exact duplicates take precedence
+    assert index.find(NOTE + " really") == 2
+
+
+def test_find_duplicate_groups():
+    """Test that texts are grouped with the earliest text they duplicate."""
+    groups = find_duplicate_groups(
+        [(1, "Fact 1"), (2, NOTE), (3, "Fact 2"), (4, "fact 1!"), (5, NOTE + " Really.")]
+    )
+
+    assert groups == [[1, 4], [2, 5]]
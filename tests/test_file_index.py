@@ -0,0 +1,145 @@
+"""Tests for the process-wide project file index."""
+
+import subprocess
+import time
+from unittest.mock import patch
+
+import pytest
+
+from ra_aid.file_index import RACY_WINDOW_NS, ProjectFileIndex, get_project_file_index
+from ra_aid.file_listing import DirectoryNotFoundError, get_all_project_files
+from ra_aid.project_info import get_project_info
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "Test",
+    "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "Test",
+    "GIT_COMMITTER_EMAIL": "test@example.com",
+}
+
+
+def settle():
+    """Wait until recent modifications are outside the index's racy window."""
+    time.sleep(2 * RACY_WINDOW_NS / 1e9)
+
+
+@pytest.fixture
+def index():
+    """Return the shared index, emptied before and after the test."""
+    file_index = get_project_file_index()
+    file_index.invalidate()
+    yield file_index
+    file_index.invalidate()
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """Create a git repository with committed and untracked files."""
+    subprocess.run(["git", "init"], cwd=tmp_path, capture_output=True)
+    for file_path in ["README.md", "src/main.py", "src/utils.py"]:
+        full_path = tmp_path / file_path
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path.write_text(f"Content of {file_path}")
+    subprocess.run(["git", "add", "."], cwd=tmp_path, capture_output=True)
+    subprocess.run(
+        ["git", "commit", "-m", "Initial commit"],
+        cwd=tmp_path,
+        env=GIT_ENV,
+        capture_output=True,
+    )
+    (tmp_path / "notes.txt").write_text("untracked")
+    settle()
+    return tmp_path
+
+
+def test_index_is_process_wide():
+    """Test that all accessors return the same instance."""
+    assert get_project_file_index() is ProjectFileIndex()
+
+
+def test_repeated_listing_is_cached(index, git_repo):
+    """Test that an unchanged project is listed only once."""
+    with patch(
+        "ra_aid.file_index.get_all_project_files", wraps=get_all_project_files
+    ) as lister:
+        first = index.get_files(str(git_repo))
+        second = index.get_files(str(git_repo))
+
+    assert first == ["README.md", "notes.txt", "src/main.py", "src/utils.py"]
+    assert second == first
+    assert lister.call_count == 1
+
+
+def test_new_and_deleted_files_invalidate(index, git_repo):
+    """Test that creating or deleting files anywhere in the listing is detected."""
+    index.get_files(str(git_repo))
+
+    (git_repo / "src" / "new_module.py").write_text("new")
+    assert "src/new_module.py" in index.get_files(str(git_repo))
+
+    (git_repo / "pkg").mkdir()
+    (git_repo / "pkg" / "mod.py").write_text("new")
+    assert "pkg/mod.py" in index.get_files(str(git_repo))
+
+    (git_repo / "notes.txt").unlink()
+    assert "notes.txt" not in index.get_files(str(git_repo))
+
+    # Staging a removal updates the git index
+    subprocess.run(["git", "rm", "-q", "src/utils.py"], cwd=git_repo, check=True)
+    assert "src/utils.py" not in index.get_files(str(git_repo))
+
+
+def test_gitignore_change_invalidates(index, git_repo):
+    """Test that editing .gitignore changes which untracked files are listed."""
+    (git_repo / ".gitignore").write_text("")
+    settle()
+    assert "notes.txt" in index.get_files(str(git_repo))
+
+    (git_repo / ".gitignore").write_text("notes.txt\n")
+    assert "notes.txt" not in index.get_files(str(git_repo))
+
+
+def test_unchanged_project_served_from_cache(index, git_repo):
+    """Test that cache hits are counted and no longer hit after invalidation."""
+    index.get_files(str(git_repo))
+    hits = index.hits
+    index.get_files(str(git_repo))
+    assert index.hits == hits + 1
+
+    index.invalidate(str(git_repo))
+    misses = index.misses
+    index.get_files(str(git_repo))
+    assert index.misses == misses + 1
+
+
+def test_non_git_directory(index, tmp_path):
+    """Test indexing a directory that is not a git repository."""
+    (tmp_path / "a.txt").write_text("a")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.txt").write_text("b")
+    settle()
+
+    assert index.get_files(str(tmp_path)) == ["a.txt", "sub/b.txt"]
+    (tmp_path / "sub" / "c.txt").write_text("c")
+    assert index.get_files(str(tmp_path)) == ["a.txt", "sub/b.txt", "sub/c.txt"]
+
+
+def test_get_file_listing_limit_and_errors(index, git_repo, tmp_path):
+    """Test the get_file_listing equivalent, including errors that are not cached."""
+    files, total = index.get_file_listing(str(git_repo), limit=2)
+    assert files == ["README.md", "notes.txt"]
+    assert total == 4
+
+    with pytest.raises(DirectoryNotFoundError):
+        index.get_file_listing(str(tmp_path / "missing"))
+
+
+def test_project_info_uses_index(index, git_repo):
+    """Test that get_project_info reuses the shared listing."""
+    get_project_info(str(git_repo), file_limit=2)
+    hits = index.hits
+    info = get_project_info(str(git_repo), file_limit=2)
+
+    assert index.hits == hits + 1
+    assert info.files == ["README.md", "notes.txt"]
+    assert info.total_files == 4
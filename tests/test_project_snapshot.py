@@ -0,0 +1,163 @@
+"""Tests for the persistent project snapshot."""
+
+import os
+import subprocess
+import time
+from unittest.mock import patch
+
+import pytest
+
+from ra_aid.file_index import RACY_WINDOW_NS, get_project_file_index
+from ra_aid.file_listing import get_all_project_files
+from ra_aid.project_info import get_project_info
+from ra_aid.project_snapshot import git_state, project_snapshot_path
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "Test",
+    "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "Test",
+    "GIT_COMMITTER_EMAIL": "test@example.com",
+}
+
+
+def settle():
+    """Wait until recent modifications are outside the racy window."""
+    time.sleep(2 * RACY_WINDOW_NS / 1e9)
+
+
+def new_run():
+    """Forget everything cached in process, as if ra-aid was started again."""
+    get_project_file_index().invalidate()
+
+
+@pytest.fixture(autouse=True)
+def index():
+    new_run()
+    yield
+    new_run()
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """Create a git repository with a state directory, as ra-aid leaves it."""
+    subprocess.run(["git", "init"], cwd=tmp_path, capture_output=True)
+    for file_path in ["README.md", "src/main.py"]:
+        full_path = tmp_path / file_path
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path.write_text(f"Content of {file_path}")
+    subprocess.run(["git", "add", "."], cwd=tmp_path, capture_output=True)
+    subprocess.run(
+        ["git", "commit", "-m", "Initial commit"],
+        cwd=tmp_path,
+        env=GIT_ENV,
+        capture_output=True,
+    )
+    (tmp_path / ".ra-aid").mkdir(exist_ok=True)
+    settle()
+    return tmp_path
+
+
+def listing_runs(directory):
+    """Run get_project_info as a new run and count how often files were listed."""
+    new_run()
+    with patch(
+        "ra_aid.file_index.get_all_project_files", wraps=get_all_project_files
+    ) as lister:
+        info = get_project_info(str(directory))
+    return info, lister.call_count
+
+
+def test_repeat_run_loads_snapshot(git_repo):
+    """Test that a second run in an unchanged project does not list it again."""
+    first, listed = listing_runs(git_repo)
+    assert listed == 1
+    assert os.path.exists(project_snapshot_path(os.path.realpath(git_repo)))
+
+    second, listed = listing_runs(git_repo)
+    assert listed == 0
+    assert second == first
+    assert second.files == ["README.md", "src/main.py"]
+
+    # The stored listing is shared with the file tools
+    hits = get_project_file_index().hits
+    get_project_file_index().get_files(str(git_repo))
+    assert get_project_file_index().hits == hits + 1
+
+
+def test_changes_rebuild_snapshot(git_repo):
+    """Test that new files and commits invalidate the stored snapshot."""
+    listing_runs(git_repo)
+
+    (git_repo / "src" / "utils.py").write_text("untracked")
+    settle()
+    info, listed = listing_runs(git_repo)
+    assert listed == 1
+    assert "src/utils.py" in info.files
+
+    subprocess.run(["git", "add", "."], cwd=git_repo, capture_output=True)
+    subprocess.run(
+        ["git", "commit", "-m", "Add utils"], cwd=git_repo, env=GIT_ENV, capture_output=True
+    )
+    settle()
+    _, listed = listing_runs(git_repo)
+    assert listed == 1
+    _, listed = listing_runs(git_repo)
+    assert listed == 0
+
+
+def test_snapshot_requires_state_dir_and_git(tmp_path_factory, git_repo):
+    """Test that nothing is written without .ra-aid or outside git work trees."""
+    (git_repo / ".ra-aid").rmdir()
+    listing_runs(git_repo)
+    assert not (git_repo / ".ra-aid").exists()
+
+    plain = tmp_path_factory.mktemp("plain")
+    (plain / ".ra-aid").mkdir()
+    (plain / "a.txt").write_text("a")
+    settle()
+    assert git_state(str(plain)) is None
+    listing_runs(plain)
+    _, listed = listing_runs(plain)
+    assert listed == 1
+    assert os.listdir(plain / ".ra-aid") == []
+
+
+def test_git_state_without_commits(tmp_path):
+    """Test that a repository without commits has a git directory but no HEAD."""
+    subprocess.run(["git", "init"], cwd=tmp_path, capture_output=True)
+    git_dir, head = git_state(str(tmp_path))
+    assert git_dir == os.path.realpath(tmp_path / ".git")
+    assert head is None
+
+
+def test_ignore_file_edits_rebuild_snapshot(tmp_path_factory, git_repo):
+    """Test that editing nested .gitignore files or core.excludesFile invalidates the snapshot."""
+    (git_repo / "src" / ".gitignore").write_text("*.tmp\n")
+    (git_repo / "src" / "debug.log").write_text("log")
+    (git_repo / "src" / "notes.txt").write_text("notes")
+    excludes = tmp_path_factory.mktemp("config") / "ignore"
+    excludes.write_text("*.bak\n")
+    subprocess.run(
+        ["git", "config", "core.excludesFile", str(excludes)],
+        cwd=git_repo,
+        capture_output=True,
+    )
+    settle()
+    info, listed = listing_runs(git_repo)
+    assert listed == 1
+    assert "src/debug.log" in info.files
+
+    # Rewriting existing files leaves their directories' modification times alone
+    (git_repo / "src" / ".gitignore").write_text("*.log\n")
+    settle()
+    info, listed = listing_runs(git_repo)
+    assert listed == 1
+    assert "src/debug.log" not in info.files
+
+    excludes.write_text("notes.txt\n")
+    settle()
+    info, listed = listing_runs(git_repo)
+    assert listed == 1
+    assert "src/notes.txt" not in info.files
+    _, listed = listing_runs(git_repo)
+    assert listed == 0